@@ -434,3 +434,187 @@ async def calculate_matching_score(
             status_code=500,
             detail=f"Error al calcular matching score: {str(e)}"
         )
+
+
+@router.get(
+    "/student/{student_id}/semantic-recommendations",
+    response_model=dict,
+    summary="Recomendaciones semánticas por embeddings",
+    description="Empleos activos más cercanos al perfil del estudiante en el índice de embeddings",
+    responses={
+        200: {"description": "Recomendaciones generadas exitosamente"},
+        404: {"model": ErrorResponse, "description": "Estudiante no encontrado"},
+        401: {"model": ErrorResponse, "description": "No autenticado"}
+    }
+)
+async def get_semantic_recommendations(
+    student_id: int = Path(
+        ...,
+        gt=0,
+        description="ID del estudiante"
+    ),
+    top_k: int = Query(
+        10,
+        ge=1,
+        le=100,
+        description="Número máximo de empleos a retornar"
+    ),
+    current_user: UserContext = Depends(AuthService.get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Obtener empleos semánticamente similares al perfil del estudiante.
+
+    Usa el índice de embeddings precomputado (vectores spaCy L2-normalizados
+    con índice IVF), por lo que la consulta no depende del número de empleos
+    indexados más allá de las listas exploradas.
+
+    **Reglas de Autorización:**
+    - El estudiante puede ver sus propias recomendaciones
+    - Los administradores pueden ver recomendaciones de cualquier estudiante
+    """
+    try:
+        if current_user.role == "student" and current_user.user_id != student_id:
+            raise HTTPException(
+                status_code=403,
+                detail="No tienes permiso para ver recomendaciones de otro estudiante"
+            )
+
+        if current_user.role not in ["student", "admin"]:
+            raise HTTPException(
+                status_code=403,
+                detail="Las empresas no tienen acceso a recomendaciones de estudiantes"
+            )
+
+        result = await matching_service.find_semantic_job_matches(
+            session, student_id, top_k=top_k
+        )
+
+        return {
+            "student_id": student_id,
+            "jobs": [
+                {
+                    "id": match["job"].id,
+                    "title": match["job"].title,
+                    "company": match["job"].company,
+                    "location": match["job"].location,
+                    "semantic_score": match["score"]
+                }
+                for match in result["matches"]
+            ],
+            "index": result["index"],
+            "generated_at": result["generated_at"]
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error generando recomendaciones semánticas: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error al generar recomendaciones semánticas: {str(e)}"
+        )
+
+
+@router.get(
+    "/student/{student_id}/hybrid-recommendations",
+    response_model=dict,
+    summary="Recomendaciones con pipeline híbrido",
+    description="Candidatos léxicos acotados re-rankeados por similitud semántica, con tiempos por etapa",
+    responses={
+        200: {"description": "Recomendaciones generadas exitosamente"},
+        404: {"model": ErrorResponse, "description": "Estudiante no encontrado"},
+        401: {"model": ErrorResponse, "description": "No autenticado"}
+    }
+)
+async def get_hybrid_recommendations(
+    student_id: int = Path(
+        ...,
+        gt=0,
+        description="ID del estudiante"
+    ),
+    limit: int = Query(
+        10,
+        ge=1,
+        le=100,
+        description="Número máximo de empleos a retornar"
+    ),
+    lexical_limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=2000,
+        description="Candidatos de la etapa léxica (default: settings)"
+    ),
+    semantic_limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=500,
+        description="Candidatos a re-rankear semánticamente (default: settings)"
+    ),
+    current_user: UserContext = Depends(AuthService.get_current_user),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Obtener recomendaciones con el pipeline híbrido de dos etapas.
+
+    **Etapas:**
+    1. Léxica: índice invertido de términos, candidatos acotados
+    2. Semántica: re-rank de los mejores candidatos con vectores spaCy
+
+    La respuesta incluye `pipeline.stages` con candidatos, presupuesto y
+    tiempo medido (`elapsed_ms`) de cada etapa.
+
+    **Reglas de Autorización:**
+    - El estudiante puede ver sus propias recomendaciones
+    - Los administradores pueden ver recomendaciones de cualquier estudiante
+    """
+    try:
+        if current_user.role == "student" and current_user.user_id != student_id:
+            raise HTTPException(
+                status_code=403,
+                detail="No tienes permiso para ver recomendaciones de otro estudiante"
+            )
+
+        if current_user.role not in ["student", "admin"]:
+            raise HTTPException(
+                status_code=403,
+                detail="Las empresas no tienen acceso a recomendaciones de estudiantes"
+            )
+
+        result = await matching_service.find_hybrid_job_matches(
+            session,
+            student_id,
+            limit=limit,
+            lexical_limit=lexical_limit,
+            semantic_limit=semantic_limit
+        )
+
+        return {
+            "student_id": student_id,
+            "jobs": [
+                {
+                    "id": match["job"].id,
+                    "title": match["job"].title,
+                    "company": match["job"].company,
+                    "location": match["job"].location,
+                    "score": match["score"],
+                    "match_details": match["details"]
+                }
+                for match in result["matches"]
+            ],
+            "pipeline": result["pipeline"],
+            "generated_at": result["generated_at"]
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error generando recomendaciones híbridas: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error al generar recomendaciones híbridas: {str(e)}"
+        )
@@ -3,27 +3,43 @@ Endpoints para gestión de estudiantes - CRUD completo (ASYNC)
 Incluye operaciones para crear, leer, actualizar y eliminar estudiantes
 considerando historias de usuario y flujos de trabajo académicos
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, BackgroundTasks
+from typing import List, Optional, Tuple, Union
+import time
+import logging
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, BackgroundTasks, Response
 from sqlmodel import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 import json
 import hashlib
 from datetime import datetime, timedelta
 
-from app.core.database import get_session
-from app.models import Student, AuditLog, Company
+from app.core.database import get_session, async_session
+from app.models import Student, AuditLog, Company, CVProcessingTask, StudentReanalysisJob
 from app.schemas import (
     StudentProfile, StudentCreate, StudentUpdate, StudentSkillsUpdate, ResumeUploadRequest,
     ResumeAnalysisResponse, UserContext, BaseResponse, PaginatedResponse,
-    StudentPublic
+    StudentPublic, ResumeTaskStatus, ReanalysisJobStatus
+)
+from app.services.text_vectorization_service import (
+    text_vectorization_service, TermExtractor, ANALYZER_VERSION
+)
+from app.services.cv_extractor_v2_spacy import get_cv_extractor, EXTRACTOR_VERSION as CV_EXTRACTOR_VERSION
+from app.services.cv_extraction_cascade import CascadeResult, CascadeTier, Deadline, ExtractionCascade
+from app.services.document_context import DocumentContext
+from app.services.unsupervised_cv_extractor import unsupervised_cv_extractor
+from app.services import cv_patterns
+from app.services.cv_analysis_cache import cv_analysis_cache, content_hash
+from app.services.cv_processing_queue import cv_processing_queue, COMPLETED, FAILED
+from app.services.student_reanalysis import student_reanalysis_jobs, ReanalysisJobConflictError
+from app.utils.datetime_utils import utc_now
+from app.utils.file_processing import (
+    extract_text_from_upload, extract_text_from_bytes_async, read_upload_async, CVFileValidator
 )
-from app.services.text_vectorization_service import text_vectorization_service, TermExtractor
-from app.services.cv_extractor_v2_spacy import CVExtractorV2
-from app.utils.file_processing import extract_text_from_upload, extract_text_from_upload_async, CVFileValidator
 from app.middleware.auth import AuthService
 from app.core.config import settings
+from app.core.cpu_executor import run_cpu, CPUExecutorBusyError, CPUTaskTimeoutError
 
+logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/students", tags=["students"])
 
 
@@ -44,12 +60,13 @@ async def _log_audit_action(session: AsyncSession, action: str, resource: str,
     await session.commit()
 
 
-def _extract_resume_analysis(resume_text: str) -> dict:
+def _extract_resume_analysis(resume_text: Union[str, DocumentContext]) -> dict:
     """
     Procesar análisis de CV para extraer skills, soft_skills y proyectos estructurados.
     
     Usa analyze_document() de text_vectorization_service para obtener features,
-    luego los procesa según la lógica de negocio del endpoint.
+    luego los procesa según la lógica de negocio del endpoint. Con un
+    DocumentContext la normalización se comparte con los demás extractores.
     
     Retorna:
         Dict con: {
@@ -59,7 +76,8 @@ def _extract_resume_analysis(resume_text: str) -> dict:
             "confidence": float
         }
     """
-    if not resume_text or len(resume_text.strip()) < 50:
+    context = DocumentContext.of(resume_text)
+    if len(context.text.strip()) < 50:
         return {
             "skills": [],
             "soft_skills": [],
@@ -69,7 +87,7 @@ def _extract_resume_analysis(resume_text: str) -> dict:
     
     try:
         # Usar analyze_document (genérico) para obtener features
-        doc_analysis = text_vectorization_service.analyze_document(resume_text)
+        doc_analysis = text_vectorization_service.analyze_document(context)
         
         # Extraer skills de los términos técnicos
         # technical_terms es List[Tuple[term, relevance]]
@@ -116,7 +134,7 @@ def _extract_resume_analysis(resume_text: str) -> dict:
         # Fallback: análisis básico con hardcoded skills
         print(f"⚠️ Error en _extract_resume_analysis: {str(e)}, usando fallback básico")
         
-        resume_clean = resume_text.lower()
+        resume_clean = context.lower
         technical_skills = {
             "python", "java", "javascript", "typescript", "csharp", "cpp", "rust", "go",
             "react", "vue", "angular", "fastapi", "django", "flask", "spring",
@@ -136,7 +154,7 @@ def _extract_resume_analysis(resume_text: str) -> dict:
         }
 
 
-def _extract_harvard_cv_fields(resume_text: str) -> dict:
+def _extract_harvard_cv_fields(resume_text: Union[str, DocumentContext]) -> dict:
     """
     Extrae campos estructurados del CV en formato Harvard.
     
@@ -155,10 +173,11 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
     - Experiencia: Busca keywords (position, role, company) + períodos
     - Certificaciones: Busca keywords (certification, course, certified)
     - Idiomas: Busca keywords (language, español, english, idioma) + nivel
-    """
-    import re
     
-    if not resume_text or len(resume_text.strip()) < 50:
+    Acepta un DocumentContext para reutilizar líneas y minúsculas ya calculadas.
+    """
+    context = DocumentContext.of(resume_text)
+    if len(context.text.strip()) < 50:
         return {
             "objective": None,
             "education": [],
@@ -168,8 +187,8 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
         }
     
     try:
-        lines = resume_text.split('\n')
-        text_lower = resume_text.lower()
+        lines = context.lines
+        text_lower = context.lower
         
         # 1️⃣ Extraer OBJETIVO: Primeras líneas que no sean headers
         objective = None
@@ -193,15 +212,12 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
                             'university', 'instituto', 'instituto', 'colegio']
         
         # Buscar secciones de educación
-        education_section_match = re.search(
-            r'(educación|education|formación|training)[\s\n]+(.*?)(?:experiencia|experience|habilidades|skills|certificado|certification|$)',
-            text_lower, re.DOTALL | re.IGNORECASE
-        )
+        education_section_match = cv_patterns.HARVARD_EDUCATION_SECTION.search(text_lower)
         
         if education_section_match:
             education_text = education_section_match.group(2)
             # Extraer bloques de educación (delimitados por líneas vacías o bullets)
-            edu_blocks = re.split(r'\n\s*\n', education_text)
+            edu_blocks = cv_patterns.BLANK_LINES.split(education_text)
             
             for block in edu_blocks[:5]:  # Máximo 5 registros
                 if any(kw in block.lower() for kw in education_keywords):
@@ -215,7 +231,7 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
                     }
                     
                     # Buscar año de graduación
-                    year_match = re.search(r'(20\d{2}|19\d{2})', ' '.join(lines_in_block))
+                    year_match = cv_patterns.HARVARD_YEAR.search(' '.join(lines_in_block))
                     if year_match:
                         edu_record["graduation_year"] = int(year_match.group(1))
                     
@@ -232,14 +248,11 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
         
         # 3️⃣ Extraer EXPERIENCIA
         experience = []
-        exp_section_match = re.search(
-            r'(experiencia|experience|trabajos|jobs|profesional)[\s\n]+(.*?)(?:educación|education|habilidades|skills|certificado|certification|$)',
-            text_lower, re.DOTALL | re.IGNORECASE
-        )
+        exp_section_match = cv_patterns.HARVARD_EXPERIENCE_SECTION.search(text_lower)
         
         if exp_section_match:
             exp_text = exp_section_match.group(2)
-            exp_blocks = re.split(r'\n\s*\n', exp_text)
+            exp_blocks = cv_patterns.BLANK_LINES.split(exp_text)
             
             for block in exp_blocks[:5]:  # Máximo 5 registros
                 lines_in_block = [l.strip() for l in block.split('\n') if l.strip()]
@@ -254,7 +267,7 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
                     }
                     
                     # Buscar fechas (formato: 2020-2022, 2020/2022, 2020 - 2022)
-                    dates_match = re.search(r'(20\d{2})[/-]?(20\d{2})?', ' '.join(lines_in_block))
+                    dates_match = cv_patterns.HARVARD_DATE_RANGE.search(' '.join(lines_in_block))
                     if dates_match:
                         exp_record["start_date"] = dates_match.group(1)
                         if dates_match.group(2):
@@ -275,10 +288,7 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
         cert_keywords = ['certification', 'course', 'certified', 'award', 'certificación',
                         'curso', 'certificado', 'reconocimiento']
         
-        cert_section_match = re.search(
-            r'(certificado|certification|cursos|courses|capacitación|training)[\s\n]+(.*?)(?:idiomas|languages|habilidades|skills|$)',
-            text_lower, re.DOTALL | re.IGNORECASE
-        )
+        cert_section_match = cv_patterns.HARVARD_CERTIFICATION_SECTION.search(text_lower)
         
         if cert_section_match:
             cert_text = cert_section_match.group(2)
@@ -290,10 +300,7 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
         lang_keywords = ['language', 'speak', 'fluent', 'idioma', 'habla', 'fluido',
                         'english', 'spanish', 'français', 'alemán', 'portuguese']
         
-        lang_section_match = re.search(
-            r'(idioma|language|lengua)[\s\n]+(.*?)(?:$)',
-            text_lower, re.DOTALL | re.IGNORECASE
-        )
+        lang_section_match = cv_patterns.HARVARD_LANGUAGE_SECTION.search(text_lower)
         
         if lang_section_match:
             lang_text = lang_section_match.group(2)
@@ -319,6 +326,199 @@ def _extract_harvard_cv_fields(resume_text: str) -> dict:
         }
 
 
+def _harvard_fields_from_profile(spacy_result) -> dict:
+    """Convertir resultado de CVExtractorV2 (dataclass) a dict compatible con el código existente"""
+    return {
+        "objective": spacy_result.objective,
+        "education": [
+            {
+                "institution": edu.institution,
+                "degree": edu.degree,
+                "field_of_study": edu.field,
+                "graduation_year": edu.end_year  # end_year es el año de graduación
+            }
+            for edu in spacy_result.education
+        ],
+        "experience": [
+            {
+                "position": exp.position,
+                "company": exp.company,
+                "start_date": str(exp.start_year) if exp.start_year else None,
+                "end_date": str(exp.end_year) if exp.end_year else None,
+                "description": exp.description
+            }
+            for exp in spacy_result.experience
+        ],
+        "certifications": spacy_result.certifications,
+        "languages": spacy_result.languages if isinstance(spacy_result.languages, list) else list(spacy_result.languages.keys()),
+    }
+
+
+HARVARD_FIELD_KEYS = ("objective", "education", "experience", "certifications", "languages")
+
+
+def _regex_tier(context: DocumentContext, deadline: Deadline) -> dict:
+    return _extract_harvard_cv_fields(context)
+
+
+def _unsupervised_tier(context: DocumentContext, deadline: Deadline) -> dict:
+    extracted = unsupervised_cv_extractor.extract(context).to_dict()
+    return {key: extracted[key] for key in HARVARD_FIELD_KEYS + ("skills",)}
+
+
+def _spacy_tier(context: DocumentContext, deadline: Deadline) -> dict:
+    profile = get_cv_extractor().extract(context, deadline=deadline)
+    return {**_harvard_fields_from_profile(profile), "skills": profile.skills}
+
+
+CASCADE_TIERS = {
+    "regex": (_regex_tier, "CV_CASCADE_REGEX_DEADLINE_MS", 0),
+    "unsupervised": (_unsupervised_tier, "CV_CASCADE_UNSUPERVISED_DEADLINE_MS", 0),
+    # spaCy solo compensa con suficiente contenido
+    "spacy": (_spacy_tier, "CV_CASCADE_SPACY_DEADLINE_MS", 50),
+}
+
+
+def _build_extraction_cascade() -> ExtractionCascade:
+    """Cascada regex → unsupervised → spaCy según settings.CV_CASCADE_*"""
+    tiers = []
+    for name in settings.CV_CASCADE_TIERS:
+        extract, deadline_setting, min_words = CASCADE_TIERS[name]
+        tiers.append(CascadeTier(
+            name=name,
+            extract=extract,
+            deadline_seconds=getattr(settings, deadline_setting) / 1000,
+            min_words=min_words,
+        ))
+    return ExtractionCascade(tiers, settings.CV_CASCADE_CONFIDENCE_THRESHOLD)
+
+
+extraction_cascade = _build_extraction_cascade()
+
+
+def _harvard_fields_from_cascade(result: CascadeResult) -> dict:
+    """Campos Harvard + traza de la cascada (qué niveles corrieron y cuánto tardaron)"""
+    harvard_fields = {key: result.fields.get(key) or [] for key in HARVARD_FIELD_KEYS}
+    harvard_fields["objective"] = result.fields.get("objective") or None
+    harvard_fields["extraction_method"] = result.method
+    harvard_fields["confidence"] = result.confidence
+    harvard_fields["extraction_tiers"] = [run.to_dict() for run in result.tiers]
+    return harvard_fields
+
+
+def _analyze_resume_text(resume_text: str) -> Tuple[dict, dict]:
+    """
+    Pipeline completo de análisis de CV: skills/proyectos + campos Harvard.
+    
+    Los campos Harvard salen de la cascada de extracción (regex →
+    unsupervised → spaCy): solo se escala mientras la confianza no alcance
+    CV_CASCADE_CONFIDENCE_THRESHOLD, y cada nivel tiene su deadline.
+    
+    CPU-bound (regex + spaCy): se ejecuta en el pool de procesos del CPU
+    executor desde los endpoints para no bloquear el event loop.
+    
+    Retorna:
+        (analysis, harvard_fields)
+    """
+    # Normalización, líneas, secciones e idioma se calculan una vez por CV
+    context = DocumentContext(resume_text)
+    analysis = _extract_resume_analysis(context)
+    result = extraction_cascade.run(context, seed={"skills": analysis["skills"]})
+    return analysis, _harvard_fields_from_cascade(result)
+
+
+def _analyze_resume_batch(resume_texts: List[str]) -> List[Tuple[dict, dict]]:
+    """
+    _analyze_resume_text para un lote de CVs (ingesta masiva).
+    
+    Los niveles baratos corren por CV; los que aún requieren spaCy se
+    procesan juntos con CVExtractorV2.extract_many (nlp.pipe por lote, no
+    por documento, sin deadline por CV).
+    """
+    contexts = [DocumentContext(text) for text in resume_texts]
+    analyses = [_extract_resume_analysis(context) for context in contexts]
+    results = [
+        extraction_cascade.run(context, seed={"skills": analysis["skills"]}, skip=("spacy",))
+        for context, analysis in zip(contexts, analyses)
+    ]
+    
+    spacy_tier = next((tier for tier in extraction_cascade.tiers if tier.name == "spacy"), None)
+    pending = [
+        row for row, context in enumerate(contexts)
+        if spacy_tier and extraction_cascade.needs_escalation(results[row])
+        and context.word_count >= spacy_tier.min_words
+    ]
+    if pending:
+        logger.info(f"🔄 {len(pending)} CVs bajo el umbral de confianza, extracción spaCy NLP en lote...")
+        started = time.perf_counter()
+        try:
+            profiles = get_cv_extractor().extract_many([resume_texts[row] for row in pending])
+            duration_ms = (time.perf_counter() - started) * 1000 / len(pending)
+            for row, profile in zip(pending, profiles):
+                fields = {**_harvard_fields_from_profile(profile), "skills": profile.skills}
+                extraction_cascade.add_tier_result(results[row], "spacy", fields, duration_ms)
+        except Exception as e:
+            logger.error(f"❌ Error en extracción spaCy NLP en lote: {str(e)}")
+            duration_ms = (time.perf_counter() - started) * 1000 / len(pending)
+            for row in pending:
+                extraction_cascade.add_tier_result(results[row], "spacy", {}, duration_ms, error=str(e))
+    
+    return [(analysis, _harvard_fields_from_cascade(result)) for analysis, result in zip(analyses, results)]
+
+
+# Versiones que determinan cada resultado de análisis: forman parte de la
+# clave del cache por hash de texto (cambiar una invalida lo cacheado)
+RESUME_ANALYSIS_VERSIONS = {
+    "resume_analysis": "1",
+    "text_vectorization": ANALYZER_VERSION,
+    "limits": f"{settings.MAX_SKILLS_EXTRACTED}/{settings.MAX_SOFT_SKILLS_EXTRACTED}/{settings.MAX_PROJECTS_EXTRACTED}",
+}
+RESUME_FIELDS_VERSIONS = {
+    "harvard_fields": "2",
+    "cv_extractor_v2": CV_EXTRACTOR_VERSION,
+    "cascade": f"{','.join(settings.CV_CASCADE_TIERS)}/{settings.CV_CASCADE_CONFIDENCE_THRESHOLD}",
+}
+cv_analysis_cache.register("resume_analysis", RESUME_ANALYSIS_VERSIONS)
+cv_analysis_cache.register("resume_fields", RESUME_FIELDS_VERSIONS)
+
+
+async def _extract_text_cached(filename: str, content: bytes) -> str:
+    """
+    Texto de un archivo de CV, reutilizando el cache por hash de bytes.
+    
+    El parseo PDF/DOCX (pool de procesos) solo corre si el archivo no se
+    había procesado antes con la versión actual del extractor.
+    """
+    key = content_hash(content)
+    resume_text = await cv_analysis_cache.get_text(key)
+    if resume_text is None:
+        resume_text = await extract_text_from_bytes_async(filename, content)
+        await cv_analysis_cache.put_text(key, resume_text)
+    return resume_text
+
+
+async def _cached_resume_analysis(resume_text: str) -> dict:
+    """_extract_resume_analysis con cache por hash de texto + versiones."""
+    analysis = await cv_analysis_cache.get_analysis("resume_analysis", resume_text, RESUME_ANALYSIS_VERSIONS)
+    if analysis is None:
+        analysis = await run_cpu(_extract_resume_analysis, resume_text)
+        await cv_analysis_cache.put_analysis("resume_analysis", resume_text, RESUME_ANALYSIS_VERSIONS, analysis)
+    return analysis
+
+
+async def _cached_analyze_resume_text(resume_text: str) -> Tuple[dict, dict]:
+    """_analyze_resume_text con cache por hash de texto + versiones."""
+    analysis = await cv_analysis_cache.get_analysis("resume_analysis", resume_text, RESUME_ANALYSIS_VERSIONS)
+    harvard_fields = await cv_analysis_cache.get_analysis("resume_fields", resume_text, RESUME_FIELDS_VERSIONS)
+    if analysis is None or harvard_fields is None:
+        analysis, harvard_fields = await run_cpu(_analyze_resume_text, resume_text)
+        await cv_analysis_cache.put_analysis("resume_analysis", resume_text, RESUME_ANALYSIS_VERSIONS, analysis)
+        # Un resultado parcial (nivel con deadline vencido) no se cachea
+        if not any(run["timed_out"] for run in harvard_fields.get("extraction_tiers") or []):
+            await cv_analysis_cache.put_analysis("resume_fields", resume_text, RESUME_FIELDS_VERSIONS, harvard_fields)
+    return analysis, harvard_fields
+
+
 def _convert_to_student_profile(student: Student) -> StudentProfile:
     """Convierte modelo Student a StudentProfile"""
     # Extraer first_name y last_name del nombre combinado si no están presentes
@@ -432,35 +632,11 @@ async def create_student(
         )
 
 
-@router.post("/upload_resume", response_model=ResumeAnalysisResponse)
-async def upload_resume(
-    meta: str = Form(..., description="JSON con datos del estudiante"),
-    file: UploadFile = File(..., description="Archivo de currículum (PDF/DOCX/TXT)"),
-    session: AsyncSession = Depends(get_session),
-    current_user: UserContext = Depends(AuthService.get_current_user)
-):
-    """
-    Subir y analizar currículum de estudiante
-    
-    Historia de usuario: Como estudiante, quiero subir mi currículum para que
-    el sistema extraiga automáticamente mis habilidades y proyectos.
-    
-    Flujo:
-    - Si el estudiante NO EXISTE: crea un nuevo registro y lo asocia al email
-    - Si el estudiante YA EXISTE: actualiza su CV y habilidades extraídas
-    
-    Extrae habilidades técnicas, blandas y proyectos usando NLP
-    """
-    # Verificar permisos: solo estudiantes y administradores
-    if current_user.role not in ["student", "admin"]:
-        raise HTTPException(
-            status_code=403,
-            detail="Solo estudiantes y administradores pueden subir currículums"
-        )
-    # Validar metadatos
+async def _parse_resume_meta(meta: str, session: AsyncSession, current_user: UserContext) -> ResumeUploadRequest:
+    """Valida los metadatos JSON de la subida (registrando auditoría si fallan)."""
     try:
         meta_dict = json.loads(meta)
-        student_data = ResumeUploadRequest(**meta_dict)
+        return ResumeUploadRequest(**meta_dict)
     except json.JSONDecodeError as e:
         print(f"❌ JSON decode error: {str(e)}")
         await _log_audit_action(
@@ -491,7 +667,57 @@ async def upload_resume(
             status_code=400, 
             detail=f"Error procesando metadatos: {str(e)}"
         )
+
+
+def _split_name(name: Optional[str]) -> Tuple[str, str]:
+    """(first_name, last_name) a partir del nombre completo."""
+    name_parts = name.split(' ', 1) if name else ["", ""]
+    first_name = name_parts[0] if len(name_parts) > 0 else ""
+    last_name = name_parts[1] if len(name_parts) > 1 else ""
+    return first_name, last_name
+
+
+def _apply_resume_analysis(
+    student: Student,
+    filename: str,
+    resume_text: str,
+    analysis: dict,
+    harvard_fields: dict
+) -> None:
+    """Copia texto, análisis y campos Harvard de un CV al estudiante (sin guardar)."""
+    student.profile_text = resume_text[:20000]  # Limitar texto almacenado
+    student.skills = json.dumps(analysis["skills"])
+    student.soft_skills = json.dumps(analysis["soft_skills"])
+    student.projects = json.dumps(analysis["projects"])
     
+    # ✅ Guardar campos Harvard CV
+    student.objective = harvard_fields["objective"]
+    student.education = json.dumps(harvard_fields["education"])
+    student.experience = json.dumps(harvard_fields["experience"])
+    student.certifications = json.dumps(harvard_fields["certifications"])
+    student.languages = json.dumps(harvard_fields["languages"])
+    
+    # ✅ Banderas de CV (FIX: persistencia en BD)
+    student.cv_uploaded = True
+    student.cv_filename = filename
+    student.cv_upload_date = utc_now()
+
+
+async def _save_resume_analysis(
+    session: AsyncSession,
+    student_data: ResumeUploadRequest,
+    filename: str,
+    resume_text: str,
+    analysis: dict,
+    harvard_fields: dict,
+    current_user: UserContext
+) -> Student:
+    """
+    Persiste el análisis de un CV.
+    
+    - Si el estudiante NO EXISTE: crea un nuevo registro y lo asocia al email
+    - Si el estudiante YA EXISTE: actualiza su CV y habilidades extraídas
+    """
     # Verificar si ya existe estudiante con ese email (usando hash para comparación segura)
     email_hash = hashlib.sha256(student_data.email.lower().encode()).hexdigest()
     result = await session.execute(
@@ -499,119 +725,21 @@ async def upload_resume(
     )
     existing = result.scalars().first()
     
-    # Extraer texto del archivo (usando versión async para no bloquear)
-    try:
-        resume_text = await extract_text_from_upload_async(file)
-        if len(resume_text.strip()) < 50:
-            raise HTTPException(
-                status_code=400,
-                detail="El currículum debe contener al menos 50 caracteres de texto"
-            )
-    except Exception as e:
-        await _log_audit_action(
-            session, "UPLOAD_RESUME", f"email:{student_data.email}",
-            current_user, success=False, error_message=f"Error procesando archivo: {str(e)}"
-        )
-        raise HTTPException(
-            status_code=400,
-            detail=f"Error procesando archivo: {str(e)}"
-        )
-    
-    # Análisis NLP
-    try:
-        analysis = _extract_resume_analysis(resume_text)
-        harvard_fields = _extract_harvard_cv_fields(resume_text)
-        
-        # ✅ FALLBACK UNSUPERVISED: Si regex no encontró campos clave → usa unsupervised extractor
-        if (not harvard_fields.get("education") and 
-            not harvard_fields.get("experience") and
-            len(resume_text.split()) > 50):  # Solo si hay suficiente contenido
-            
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info("🔄 Regex no encontró campos, intentando extracción con spaCy NLP...")
-            
-            try:
-                # Usar CVExtractorV2 con soporte bilingual automático (es + en)
-                extractor = CVExtractorV2()
-                spacy_result = extractor.extract(resume_text)
-                
-                # Convertir resultado de CVExtractorV2 (dataclass) a dict compatible con el código existente
-                harvard_fields = {
-                    "objective": spacy_result.objective,
-                    "education": [
-                        {
-                            "institution": edu.institution,
-                            "degree": edu.degree,
-                            "field_of_study": edu.field,
-                            "graduation_year": edu.end_year  # end_year es el año de graduación
-                        }
-                        for edu in spacy_result.education
-                    ],
-                    "experience": [
-                        {
-                            "position": exp.position,
-                            "company": exp.company,
-                            "start_date": str(exp.start_year) if exp.start_year else None,
-                            "end_date": str(exp.end_year) if exp.end_year else None,
-                            "description": exp.description
-                        }
-                        for exp in spacy_result.experience
-                    ],
-                    "certifications": spacy_result.certifications,
-                    "languages": spacy_result.languages if isinstance(spacy_result.languages, list) else list(spacy_result.languages.keys()),
-                    "extraction_method": "spacy_nlp_v2",
-                    "confidence": 0.75  # CVExtractorV2 proporciona confianza a nivel de campos individuales
-                }
-                logger.info(f"✅ Extracción spaCy NLP exitosa. Educación: {len(spacy_result.education)}, Experiencia: {len(spacy_result.experience)}")
-            
-            except Exception as e:
-                logger.error(f"❌ Error en extracción spaCy NLP: {str(e)}")
-                # Fallback: mantener resultado de regex (podría estar vacío)
-    
-    except Exception as e:
-        await _log_audit_action(
-            session, "UPLOAD_RESUME", f"email:{student_data.email}",
-            current_user, success=False, error_message=f"Error en análisis NLP: {str(e)}"
-        )
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error en análisis NLP: {str(e)}"
-        )
-    
     # Si el estudiante YA EXISTE: actualizar su CV y habilidades
     if existing:
         student = existing
-        action_type = "UPDATE"
         
         # Actualizar datos
         if student_data.name:
             student.name = student_data.name
             # Actualizar first_name y last_name del nombre
-            name_parts = student_data.name.split(' ', 1)
-            student.first_name = name_parts[0] if len(name_parts) > 0 else ""
-            student.last_name = name_parts[1] if len(name_parts) > 1 else ""
+            student.first_name, student.last_name = _split_name(student_data.name)
         
         if student_data.program:
             student.program = student_data.program
         
-        # Actualizar CV análisis
-        student.profile_text = resume_text[:20000]
-        student.skills = json.dumps(analysis["skills"])
-        student.soft_skills = json.dumps(analysis["soft_skills"])
-        student.projects = json.dumps(analysis["projects"])
-        
-        # ✅ Guardar campos Harvard CV (NEW)
-        student.objective = harvard_fields["objective"]
-        student.education = json.dumps(harvard_fields["education"])
-        student.experience = json.dumps(harvard_fields["experience"])
-        student.certifications = json.dumps(harvard_fields["certifications"])
-        student.languages = json.dumps(harvard_fields["languages"])
-        
-        # ✅ Actualizar banderas de CV (FIX: persistencia en BD)
-        student.cv_uploaded = True
-        student.cv_filename = file.filename
-        student.cv_upload_date = datetime.utcnow()
+        # Actualizar CV análisis y campos Harvard
+        _apply_resume_analysis(student, filename, resume_text, analysis, harvard_fields)
         
         await _log_audit_action(
             session, "UPLOAD_RESUME", f"student_id:{student.id}",
@@ -620,11 +748,8 @@ async def upload_resume(
     
     # Si el estudiante NO EXISTE: crear uno nuevo
     else:
-        action_type = "CREATE"
         # Extraer first_name y last_name del nombre completo
-        name_parts = student_data.name.split(' ', 1) if student_data.name else ["", ""]
-        first_name = name_parts[0] if len(name_parts) > 0 else ""
-        last_name = name_parts[1] if len(name_parts) > 1 else ""
+        first_name, last_name = _split_name(student_data.name)
         
         student = Student(
             name=student_data.name,
@@ -632,21 +757,8 @@ async def upload_resume(
             last_name=last_name,
             program=student_data.program,
             consent_data_processing=True,
-            profile_text=resume_text[:20000],  # Limitar texto almacenado
-            skills=json.dumps(analysis["skills"]),
-            soft_skills=json.dumps(analysis["soft_skills"]),
-            projects=json.dumps(analysis["projects"]),
-            # ✅ Guardar campos Harvard CV (NEW)
-            objective=harvard_fields["objective"],
-            education=json.dumps(harvard_fields["education"]),
-            experience=json.dumps(harvard_fields["experience"]),
-            certifications=json.dumps(harvard_fields["certifications"]),
-            languages=json.dumps(harvard_fields["languages"]),
-            # ✅ Establecer banderas de CV (FIX: persistencia en BD)
-            cv_uploaded=True,
-            cv_filename=file.filename,
-            cv_upload_date=datetime.utcnow()
         )
+        _apply_resume_analysis(student, filename, resume_text, analysis, harvard_fields)
         
         # Usar set_email() para encriptar automáticamente
         student.set_email(student_data.email)
@@ -665,17 +777,187 @@ async def upload_resume(
         session, "UPLOAD_RESUME", f"student_id:{student.id}",
         current_user, details=f"Currículum procesado para {student.name}"
     )
+    return student
+
+
+async def _process_resume_task(task: CVProcessingTask, content: bytes, report) -> dict:
+    """
+    Procesador de la cola de CVs: extracción de texto + análisis NLP + guardado.
     
-    # Preparar respuesta
-    student_profile = _convert_to_student_profile(student)
+    Los errores se propagan como HTTPException: la cola reintenta los 5xx
+    (p. ej. executor ocupado) y da por fallidos los 4xx.
+    """
+    current_user = UserContext(
+        role=task.actor_role, user_id=task.actor_id, email=cv_processing_queue.task_actor_email(task)
+    )
+    student_data = ResumeUploadRequest(**cv_processing_queue.task_meta(task))
     
-    return ResumeAnalysisResponse(
-        student=student_profile,
-        extracted_skills=analysis["skills"],
-        extracted_soft_skills=analysis["soft_skills"],
-        extracted_projects=analysis["projects"],
-        analysis_confidence=analysis["confidence"]
+    async with async_session() as session:
+        # Extraer texto del archivo (cache por hash; parseo en el pool de procesos si no está)
+        await report("extracting_text", 10)
+        try:
+            resume_text = await _extract_text_cached(task.filename, content)
+            if len(resume_text.strip()) < 50:
+                raise HTTPException(
+                    status_code=400,
+                    detail="El currículum debe contener al menos 50 caracteres de texto"
+                )
+        except Exception as e:
+            await _log_audit_action(
+                session, "UPLOAD_RESUME", f"email:{student_data.email}",
+                current_user, success=False, error_message=f"Error procesando archivo: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=getattr(e, "status_code", 400),
+                detail=f"Error procesando archivo: {getattr(e, 'detail', str(e))}"
+            )
+        
+        # Análisis NLP (cacheado; si no, fuera del event loop en el pool de procesos)
+        await report("analyzing", 40)
+        try:
+            analysis, harvard_fields = await _cached_analyze_resume_text(resume_text)
+        
+        except (CPUExecutorBusyError, CPUTaskTimeoutError) as e:
+            await _log_audit_action(
+                session, "UPLOAD_RESUME", f"email:{student_data.email}",
+                current_user, success=False, error_message=f"Análisis NLP no disponible: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=503,
+                detail=f"Servidor ocupado procesando currículums, intenta de nuevo: {str(e)}"
+            )
+        except Exception as e:
+            await _log_audit_action(
+                session, "UPLOAD_RESUME", f"email:{student_data.email}",
+                current_user, success=False, error_message=f"Error en análisis NLP: {str(e)}"
+            )
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error en análisis NLP: {str(e)}"
+            )
+        
+        await report("saving", 80)
+        student = await _save_resume_analysis(
+            session, student_data, task.filename, resume_text, analysis, harvard_fields, current_user
+        )
+    
+    return {
+        "student_id": student.id,
+        "extracted_skills": analysis["skills"],
+        "extracted_soft_skills": analysis["soft_skills"],
+        "extracted_projects": analysis["projects"],
+        "analysis_confidence": analysis["confidence"],
+        "extraction_method": harvard_fields.get("extraction_method"),
+        "extraction_tiers": harvard_fields.get("extraction_tiers"),
+    }
+
+
+cv_processing_queue.set_processor(_process_resume_task)
+
+
+async def _resume_task_status(session: AsyncSession, task: CVProcessingTask) -> ResumeTaskStatus:
+    """Estado de una tarea; si terminó, incluye el ResumeAnalysisResponse."""
+    status = ResumeTaskStatus(
+        task_id=task.task_id,
+        status=task.status,
+        stage=task.stage,
+        progress=task.progress,
+        filename=task.filename,
+        error=task.error,
+        created_at=task.created_at,
+        started_at=task.started_at,
+        finished_at=task.finished_at,
     )
+    if task.status == COMPLETED and task.result:
+        result = json.loads(task.result)
+        student = await session.get(Student, result.pop("student_id"))
+        if student:
+            status.result = ResumeAnalysisResponse(student=_convert_to_student_profile(student), **result)
+    return status
+
+
+@router.post("/upload_resume", response_model=ResumeTaskStatus, status_code=202)
+async def upload_resume(
+    response: Response,
+    meta: str = Form(..., description="JSON con datos del estudiante"),
+    file: UploadFile = File(..., description="Archivo de currículum (PDF/DOCX/TXT)"),
+    wait: bool = Query(False, description="Procesar dentro de la petición y responder con el resultado"),
+    session: AsyncSession = Depends(get_session),
+    current_user: UserContext = Depends(AuthService.get_current_user)
+):
+    """
+    Subir currículum de estudiante para análisis
+    
+    Historia de usuario: Como estudiante, quiero subir mi currículum para que
+    el sistema extraiga automáticamente mis habilidades y proyectos.
+    
+    Flujo:
+    - Valida metadatos y archivo, lo guarda y encola una tarea de análisis
+    - Responde 202 con el task_id; el progreso y el ResumeAnalysisResponse
+      final se consultan en GET /students/upload_resume/{task_id}
+    - Con `wait=true` procesa en la misma petición y responde 200 con la
+      tarea terminada (o el error HTTP de la tarea si falló)
+    
+    Al procesar:
+    - Si el estudiante NO EXISTE: crea un nuevo registro y lo asocia al email
+    - Si el estudiante YA EXISTE: actualiza su CV y habilidades extraídas
+    """
+    # Verificar permisos: solo estudiantes y administradores
+    if current_user.role not in ["student", "admin"]:
+        raise HTTPException(
+            status_code=403,
+            detail="Solo estudiantes y administradores pueden subir currículums"
+        )
+    # Validar metadatos
+    student_data = await _parse_resume_meta(meta, session, current_user)
+    
+    # Leer y validar archivo (sin parsear)
+    try:
+        content = await read_upload_async(file)
+    except HTTPException as e:
+        await _log_audit_action(
+            session, "UPLOAD_RESUME", f"email:{student_data.email}",
+            current_user, success=False, error_message=f"Error procesando archivo: {e.detail}"
+        )
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error procesando archivo: {e.detail}"
+        )
+    
+    task = await cv_processing_queue.enqueue(
+        file.filename, content, student_data.dict(),
+        actor={"role": current_user.role, "user_id": current_user.user_id, "email": current_user.email},
+    )
+    
+    if wait:
+        task = await cv_processing_queue.run_now(task.task_id)
+        if task.status == FAILED:
+            raise HTTPException(status_code=task.error_status or 500, detail=task.error)
+        response.status_code = 200
+    
+    return await _resume_task_status(session, task)
+
+
+@router.get("/upload_resume/{task_id}", response_model=ResumeTaskStatus)
+async def get_upload_resume_status(
+    task_id: str,
+    session: AsyncSession = Depends(get_session),
+    current_user: UserContext = Depends(AuthService.get_current_user)
+):
+    """
+    Estado de una subida de currículum
+    
+    Reporta etapa y progreso; cuando status == "completed" incluye el
+    ResumeAnalysisResponse en `result`, y si falló el error en `error`.
+    """
+    task = await cv_processing_queue.get(task_id)
+    if not task or (
+        current_user.role != "admin"
+        and (task.actor_role, task.actor_id) != (current_user.role, current_user.user_id)
+    ):
+        raise HTTPException(status_code=404, detail="Tarea de currículum no encontrada")
+    
+    return await _resume_task_status(session, task)
 
 
 # === LEER ESTUDIANTES ===
@@ -1512,7 +1794,7 @@ async def reanalyze_student_profile(
     
     # Re-análisis NLP
     try:
-        analysis = _extract_resume_analysis(student.profile_text)
+        analysis = await _cached_resume_analysis(student.profile_text)
     except Exception as e:
         await _log_audit_action(
             session, "REANALYZE_STUDENT", f"student_id:{student_id}",
@@ -1561,6 +1843,9 @@ async def bulk_reanalyze_students(
     
     Historia de usuario: Como administrador, quiero poder re-procesar múltiples
     currículums al mismo tiempo para optimizar el tiempo de actualización.
+    
+    Para re-procesar toda la base usar POST /students/reanalysis-jobs (en
+    segundo plano, por lotes y reanudable).
     """
     # Solo administradores pueden hacer operaciones en lote
     if current_user.role != "admin":
@@ -1585,7 +1870,7 @@ async def bulk_reanalyze_students(
                 errors.append(f"Estudiante {student_id}: sin texto de currículum")
                 continue
             
-            analysis = _extract_resume_analysis(student.profile_text)
+            analysis = await _cached_resume_analysis(student.profile_text)
             
             student.skills = json.dumps(analysis["skills"])
             student.soft_skills = json.dumps(analysis["soft_skills"])
@@ -1616,6 +1901,102 @@ async def bulk_reanalyze_students(
     )
 
 
+def _reanalysis_job_status(job: StudentReanalysisJob) -> ReanalysisJobStatus:
+    progress = 100 if job.status == "completed" else min(99, job.processed * 100 // job.total) if job.total else 0
+    return ReanalysisJobStatus(
+        job_id=job.job_id,
+        status=job.status,
+        total=job.total,
+        processed=job.processed,
+        updated=job.updated,
+        failed=job.failed,
+        progress=progress,
+        last_student_id=job.last_student_id,
+        errors=json.loads(job.errors or "[]"),
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/reanalysis-jobs", response_model=ReanalysisJobStatus, status_code=202)
+async def start_reanalysis_job(
+    session: AsyncSession = Depends(get_session),
+    current_user: UserContext = Depends(AuthService.get_current_user)
+):
+    """
+    🔁 Re-analizar los CVs de toda la base de estudiantes en segundo plano
+    
+    Para re-procesar después de actualizar un extractor: el job recorre los
+    estudiantes por lotes, analiza en un pool de procesos propio y guarda
+    cada lote con su checkpoint (se reanuda tras un reinicio). Responde 202;
+    el avance se consulta en GET /students/reanalysis-jobs/{job_id}.
+    
+    Solo un job activo a la vez (409 si ya hay uno en curso).
+    """
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Solo administradores pueden re-analizar la base de estudiantes"
+        )
+    
+    try:
+        job = await student_reanalysis_jobs.create(
+            actor={"user_id": current_user.user_id, "email": current_user.email}
+        )
+    except ReanalysisJobConflictError as e:
+        raise HTTPException(status_code=409, detail=f"{e} (GET /students/reanalysis-jobs/{e.job.job_id})")
+    
+    await _log_audit_action(
+        session, "REANALYSIS_JOB_START", f"job_id:{job.job_id}",
+        current_user, details=f"Re-análisis masivo de {job.total} estudiantes"
+    )
+    return _reanalysis_job_status(job)
+
+
+@router.get("/reanalysis-jobs/{job_id}", response_model=ReanalysisJobStatus)
+async def get_reanalysis_job(
+    job_id: str,
+    current_user: UserContext = Depends(AuthService.get_current_user)
+):
+    """Progreso de un job de re-análisis masivo"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Solo administradores pueden consultar el re-análisis masivo"
+        )
+    
+    job = await student_reanalysis_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de re-análisis no encontrado")
+    return _reanalysis_job_status(job)
+
+
+@router.post("/reanalysis-jobs/{job_id}/cancel", response_model=ReanalysisJobStatus)
+async def cancel_reanalysis_job(
+    job_id: str,
+    session: AsyncSession = Depends(get_session),
+    current_user: UserContext = Depends(AuthService.get_current_user)
+):
+    """Cancelar un job de re-análisis (los lotes ya guardados se conservan)"""
+    if current_user.role != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Solo administradores pueden cancelar el re-análisis masivo"
+        )
+    
+    job = await student_reanalysis_jobs.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de re-análisis no encontrado")
+    
+    await _log_audit_action(
+        session, "REANALYSIS_JOB_CANCEL", f"job_id:{job_id}",
+        current_user, details=f"Procesados: {job.processed}/{job.total}"
+    )
+    return _reanalysis_job_status(job)
+
+
 # ============================================================================
 # ✅ NUEVOS ENDPOINTS PARA GESTIÓN DE CV
 # Descargar y eliminar contenido del CV del estudiante
@@ -2,7 +2,7 @@
 Configuración central de la aplicación MoirAI
 Manejo de variables de entorno y configuraciones de seguridad
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -70,7 +70,290 @@ class Settings(BaseSettings):
     MAX_SKILLS_EXTRACTED: int = 30
     MAX_SOFT_SKILLS_EXTRACTED: int = 20
     MAX_PROJECTS_EXTRACTED: int = 20
-    
+    CV_EXTRACTION_BATCH_SIZE: int = Field(
+        default=64,
+        description="CVs featurizados por lote en UnsupervisedCVExtractor.extract_many"
+    )
+    CV_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Reutilizar texto extraído y análisis NLP de CVs por hash de contenido"
+    )
+    CV_CACHE_MAX_AGE_DAYS: int = Field(
+        default=90,
+        description="Días sin uso tras los que se purga una entrada del cache de CVs"
+    )
+    CV_QUEUE_WORKERS: int = Field(
+        default=2,
+        description="CVs procesados en paralelo por la cola de procesamiento (0 = sin workers)"
+    )
+    CV_QUEUE_STORAGE_DIR: str = Field(
+        default="uploads/cv_queue",
+        description="Directorio donde se guardan los CVs pendientes de procesar"
+    )
+    CV_QUEUE_MAX_ATTEMPTS: int = Field(
+        default=3,
+        description="Intentos por tarea ante errores transitorios (executor ocupado, caída)"
+    )
+    CV_QUEUE_POLL_SECONDS: float = Field(
+        default=2.0,
+        description="Intervalo de consulta de tareas nuevas cuando la cola está vacía"
+    )
+    CV_QUEUE_TASK_TIMEOUT_SECONDS: float = Field(
+        default=600.0,
+        description="Tiempo tras el cual una tarea en proceso se considera abandonada y se re-encola"
+    )
+    CV_BULK_INGEST_BATCH_SIZE: int = Field(
+        default=16,
+        description="CVs por lote en la ingesta masiva (análisis y commit por lote)"
+    )
+    CV_BULK_INGEST_WORKERS: int = Field(
+        default=2,
+        description="Procesos de análisis en la ingesta masiva (0 = en hilos, sin procesos)"
+    )
+    REANALYSIS_JOB_CHUNK_SIZE: int = Field(
+        default=200,
+        description="Estudiantes leídos, analizados y guardados por lote en el re-análisis masivo"
+    )
+    REANALYSIS_JOB_WORKERS: int = Field(
+        default=1,
+        description="Procesos propios del re-análisis masivo, aparte del pool de peticiones (0 = en hilos)"
+    )
+    REANALYSIS_JOB_STALE_SECONDS: float = Field(
+        default=600.0,
+        description="Tiempo sin avance tras el cual un job en curso se considera abandonado y se reanuda"
+    )
+    OCC_DETAIL_CONCURRENCY: int = Field(
+        default=8,
+        description="Detalles de ofertas OCC pedidos en paralelo por búsqueda (fetch_full_details)"
+    )
+    OCC_DETAIL_PER_HOST_LIMIT: int = Field(
+        default=4,
+        description="Peticiones simultáneas máximas a un mismo host de OCC (cortesía)"
+    )
+    OCC_DETAIL_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        description="Tiempo máximo por detalle de oferta; al vencer se usan los datos del listado"
+    )
+    OCC_DETAIL_DEADLINE_SECONDS: float = Field(
+        default=10.0,
+        description="Tiempo máximo para todos los detalles de una búsqueda; los pendientes usan datos del listado (0 = sin límite)"
+    )
+    OCC_INCREMENTAL_MAX_PAGES: int = Field(
+        default=10,
+        description="Páginas máximas que recorre una actualización incremental de una búsqueda de OCC"
+    )
+    OCC_INCREMENTAL_MAX_CARDS: int = Field(
+        default=2000,
+        description="Huellas de tarjetas recordadas por búsqueda (se olvidan las vistas hace más tiempo)"
+    )
+    SCRAPER_PIPELINE_FETCH_CONCURRENCY: int = Field(
+        default=4,
+        description="Descargas simultáneas de la etapa fetch del pipeline de scraping (el límite por host aplica aparte)"
+    )
+    SCRAPER_PIPELINE_PARSE_CONCURRENCY: int = Field(
+        default=2,
+        description="Páginas parseadas en paralelo (CPU executor) por el pipeline de scraping"
+    )
+    SCRAPER_PIPELINE_TRANSFORM_CONCURRENCY: int = Field(
+        default=1,
+        description="Workers de la etapa transform (conversión y deduplicación) del pipeline de scraping"
+    )
+    SCRAPER_PIPELINE_WRITE_CONCURRENCY: int = Field(
+        default=1,
+        description="Writers de la base de datos del pipeline de scraping (cada uno guarda lotes completos)"
+    )
+    SCRAPER_PIPELINE_QUEUE_SIZE: int = Field(
+        default=8,
+        description="Capacidad de cada cola entre etapas del pipeline de scraping (backpressure)"
+    )
+    SCRAPER_PIPELINE_WRITE_BATCH_SIZE: int = Field(
+        default=50,
+        description="Registros por transacción del writer del pipeline de scraping"
+    )
+    SCRAPER_PIPELINE_WRITE_BATCH_SECONDS: float = Field(
+        default=1.0,
+        description="Espera máxima para completar un lote del writer antes de guardarlo incompleto"
+    )
+    SCRAPER_DEDUP_TTL_HOURS: float = Field(
+        default=168.0,
+        description="Horas sin ver una oferta tras las que vuelve a contar como nueva (re-publicaciones)"
+    )
+    SCRAPER_DEDUP_GENERATIONS: int = Field(
+        default=7,
+        description="Generaciones de filtros de Bloom en que se divide el TTL de deduplicación"
+    )
+    SCRAPER_DEDUP_INITIAL_CAPACITY: int = Field(
+        default=10000,
+        description="Ids por filtro de Bloom antes de crecer (filtro escalable)"
+    )
+    SCRAPER_DEDUP_ERROR_RATE: float = Field(
+        default=0.001,
+        description="Tasa de falsos positivos de los filtros de Bloom (se confirman contra scraped_job_ids)"
+    )
+    SCRAPER_DEDUP_SNAPSHOT_DIR: str = Field(
+        default="data/dedup",
+        description="Directorio de snapshots de los filtros de deduplicación del scraping"
+    )
+    JOB_ENRICHMENT_ENABLED: bool = Field(
+        default=True,
+        description="Enriquecer en segundo plano los empleos recién guardados (skills, salario, idioma, vectores)"
+    )
+    JOB_ENRICHMENT_BATCH_SIZE: int = Field(
+        default=100,
+        description="Empleos leídos, analizados (un lote de NLP) y guardados por lote del enriquecimiento"
+    )
+    JOB_ENRICHMENT_POLL_SECONDS: float = Field(
+        default=60.0,
+        description="Espera entre pasadas del enriquecimiento cuando no hay empleos nuevos"
+    )
+    JOB_ENRICHMENT_WORKERS: int = Field(
+        default=1,
+        description="Procesos propios del enriquecimiento, aparte del pool de peticiones (0 = en hilos)"
+    )
+    JOB_ENRICHMENT_NICE: int = Field(
+        default=10,
+        description="Incremento de nice de los procesos del enriquecimiento (prioridad baja frente a las peticiones)"
+    )
+    JOB_ENRICHMENT_VECTORIZE: bool = Field(
+        default=True,
+        description="Agregar los empleos enriquecidos al índice de embeddings"
+    )
+    CRAWL_FRONTIER_LEASE_SECONDS: float = Field(
+        default=120.0,
+        description="Duración del lease de un worker sobre las páginas de la frontera de crawling (se renueva mientras trabaja)"
+    )
+    CRAWL_FRONTIER_BATCH_SIZE: int = Field(
+        default=10,
+        description="Páginas de la frontera que toma un worker en cada lote"
+    )
+    CRAWL_FRONTIER_CONCURRENCY: int = Field(
+        default=2,
+        description="Páginas de un lote procesadas en paralelo por un worker"
+    )
+    CRAWL_FRONTIER_POLL_SECONDS: float = Field(
+        default=10.0,
+        description="Intervalo de consulta cuando la frontera no tiene páginas vencidas"
+    )
+    CRAWL_FRONTIER_MAX_ATTEMPTS: int = Field(
+        default=5,
+        description="Fallos consecutivos tras los que una página de la frontera se marca como failed"
+    )
+    CRAWL_FRONTIER_RETRY_BACKOFF_SECONDS: float = Field(
+        default=60.0,
+        description="Espera base tras un fallo antes de reintentar una página (se duplica en cada intento)"
+    )
+    SCRAPER_HOST_RATE: float = Field(
+        default=0.5,
+        description="Peticiones por segundo iniciales permitidas a cada host al hacer scraping (token bucket)"
+    )
+    SCRAPER_HOST_BURST: int = Field(
+        default=1,
+        description="Peticiones que un host puede recibir seguidas antes de aplicar la tasa"
+    )
+    SCRAPER_HOST_MIN_RATE: float = Field(
+        default=0.1,
+        description="Tasa mínima (peticiones/s) a la que puede bajar un host tras respuestas 429/5xx"
+    )
+    SCRAPER_HOST_MAX_RATE: float = Field(
+        default=2.0,
+        description="Tasa máxima (peticiones/s) a la que puede subir un host con respuestas exitosas"
+    )
+    SCRAPER_AIMD_INCREASE: float = Field(
+        default=0.1,
+        description="Peticiones/s que se suman a la tasa de un host tras una racha de éxitos"
+    )
+    SCRAPER_AIMD_DECREASE_FACTOR: float = Field(
+        default=0.5,
+        description="Factor por el que se multiplica la tasa de un host ante un 429/5xx o timeout"
+    )
+    SCRAPER_AIMD_SUCCESS_WINDOW: int = Field(
+        default=10,
+        description="Respuestas exitosas seguidas necesarias para subir la tasa de un host"
+    )
+    SCRAPER_RETRY_AFTER_MAX_SECONDS: float = Field(
+        default=300.0,
+        description="Pausa máxima que se respeta de un encabezado Retry-After"
+    )
+    SCRAPER_MAX_CONNECTIONS_PER_HOST: int = Field(
+        default=4,
+        description="Peticiones simultáneas máximas a un mismo host desde SessionManager"
+    )
+    SCRAPER_MAX_CONNECTIONS: int = Field(
+        default=20,
+        description="Conexiones totales del pool HTTP de scraping"
+    )
+    SCRAPER_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=10,
+        description="Conexiones keep-alive que conserva el pool HTTP de scraping"
+    )
+    SCRAPER_HOST_OVERRIDES: Dict[str, Dict[str, float]] = Field(
+        default={},
+        description=(
+            "Límites por host que reemplazan los globales, p. ej. "
+            '{"jsearch.p.rapidapi.com": {"rate": 5, "burst": 10, "max_rate": 10, "max_connections": 8}}'
+        )
+    )
+    HTML_PARSER_BACKEND: str = Field(
+        default="lxml",
+        description="Backend de BeautifulSoup para el HTML del scraping (lxml | html.parser); sin lxml instalado se usa html.parser"
+    )
+    HTTP_CACHE_ENABLED: bool = Field(
+        default=True,
+        description="Guardar en disco las respuestas GET del scraping y revalidarlas con peticiones condicionales"
+    )
+    HTTP_CACHE_PATH: str = Field(
+        default="data/http_cache/responses.sqlite3",
+        description="Archivo SQLite del cache HTTP del scraping"
+    )
+    HTTP_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Tamaño máximo (comprimido) del cache HTTP; se expulsan las entradas menos usadas"
+    )
+    HTTP_CACHE_DEFAULT_TTL_SECONDS: float = Field(
+        default=300.0,
+        description="Frescura de una respuesta sin Cache-Control max-age ni regla de URL"
+    )
+    HTTP_CACHE_TTL_RULES: Dict[str, float] = Field(
+        default={r"/offer/\d+/d/j": 3600.0, r"/empleos/": 600.0},
+        description="Frescura (segundos) por clase de URL: regex -> TTL, la primera que coincide"
+    )
+    UPLOAD_READ_CHUNK_BYTES: int = Field(
+        default=64 * 1024,
+        description="Tamaño de bloque al leer archivos subidos (se corta al superar el máximo)"
+    )
+    PDF_MAX_TEXT_CHARS: int = Field(
+        default=100000,
+        description="Caracteres tras los que se deja de extraer páginas de un PDF (0 = sin límite)"
+    )
+    PDF_PARALLEL_MIN_PAGES: int = Field(
+        default=8,
+        description="Páginas a partir de las cuales un PDF se reparte entre procesos (0 = nunca)"
+    )
+    PDF_PAGES_PER_TASK: int = Field(
+        default=4,
+        description="Páginas por tarea al repartir un PDF entre procesos"
+    )
+    CV_CASCADE_TIERS: List[str] = Field(
+        default=["regex", "unsupervised", "spacy"],
+        description="Niveles de extracción de CV en orden de escalamiento (regex | unsupervised | spacy)"
+    )
+    CV_CASCADE_CONFIDENCE_THRESHOLD: float = Field(
+        default=0.3,
+        description="Confianza (0-1) a partir de la cual la cascada no escala al siguiente nivel"
+    )
+    CV_CASCADE_REGEX_DEADLINE_MS: int = Field(
+        default=500,
+        description="Tiempo máximo del nivel regex antes de usar su resultado parcial (0 = sin límite)"
+    )
+    CV_CASCADE_UNSUPERVISED_DEADLINE_MS: int = Field(
+        default=1000,
+        description="Tiempo máximo del nivel unsupervised antes de usar su resultado parcial (0 = sin límite)"
+    )
+    CV_CASCADE_SPACY_DEADLINE_MS: int = Field(
+        default=10000,
+        description="Tiempo máximo del nivel spaCy antes de usar su resultado parcial (0 = sin límite)"
+    )
+
     # Text Vectorization Configuration
     NLP_MAX_TEXT_LENGTH: int = Field(
         default=50000,
@@ -92,7 +375,99 @@ class Settings(BaseSettings):
         default=2,
         description="Longitud mínima de tokens válidos"
     )
-    
+    NLP_CHUNK_MAX_CHARS: int = Field(
+        default=5000,
+        description="Tamaño máximo de fragmento al procesar documentos largos"
+    )
+    NLP_CHUNK_BATCH_SIZE: int = Field(
+        default=4,
+        description="Fragmentos procesados simultáneamente por spaCy (nlp.pipe)"
+    )
+    NLP_MAX_DOCUMENT_CHARS: int = Field(
+        default=1_000_000,
+        description="Tope de caracteres por documento en procesamiento por fragmentos"
+    )
+
+    # Language ID - Detección de idioma por trigramas
+    LANGUAGE_ID_PREFIX_CHARS: int = Field(
+        default=1024,
+        description="Caracteres iniciales del texto usados para detectar idioma"
+    )
+    LANGUAGE_ID_CACHE_SIZE: int = Field(
+        default=4096,
+        description="Entradas del cache LRU de idioma (por hash de contenido)"
+    )
+    LANGUAGE_ID_MIN_CONFIDENCE: float = Field(
+        default=0.8,
+        description="Confianza mínima para considerar confiable la detección"
+    )
+
+    # Semantic Matching - Índice de embeddings de empleos
+    EMBEDDING_INDEX_PATH: str = Field(
+        default="data/embeddings/job_index.npz",
+        description="Ruta del archivo donde se persiste el índice de embeddings"
+    )
+    EMBEDDING_INDEX_DTYPE: str = Field(
+        default="float32",
+        description="Precisión de la matriz de embeddings (float32, float16, int8)"
+    )
+    EMBEDDING_INDEX_NLIST: int = Field(
+        default=64,
+        description="Número de listas invertidas (centroides) del índice IVF"
+    )
+    EMBEDDING_INDEX_NPROBE: int = Field(
+        default=8,
+        description="Listas IVF a explorar por consulta (recall vs latencia)"
+    )
+    EMBEDDING_INDEX_MIN_TRAIN_SIZE: int = Field(
+        default=2048,
+        description="Vectores mínimos para entrenar IVF (por debajo se usa búsqueda exacta)"
+    )
+
+    # Hybrid Retrieval - Pipeline léxico -> semántico
+    HYBRID_LEXICAL_CANDIDATES: int = Field(
+        default=200,
+        description="Máximo de candidatos que entrega la etapa léxica"
+    )
+    HYBRID_LEXICAL_BUDGET_MS: float = Field(
+        default=50.0,
+        description="Presupuesto de tiempo (ms) de la etapa léxica"
+    )
+    HYBRID_SEMANTIC_CANDIDATES: int = Field(
+        default=50,
+        description="Máximo de candidatos léxicos que se re-rankean semánticamente"
+    )
+    HYBRID_SEMANTIC_BUDGET_MS: float = Field(
+        default=150.0,
+        description="Presupuesto de tiempo (ms) de la etapa semántica"
+    )
+    HYBRID_SEMANTIC_WEIGHT: float = Field(
+        default=0.7,
+        description="Peso del score semántico en el score final (resto: léxico)"
+    )
+
+    # CPU Executor - Trabajo CPU-bound fuera del event loop
+    CPU_EXECUTOR_PROCESSES: int = Field(
+        default=2,
+        description="Procesos para NLP/extracción de CVs (0 = usar solo el pool de hilos)"
+    )
+    CPU_EXECUTOR_THREADS: int = Field(
+        default=4,
+        description="Hilos para trabajo ligero (parseo HTML, JSON)"
+    )
+    CPU_EXECUTOR_MAX_QUEUE: int = Field(
+        default=32,
+        description="Máximo de tareas en vuelo por pool antes de rechazar (503)"
+    )
+    CPU_EXECUTOR_TIMEOUT_SECONDS: float = Field(
+        default=60.0,
+        description="Timeout por defecto de una tarea CPU (0 = sin límite)"
+    )
+    CPU_EXECUTOR_WARM_SPACY: bool = Field(
+        default=True,
+        description="Precargar modelos spaCy en cada proceso hijo"
+    )
+
     # Privacy and Security (LFPDPPP compliance)
     DATA_RETENTION_DAYS: int = 365
     REQUIRE_CONSENT: bool = True
@@ -0,0 +1,251 @@
+"""
+⚙️ CPU Executor - Trabajo CPU-bound fuera del event loop
+
+Las rutas async de FastAPI comparten un único event loop por worker: una
+extracción de PDF + análisis spaCy de varios segundos dentro de un
+`async def` congela TODAS las demás solicitudes del worker. Este módulo
+ofrece dos pools gestionados y una API mínima para usarlos:
+
+- Pool de PROCESOS: NLP/extracción de CVs (spaCy, regex pesadas, PDF).
+  Cada hijo precarga los modelos spaCy al iniciar (initializer), así la
+  primera tarea no paga la carga del modelo.
+- Pool de HILOS: trabajo ligero o no serializable (parseo HTML del scraper,
+  objetos con clientes HTTP, etc.).
+
+Protecciones:
+- Límite de profundidad de cola por pool: si hay demasiadas tareas en
+  vuelo se rechaza de inmediato con CPUExecutorBusyError (el endpoint
+  responde 503) en lugar de acumular latencia sin límite.
+- Timeout por tarea: CPUTaskTimeoutError. Una tarea de proceso que ya
+  empezó no se puede interrumpir; sigue ocupando su lugar en la cola
+  hasta terminar (backpressure correcto).
+
+Uso:
+----
+from app.core.cpu_executor import run_cpu
+
+text = await run_cpu(extract_text_from_bytes, filename, content)
+soup_result = await run_cpu(parse_html, html_content, kind="thread", timeout=10)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROCESS = "process"
+THREAD = "thread"
+
+
+class CPUExecutorBusyError(RuntimeError):
+    """La cola del pool alcanzó su límite de tareas en vuelo."""
+
+
+class CPUTaskTimeoutError(TimeoutError):
+    """La tarea excedió su tiempo máximo."""
+
+
+def _warm_worker(nice: int = 0) -> None:
+    """
+    Initializer de cada proceso hijo: baja su prioridad (`nice`) y precarga
+    los modelos spaCy.
+
+    Best-effort: si los modelos no están instalados el hijo sigue
+    disponible para tareas que no los requieren.
+    """
+    if nice:
+        try:
+            os.nice(nice)
+        except (AttributeError, OSError) as e:
+            logger.warning(f"⚠️  Proceso CPU {os.getpid()} sin bajar prioridad: {e}")
+    if not settings.CPU_EXECUTOR_WARM_SPACY:
+        return
+    try:
+        from app.services.spacy_nlp_service import get_nlp_service
+        get_nlp_service()
+    except Exception as e:
+        logger.warning(f"⚠️  Proceso CPU {os.getpid()} sin modelos spaCy: {e}")
+
+
+class CPUExecutor:
+    """
+    Pools de procesos e hilos con límite de cola y timeouts.
+
+    Los pools se crean de forma perezosa en el primer uso. Con
+    `process_workers=0` las tareas de proceso se ejecutan en el pool de
+    hilos (útil en desarrollo/tests o entornos sin fork/spawn). `nice`
+    baja la prioridad de los procesos hijos (trabajo de fondo que no debe
+    competir con las peticiones).
+    """
+
+    def __init__(
+        self,
+        process_workers: Optional[int] = None,
+        thread_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        nice: int = 0,
+    ):
+        self.process_workers = (
+            settings.CPU_EXECUTOR_PROCESSES if process_workers is None else process_workers
+        )
+        self.thread_workers = thread_workers or settings.CPU_EXECUTOR_THREADS
+        self.max_queue = max_queue or settings.CPU_EXECUTOR_MAX_QUEUE
+        self.default_timeout = (
+            settings.CPU_EXECUTOR_TIMEOUT_SECONDS if default_timeout is None else default_timeout
+        )
+        self.nice = nice
+
+        self._lock = threading.Lock()
+        self._pools: Dict[str, Executor] = {}
+        self._in_flight = {PROCESS: 0, THREAD: 0}
+        self._completed = {PROCESS: 0, THREAD: 0}
+        self._rejected = {PROCESS: 0, THREAD: 0}
+        self._timeouts = {PROCESS: 0, THREAD: 0}
+
+    # ------------------------------------------------------------------
+    # Pools
+    # ------------------------------------------------------------------
+
+    def _resolve_kind(self, kind: str) -> str:
+        if kind not in (PROCESS, THREAD):
+            raise ValueError(f"Tipo de pool inválido: {kind}")
+        if kind == PROCESS and self.process_workers <= 0:
+            return THREAD
+        return kind
+
+    def _get_pool(self, kind: str) -> Executor:
+        with self._lock:
+            pool = self._pools.get(kind)
+            if pool is None:
+                if kind == PROCESS:
+                    # spawn: el event loop y los hilos del padre no se heredan
+                    pool = ProcessPoolExecutor(
+                        max_workers=self.process_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker,
+                        initargs=(self.nice,),
+                    )
+                    logger.info(f"⚙️  Pool de procesos CPU iniciado ({self.process_workers} workers)")
+                else:
+                    pool = ThreadPoolExecutor(
+                        max_workers=self.thread_workers,
+                        thread_name_prefix="cpu-executor",
+                    )
+                self._pools[kind] = pool
+            return pool
+
+    def _discard_pool(self, kind: str) -> None:
+        with self._lock:
+            pool = self._pools.pop(kind, None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+
+    def _acquire(self, kind: str) -> None:
+        with self._lock:
+            if self._in_flight[kind] >= self.max_queue:
+                self._rejected[kind] += 1
+                raise CPUExecutorBusyError(
+                    f"Pool '{kind}' saturado ({self._in_flight[kind]} tareas en vuelo)"
+                )
+            self._in_flight[kind] += 1
+
+    def _release(self, kind: str, _future=None) -> None:
+        with self._lock:
+            self._in_flight[kind] -= 1
+            self._completed[kind] += 1
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        kind: str = PROCESS,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Ejecuta `fn(*args, **kwargs)` en el pool indicado y espera el resultado.
+
+        Para `kind="process"`, `fn` y sus argumentos deben ser serializables
+        (funciones a nivel de módulo, bytes, str, dicts...).
+
+        Raises:
+            CPUExecutorBusyError: Cola llena
+            CPUTaskTimeoutError: Se excedió `timeout` (default: settings)
+        """
+        kind = self._resolve_kind(kind)
+        timeout = self.default_timeout if timeout is None else timeout
+
+        self._acquire(kind)
+        try:
+            pool = self._get_pool(kind)
+            future = pool.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release(kind)
+            raise
+        # El lugar en la cola se libera cuando la tarea REALMENTE termina
+        future.add_done_callback(partial(self._release, kind))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout or None)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts[kind] += 1
+            future.cancel()  # Solo tiene efecto si aún no empezó
+            raise CPUTaskTimeoutError(
+                f"{getattr(fn, '__name__', fn)} excedió {timeout}s en pool '{kind}'"
+            )
+        except BrokenProcessPool:
+            # Un hijo murió (OOM, segfault): recrear el pool en el próximo uso
+            logger.error("💥 Pool de procesos CPU roto, se recreará")
+            self._discard_pool(kind)
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de los pools (para monitoreo)."""
+        with self._lock:
+            return {
+                "process_workers": self.process_workers,
+                "thread_workers": self.thread_workers,
+                "max_queue": self.max_queue,
+                "in_flight": dict(self._in_flight),
+                "completed": dict(self._completed),
+                "rejected": dict(self._rejected),
+                "timeouts": dict(self._timeouts),
+                "started": sorted(self._pools),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cierra ambos pools (llamar en el shutdown de la app)."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Instancia compartida
+cpu_executor = CPUExecutor()
+
+
+async def run_cpu(
+    fn: Callable[..., Any],
+    *args,
+    kind: str = PROCESS,
+    timeout: Optional[float] = None,
+    **kwargs,
+) -> Any:
+    """Atajo sobre `cpu_executor.run` (ver CPUExecutor.run)."""
+    return await cpu_executor.run(fn, *args, kind=kind, timeout=timeout, **kwargs)
@@ -0,0 +1,422 @@
+"""
+🗄️ HTTP Cache - Cache persistente de respuestas del scraping (OCC)
+
+Búsquedas, alertas, tendencias y estadísticas pedían una y otra vez las
+mismas páginas de búsqueda de OCC y el JSON de detalle
+`/offer/{job_id}/d/j`. Este módulo agrega un cache HTTP en disco como
+*transport* de httpx, así que cualquier `httpx.AsyncClient` (OCCScraper,
+SessionManager) lo usa sin cambiar su código de peticiones:
+
+- Clave: método + URL completa con parámetros (orden canónico)
+- Cuerpos comprimidos con zlib en un índice SQLite (sobrevive reinicios)
+- Frescura: `Cache-Control: max-age` de la respuesta; si el servidor no la
+  indica, el TTL de la clase de URL (HTTP_CACHE_TTL_RULES, regex -> segundos)
+  o HTTP_CACHE_DEFAULT_TTL_SECONDS. `no-store` no se guarda; `no-cache`
+  se guarda pero siempre se revalida.
+- Revalidación condicional: una entrada vencida con `ETag`/`Last-Modified`
+  se pide con `If-None-Match`/`If-Modified-Since`; un 304 renueva la entrada
+  y se responde con el cuerpo guardado.
+- Tamaño acotado: al superar HTTP_CACHE_MAX_BYTES se expulsan las entradas
+  usadas hace más tiempo (LRU). El total se lleva en memoria (un SUM al
+  abrir y al expulsar) y los accesos se anotan en lote, no uno por lectura.
+- SQLite es síncrono: el transport lo usa con `asyncio.to_thread` para no
+  bloquear el event loop.
+- `gate`: context manager opcional que envuelve solo las peticiones que sí
+  salen a la red (SessionManager pasa su rate limiter por host); un hit
+  fresco no cuesta token ni conexión.
+
+Solo se guardan respuestas 200 a GET. Las directivas de la *petición*
+(los encabezados anti-cache que imitan a un navegador) no se consideran:
+es un cache privado del scraper. `Vary` tampoco se considera.
+
+Los errores del cache nunca rompen la petición: se registran y la petición
+sigue contra el servidor.
+
+Uso:
+----
+from app.core.http_cache import caching_transport
+
+client = httpx.AsyncClient(transport=caching_transport(limits=limits))
+response = await client.get(url)        # fresca -> sin red; vencida -> 304
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import AsyncContextManager, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Encabezados que no se guardan con la entrada (dependen de la conexión)
+HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "set-cookie"}
+
+# Accesos (accessed_at) pendientes antes de escribirlos en un solo UPDATE
+TOUCH_BATCH_SIZE = 64
+
+
+# ============================================================================
+# FRESCURA
+# ============================================================================
+
+def cache_key(method: str, url: httpx.URL) -> str:
+    """SHA-256 de método + URL con los parámetros en orden canónico."""
+    params = sorted(url.params.multi_items())
+    canonical = url.copy_with(params=httpx.QueryParams(params)) if params else url
+    return hashlib.sha256(f"{method.upper()} {canonical}".encode("utf-8")).hexdigest()
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Directivas de un Cache-Control: {"max-age": "60", "no-cache": None, ...}."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or None
+    return directives
+
+
+def freshness_lifetime(url: str, headers: httpx.Headers, ttl_rules: Dict[str, float],
+                       default_ttl: float) -> Optional[float]:
+    """
+    Segundos que una respuesta se considera fresca (None = no guardar).
+
+    max-age del servidor > regla de la clase de URL > TTL por defecto.
+    """
+    directives = parse_cache_control(headers.get("cache-control"))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+    if directives.get("max-age"):
+        try:
+            return max(0.0, float(directives["max-age"]))
+        except ValueError:
+            pass
+    for pattern, ttl in ttl_rules.items():
+        if re.search(pattern, url):
+            return float(ttl)
+    return default_ttl
+
+
+@dataclass
+class CachedResponse:
+    """Entrada del cache (cuerpo tal como llegó, sin descomprimir Content-Encoding)."""
+    key: str
+    status_code: int
+    headers: Dict[str, str]
+    body: bytes
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Encabezados para una petición condicional."""
+        headers = {}
+        if self.headers.get("etag"):
+            headers["If-None-Match"] = self.headers["etag"]
+        if self.headers.get("last-modified"):
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_response(self, request: httpx.Request, revalidated: bool = False) -> httpx.Response:
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            stream=httpx.ByteStream(self.body),
+            request=request,
+            extensions={"from_cache": True, "revalidated": revalidated},
+        )
+
+
+# ============================================================================
+# ALMACENAMIENTO
+# ============================================================================
+
+class HTTPCache:
+    """
+    Respuestas HTTP comprimidas en SQLite con expulsión LRU por tamaño.
+
+    Los métodos son síncronos y seguros entre hilos; desde el event loop se
+    llaman con asyncio.to_thread (ver CachingTransport).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        default_ttl: Optional[float] = None,
+        ttl_rules: Optional[Dict[str, float]] = None,
+    ):
+        self.path = path or settings.HTTP_CACHE_PATH
+        self.max_bytes = settings.HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.default_ttl = settings.HTTP_CACHE_DEFAULT_TTL_SECONDS if default_ttl is None else default_ttl
+        self.ttl_rules = settings.HTTP_CACHE_TTL_RULES if ttl_rules is None else ttl_rules
+        self.stats: Counter = Counter()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._total = 0  # Bytes comprimidos guardados (SUM(size) al abrir y al expulsar)
+        self._touched: Dict[str, float] = {}  # key -> accessed_at pendiente de escribir
+
+    def _connect(self, create: bool) -> Optional[sqlite3.Connection]:
+        """Conexión perezosa; sin `create` no crea el archivo (lecturas sin cache aún)."""
+        if self._conn is None:
+            if not create and not os.path.exists(self.path):
+                return None
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                " key TEXT PRIMARY KEY, url TEXT, status_code INTEGER, headers TEXT,"
+                " body BLOB, size INTEGER, expires_at REAL, accessed_at REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_http_cache_accessed ON http_cache (accessed_at)")
+            conn.commit()
+            self._total = self._stored_bytes(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _stored_bytes(conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """Escribe los accessed_at pendientes en un solo executemany (sin commit)."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE http_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT status_code, headers, body, expires_at FROM http_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                self._flush_touched(conn)
+                conn.commit()
+        status_code, headers, body, expires_at = row
+        return CachedResponse(key, status_code, json.loads(headers), zlib.decompress(body), expires_at)
+
+    def is_fresh(self, url: httpx.URL, method: str = "GET") -> bool:
+        """True si `url` se respondería desde el cache sin tocar la red."""
+        try:
+            entry = self.get(cache_key(method, url))
+        except Exception:
+            return False
+        return entry is not None and entry.fresh
+
+    def put(self, key: str, url: str, status_code: int, headers: httpx.Headers, body: bytes) -> bool:
+        """Guarda una respuesta si su Cache-Control lo permite. True si se guardó."""
+        lifetime = freshness_lifetime(url, headers, self.ttl_rules, self.default_ttl)
+        # Sin frescura ni validadores la entrada nunca se podría reutilizar
+        if lifetime is None or (lifetime == 0 and not ("etag" in headers or "last-modified" in headers)):
+            return False
+        stored_headers = {
+            name.lower(): value for name, value in headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        }
+        compressed = zlib.compress(body)
+        if len(compressed) > self.max_bytes:
+            return False
+        now = time.time()
+        with self._lock:
+            conn = self._connect(create=True)
+            replaced = conn.execute("SELECT size FROM http_cache WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, status_code, json.dumps(stored_headers), compressed,
+                 len(compressed), now + lifetime, now),
+            )
+            self._touched.pop(key, None)
+            self._total += len(compressed) - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                self._evict(conn)
+            conn.commit()
+        self.stats["stored"] += 1
+        return True
+
+    def refresh(self, entry: CachedResponse, url: str, headers: httpx.Headers) -> CachedResponse:
+        """Actualiza validadores y frescura de `entry` tras un 304."""
+        for name in ("cache-control", "etag", "last-modified", "expires", "date"):
+            if name in headers:
+                entry.headers[name] = headers[name]
+        lifetime = freshness_lifetime(url, httpx.Headers(entry.headers), self.ttl_rules, self.default_ttl)
+        entry.expires_at = time.time() + (lifetime or 0.0)
+        with self._lock:
+            conn = self._connect(create=True)
+            conn.execute(
+                "UPDATE http_cache SET headers = ?, expires_at = ?, accessed_at = ? WHERE key = ?",
+                (json.dumps(entry.headers), entry.expires_at, time.time(), entry.key),
+            )
+            self._touched.pop(entry.key, None)
+            conn.commit()
+        return entry
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Borra las entradas menos usadas hasta quedar dentro de max_bytes."""
+        self._flush_touched(conn)  # El orden LRU necesita los accesos pendientes
+        total = self._stored_bytes(conn)  # Otros procesos pueden compartir el archivo
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM http_cache ORDER BY accessed_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM http_cache WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        self._total = total
+        self.stats["evicted"] += evicted
+
+    def size(self) -> int:
+        """Bytes (comprimidos) ocupados por las entradas."""
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return 0
+            self._total = self._stored_bytes(conn)
+            return self._total
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is not None:
+                conn.execute("DELETE FROM http_cache")
+                conn.commit()
+            self._touched.clear()
+            self._total = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touched(self._conn)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+
+
+# ============================================================================
+# TRANSPORT
+# ============================================================================
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """Transport de httpx que responde GETs desde HTTPCache y revalida con 304."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        cache: HTTPCache,
+        gate: Optional[Callable[[httpx.Request], AsyncContextManager]] = None,
+    ):
+        """
+        Args:
+            transport: Transport que sale a la red
+            cache: Almacenamiento de las respuestas
+            gate: Context manager por petición que sí sale a la red (rate limit,
+                conexiones por host); los hits frescos no pasan por él
+        """
+        self.transport = transport
+        self.cache = cache
+        self.gate = gate
+
+    async def _send(self, request: httpx.Request) -> Tuple[httpx.Response, bytes]:
+        """Petición a la red dentro de `gate`; regresa la respuesta y su cuerpo crudo."""
+        async with (self.gate(request) if self.gate else contextlib.nullcontext()):
+            response = await self.transport.handle_async_request(request)
+            try:
+                body = b"".join([chunk async for chunk in response.stream])
+            finally:
+                await response.aclose()
+        response = httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=httpx.ByteStream(body),
+            request=request,
+            extensions=response.extensions,
+        )
+        return response, body
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return (await self._send(request))[0]
+
+        url = str(request.url)
+        key = cache_key(request.method, request.url)
+        try:
+            entry = await asyncio.to_thread(self.cache.get, key)
+        except Exception as e:
+            logger.warning(f"HTTP cache no disponible para {url}: {e}")
+            entry = None
+
+        if entry is not None and entry.fresh:
+            self.cache.stats["hit"] += 1
+            return entry.to_response(request)
+        if entry is not None:
+            request.headers.update(entry.validators)
+
+        response, body = await self._send(request)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.stats["revalidated"] += 1
+            try:
+                entry = await asyncio.to_thread(self.cache.refresh, entry, url, response.headers)
+            except Exception as e:
+                logger.warning(f"No se pudo renovar {url} en el HTTP cache: {e}")
+            return entry.to_response(request, revalidated=True)
+
+        self.cache.stats["miss"] += 1
+        if response.status_code == 200:
+            # Se guarda el cuerpo crudo (con su Content-Encoding); el cliente lo decodifica
+            try:
+                await asyncio.to_thread(
+                    self.cache.put, key, url, response.status_code, response.headers, body
+                )
+            except Exception as e:
+                logger.warning(f"No se pudo guardar {url} en el HTTP cache: {e}")
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+# Instancia global compartida por los clientes del scraping
+http_cache = HTTPCache()
+
+
+def caching_transport(
+    gate: Optional[Callable[[httpx.Request], AsyncContextManager]] = None, **transport_kwargs
+) -> httpx.AsyncBaseTransport:
+    """
+    Transport HTTP para clientes de scraping, con cache si HTTP_CACHE_ENABLED.
+
+    Args:
+        gate: Ver CachingTransport (solo aplica con el cache activo)
+        **transport_kwargs: Argumentos de httpx.AsyncHTTPTransport (limits, retries...)
+    """
+    transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+    if not settings.HTTP_CACHE_ENABLED:
+        return transport
+    return CachingTransport(transport, http_cache, gate=gate)
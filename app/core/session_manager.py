@@ -4,14 +4,27 @@ and adaptive request delays.
 
 This module provides a managed HTTP client that rotates User-Agent headers
 and enforces adaptive delays between requests to avoid detection.
+
+Rate limiting is per host: each host gets its own token bucket (rate and
+burst from settings, overridable per host) whose rate follows AIMD - it is
+cut on 429/5xx/timeouts, paused on Retry-After, and raised slowly after a
+run of successful responses. Unrelated hosts (www.occ.com.mx,
+oferta.occ.com.mx, JSearch) no longer wait on each other.
 """
 
 import random
 import asyncio
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
 import httpx
 
+from app.core.config import settings
+from app.core.http_cache import CachingTransport, caching_transport
+
 
 # Rotating User-Agents to appear like real browsers
 USER_AGENTS = [
@@ -24,32 +37,164 @@ USER_AGENTS = [
 ]
 
 
+class HostRateLimiter:
+    """
+    Token bucket with AIMD rate adjustment for a single host.
+
+    Tokens are reserved synchronously (the balance may go negative), so
+    concurrent callers on the same event loop queue up without a lock and
+    each one sleeps for its own slot.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        decrease_factor: float,
+        success_window: int,
+    ):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.success_window = max(1, success_window)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.successes = 0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait for it.
+
+        Returns:
+            float: Seconds to sleep before sending the request
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens -= 1
+        wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(wait, self.blocked_until - now)
+
+    def on_success(self) -> None:
+        """Additive increase after `success_window` consecutive successes."""
+        self.successes += 1
+        if self.successes >= self.success_window:
+            self.successes = 0
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_backoff(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease; `retry_after` also pauses the host."""
+        now = time.monotonic()
+        self._refill(now)
+        self.successes = 0
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def stats(self) -> dict:
+        return {
+            "rate": round(self.rate, 3),
+            "tokens": round(self.tokens, 3),
+            "blocked_for": round(max(0.0, self.blocked_until - time.monotonic()), 3),
+        }
+
+
+def parse_retry_after(value: Optional[str], max_seconds: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+
+    Returns:
+        Optional[float]: Seconds to wait (capped at `max_seconds`), or None if
+        the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        seconds = retry_at.timestamp() - time.time()
+    seconds = max(0.0, seconds)
+    max_seconds = settings.SCRAPER_RETRY_AFTER_MAX_SECONDS if max_seconds is None else max_seconds
+    return min(seconds, max_seconds)
+
+
+def _host(url: Optional[str]) -> str:
+    return (urlsplit(url).hostname or "") if url else ""
+
+
 class SessionManager:
     """
     Manages HTTP sessions for web scraping with rate limiting and header rotation.
     
     Features:
     - Rotating User-Agent headers
-    - Adaptive delays between requests
-    - Connection pooling
+    - Per-host token buckets with AIMD backoff (429/5xx, Retry-After)
+    - Per-host concurrency limits and configurable connection pooling
+    - On-disk HTTP cache with conditional revalidation (app.core.http_cache)
     - Context manager support
     
     Example:
         manager = SessionManager()
-        await manager.adaptive_delay()
-        session = await manager.get_session()
-        response = await session.get(url)
+        response = await manager.request("GET", url)
+        
+        # Or manually (a session from get_session() with the HTTP cache
+        # enabled already applies network_slot() to each network request):
+        async with manager.network_slot(url):
+            response = await my_client.get(url)
+        manager.record_response(url, response.status_code, response.headers)
     """
     
-    # Delay constraints (seconds)
-    MIN_DELAY = 1.0
-    MAX_DELAY = 3.0
-    MAX_RETRIES = 2
-    
     def __init__(self):
         """Initialize SessionManager with no active session"""
         self.last_request: Optional[datetime] = None
         self.session: Optional[httpx.AsyncClient] = None
+        self.hosts: Dict[str, HostRateLimiter] = {}
+        self._connection_slots: Dict[str, asyncio.Semaphore] = {}
+        # Client whose caching transport applies the host limits itself
+        self._gated_session: Optional[httpx.AsyncClient] = None
+    
+    def _host_setting(self, host: str, key: str, default: float) -> float:
+        return settings.SCRAPER_HOST_OVERRIDES.get(host, {}).get(key, default)
+    
+    def limiter(self, url: Optional[str] = None) -> HostRateLimiter:
+        """
+        Get or create the rate limiter of the host of `url`.
+        
+        Requests without URL share a single default bucket.
+        """
+        host = _host(url)
+        if host not in self.hosts:
+            self.hosts[host] = HostRateLimiter(
+                rate=self._host_setting(host, "rate", settings.SCRAPER_HOST_RATE),
+                burst=int(self._host_setting(host, "burst", settings.SCRAPER_HOST_BURST)),
+                min_rate=self._host_setting(host, "min_rate", settings.SCRAPER_HOST_MIN_RATE),
+                max_rate=self._host_setting(host, "max_rate", settings.SCRAPER_HOST_MAX_RATE),
+                increase=settings.SCRAPER_AIMD_INCREASE,
+                decrease_factor=settings.SCRAPER_AIMD_DECREASE_FACTOR,
+                success_window=settings.SCRAPER_AIMD_SUCCESS_WINDOW,
+            )
+        return self.hosts[host]
+    
+    def _connection_slot(self, url: str) -> asyncio.Semaphore:
+        host = _host(url)
+        if host not in self._connection_slots:
+            limit = self._host_setting(host, "max_connections", settings.SCRAPER_MAX_CONNECTIONS_PER_HOST)
+            self._connection_slots[host] = asyncio.Semaphore(max(1, int(limit)))
+        return self._connection_slots[host]
     
     def get_headers(self) -> dict:
         """
@@ -73,25 +218,79 @@ class SessionManager:
             "Sec-Fetch-User": "?1",
         }
     
-    async def adaptive_delay(self) -> None:
+    async def adaptive_delay(self, url: Optional[str] = None) -> None:
         """
-        Enforce adaptive delay between HTTP requests.
+        Wait for a token of the host of `url` before an HTTP request.
         
-        If a request was made recently, calculate remaining delay needed
-        to avoid rate limiting. First call is immediate.
+        The first `burst` requests to a host are immediate; after that the
+        host's current rate applies, plus any Retry-After pause. Requests to
+        other hosts are not delayed.
         
-        This prevents detection by job sites and respects robots.txt
+        Args:
+            url: Target URL (None uses a shared default bucket)
         """
-        if self.last_request:
-            elapsed = (datetime.now() - self.last_request).total_seconds()
-            delay_needed = random.uniform(self.MIN_DELAY, self.MAX_DELAY)
-            
-            if elapsed < delay_needed:
-                sleep_time = delay_needed - elapsed
-                await asyncio.sleep(sleep_time)
+        wait = self.limiter(url).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
         
         self.last_request = datetime.now()
     
+    def record_response(self, url: str, status_code: int, headers=None) -> None:
+        """
+        Feed a response back into the host's AIMD rate.
+        
+        429 and 5xx cut the rate (and honour Retry-After); other statuses
+        below 400 count towards the next rate increase.
+        """
+        limiter = self.limiter(url)
+        if status_code == 429 or status_code >= 500:
+            limiter.on_backoff(parse_retry_after((headers or {}).get("Retry-After")))
+        elif status_code < 400:
+            limiter.on_success()
+    
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request through the host's rate limiter and connection limit.
+        
+        Args:
+            method: HTTP method
+            url: Target URL
+            **kwargs: Passed to httpx.AsyncClient.request
+            
+        Returns:
+            httpx.Response: The response (status is not raised)
+        """
+        session = await self.get_session()
+        try:
+            if session is self._gated_session:
+                # The caching transport decides: fresh hits cost no token or host connection
+                response = await session.request(method, url, **kwargs)
+            else:
+                async with self.network_slot(url):
+                    response = await session.request(method, url, **kwargs)
+        except httpx.TimeoutException:
+            self.limiter(url).on_backoff()
+            raise
+        if not response.extensions.get("from_cache") or response.extensions.get("revalidated"):
+            self.record_response(url, response.status_code, response.headers)
+        return response
+    
+    @asynccontextmanager
+    async def network_slot(self, url: str):
+        """
+        Hold a host connection slot and wait for a token of the host of `url`.
+        
+        Wraps every request that actually reaches the network; the caching
+        transport uses it as its gate so cache hits skip it.
+        """
+        async with self._connection_slot(url):
+            await self.adaptive_delay(url)
+            yield
+    
+    def rate_stats(self) -> Dict[str, dict]:
+        """Current rate, tokens and pause per host."""
+        return {host or "default": limiter.stats() for host, limiter in self.hosts.items()}
+    
     async def get_session(self) -> httpx.AsyncClient:
         """
         Get or create an async HTTP session.
@@ -105,15 +304,21 @@ class SessionManager:
             - Call close() to cleanup resources
         """
         if not self.session:
+            transport = caching_transport(
+                gate=lambda request: self.network_slot(str(request.url)),
+                limits=httpx.Limits(
+                    max_connections=settings.SCRAPER_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.SCRAPER_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
             self.session = httpx.AsyncClient(
                 headers=self.get_headers(),
                 timeout=30.0,
                 follow_redirects=True,
-                limits=httpx.Limits(
-                    max_connections=10,
-                    max_keepalive_connections=5
-                )
+                transport=transport
             )
+            if isinstance(transport, CachingTransport):
+                self._gated_session = self.session
         return self.session
     
     async def close(self) -> None:
@@ -151,7 +356,7 @@ def get_session_manager() -> SessionManager:
         
     Example:
         manager = get_session_manager()
-        await manager.adaptive_delay()
+        response = await manager.request("GET", url)
     """
     global _session_manager
     if not _session_manager:
@@ -365,7 +365,7 @@ async function handleCVUpload(file) {
         console.log('📄 Archivo:', { name: file.name, size: file.size, type: file.type });
 
         // Usar XMLHttpRequest para obtener progress con FormData
-        const response = await uploadFileWithProgress(
+        const task = await uploadFileWithProgress(
             `/students/upload_resume`,
             file,
             metadata,
@@ -377,6 +377,9 @@ async function handleCVUpload(file) {
             }
         );
 
+        // ✅ El servidor responde 202 con la tarea: esperar el análisis
+        const response = await waitForResumeTask(task);
+
         // ✅ Procesar respuesta: ResumeAnalysisResponse contiene student y skills extraídas
         if (response.student) {
             // ✅ IMPORTANTE: Limpiar datos anteriores antes de cargar nuevos
@@ -440,6 +443,30 @@ async function handleCVUpload(file) {
     }
 }
 
+/**
+ * Esperar a que termine la tarea de análisis de CV (cola del servidor)
+ * Consulta GET /students/upload_resume/{task_id} hasta completed/failed
+ * y devuelve el ResumeAnalysisResponse final.
+ */
+async function waitForResumeTask(task, intervalMs = 1500, timeoutMs = 5 * 60 * 1000) {
+    const deadline = Date.now() + timeoutMs;
+    let status = task;
+
+    while (status.status !== 'completed' && status.status !== 'failed') {
+        if (Date.now() > deadline) {
+            throw new Error('El análisis del CV está tardando más de lo esperado, revisa tu perfil en unos minutos');
+        }
+        notificationManager.loading(`Analizando CV... ${status.progress || 0}%`);
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+        status = await apiClient.get(`/students/upload_resume/${task.task_id}`);
+    }
+
+    if (status.status === 'failed') {
+        throw new Error(status.error || 'Error al analizar el CV');
+    }
+    return status.result || {};
+}
+
 /**
  * Upload de archivo con progress
  * 
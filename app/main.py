@@ -22,6 +22,7 @@ from fastapi.responses import JSONResponse, FileResponse
 from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import asyncio
 import uvicorn
 from datetime import datetime
 from pathlib import Path
@@ -115,7 +116,36 @@ async def startup_event():
     
     # Verificar que hay acceso admin disponible
     verify_admin_access_configured()
-    
+
+    # Cargar índice de embeddings de empleos (si fue persistido)
+    try:
+        from app.services.job_embedding_index import job_embedding_index
+        if job_embedding_index.load():
+            print(f"🧭 Índice de embeddings cargado: {len(job_embedding_index)} empleos")
+    except Exception as e:
+        print(f"⚠️  No se pudo cargar índice de embeddings: {e}")
+
+    # Purgar cache de CVs calculado con versiones anteriores de extractores
+    from app.services.cv_analysis_cache import cv_analysis_cache
+    purged = await cv_analysis_cache.purge_stale()
+    if purged:
+        print(f"🗃️ Cache de CVs: {purged} entradas obsoletas eliminadas")
+
+    # Workers de la cola de procesamiento de CVs (subidas asíncronas)
+    from app.services.cv_processing_queue import cv_processing_queue
+    await cv_processing_queue.start()
+
+    # Reanudar jobs de re-análisis masivo interrumpidos (desde su checkpoint)
+    from app.services.student_reanalysis import student_reanalysis_jobs
+    resumed = await student_reanalysis_jobs.resume()
+    if resumed:
+        print(f"🔁 Re-análisis masivo: {resumed} job(s) reanudados")
+
+    # Enriquecimiento en segundo plano de los empleos guardados por el scraping
+    if settings.JOB_ENRICHMENT_ENABLED:
+        from app.services.job_background_enrichment import job_background_enricher
+        await job_background_enricher.start()
+
     print(f"🚀 {settings.PROJECT_NAME} iniciado correctamente")
     print(f"📊 Base de datos: {settings.DATABASE_URL}")
     print(f"🔐 Audit logging: {'✅' if settings.ENABLE_AUDIT_LOGGING else '❌'}")
@@ -130,6 +160,42 @@ if static_path.exists():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Limpiar recursos al cerrar"""
+    try:
+        from app.services.job_embedding_index import job_embedding_index
+        if len(job_embedding_index):
+            job_embedding_index.save()
+    except Exception as e:
+        print(f"⚠️  No se pudo guardar índice de embeddings: {e}")
+
+    try:
+        from app.services.dedup_store import job_dedup_store
+        await job_dedup_store.close()
+    except Exception as e:
+        print(f"⚠️  No se pudo guardar snapshot de deduplicación: {e}")
+
+    # Cerrar el cache HTTP del scraping (escribe los accesos pendientes del LRU)
+    try:
+        from app.core.http_cache import http_cache
+        await asyncio.to_thread(http_cache.close)
+    except Exception as e:
+        print(f"⚠️  No se pudo cerrar el cache HTTP: {e}")
+
+    # Detener el enriquecimiento de empleos (el lote en curso se retoma en la siguiente pasada)
+    from app.services.job_background_enrichment import job_background_enricher
+    await job_background_enricher.stop()
+
+    # Detener workers de la cola de CVs (las tareas en curso se re-encolan al reiniciar)
+    from app.services.cv_processing_queue import cv_processing_queue
+    await cv_processing_queue.stop()
+
+    # Detener jobs de re-análisis (se reanudan desde su checkpoint al reiniciar)
+    from app.services.student_reanalysis import student_reanalysis_jobs
+    await student_reanalysis_jobs.stop()
+
+    # Cerrar pools del CPU executor (no esperar tareas en curso)
+    from app.core.cpu_executor import cpu_executor
+    cpu_executor.shutdown(wait=False)
+
     print(f"🛑 {settings.PROJECT_NAME} detenido")
 
 
@@ -7,6 +7,8 @@ from typing import Optional
 from sqlmodel import SQLModel, Field
 import hashlib
 
+from app.utils.datetime_utils import utc_now
+
 # Importar modelos específicos
 from .user import User, UserCreate, UserRead, UserUpdate
 from .job_scraping import (
@@ -16,6 +18,13 @@ from .job_scraping import (
     UserJobAlertDB,
     ScrapingLogDB
 )
+from .cv_cache import CVExtractionCache
+from .cv_task import CVProcessingTask
+from .reanalysis_job import StudentReanalysisJob
+from .crawl_state import OCCCrawlState
+from .crawl_frontier import CrawlFrontierEntry
+from .scraped_job_id import ScrapedJobId
+from .job_enrichment import JobEnrichment
 
 
 # ============================================================================
@@ -45,7 +54,7 @@ class Student(SQLModel, table=True):
     
     # Datos de privacidad y consentimiento (LFPDPPP)
     consent_data_processing: bool = Field(default=True, description="Consentimiento para procesamiento de datos")
-    consent_date: Optional[datetime] = Field(default_factory=datetime.utcnow)
+    consent_date: Optional[datetime] = Field(default_factory=utc_now)
     
     # Perfil y habilidades (almacenados como JSON strings)
     profile_text: Optional[str] = Field(description="Texto crudo del currículum")
@@ -66,7 +75,7 @@ class Student(SQLModel, table=True):
     cv_upload_date: Optional[datetime] = Field(default=None, description="Fecha de subida del CV")
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: Optional[datetime] = None
     last_active: Optional[datetime] = None
     is_active: bool = Field(default=True)
@@ -157,7 +166,7 @@ class Company(SQLModel, table=True):
     is_active: bool = Field(default=True)
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: Optional[datetime] = None
     
     # ============================================================
@@ -209,7 +218,7 @@ class Admin(SQLModel, table=True):
     is_active: bool = Field(default=True, description="Si el admin está activo")
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: Optional[datetime] = None
     
     # ============================================================
@@ -294,8 +303,8 @@ class JobPosition(SQLModel, table=True):
     expires_at: Optional[datetime] = Field(default=None, description="Fecha de expiración")
     
     # Metadatos del sistema (updated_at es suficiente)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, description="Última actualización")
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now, description="Última actualización")
 
 
 # ============================================================================
@@ -316,7 +325,7 @@ class JobMatchEvent(SQLModel, table=True):
     source: str = Field(default="internal", description="Fuente del matching (internal, occ, jsearch, etc.)")
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
 
 
 class AuditLog(SQLModel, table=True):
@@ -339,7 +348,7 @@ class AuditLog(SQLModel, table=True):
     error_message: Optional[str] = Field(description="Mensaje de error si aplica")
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
 
 
 class UserSession(SQLModel, table=True):
@@ -357,8 +366,8 @@ class UserSession(SQLModel, table=True):
     expires_at: datetime = Field(description="Fecha de expiración")
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    last_activity: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    last_activity: datetime = Field(default_factory=utc_now)
 
 
 class ApiKey(SQLModel, table=True):
@@ -394,7 +403,7 @@ class ApiKey(SQLModel, table=True):
     expires_at: Optional[datetime] = None
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     updated_at: Optional[datetime] = None
 
 
@@ -425,4 +434,13 @@ __all__ = [
     "SearchResultDB", 
     "UserJobAlertDB",
     "ScrapingLogDB",
+    "OCCCrawlState",
+    "CrawlFrontierEntry",
+    "ScrapedJobId",
+    "JobEnrichment",
+    
+    # Cache y cola de procesamiento de CVs
+    "CVExtractionCache",
+    "CVProcessingTask",
+    "StudentReanalysisJob",
 ]
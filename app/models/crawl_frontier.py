@@ -0,0 +1,51 @@
+"""
+Modelo de la frontera de crawling (trabajo de scraping compartido)
+
+Una fila por página de búsqueda a recorrer (fuente + keyword + ubicación +
+página). Los workers, en uno o varios procesos y hosts, toman lotes de
+filas vencidas con un lease (lease_owner + lease_expiry) que renuevan
+mientras trabajan; al terminar registran el resultado y programan la
+siguiente visita (next_due). Si un worker muere su lease expira y otro
+worker retoma la fila: el progreso vive en la base de datos, no en memoria.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+from app.utils.datetime_utils import utc_now
+
+
+class CrawlFrontierEntry(SQLModel, table=True):
+    """Página de búsqueda pendiente de recorrer por los workers de scraping"""
+    __tablename__ = "crawl_frontier"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entry_key: str = Field(unique=True, index=True, max_length=64, description="SHA-256 de fuente + keyword + ubicación + página")
+    source: str = Field(default="occ", max_length=50)
+    keyword: str = Field(max_length=200)
+    location: Optional[str] = Field(default=None, max_length=200)
+    page: int = Field(default=1)
+    priority: int = Field(default=0, index=True, description="Mayor = se toma antes")
+
+    # pending: en la frontera | failed: agotó reintentos (se reactiva al re-encolar)
+    status: str = Field(default="pending", max_length=20, index=True)
+    recrawl_seconds: int = Field(default=0, description="Segundos hasta la siguiente visita tras un éxito (0 = no volver)")
+
+    # Lease del worker que la está procesando
+    lease_owner: Optional[str] = Field(default=None, max_length=200, index=True)
+    attempts: int = Field(default=0, description="Fallos consecutivos")
+
+    # Resultado de la última visita
+    runs: int = Field(default=0)
+    last_outcome: Optional[str] = Field(default=None, max_length=20, description="ok, error")
+    last_error: Optional[str] = Field(default=None, max_length=500)
+    last_found: int = Field(default=0)
+    last_new: int = Field(default=0, description="Ofertas que no estaban en job_positions")
+
+    # Timestamps UTC con zona horaria (UTCDateTime de SQLModel)
+    next_due: Optional[datetime] = Field(default_factory=utc_now, index=True)
+    lease_expiry: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=utc_now)
+    last_run_at: Optional[datetime] = Field(default=None)
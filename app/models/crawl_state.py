@@ -0,0 +1,42 @@
+"""
+Modelo de estado del crawling incremental de OCC
+
+Una fila por búsqueda (keyword + ubicación + filtros) y consumidor (cada
+alerta, el tracker...; así uno no marca como vistas las ofertas de otro):
+las huellas de las tarjetas del listado ya vistas y los ids más recientes
+de la última corrida. Con esto una actualización deja de paginar al llegar
+a ofertas conocidas y solo pide detalles de tarjetas nuevas o modificadas.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+from app.utils.datetime_utils import utc_now
+
+
+class OCCCrawlState(SQLModel, table=True):
+    """Ofertas ya vistas por una búsqueda de OCC (crawling incremental)"""
+    __tablename__ = "occ_crawl_states"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    query_key: str = Field(unique=True, index=True, max_length=64, description="SHA-256 de alcance + filtros (sin página)")
+    scope: str = Field(default="default", max_length=100, index=True, description="Consumidor: alert:<id>, tracker...")
+    keyword: str = Field(max_length=200)
+    location: Optional[str] = Field(default=None, max_length=200)
+    filters: str = Field(default="{}", description="Filtros de la búsqueda (JSON)")
+
+    # {job_id: huella de la tarjeta} en orden de última vez visto (JSON)
+    cards: str = Field(default="{}", description="Huellas de las tarjetas conocidas (JSON)")
+    newest_job_ids: str = Field(default="[]", description="Ids de la primera página en la última corrida (JSON)")
+
+    # Métricas de la última corrida
+    runs: int = Field(default=0)
+    last_pages_fetched: int = Field(default=0)
+    last_new: int = Field(default=0)
+    last_changed: int = Field(default=0)
+
+    # Timestamps UTC con zona horaria (UTCDateTime de SQLModel)
+    created_at: datetime = Field(default_factory=utc_now)
+    last_crawled_at: Optional[datetime] = Field(default=None)
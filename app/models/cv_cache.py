@@ -0,0 +1,38 @@
+"""
+Modelo de cache de extracción/análisis de CVs por hash de contenido
+
+Una fila por (kind, content_hash):
+- kind="text": texto extraído de un archivo; content_hash = SHA-256 de los bytes
+- kind="resume_analysis" / "resume_fields": resultados NLP; content_hash =
+  SHA-256 del texto + versiones de los extractores
+
+`extractor_version` guarda la versión con la que se calculó el resultado;
+una fila con otra versión se considera inválida (ver CVAnalysisCache).
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field, UniqueConstraint
+
+from app.utils.datetime_utils import utc_now
+
+
+class CVExtractionCache(SQLModel, table=True):
+    """Resultado cacheado de extracción de texto o análisis de un CV"""
+    __tablename__ = "cv_extraction_cache"
+    __table_args__ = (
+        UniqueConstraint("kind", "content_hash", name="uq_cv_extraction_cache_kind_hash"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(max_length=32, index=True, description="Tipo de resultado (text, resume_analysis, ...)")
+    content_hash: str = Field(max_length=64, description="SHA-256 del contenido (+ versiones)")
+    extractor_version: str = Field(max_length=255, description="Versión(es) del extractor que produjo el resultado")
+    payload: str = Field(description="Resultado serializado (JSON)")
+
+    # Uso
+    hits: int = Field(default=0, description="Veces que se reutilizó el resultado")
+    # Timestamps UTC con zona (la columna de sqlmodel rechaza valores naive)
+    created_at: datetime = Field(default_factory=utc_now)
+    last_used_at: datetime = Field(default_factory=utc_now)
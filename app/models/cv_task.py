@@ -0,0 +1,48 @@
+"""
+Modelo de tareas de procesamiento de CVs (cola persistente en BD)
+
+Cada subida de CV crea una fila; los workers de CVProcessingQueue la toman
+(status queued -> processing) y registran etapa, progreso y resultado.
+Los emails (del estudiante en `meta` y de quien sube) se guardan solo
+encriptados, más el hash para búsquedas, y se borran al terminar.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+from app.utils.datetime_utils import utc_now
+
+
+class CVProcessingTask(SQLModel, table=True):
+    """Tarea de extracción + análisis de un CV subido"""
+    __tablename__ = "cv_processing_tasks"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    task_id: str = Field(unique=True, index=True, max_length=32, description="Identificador público de la tarea")
+
+    # Estado: queued | processing | completed | failed
+    status: str = Field(default="queued", max_length=20, index=True)
+    stage: Optional[str] = Field(default=None, max_length=50, description="Etapa actual del pipeline")
+    progress: int = Field(default=0, description="Progreso 0-100")
+    attempts: int = Field(default=0, description="Veces que un worker tomó la tarea")
+
+    # Entrada
+    filename: str = Field(max_length=255, description="Nombre original del archivo")
+    file_path: str = Field(max_length=500, description="Ruta del archivo almacenado")
+    meta: str = Field(default="{}", description="Metadatos de la subida (JSON con el email encriptado, se vacía al terminar)")
+    email_hash: Optional[str] = Field(default=None, max_length=64, index=True, description="SHA-256 del email del estudiante")
+    actor_role: str = Field(max_length=20, description="Rol de quien subió el CV")
+    actor_id: Optional[int] = Field(default=None, description="ID de quien subió el CV")
+    actor_email: Optional[str] = Field(default=None, max_length=500, description="Email de quien subió el CV (encriptado, se borra al terminar)")
+
+    # Salida
+    result: Optional[str] = Field(default=None, description="Resultado (JSON)")
+    error: Optional[str] = Field(default=None, description="Mensaje de error si falló")
+    error_status: Optional[int] = Field(default=None, description="Código HTTP equivalente del error")
+
+    # Timestamps UTC con zona (la columna de sqlmodel rechaza valores naive)
+    created_at: datetime = Field(default_factory=utc_now)
+    started_at: Optional[datetime] = Field(default=None)
+    finished_at: Optional[datetime] = Field(default=None)
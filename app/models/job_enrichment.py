@@ -0,0 +1,49 @@
+"""
+Modelo del enriquecimiento en segundo plano de empleos
+
+Una fila por empleo (job_positions) con lo derivado una sola vez tras la
+ingesta: skills, salario, modalidad y tipo normalizados, idioma y si se
+vectorizó. `content_hash` resume el contenido del empleo y la versión del
+enriquecedor con que se calculó: si un re-scrape deja el empleo igual, no
+se vuelve a procesar.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+from app.utils.datetime_utils import utc_now
+
+
+class JobEnrichment(SQLModel, table=True):
+    """Campos derivados de un empleo por el enriquecimiento en segundo plano"""
+    __tablename__ = "job_enrichments"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_position_id: int = Field(foreign_key="job_positions.id", unique=True, index=True)
+    content_hash: str = Field(max_length=64, description="SHA-256 del contenido del empleo + versión del enriquecedor")
+    version: str = Field(max_length=20, description="Versión del enriquecedor que produjo la fila")
+
+    # enriched | failed (se reintenta cuando cambia el contenido o la versión)
+    status: str = Field(default="enriched", max_length=20, index=True)
+    error: Optional[str] = Field(default=None, max_length=500)
+
+    # Derivados
+    skills: Optional[str] = Field(default=None, description="Habilidades (JSON list)")
+    salary_min: Optional[float] = Field(default=None)
+    salary_max: Optional[float] = Field(default=None)
+    salary_currency: Optional[str] = Field(default=None, max_length=10)
+    salary_period: Optional[str] = Field(default=None, max_length=20, description="hour, week, biweekly, month, year")
+    work_mode: Optional[str] = Field(default=None, max_length=20, description="presencial, remoto, híbrido")
+    job_type: Optional[str] = Field(default=None, max_length=20, description="full-time, part-time, freelance, temporary")
+    language: Optional[str] = Field(default=None, max_length=10)
+    language_confidence: Optional[float] = Field(default=None)
+    vectorized: bool = Field(default=False, description="Si el empleo quedó en el índice de embeddings")
+
+    # Timestamps UTC con zona (la columna de sqlmodel rechaza valores naive)
+    enriched_at: datetime = Field(default_factory=utc_now)
+    checked_at: datetime = Field(
+        default_factory=utc_now,
+        description="Última comparación del hash (aunque no haya cambiado)",
+    )
@@ -15,6 +15,8 @@ Diseño:
 from sqlmodel import SQLModel, Field, Index
 from datetime import datetime
 from typing import Optional, List
+
+from app.utils.datetime_utils import utc_now
 import json
 import logging
 
@@ -192,13 +194,13 @@ class JobPosting(SQLModel, table=True):
     )
     
     created_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utc_now,
         index=True,
         description="Fecha de creación en BD"
     )
     
     updated_at: datetime = Field(
-        default_factory=datetime.utcnow,
+        default_factory=utc_now,
         description="Fecha de última actualización"
     )
     
@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import List, Optional
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
 
+from app.utils.datetime_utils import utc_now
+
 
 class SearchQueryDB(SQLModel, table=True):
     """Modelo para almacenar consultas de búsqueda realizadas"""
@@ -20,7 +22,7 @@ class SearchQueryDB(SQLModel, table=True):
     total_results: int = 0
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     
     # Relaciones
     search_results: List["SearchResultDB"] = Relationship(back_populates="search_query")
@@ -37,7 +39,7 @@ class SearchResultDB(SQLModel, table=True):
     position_in_results: int  # Posición en los resultados de búsqueda
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
     
     # Relaciones
     search_query: SearchQueryDB = Relationship(back_populates="search_results")
@@ -53,13 +55,13 @@ class JobApplicationDB(SQLModel, table=True):
     
     # Estado de la aplicación
     status: str = Field(default="pending", description="pending, applied, viewed, rejected, accepted")
-    application_date: datetime = Field(default_factory=datetime.utcnow)
+    application_date: datetime = Field(default_factory=utc_now)
     external_application_url: Optional[str] = None
     notes: Optional[str] = None
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
 
 
 class UserJobAlertDB(SQLModel, table=True):
@@ -82,8 +84,8 @@ class UserJobAlertDB(SQLModel, table=True):
     last_notification: Optional[datetime] = None
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
 
 
 class ScrapingLogDB(SQLModel, table=True):
@@ -104,4 +106,4 @@ class ScrapingLogDB(SQLModel, table=True):
     source_url: Optional[str] = None
     
     # Metadatos
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
@@ -0,0 +1,44 @@
+"""
+Modelo de jobs de re-análisis masivo de estudiantes
+
+Un job recorre la base de estudiantes por id ascendente en lotes; cada lote
+guarda sus resultados y avanza `last_student_id` en la misma transacción,
+así un job interrumpido se reanuda desde el último lote confirmado.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlmodel import SQLModel, Field
+
+from app.utils.datetime_utils import utc_now
+
+
+class StudentReanalysisJob(SQLModel, table=True):
+    """Re-análisis de los CVs de toda la base de estudiantes en segundo plano"""
+    __tablename__ = "student_reanalysis_jobs"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    job_id: str = Field(unique=True, index=True, max_length=32, description="Identificador público del job")
+
+    # Estado: queued | running | completed | failed | cancelled
+    status: str = Field(default="queued", max_length=20, index=True)
+    chunk_size: int = Field(description="Estudiantes por lote")
+
+    # Progreso (checkpoint: último id confirmado)
+    total: int = Field(default=0, description="Estudiantes con CV al crear el job")
+    processed: int = Field(default=0, description="Estudiantes recorridos")
+    updated: int = Field(default=0, description="Estudiantes re-analizados y guardados")
+    failed: int = Field(default=0, description="Estudiantes cuyo análisis falló")
+    last_student_id: int = Field(default=0, description="Último id de estudiante confirmado")
+    errors: str = Field(default="[]", description="Muestra de errores por estudiante (JSON)")
+    error: Optional[str] = Field(default=None, description="Error que detuvo el job")
+
+    actor_id: Optional[int] = Field(default=None, description="ID del administrador que lanzó el job")
+    actor_email: Optional[str] = Field(default=None, max_length=500, description="Email del administrador (encriptado)")
+
+    # Timestamps UTC con zona (la columna de sqlmodel rechaza valores naive)
+    created_at: datetime = Field(default_factory=utc_now)
+    started_at: Optional[datetime] = Field(default=None)
+    heartbeat_at: Optional[datetime] = Field(default=None, description="Se refresca durante todo el job, también a mitad de lote")
+    finished_at: Optional[datetime] = Field(default=None)
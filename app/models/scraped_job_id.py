@@ -0,0 +1,30 @@
+"""
+Modelo de ids de ofertas ya vistas por el scraping (deduplicación)
+
+Una fila por oferta y fuente con la última vez que se vio. Es la fuente
+exacta detrás del filtro de Bloom del DedupStore: confirma sus positivos,
+permite reconstruirlo al reiniciar y, al vencer el TTL de last_seen_at,
+una oferta re-publicada vuelve a contar como nueva.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+from app.utils.datetime_utils import utc_now
+
+
+class ScrapedJobId(SQLModel, table=True):
+    """Oferta vista por el scraping (id externo por fuente)"""
+    __tablename__ = "scraped_job_ids"
+    __table_args__ = (UniqueConstraint("source", "external_job_id", name="uq_scraped_job_ids_source_id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    source: str = Field(default="occ", max_length=50)
+    external_job_id: str = Field(max_length=255)
+
+    # Timestamps UTC con zona horaria (UTCDateTime de SQLModel)
+    first_seen_at: datetime = Field(default_factory=utc_now)
+    last_seen_at: datetime = Field(default_factory=utc_now, index=True)
@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Optional
 from sqlmodel import SQLModel, Field
 
+from app.utils.datetime_utils import utc_now
+
 
 class UserBase(SQLModel):
     """Modelo base del usuario con campos comunes"""
@@ -33,8 +35,8 @@ class User(UserBase, table=True):
     __tablename__ = "users"
     
     id: Optional[int] = Field(default=None, primary_key=True)
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=utc_now)
+    updated_at: datetime = Field(default_factory=utc_now)
     
     # Password hash (nunca se incluye en respuestas API)
     hashed_password: str = Field(max_length=255)
@@ -2,7 +2,7 @@
 Esquemas Pydantic para validación de entrada y salida de la API
 """
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -241,6 +241,39 @@ class ResumeAnalysisResponse(BaseModel):
     extracted_soft_skills: List[str]
     extracted_projects: List[str]
     analysis_confidence: float = 0.0
+    extraction_method: Optional[str] = None  # Nivel de la cascada que aportó los campos
+    extraction_tiers: Optional[List[Dict[str, Any]]] = None  # Niveles corridos y su duración
+
+
+class ResumeTaskStatus(BaseModel):
+    """Estado de una tarea de análisis de currículum (cola de CVs)"""
+    task_id: str
+    status: str  # queued | processing | completed | failed
+    stage: Optional[str] = None
+    progress: int = 0
+    filename: Optional[str] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[ResumeAnalysisResponse] = None
+
+
+class ReanalysisJobStatus(BaseModel):
+    """Estado de un job de re-análisis masivo de estudiantes"""
+    job_id: str
+    status: str  # queued | running | completed | failed | cancelled
+    total: int = 0
+    processed: int = 0
+    updated: int = 0
+    failed: int = 0
+    progress: int = 0  # 0-100
+    last_student_id: int = 0
+    errors: List[Dict[str, Any]] = []
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 # Admin schemas
@@ -0,0 +1,431 @@
+"""
+🗺️ Crawl Frontier - Trabajo de scraping compartido entre workers
+
+`JobScraperWorker.scrape_occ_batch` y `scrape_jobs_batch` recorren una
+lista en memoria: si el proceso cae se pierde el progreso y no hay forma de
+repartir el trabajo entre procesos. La frontera guarda cada página de
+búsqueda pendiente en la tabla `crawl_frontier` y los workers (en uno o
+varios procesos y hosts, coordinados solo por la base de datos compartida):
+
+1. Toman un lote de páginas vencidas con un lease (`lease`): un UPDATE
+   condicionado a que la fila siga libre o con lease expirado, así cada
+   página la gana un solo worker.
+2. Renuevan el lease mientras procesan el lote (`renew`).
+3. Registran el resultado (`complete`) y programan la siguiente visita, o
+   el fallo (`fail`) con reintento exponencial hasta max_attempts.
+4. Liberan el lease de lo que no alcanzaron a procesar (`release`) al
+   apagarse o fallar; si el proceso muere, el lease simplemente expira.
+
+Uso:
+----
+from app.services.crawl_frontier import crawl_frontier, CrawlFrontierWorker
+
+await crawl_frontier.enqueue_many([("python", "remote"), ("java", None)], pages=3)
+await CrawlFrontierWorker().run(stop_when_empty=True)
+
+Worker independiente:
+    python scripts/utilities/crawl_frontier_worker.py --enqueue python:remote --pages 3
+    python scripts/utilities/crawl_frontier_worker.py --concurrency 4
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models import CrawlFrontierEntry
+from app.services.dedup_store import DedupStore, job_dedup_store
+from app.utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Estados de una página de la frontera
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+# Procesa una página y devuelve {"found": n, "new": n}; un error la marca como fallida
+PageHandler = Callable[[CrawlFrontierEntry], Awaitable[Dict[str, int]]]
+
+
+def entry_key(source: str, keyword: str, location: Optional[str], page: int) -> str:
+    """SHA-256 de fuente + keyword + ubicación + página."""
+    data = {"source": source, "keyword": keyword.strip().lower(), "location": (location or "").strip().lower(), "page": page}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def default_owner() -> str:
+    """Identificador único del worker: host:pid:aleatorio."""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+# ============================================================================
+# FRONTERA
+# ============================================================================
+
+class CrawlFrontier:
+    """Páginas de búsqueda pendientes respaldadas por la tabla crawl_frontier."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff_seconds: Optional[float] = None,
+    ):
+        self._session_factory = session_factory
+        self.lease_seconds = lease_seconds or settings.CRAWL_FRONTIER_LEASE_SECONDS
+        self.max_attempts = max_attempts or settings.CRAWL_FRONTIER_MAX_ATTEMPTS
+        self.retry_backoff_seconds = (
+            settings.CRAWL_FRONTIER_RETRY_BACKOFF_SECONDS if retry_backoff_seconds is None else retry_backoff_seconds
+        )
+
+    def session(self):
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+        return self._session_factory()
+
+    # ------------------------------------------------------------------
+    # Encolado
+    # ------------------------------------------------------------------
+
+    async def enqueue(
+        self,
+        keyword: str,
+        location: Optional[str] = None,
+        pages: int = 1,
+        priority: int = 0,
+        recrawl_seconds: int = 0,
+        source: str = "occ",
+    ) -> int:
+        """
+        Agrega las páginas 1..pages de una búsqueda a la frontera.
+
+        Las páginas que ya existen conservan su lease; si estaban terminadas
+        o fallidas vuelven a quedar pendientes para ahora, y su prioridad
+        sube si la nueva es mayor.
+
+        Returns:
+            Páginas nuevas en la frontera
+        """
+        keys = {entry_key(source, keyword, location, page): page for page in range(1, max(1, pages) + 1)}
+        now = utc_now()
+        async with self.session() as session:
+            existing = (await session.execute(
+                select(CrawlFrontierEntry).where(CrawlFrontierEntry.entry_key.in_(list(keys)))
+            )).scalars().all()
+            for entry in existing:
+                entry.priority = max(entry.priority, priority)
+                entry.recrawl_seconds = recrawl_seconds
+                if entry.status != PENDING:
+                    entry.status, entry.attempts, entry.next_due = PENDING, 0, now
+                session.add(entry)
+
+            known = {entry.entry_key for entry in existing}
+            for key, page in keys.items():
+                if key not in known:
+                    session.add(CrawlFrontierEntry(
+                        entry_key=key, source=source, keyword=keyword, location=location, page=page,
+                        priority=priority, recrawl_seconds=recrawl_seconds, next_due=now,
+                    ))
+            try:
+                await session.commit()
+            except IntegrityError:
+                # Otro proceso encoló la misma búsqueda al mismo tiempo
+                await session.rollback()
+                logger.warning(f"🗺️ '{keyword}' ({location}) encolada en paralelo por otro proceso")
+                return 0
+        return len(keys) - len(known)
+
+    async def enqueue_many(self, pairs: Iterable[Tuple[str, Optional[str]]], **options) -> int:
+        """Encola varias búsquedas (keyword, ubicación) con las mismas opciones."""
+        added = 0
+        for keyword, location in pairs:
+            added += await self.enqueue(keyword, location, **options)
+        return added
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _available(now: datetime):
+        return and_(
+            CrawlFrontierEntry.status == PENDING,
+            CrawlFrontierEntry.next_due <= now,
+            or_(CrawlFrontierEntry.lease_owner.is_(None), CrawlFrontierEntry.lease_expiry < now),
+        )
+
+    async def lease(self, owner: str, limit: int) -> List[CrawlFrontierEntry]:
+        """
+        Toma hasta `limit` páginas vencidas (mayor prioridad primero).
+
+        El UPDATE repite la condición de disponibilidad: si otro worker tomó
+        una fila entre el SELECT y el UPDATE, esa fila no se actualiza y no
+        se devuelve.
+        """
+        now = utc_now()
+        async with self.session() as session:
+            candidates = (await session.execute(
+                select(CrawlFrontierEntry.id)
+                .where(self._available(now))
+                .order_by(CrawlFrontierEntry.priority.desc(), CrawlFrontierEntry.next_due, CrawlFrontierEntry.id)
+                .limit(limit)
+            )).scalars().all()
+            if not candidates:
+                return []
+
+            await session.execute(
+                update(CrawlFrontierEntry)
+                .where(CrawlFrontierEntry.id.in_(candidates), self._available(now))
+                .values(lease_owner=owner, lease_expiry=now + timedelta(seconds=self.lease_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            leased = (await session.execute(
+                select(CrawlFrontierEntry)
+                .where(CrawlFrontierEntry.id.in_(candidates), CrawlFrontierEntry.lease_owner == owner)
+                .order_by(CrawlFrontierEntry.priority.desc(), CrawlFrontierEntry.next_due, CrawlFrontierEntry.id)
+            )).scalars().all()
+        return list(leased)
+
+    async def renew(self, entry_ids: Iterable[int], owner: str) -> Set[int]:
+        """Extiende el lease; devuelve los ids que `owner` todavía tiene."""
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return set()
+        mine = and_(CrawlFrontierEntry.id.in_(entry_ids), CrawlFrontierEntry.lease_owner == owner)
+        async with self.session() as session:
+            await session.execute(
+                update(CrawlFrontierEntry)
+                .where(mine)
+                .values(lease_expiry=utc_now() + timedelta(seconds=self.lease_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            held = (await session.execute(select(CrawlFrontierEntry.id).where(mine))).scalars().all()
+        return set(held)
+
+    async def release(self, entry_ids: Iterable[int], owner: str) -> int:
+        """Suelta el lease sin contar intento (apagado o lote abortado)."""
+        entry_ids = list(entry_ids)
+        if not entry_ids:
+            return 0
+        return await self._update_leased(entry_ids, owner, lease_owner=None, lease_expiry=None)
+
+    async def complete(self, entry: CrawlFrontierEntry, owner: str, found: int = 0, new: int = 0) -> bool:
+        """Registra una visita exitosa y programa la siguiente (o la da por terminada)."""
+        now = utc_now()
+        values: Dict[str, Any] = dict(
+            lease_owner=None, lease_expiry=None, attempts=0, runs=CrawlFrontierEntry.runs + 1,
+            last_outcome="ok", last_error=None, last_found=found, last_new=new, last_run_at=now,
+        )
+        if entry.recrawl_seconds > 0:
+            values["next_due"] = now + timedelta(seconds=entry.recrawl_seconds)
+        else:
+            values.update(status=DONE, next_due=None)
+        return await self._update_leased([entry.id], owner, **values) == 1
+
+    async def fail(self, entry: CrawlFrontierEntry, owner: str, error: str) -> bool:
+        """Registra un fallo: reintento con espera exponencial o failed al agotar intentos."""
+        now = utc_now()
+        attempts = entry.attempts + 1
+        values: Dict[str, Any] = dict(
+            lease_owner=None, lease_expiry=None, attempts=attempts, runs=CrawlFrontierEntry.runs + 1,
+            last_outcome="error", last_error=error[:500], last_run_at=now,
+        )
+        if attempts >= self.max_attempts:
+            values["status"] = FAILED
+            logger.error(f"🗺️ Página '{entry.keyword}' p{entry.page} marcada como fallida: {error}")
+        else:
+            values["next_due"] = now + timedelta(seconds=self.retry_backoff_seconds * 2 ** (attempts - 1))
+        return await self._update_leased([entry.id], owner, **values) == 1
+
+    async def _update_leased(self, entry_ids: List[int], owner: str, **values) -> int:
+        """UPDATE solo de las filas cuyo lease sigue siendo de `owner`."""
+        async with self.session() as session:
+            result = await session.execute(
+                update(CrawlFrontierEntry)
+                .where(CrawlFrontierEntry.id.in_(entry_ids), CrawlFrontierEntry.lease_owner == owner)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        if result.rowcount < len(entry_ids):
+            logger.warning(f"🗺️ {len(entry_ids) - result.rowcount} páginas ya no tenían el lease de {owner}")
+        return result.rowcount
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    async def stats(self) -> Dict[str, Any]:
+        """Páginas por estado, vencidas y con lease activo."""
+        now = utc_now()
+        async with self.session() as session:
+            by_status = dict((await session.execute(
+                select(CrawlFrontierEntry.status, func.count()).group_by(CrawlFrontierEntry.status)
+            )).all())
+            due = (await session.execute(
+                select(func.count()).select_from(CrawlFrontierEntry).where(self._available(now))
+            )).scalar()
+            leased = (await session.execute(
+                select(func.count()).select_from(CrawlFrontierEntry)
+                .where(CrawlFrontierEntry.lease_owner.is_not(None), CrawlFrontierEntry.lease_expiry >= now)
+            )).scalar()
+        return {"by_status": by_status, "due": due, "leased": leased}
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def occ_page_handler(scraper, session_factory: Callable, dedup_store: Optional[DedupStore] = None) -> PageHandler:
+    """
+    Busca la página en OCC y guarda las ofertas en job_positions.
+
+    Con `dedup_store` solo se guardan las ofertas no vistas dentro del TTL,
+    y se marcan como vistas después del commit.
+    """
+    from app.services.job_application_service import JobApplicationManager
+    from app.services.occ_scraper_service import SearchFilters
+
+    async def handle(entry: CrawlFrontierEntry) -> Dict[str, int]:
+        filters = SearchFilters(keyword=entry.keyword, location=entry.location, page=entry.page)
+        jobs, _ = await scraper.search_jobs(filters)
+        if dedup_store is not None:
+            unseen = set(await dedup_store.filter_unseen(job.job_id for job in jobs))
+            fresh = [job for job in jobs if job.job_id in unseen]
+        else:
+            fresh = jobs
+        new = 0
+        async with session_factory() as session:
+            manager = JobApplicationManager(session)
+            for job in fresh:
+                saved = await manager.save_job_offer(job)
+                if saved is not None and saved.id is None:  # Aún sin flush: no existía
+                    new += 1
+            await session.commit()
+        if dedup_store is not None:
+            await dedup_store.mark_seen(job.job_id for job in fresh)
+        return {"found": len(jobs), "new": new}
+
+    return handle
+
+
+class CrawlFrontierWorker:
+    """Toma lotes de la frontera, los procesa y registra los resultados."""
+
+    def __init__(
+        self,
+        frontier: Optional[CrawlFrontier] = None,
+        handler: Optional[PageHandler] = None,
+        owner: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        dedup_store: Optional[DedupStore] = None,
+    ):
+        self.frontier = frontier or crawl_frontier
+        self.handler = handler
+        self.dedup_store = dedup_store or job_dedup_store  # Persistente: sobrevive reinicios
+        self.owner = owner or default_owner()
+        self.batch_size = batch_size or settings.CRAWL_FRONTIER_BATCH_SIZE
+        self.concurrency = max(1, concurrency or settings.CRAWL_FRONTIER_CONCURRENCY)
+        self.poll_seconds = poll_seconds or settings.CRAWL_FRONTIER_POLL_SECONDS
+        self.processed = {"ok": 0, "error": 0, "lost": 0}
+
+    async def run(self, stop_when_empty: bool = False, max_batches: Optional[int] = None) -> Dict[str, int]:
+        """
+        Procesa lotes hasta que se cancele (o la frontera no tenga páginas
+        vencidas, con stop_when_empty). Sin handler se usa OCC.
+        """
+        if self.handler is not None:
+            return await self._loop(self.handler, stop_when_empty, max_batches)
+
+        from app.services.occ_scraper_service import OCCScraper
+        async with OCCScraper() as scraper:
+            handler = occ_page_handler(scraper, self.frontier.session, self.dedup_store)
+            return await self._loop(handler, stop_when_empty, max_batches)
+
+    async def _loop(self, handler: PageHandler, stop_when_empty: bool, max_batches: Optional[int]) -> Dict[str, int]:
+        logger.info(f"🗺️ Worker {self.owner} iniciado")
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            leased = await self.run_batch(handler)
+            if leased:
+                batches += 1
+                continue
+            if stop_when_empty:
+                break
+            await asyncio.sleep(self.poll_seconds)
+        logger.info(f"🗺️ Worker {self.owner} detenido: {self.processed}")
+        return self.processed
+
+    async def run_batch(self, handler: Optional[PageHandler] = None) -> int:
+        """Toma y procesa un lote; devuelve cuántas páginas se tomaron."""
+        handler = handler or self.handler
+        entries = await self.frontier.lease(self.owner, self.batch_size)
+        if not entries:
+            return 0
+
+        held = {entry.id for entry in entries}
+        renewer = asyncio.create_task(self._renew_loop(held))
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def process(entry: CrawlFrontierEntry) -> None:
+            async with semaphore:
+                if entry.id not in held:  # Lease perdido antes de empezar
+                    self.processed["lost"] += 1
+                    return
+                try:
+                    outcome = await handler(entry)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"🗺️ '{entry.keyword}' p{entry.page} falló: {e}")
+                    recorded = await self.frontier.fail(entry, self.owner, str(e) or type(e).__name__)
+                    self.processed["error" if recorded else "lost"] += 1
+                else:
+                    recorded = await self.frontier.complete(entry, self.owner, **outcome)
+                    self.processed["ok" if recorded else "lost"] += 1
+                held.discard(entry.id)
+
+        try:
+            await asyncio.gather(*(process(entry) for entry in entries))
+        finally:
+            renewer.cancel()
+            await asyncio.gather(renewer, return_exceptions=True)
+            if held:
+                # Apagado o error inesperado: otro worker retoma estas páginas
+                await self.frontier.release(held, self.owner)
+        return len(entries)
+
+    async def _renew_loop(self, held: Set[int]) -> None:
+        interval = self.frontier.lease_seconds / 3
+        while held:
+            await asyncio.sleep(interval)
+            try:
+                still_held = await self.frontier.renew(held, self.owner)
+            except Exception as e:
+                logger.warning(f"🗺️ No se pudo renovar el lease de {self.owner}: {e}")
+                continue
+            lost = held - still_held
+            if lost:
+                logger.warning(f"🗺️ {self.owner} perdió el lease de {len(lost)} páginas")
+                held.difference_update(lost)
+
+
+# Instancia global
+crawl_frontier = CrawlFrontier()
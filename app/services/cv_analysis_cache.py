@@ -0,0 +1,235 @@
+"""
+🗃️ CV Analysis Cache - Reutilización de extracción/análisis por hash de contenido
+
+Subir dos veces el mismo archivo o re-analizar un `profile_text` sin cambios
+repetía la extracción de PDF/DOCX y todas las etapas NLP. Este servicio
+guarda los resultados en la tabla `cv_extraction_cache` (sobrevive reinicios)
+y se consulta ANTES de parsear:
+
+- Texto extraído: clave = SHA-256 de los bytes del archivo, versión =
+  TEXT_EXTRACTOR_VERSION de file_processing.
+- Análisis: clave = SHA-256 de (versiones de extractores + texto), versión =
+  huella de esas versiones.
+
+Invalidación automática: una fila cuya versión no coincide con la actual se
+trata como fallo de cache (y se reemplaza al guardar); `purge_stale()` borra
+al iniciar las filas de versiones anteriores y las que no se usan hace más de
+CV_CACHE_MAX_AGE_DAYS.
+
+Los errores del cache nunca rompen la petición: se registran y la operación
+continúa como fallo de cache. Cada operación usa su propia sesión, así un
+conflicto de escritura no deshace cambios pendientes del endpoint.
+
+Uso:
+----
+from app.services.cv_analysis_cache import cv_analysis_cache
+
+key = content_hash(content)
+text = await cv_analysis_cache.get_text(key)
+if text is None:
+    text = extract_text_from_bytes(filename, content)
+    await cv_analysis_cache.put_text(key, text)
+"""
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models.cv_cache import CVExtractionCache
+from app.utils.datetime_utils import utc_now
+from app.utils.file_processing import TEXT_EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+TEXT_KIND = "text"
+
+
+# ============================================================================
+# CLAVES
+# ============================================================================
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 hex de los bytes de un archivo."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def versions_fingerprint(versions: Mapping[str, str]) -> str:
+    """Huella estable de un conjunto de versiones: "a=1;b=2" (orden por nombre)."""
+    return ";".join(f"{name}={versions[name]}" for name in sorted(versions))
+
+
+def analysis_hash(text: str, versions: Mapping[str, str]) -> str:
+    """SHA-256 hex del texto junto con las versiones de los extractores."""
+    digest = hashlib.sha256(versions_fingerprint(versions).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(text.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+# ============================================================================
+# CACHE
+# ============================================================================
+
+class CVAnalysisCache:
+    """Cache persistente (tabla SQL) de texto extraído y análisis de CVs."""
+
+    def __init__(self, session_factory: Optional[Callable] = None, enabled: Optional[bool] = None):
+        """
+        Args:
+            session_factory: Fábrica de AsyncSession (default: app.core.database.async_session)
+            enabled: Activa el cache (default: settings.CV_CACHE_ENABLED)
+        """
+        self._session_factory = session_factory
+        self.enabled = settings.CV_CACHE_ENABLED if enabled is None else enabled
+        # kind -> versión vigente (se registra al usar cada tipo)
+        self._current_versions: Dict[str, str] = {TEXT_KIND: TEXT_EXTRACTOR_VERSION}
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+        return self._session_factory()
+
+    # ------------------------------------------------------------------
+    # Operaciones genéricas
+    # ------------------------------------------------------------------
+
+    async def get(self, kind: str, key: str, version: str) -> Optional[Any]:
+        """
+        Resultado cacheado para (kind, key) calculado con `version`.
+
+        Returns:
+            El valor deserializado, o None si no existe o es de otra versión
+        """
+        if not self.enabled:
+            return None
+        self._current_versions[kind] = version
+        try:
+            async with self._session() as session:
+                result = await session.execute(
+                    select(CVExtractionCache).where(
+                        CVExtractionCache.kind == kind,
+                        CVExtractionCache.content_hash == key,
+                    )
+                )
+                entry = result.scalars().first()
+                if entry is None or entry.extractor_version != version:
+                    return None
+                entry.hits += 1
+                entry.last_used_at = utc_now()
+                value = json.loads(entry.payload)
+                await session.commit()
+                return value
+        except Exception as e:
+            logger.warning(f"🗃️ Error leyendo cache de CVs ({kind}): {e}")
+            return None
+
+    async def put(self, kind: str, key: str, version: str, value: Any) -> None:
+        """Guarda (o reemplaza) el resultado de (kind, key) con su versión."""
+        if not self.enabled:
+            return
+        self._current_versions[kind] = version
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        try:
+            async with self._session() as session:
+                result = await session.execute(
+                    select(CVExtractionCache).where(
+                        CVExtractionCache.kind == kind,
+                        CVExtractionCache.content_hash == key,
+                    )
+                )
+                entry = result.scalars().first()
+                now = utc_now()
+                if entry is None:
+                    entry = CVExtractionCache(kind=kind, content_hash=key, extractor_version=version, payload=payload)
+                else:
+                    entry.extractor_version = version
+                    entry.payload = payload
+                    entry.hits = 0
+                    entry.created_at = now
+                entry.last_used_at = now
+                session.add(entry)
+                await session.commit()
+        except IntegrityError:
+            # Otra petición guardó la misma clave al mismo tiempo: mismo resultado
+            logger.debug(f"🗃️ Entrada de cache {kind}:{key[:12]} ya guardada por otra petición")
+        except Exception as e:
+            logger.warning(f"🗃️ Error guardando cache de CVs ({kind}): {e}")
+
+    # ------------------------------------------------------------------
+    # Texto extraído (clave: hash de bytes)
+    # ------------------------------------------------------------------
+
+    async def get_text(self, key: str) -> Optional[str]:
+        """Texto extraído cacheado para el archivo con hash `key`."""
+        return await self.get(TEXT_KIND, key, TEXT_EXTRACTOR_VERSION)
+
+    async def put_text(self, key: str, text: str) -> None:
+        await self.put(TEXT_KIND, key, TEXT_EXTRACTOR_VERSION, text)
+
+    # ------------------------------------------------------------------
+    # Análisis (clave: hash de texto + versiones)
+    # ------------------------------------------------------------------
+
+    async def get_analysis(self, kind: str, text: str, versions: Mapping[str, str]) -> Optional[Any]:
+        """Resultado de análisis `kind` para `text` con esas versiones de extractores."""
+        return await self.get(kind, analysis_hash(text, versions), versions_fingerprint(versions))
+
+    async def put_analysis(self, kind: str, text: str, versions: Mapping[str, str], value: Any) -> None:
+        await self.put(kind, analysis_hash(text, versions), versions_fingerprint(versions), value)
+
+    # ------------------------------------------------------------------
+    # Mantenimiento
+    # ------------------------------------------------------------------
+
+    def register(self, kind: str, versions: Mapping[str, str]) -> None:
+        """Declara la versión vigente de `kind` (para purge_stale antes del primer uso)."""
+        self._current_versions[kind] = versions_fingerprint(versions)
+
+    async def purge_stale(self, max_age_days: Optional[int] = None) -> int:
+        """
+        Borra entradas de versiones anteriores y las no usadas en `max_age_days`.
+
+        Solo se purgan versiones de los tipos registrados; los demás tipos
+        únicamente por antigüedad.
+
+        Returns:
+            Número de filas borradas
+        """
+        if not self.enabled:
+            return 0
+        max_age_days = max_age_days or settings.CV_CACHE_MAX_AGE_DAYS
+        cutoff = utc_now() - timedelta(days=max_age_days)
+        deleted = 0
+        try:
+            async with self._session() as session:
+                for kind, version in self._current_versions.items():
+                    result = await session.execute(
+                        delete(CVExtractionCache).where(
+                            CVExtractionCache.kind == kind,
+                            CVExtractionCache.extractor_version != version,
+                        )
+                    )
+                    deleted += result.rowcount or 0
+                result = await session.execute(
+                    delete(CVExtractionCache).where(CVExtractionCache.last_used_at < cutoff)
+                )
+                deleted += result.rowcount or 0
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"🗃️ Error purgando cache de CVs: {e}")
+            return 0
+        if deleted:
+            logger.info(f"🗃️ Cache de CVs: {deleted} entradas obsoletas eliminadas")
+        return deleted
+
+
+# Instancia global
+cv_analysis_cache = CVAnalysisCache()
@@ -0,0 +1,453 @@
+"""
+📥 CV Bulk Ingestion - Carga masiva de CVs de una generación
+
+Dar de alta un semestre completo subiendo CVs uno por uno por
+`/students/upload_resume` repite por archivo la ida y vuelta HTTP, un
+análisis spaCy, un Fernet nuevo para el email y un commit. Este servicio
+procesa un directorio de CVs (PDF/DOCX/TXT) más un CSV de metadatos:
+
+1. Extracción + análisis en un pool de procesos propio, por lotes: los CVs
+   que requieren el fallback spaCy de un lote pasan por un solo `nlp.pipe`
+   (students._analyze_resume_batch).
+2. Guardado por lote: una consulta por email_hash para detectar existentes,
+   emails encriptados con un solo cipher (EncryptionService.encrypt_many) y
+   un commit por lote.
+3. Progreso reanudable: los archivos guardados se anotan en un checkpoint
+   (JSON lines) y se omiten al volver a ejecutar.
+
+CSV de metadatos (encabezados): filename, name, email[, program]
+
+Uso:
+----
+items, problems = load_manifest("cvs/2025-1", "cvs/2025-1/alumnos.csv")
+ingestion = BulkCVIngestion(checkpoint_path="cvs/2025-1/.ingest_progress.jsonl")
+report = await ingestion.run(items)
+print(report.to_dict())
+
+CLI: scripts/utilities/bulk_ingest_cvs.py
+"""
+
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.cpu_executor import CPUExecutor, PROCESS
+from app.models import AuditLog, Student
+from app.schemas import ResumeUploadRequest
+from app.utils.encryption import EncryptionService
+from app.utils.file_processing import CVFileValidator, extract_text_from_bytes
+
+logger = logging.getLogger(__name__)
+
+# Etapas cronometradas (segundos acumulados en el reporte)
+STAGES = ("extract", "analyze", "encrypt", "save")
+
+# Actor de las entradas de auditoría (la ingesta corre sin usuario autenticado)
+AUDIT_ACTOR_ROLE = "system"
+AUDIT_ACTOR_ID = "cv_bulk_ingestion"
+
+
+# ============================================================================
+# MANIFIESTO
+# ============================================================================
+
+@dataclass
+class IngestionItem:
+    """Un CV a ingerir con los metadatos del estudiante."""
+    filename: str
+    path: str
+    name: str
+    email: str
+    program: Optional[str] = None
+
+
+def validate_item(item: IngestionItem) -> Optional[str]:
+    """
+    Validar los metadatos de un CV con el mismo esquema que /students/upload_resume.
+
+    Normaliza `item` en sitio (email y programa) y regresa el mensaje de error
+    o None si la fila es válida.
+    """
+    try:
+        meta = ResumeUploadRequest(name=item.name, email=item.email, program=item.program)
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        )
+    item.name, item.email, item.program = meta.name, str(meta.email), meta.program
+    return None
+
+
+def load_manifest(directory: str, metadata_csv: str) -> Tuple[List[IngestionItem], List[str]]:
+    """
+    Cruzar los archivos del directorio con las filas del CSV.
+
+    Returns:
+        (items en orden del CSV, problemas encontrados: filas sin archivo,
+        archivos sin fila, filas incompletas, inválidas o duplicadas)
+    """
+    root = Path(directory)
+    files = {
+        path.name: path
+        for path in sorted(root.iterdir())
+        if path.is_file() and path.suffix.lower() in CVFileValidator.ALLOWED_EXTENSIONS
+    }
+
+    items: List[IngestionItem] = []
+    problems: List[str] = []
+    seen: Set[str] = set()
+    with open(metadata_csv, newline="", encoding="utf-8-sig") as handle:
+        for line, row in enumerate(csv.DictReader(handle), start=2):
+            filename = (row.get("filename") or "").strip()
+            name = (row.get("name") or "").strip()
+            email = (row.get("email") or "").strip()
+            if not (filename and name and email):
+                problems.append(f"Línea {line}: filename, name y email son obligatorios")
+                continue
+            if filename in seen:
+                problems.append(f"Línea {line}: {filename} duplicado en el CSV")
+                continue
+            if filename not in files:
+                problems.append(f"Línea {line}: no existe {filename} en {directory}")
+                continue
+            seen.add(filename)
+            item = IngestionItem(
+                filename=filename,
+                path=str(files[filename]),
+                name=name,
+                email=email,
+                program=(row.get("program") or "").strip() or None,
+            )
+            error = validate_item(item)
+            if error:
+                problems.append(f"Línea {line}: {filename} inválido ({error})")
+                continue
+            items.append(item)
+
+    problems.extend(f"{filename}: sin fila en el CSV" for filename in files if filename not in seen)
+    return items, problems
+
+
+# ============================================================================
+# CHECKPOINT
+# ============================================================================
+
+class IngestionCheckpoint:
+    """Archivos ya guardados (JSON lines, una línea por lote) para reanudar."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Set[str] = set()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    try:
+                        self.done.update(json.loads(line)["files"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Línea truncada por una interrupción
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.done
+
+    def mark(self, filenames: List[str]) -> None:
+        self.done.update(filenames)
+        if not self.path or not filenames:
+            return
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"files": filenames}) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+
+# ============================================================================
+# WORKER (pool de procesos)
+# ============================================================================
+
+def _process_batch(files: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Extraer texto y analizar un lote de CVs (se ejecuta en un proceso hijo).
+
+    Args:
+        files: [(filename, path)]
+
+    Returns:
+        {"results": [{"filename", "text", "analysis", "harvard_fields"} o
+        {"filename", "error"}], "timings": {"extract": s, "analyze": s}}
+    """
+    # Import diferido: la lógica de análisis vive en el endpoint de estudiantes
+    from app.api.endpoints.students import _analyze_resume_batch
+
+    results: List[Dict[str, Any]] = []
+    texts: List[str] = []
+    rows: List[int] = []
+
+    started = time.perf_counter()
+    for filename, path in files:
+        try:
+            with open(path, "rb") as handle:
+                content = handle.read()
+            if len(content) > CVFileValidator.MAX_SIZE_BYTES:
+                raise HTTPException(status_code=413, detail=f"Archivo muy grande. Máximo: {CVFileValidator.MAX_SIZE_MB}MB")
+            text = extract_text_from_bytes(filename, content)
+            if len(text.strip()) < CVFileValidator.MIN_TEXT_LENGTH:
+                raise HTTPException(status_code=400, detail="El currículum debe contener al menos 50 caracteres de texto")
+        except HTTPException as e:
+            results.append({"filename": filename, "error": str(e.detail)})
+            continue
+        except OSError as e:
+            results.append({"filename": filename, "error": f"Error leyendo archivo: {e}"})
+            continue
+        rows.append(len(results))
+        texts.append(text)
+        results.append({"filename": filename, "text": text})
+    extract_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for row, (analysis, harvard_fields) in zip(rows, _analyze_resume_batch(texts)):
+        results[row]["analysis"] = analysis
+        results[row]["harvard_fields"] = harvard_fields
+    analyze_seconds = time.perf_counter() - started
+
+    return {"results": results, "timings": {"extract": extract_seconds, "analyze": analyze_seconds}}
+
+
+# ============================================================================
+# REPORTE
+# ============================================================================
+
+@dataclass
+class IngestionReport:
+    """Contadores, tiempos por etapa y errores de una ingesta."""
+    total: int = 0
+    skipped: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    timings: Dict[str, float] = field(default_factory=lambda: {stage: 0.0 for stage in STAGES})
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.created + self.updated + self.failed
+
+    @property
+    def throughput(self) -> float:
+        """CVs procesados por segundo (reloj de pared)."""
+        elapsed = self.elapsed or (time.perf_counter() - self.started_at)
+        return self.processed / elapsed if elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "processed": self.processed,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 2),
+            "cvs_per_second": round(self.throughput, 2),
+            "stage_seconds": {stage: round(seconds, 2) for stage, seconds in self.timings.items()},
+            "errors": [{"filename": filename, "error": error} for filename, error in self.errors],
+        }
+
+
+# ============================================================================
+# SERVICIO
+# ============================================================================
+
+class BulkCVIngestion:
+    """
+    Ingesta de CVs por lotes: análisis en procesos, guardado por lote.
+
+    Hasta `workers` lotes se analizan a la vez; los guardados se serializan
+    (un commit por lote) para no competir por la BD.
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        encryption: Optional[EncryptionService] = None,
+    ):
+        if session_factory is None:
+            from app.core.database import async_session
+            session_factory = async_session
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size or settings.CV_BULK_INGEST_BATCH_SIZE)
+        self.workers = settings.CV_BULK_INGEST_WORKERS if workers is None else workers
+        self.checkpoint = IngestionCheckpoint(checkpoint_path)
+        self.encryption = encryption or EncryptionService()
+        self._save_lock = asyncio.Lock()
+
+    async def run(
+        self,
+        items: Iterable[IngestionItem],
+        on_progress: Optional[Callable[[IngestionReport], None]] = None,
+    ) -> IngestionReport:
+        """
+        Ingerir los CVs que no estén en el checkpoint.
+
+        Args:
+            items: CVs a ingerir (ver load_manifest)
+            on_progress: Se invoca tras guardar cada lote
+        """
+        items = list(items)
+        report = IngestionReport(total=len(items))
+        pending = [item for item in items if item.filename not in self.checkpoint]
+        report.skipped = len(items) - len(pending)
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+
+        # Pool propio (no el del servidor): lotes largos, sin timeout por tarea
+        executor = CPUExecutor(
+            process_workers=self.workers,
+            max_queue=max(1, self.workers) * 2,
+            default_timeout=0,
+        )
+        slots = asyncio.Semaphore(max(1, self.workers))
+
+        async def handle(batch: List[IngestionItem]) -> None:
+            async with slots:
+                try:
+                    output = await executor.run(
+                        _process_batch, [(item.filename, item.path) for item in batch], kind=PROCESS
+                    )
+                except Exception as e:
+                    logger.error(f"❌ Lote de {len(batch)} CVs falló en el análisis: {e}")
+                    report.failed += len(batch)
+                    report.errors.extend((item.filename, str(e)) for item in batch)
+                    return
+            for stage, seconds in output["timings"].items():
+                report.timings[stage] += seconds
+            await self._save_batch(batch, output["results"], report)
+            if on_progress:
+                on_progress(report)
+
+        try:
+            await asyncio.gather(*(handle(batch) for batch in batches))
+        finally:
+            executor.shutdown()
+
+        report.elapsed = time.perf_counter() - report.started_at
+        logger.info(f"📥 Ingesta terminada: {report.to_dict()}")
+        return report
+
+    async def _save_batch(
+        self, batch: List[IngestionItem], results: List[Dict[str, Any]], report: IngestionReport
+    ) -> None:
+        """
+        Crear/actualizar los estudiantes de un lote con un solo commit.
+
+        Cada fila se valida con ResumeUploadRequest (los items pueden no venir
+        de load_manifest) y deja su entrada de auditoría UPLOAD_RESUME en la
+        misma transacción, exitosa o fallida.
+        """
+        from app.api.endpoints.students import _apply_resume_analysis, _split_name
+
+        rows = []
+        failures: List[Tuple[IngestionItem, str]] = []
+        for item, result in zip(batch, results):
+            error = result.get("error") or validate_item(item)
+            if error:
+                failures.append((item, error))
+            else:
+                email = item.email.lower().strip()
+                rows.append((item, result, email, hashlib.sha256(email.encode()).hexdigest()))
+        report.failed += len(failures)
+        report.errors.extend((item.filename, error) for item, error in failures)
+        if not rows and not failures:
+            return
+
+        async with self._save_lock:
+            async with self.session_factory() as session:
+                students: Dict[str, Student] = {}
+                if rows:
+                    existing = await session.execute(
+                        select(Student).where(Student.email_hash.in_({row[3] for row in rows}))
+                    )
+                    students = {student.email_hash: student for student in existing.scalars()}
+
+                # Emails nuevos del lote: un solo cipher para todos
+                started = time.perf_counter()
+                new_emails = list(dict.fromkeys(email for _, _, email, email_hash in rows if email_hash not in students))
+                encrypted = dict(zip(new_emails, self.encryption.encrypt_many(new_emails)))
+                report.timings["encrypt"] += time.perf_counter() - started
+
+                started = time.perf_counter()
+                created = updated = 0
+                saved: List[Tuple[IngestionItem, Student, bool]] = []
+                for item, result, email, email_hash in rows:
+                    student = students.get(email_hash)
+                    is_new = student is None
+                    if is_new:
+                        # Sin contraseña utilizable: ningún hash coincide con "" en el login
+                        student = Student(program=item.program, consent_data_processing=True, hashed_password="")
+                        student.email = encrypted[email]
+                        student.email_hash = email_hash
+                        session.add(student)
+                        students[email_hash] = student
+                        created += 1
+                    else:
+                        updated += 1
+                    student.name = item.name
+                    student.first_name, student.last_name = _split_name(item.name)
+                    if item.program:
+                        student.program = item.program
+                    _apply_resume_analysis(
+                        student, item.filename, result["text"], result["analysis"], result["harvard_fields"]
+                    )
+                    saved.append((item, student, is_new))
+
+                try:
+                    await session.flush()  # ids de los estudiantes nuevos para la auditoría
+                    session.add_all(
+                        _audit_entry(
+                            f"student_id:{student.id}",
+                            details=f"Currículum {item.filename} {'creado' if is_new else 'actualizado'} por ingesta masiva",
+                        )
+                        for item, student, is_new in saved
+                    )
+                    session.add_all(
+                        _audit_entry(f"file:{item.filename}", success=False, error_message=error)
+                        for item, error in failures
+                    )
+                    await session.commit()
+                except Exception as e:
+                    await session.rollback()
+                    logger.error(f"❌ Error guardando lote de {len(rows)} CVs: {e}")
+                    message = f"Error guardando: {(str(e) or repr(e)).splitlines()[0]}"
+                    report.failed += len(rows)
+                    report.errors.extend((item.filename, message) for item, *_ in rows)
+                    return
+                finally:
+                    report.timings["save"] += time.perf_counter() - started
+
+        report.created += created
+        report.updated += updated
+        self.checkpoint.mark([item.filename for item, *_ in rows])
+
+
+def _audit_entry(resource: str, **fields: Any) -> AuditLog:
+    """Entrada de auditoría UPLOAD_RESUME a nombre de la ingesta masiva."""
+    return AuditLog(
+        actor_role=AUDIT_ACTOR_ROLE,
+        actor_id=AUDIT_ACTOR_ID,
+        action="UPLOAD_RESUME",
+        resource=resource,
+        **fields,
+    )
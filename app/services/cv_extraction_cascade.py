@@ -0,0 +1,195 @@
+"""
+🪜 CV Extraction Cascade - Extracción por niveles con umbral de confianza
+
+`upload_resume` corría siempre regex + análisis y, según una regla fija, el
+extractor spaCy completo sin límite de tiempo. La cascada ordena los
+extractores de más barato a más caro y solo escala mientras la confianza
+del resultado acumulado no alcance el umbral:
+
+    regex (~ms) → unsupervised (~ms) → spaCy (~100s de ms a segundos)
+
+- Confianza: `extraction_confidence` (la misma fórmula que
+  ExtractedCV.overall_confidence) sobre los campos acumulados.
+- Fusión: cada nivel rellena los campos vacíos; en listas gana la más larga.
+- Deadline por nivel: cooperativo. El extractor recibe un `Deadline` y deja
+  de avanzar al vencer; se usa su resultado parcial (`timed_out=True`).
+- Cada corrida registra qué niveles corrieron, cuánto tardaron y con qué
+  confianza quedó el resultado (`CascadeResult.tiers`).
+
+Uso:
+----
+cascade = ExtractionCascade([
+    CascadeTier("regex", regex_fn, deadline_seconds=0.5),
+    CascadeTier("spacy", spacy_fn, deadline_seconds=10, min_words=50),
+], confidence_threshold=0.3)
+result = cascade.run(text, seed={"skills": skills})
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from app.services.document_context import DocumentContext
+from app.services.unsupervised_cv_extractor import extraction_confidence
+
+logger = logging.getLogger(__name__)
+
+
+class Deadline:
+    """Instante límite (time.monotonic) de un nivel; None = sin límite."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.at: Optional[float] = time.monotonic() + seconds if seconds else None
+
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() >= self.at
+
+
+@dataclass
+class CascadeTier:
+    """Un nivel de la cascada: `extract(context, deadline) -> campos`."""
+    name: str
+    extract: Callable[[DocumentContext, Deadline], Dict[str, Any]]
+    deadline_seconds: Optional[float] = None
+    min_words: int = 0  # Textos más cortos no justifican este nivel
+
+
+@dataclass
+class TierRun:
+    """Registro de la ejecución de un nivel."""
+    name: str
+    duration_ms: float
+    confidence: float  # Confianza acumulada tras este nivel
+    timed_out: bool = False
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration_ms": self.duration_ms,
+            "confidence": self.confidence,
+            "timed_out": self.timed_out,
+            "error": self.error,
+        }
+
+
+@dataclass
+class CascadeResult:
+    """Campos fusionados y traza de niveles."""
+    fields: Dict[str, Any] = field(default_factory=dict)
+    tiers: List[TierRun] = field(default_factory=list)
+    confidence: float = 0.0
+    method: Optional[str] = None  # Último nivel que aportó campos
+
+    @property
+    def timed_out(self) -> bool:
+        return any(run.timed_out for run in self.tiers)
+
+
+def fields_confidence(fields: Dict[str, Any]) -> float:
+    """Confianza estilo ExtractedCV.overall_confidence de un dict de campos."""
+    return extraction_confidence(
+        fields.get("objective"),
+        fields.get("education") or [],
+        fields.get("experience") or [],
+        fields.get("skills") or [],
+    )
+
+
+def merge_fields(merged: Dict[str, Any], fields: Dict[str, Any]) -> bool:
+    """
+    Fusionar `fields` en `merged` (in-place): rellena vacíos y, en listas,
+    conserva la más larga.
+
+    Returns:
+        True si `fields` aportó algún valor
+    """
+    contributed = False
+    for key, value in fields.items():
+        if not value:
+            continue
+        current = merged.get(key)
+        if not current or (isinstance(value, list) and isinstance(current, list) and len(value) > len(current)):
+            merged[key] = value
+            contributed = True
+    return contributed
+
+
+class ExtractionCascade:
+    """Ejecuta niveles en orden hasta alcanzar `confidence_threshold`."""
+
+    def __init__(self, tiers: List[CascadeTier], confidence_threshold: float):
+        self.tiers = tiers
+        self.confidence_threshold = confidence_threshold
+
+    def needs_escalation(self, result: CascadeResult) -> bool:
+        return result.confidence < self.confidence_threshold
+
+    def run(
+        self,
+        text: Union[str, DocumentContext],
+        seed: Optional[Dict[str, Any]] = None,
+        skip: Iterable[str] = (),
+    ) -> CascadeResult:
+        """
+        Correr la cascada sobre `text`.
+
+        Todos los niveles reciben el mismo DocumentContext (normalización,
+        líneas, secciones e idioma se calculan una sola vez).
+
+        Args:
+            seed: Campos ya conocidos (p. ej. skills del análisis de términos);
+                cuentan para la confianza pero no se atribuyen a ningún nivel
+            skip: Niveles a omitir (p. ej. spaCy cuando se procesa en lote aparte)
+        """
+        result = CascadeResult(fields=dict(seed or {}))
+        result.confidence = round(fields_confidence(result.fields), 3)
+        skip = set(skip)
+        context = DocumentContext.of(text)
+
+        for tier in self.tiers:
+            if not self.needs_escalation(result):
+                break
+            if tier.name in skip or context.word_count < tier.min_words:
+                continue
+
+            deadline = Deadline(tier.deadline_seconds)
+            started = time.perf_counter()
+            error = None
+            try:
+                fields = tier.extract(context, deadline) or {}
+            except Exception as e:
+                logger.error(f"❌ Nivel {tier.name} de la cascada falló: {e}")
+                fields, error = {}, str(e)
+            self.add_tier_result(
+                result, tier.name, fields,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                timed_out=deadline.expired(),
+                error=error,
+            )
+
+        return result
+
+    def add_tier_result(
+        self,
+        result: CascadeResult,
+        name: str,
+        fields: Dict[str, Any],
+        duration_ms: float,
+        timed_out: bool = False,
+        error: Optional[str] = None,
+    ) -> None:
+        """Fusionar el resultado de un nivel ejecutado fuera de `run` (lotes)."""
+        if merge_fields(result.fields, fields):
+            result.method = name
+        result.confidence = round(fields_confidence(result.fields), 3)
+        result.tiers.append(TierRun(
+            name=name,
+            duration_ms=round(duration_ms, 2),
+            confidence=result.confidence,
+            timed_out=timed_out,
+            error=error,
+        ))
+        if timed_out:
+            logger.info(f"⏱️  Nivel {name} de la cascada agotó su tiempo; se usa resultado parcial")
@@ -16,16 +16,24 @@ RENDIMIENTO:
 - Memoria: ~100MB (modelo spaCy)
 """
 
-import re
 import logging
-from typing import List, Dict, Optional, Any
+import threading
+from typing import List, Dict, Optional, Any, Union
 from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from app.services import cv_patterns
+from app.services.cv_patterns import keyword_matcher
 from app.services.spacy_nlp_service import get_nlp_service
+from app.services.document_context import DocumentContext
+from app.services.language_id_service import detect_language
 
 logger = logging.getLogger(__name__)
 
+# Versión del extractor: subirla al cambiar la extracción (invalida los
+# resultados cacheados en cv_analysis_cache)
+EXTRACTOR_VERSION = "2"
+
 
 # ============================================================================
 # DATA CLASSES
@@ -79,6 +87,7 @@ class CVProfile:
     certifications: List[str] = field(default_factory=list)
     organizations: List[str] = field(default_factory=list)  # empresas encontradas
     projects: List[str] = field(default_factory=list)
+    detected_language: str = ""  # Idioma del CV ('es' | 'en')
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -90,9 +99,93 @@ class CVProfile:
             "certifications": self.certifications,
             "organizations": self.organizations,
             "projects": self.projects,
+            "detected_language": self.detected_language,
         }
 
 
+# ============================================================================
+# KEYWORDS (compiladas una vez al importar)
+# ============================================================================
+
+# ====== ENGLISH KEYWORDS ======
+EDUCATION_KEYWORDS_EN = {
+    "degree", "bachelor", "master", "phd", "doctorate", "university",
+    "college", "school", "institute", "graduated", "graduation",
+    "diploma", "certificate", "certification", "coursework", "major",
+    "minor", "gpa", "cumulative", "undergraduate", "postgraduate",
+    "associate", "bootcamp", "course", "training", "program",
+}
+EXPERIENCE_KEYWORDS_EN = {
+    "experience", "worked", "developed", "led", "managed", "position",
+    "engineer", "developer", "manager", "director", "employment",
+    "role", "responsibility", "contributed", "designed", "implemented",
+    "analyzed", "coordinated", "supervised", "mentored", "achieved",
+    "improved", "created", "built", "founded", "launched",
+}
+SKILLS_KEYWORDS_EN = {
+    "skills", "technologies", "expertise", "proficiency", "technical",
+    "programming", "languages", "tools", "frameworks", "platforms",
+    "software", "hardware", "competency", "capability", "knowledge",
+}
+
+# ====== SPANISH KEYWORDS ======
+EDUCATION_KEYWORDS_ES = {
+    "grado", "licenciatura", "maestría", "máster", "doctorado",
+    "universidad", "carrera", "educación", "diplomado", "curso",
+    "certificado", "formación", "estudios", "escuela", "instituto",
+    "colegio", "facultad", "programa", "especialidad", "posgrado",
+    "pregrado", "técnico", "capacitación", "seminario", "taller",
+}
+EXPERIENCE_KEYWORDS_ES = {
+    "experiencia", "trabajé", "desarrollé", "lideré", "gestioné",
+    "puesto", "empleo", "posición", "cargo", "empresa", "compañía",
+    "corporación", "responsabilidad", "función", "rol", "proyecto",
+    "analicé", "diseñé", "implementé", "coordiné", "supervisé",
+    "mentorizé", "logré", "mejoré", "creé", "construí", "fundé",
+}
+SKILLS_KEYWORDS_ES = {
+    "habilidades", "tecnologías", "conocimientos", "competencias",
+    "especialización", "destreza", "capacidad", "dominio", "técnicas",
+    "herramientas", "plataformas", "lenguajes", "frameworks",
+    "software", "programación", "sistemas", "metodología",
+}
+
+# ====== LANGUAGES MAPPING (Bilingual) ======
+LANGUAGES = {
+    # English variants
+    "english": "English", "spanish": "Spanish", "french": "French",
+    "german": "German", "portuguese": "Portuguese", "italian": "Italian",
+    "chinese": "Chinese", "japanese": "Japanese", "russian": "Russian",
+    "arabic": "Arabic", "dutch": "Dutch", "korean": "Korean",
+    "mandarin": "Chinese", "cantonese": "Chinese", "vietnamese": "Vietnamese",
+    "thai": "Thai", "hindi": "Hindi", "polish": "Polish",
+    # Spanish variants
+    "inglés": "English", "español": "Spanish", "francés": "French",
+    "alemán": "German", "portugués": "Portuguese", "italiano": "Italian",
+    "chino": "Chinese", "japonés": "Japanese", "ruso": "Russian",
+    "árabe": "Arabic", "holandés": "Dutch", "coreano": "Korean",
+    "mandarín": "Chinese", "cantonés": "Chinese", "vietnamita": "Vietnamese",
+    "tailandés": "Thai", "hindi": "Hindi", "polaco": "Polish",
+}
+
+_KEYWORDS_BY_TYPE = {
+    "education": (EDUCATION_KEYWORDS_ES, EDUCATION_KEYWORDS_EN),
+    "experience": (EXPERIENCE_KEYWORDS_ES, EXPERIENCE_KEYWORDS_EN),
+    "skills": (SKILLS_KEYWORDS_ES, SKILLS_KEYWORDS_EN),
+}
+
+# Keywords en ambos idiomas -> una regex por tipo
+_ALL_KEYWORDS_MATCHERS = {
+    keyword_type: keyword_matcher(es | en)
+    for keyword_type, (es, en) in _KEYWORDS_BY_TYPE.items()
+}
+
+ROLE_KEYWORD_MATCHER = keyword_matcher([
+    "engineer", "developer", "manager", "director",
+    "ingeniero", "desarrollador", "gerente",
+])
+
+
 # ============================================================================
 # CV EXTRACTOR V2
 # ============================================================================
@@ -103,7 +196,7 @@ class CVExtractorV2:
     
     Uso:
     ----
-    extractor = CVExtractorV2()
+    extractor = get_cv_extractor()  # instancia compartida
     profile = extractor.extract("Mi CV en texto...")
     print(profile.to_dict())
     """
@@ -113,178 +206,100 @@ class CVExtractorV2:
         # Servicio NLP con detección automática de idioma
         self.nlp = get_nlp_service(primary_lang="auto")
         
-        # ====== ENGLISH KEYWORDS ======
-        self.education_keywords_en = {
-            "degree", "bachelor", "master", "phd", "doctorate", "university",
-            "college", "school", "institute", "graduated", "graduation",
-            "diploma", "certificate", "certification", "coursework", "major",
-            "minor", "gpa", "cumulative", "undergraduate", "postgraduate",
-            "associate", "bootcamp", "course", "training", "program",
-        }
-        self.experience_keywords_en = {
-            "experience", "worked", "developed", "led", "managed", "position",
-            "engineer", "developer", "manager", "director", "employment",
-            "role", "responsibility", "contributed", "designed", "implemented",
-            "analyzed", "coordinated", "supervised", "mentored", "achieved",
-            "improved", "created", "built", "founded", "launched",
-        }
-        self.skills_keywords_en = {
-            "skills", "technologies", "expertise", "proficiency", "technical",
-            "programming", "languages", "tools", "frameworks", "platforms",
-            "software", "hardware", "competency", "capability", "knowledge",
-        }
-        
-        # ====== SPANISH KEYWORDS ======
-        self.education_keywords_es = {
-            "grado", "licenciatura", "maestría", "máster", "doctorado",
-            "universidad", "carrera", "educación", "diplomado", "curso",
-            "certificado", "formación", "estudios", "escuela", "instituto",
-            "colegio", "facultad", "programa", "especialidad", "posgrado",
-            "pregrado", "técnico", "capacitación", "seminario", "taller",
-        }
-        self.experience_keywords_es = {
-            "experiencia", "trabajé", "desarrollé", "lideré", "gestioné",
-            "puesto", "empleo", "posición", "cargo", "empresa", "compañía",
-            "corporación", "responsabilidad", "función", "rol", "proyecto",
-            "analicé", "diseñé", "implementé", "coordiné", "supervisé",
-            "mentorizé", "logré", "mejoré", "creé", "construí", "fundé",
-        }
-        self.skills_keywords_es = {
-            "habilidades", "tecnologías", "conocimientos", "competencias",
-            "especialización", "destreza", "capacidad", "dominio", "técnicas",
-            "herramientas", "plataformas", "lenguajes", "frameworks",
-            "software", "programación", "sistemas", "metodología",
-        }
-        
-        # ====== LANGUAGES MAPPING (Bilingual) ======
-        self.languages = {
-            # English variants
-            "english": "English", "spanish": "Spanish", "french": "French",
-            "german": "German", "portuguese": "Portuguese", "italian": "Italian",
-            "chinese": "Chinese", "japanese": "Japanese", "russian": "Russian",
-            "arabic": "Arabic", "dutch": "Dutch", "korean": "Korean",
-            "mandarin": "Chinese", "cantonese": "Chinese", "vietnamese": "Vietnamese",
-            "thai": "Thai", "hindi": "Hindi", "polish": "Polish",
-            # Spanish variants
-            "inglés": "English", "español": "Spanish", "francés": "French",
-            "alemán": "German", "portugués": "Portuguese", "italiano": "Italian",
-            "chino": "Chinese", "japonés": "Japanese", "ruso": "Russian",
-            "árabe": "Arabic", "holandés": "Dutch", "coreano": "Korean",
-            "mandarín": "Chinese", "cantonés": "Chinese", "vietnamita": "Vietnamese",
-            "tailandés": "Thai", "hindi": "Hindi", "polaco": "Polish",
-        }
+        # Keywords y mapa de idiomas: constantes de módulo (se construyen una
+        # sola vez al importar, no por instancia)
+        self.education_keywords_en = EDUCATION_KEYWORDS_EN
+        self.experience_keywords_en = EXPERIENCE_KEYWORDS_EN
+        self.skills_keywords_en = SKILLS_KEYWORDS_EN
+        self.education_keywords_es = EDUCATION_KEYWORDS_ES
+        self.experience_keywords_es = EXPERIENCE_KEYWORDS_ES
+        self.skills_keywords_es = SKILLS_KEYWORDS_ES
+        self.languages = LANGUAGES
     
-    def extract(self, cv_text: str) -> CVProfile:
+    def extract(self, cv_text: Union[str, DocumentContext], analysis: Optional[Dict[str, Any]] = None, deadline=None) -> CVProfile:
         """
         Extrae todos los campos del CV.
         
         Args:
-            cv_text: Texto completo del CV
+            cv_text: Texto completo del CV (o su DocumentContext: idioma y
+                secciones se reutilizan)
+            analysis: Resultado previo de `nlp.analyze(cv_text)` (ver extract_many)
+            deadline: Objeto con `.expired()` (ver cv_extraction_cascade.Deadline);
+                al vencer se omiten las secciones restantes y el perfil queda parcial
         
         Returns:
             CVProfile con toda la información extraída
         """
         logger.info("Iniciando extracción de CV...")
         
+        context = DocumentContext.of(cv_text)
+        cv_text = context.text
         profile = CVProfile()
+        profile.detected_language = context.language
         
         # 1. Análisis con spaCy
-        analysis = self.nlp.analyze(cv_text)
+        if analysis is None:
+            analysis = self.nlp.analyze(cv_text, deadline=deadline)
         
         # 2. Extrae sections del CV
-        sections = self._split_sections(cv_text)
-        
-        # 3. Procesa cada sección
-        profile.objective = self._extract_objective(cv_text, sections)
-        profile.education = self._extract_education(cv_text, analysis, sections)
-        profile.experience = self._extract_experience(cv_text, analysis, sections)
-        profile.skills = self._extract_skills(cv_text, analysis, sections)
-        profile.languages = self._extract_languages(cv_text, analysis)
-        profile.certifications = self._extract_certifications(cv_text, sections)
-        profile.organizations = analysis.get("organizations", [])
-        profile.projects = self._extract_projects(cv_text, sections)
+        sections = self._split_sections(context)
+        
+        # 3. Procesa cada sección (en orden de valor para la confianza)
+        steps = [
+            ("experience", lambda: self._extract_experience(cv_text, analysis, sections)),
+            ("education", lambda: self._extract_education(cv_text, analysis, sections)),
+            ("skills", lambda: self._extract_skills(cv_text, analysis, sections)),
+            ("objective", lambda: self._extract_objective(cv_text, sections)),
+            ("languages", lambda: self._extract_languages(cv_text, analysis)),
+            ("certifications", lambda: self._extract_certifications(cv_text, sections)),
+            ("organizations", lambda: analysis.get("organizations", [])),
+            ("projects", lambda: self._extract_projects(cv_text, sections)),
+        ]
+        for attr, step in steps:
+            if deadline is not None and deadline.expired():
+                logger.info(f"⏱️  Deadline vencido: extracción parcial (sin {attr} en adelante)")
+                break
+            setattr(profile, attr, step())
         
         logger.info(f"✅ Extracción completada: {len(profile.education)} educación, "
                    f"{len(profile.experience)} experiencia, {len(profile.skills)} skills")
         
         return profile
     
+    def extract_many(self, cv_texts: List[str]) -> List[CVProfile]:
+        """
+        Extrae varios CVs analizándolos juntos con `nlp.analyze_many`
+        (un `nlp.pipe` por idioma para todo el lote).
+        """
+        analyses = self.nlp.analyze_many(cv_texts)
+        return [self.extract(text, analysis) for text, analysis in zip(cv_texts, analyses)]
+    
     # ====================================================================
     # MÉTODOS PRIVADOS - EXTRACCIÓN POR SECCIÓN
     # ====================================================================
     
-    def _split_sections(self, text: str) -> Dict[str, str]:
+    def _split_sections(self, text: Union[str, DocumentContext]) -> Dict[str, str]:
         """
         Divide el CV en secciones (EDUCACIÓN, EXPERIENCIA, SKILLS, etc).
         
+        Los encabezados se detectan una vez por documento (DocumentContext.sections).
+        
         Returns:
             Dict con sección -> contenido
         """
-        sections = {}
-        
-        # Patrones comunes de headers
-        header_patterns = [
-            (r'(OBJECTIVE|CAREER SUMMARY|PROFESSIONAL SUMMARY)', "objective"),
-            (r'(EDUCATION|EDUCACIÓN|FORMACIÓN)', "education"),
-            (r'(EXPERIENCE|EXPERIENCIA|PROFESSIONAL EXPERIENCE)', "experience"),
-            (r'(SKILLS|HABILIDADES|COMPETENCIAS|TECHNICAL SKILLS)', "skills"),
-            (r'(LANGUAGE|IDIOMAS|LANGUAGES)', "languages"),
-            (r'(CERTIFICATIONS?|CERTIFICACIONES?|CREDENTIALS?)', "certifications"),
-            (r'(PROJECTS?|PROYECTOS?|PORTFOLIO)', "projects"),
-        ]
-        
-        lines = text.split('\n')
-        current_section = None
-        current_content = []
-        
-        for line in lines:
-            line_upper = line.upper().strip()
-            
-            # Verifica si es un header
-            found_header = False
-            for pattern, section_name in header_patterns:
-                if re.search(pattern, line_upper):
-                    # Guarda sección anterior
-                    if current_section:
-                        sections[current_section] = '\n'.join(current_content)
-                    current_section = section_name
-                    current_content = []
-                    found_header = True
-                    break
-            
-            if not found_header and current_section:
-                current_content.append(line)
-        
-        # Guarda última sección
-        if current_section:
-            sections[current_section] = '\n'.join(current_content)
-        
-        return sections
+        context = DocumentContext.of(text)
+        return {name: context.section_text(name) for name in context.sections}
     
     def _detect_text_language(self, text: str) -> str:
         """
         Detecta si el texto está en Spanish o English.
         
+        Delega en el identificador de idioma compartido (trigramas + cache),
+        el mismo que usa el router de modelos spaCy.
+        
         Retorna: 'es' para Spanish, 'en' para English
         """
-        text_lower = text.lower()
-        
-        # Contadores de indicadores por idioma
-        spanish_indicators = {
-            "educación", "experiencia", "habilidades", "competencias",
-            "trabajé", "lideré", "gestioné", "desarrollé", "logré",
-            "universidad", "empresa", "proyecto", "certificado", "idioma",
-        }
-        english_indicators = {
-            "education", "experience", "skills", "expertise", "worked",
-            "led", "managed", "developed", "achieved", "university",
-            "company", "project", "certificate", "language",
-        }
-        
-        spanish_score = sum(1 for indicator in spanish_indicators if indicator in text_lower)
-        english_score = sum(1 for indicator in english_indicators if indicator in text_lower)
-        
-        return 'es' if spanish_score >= english_score else 'en'
+        return detect_language(text).language
     
     def _get_keywords_for_language(self, language: str, keyword_type: str) -> set:
         """
@@ -297,23 +312,17 @@ class CVExtractorV2:
         Returns:
             Set de keywords del idioma especificado
         """
-        if keyword_type == "education":
-            return self.education_keywords_es if language == 'es' else self.education_keywords_en
-        elif keyword_type == "experience":
-            return self.experience_keywords_es if language == 'es' else self.experience_keywords_en
-        elif keyword_type == "skills":
-            return self.skills_keywords_es if language == 'es' else self.skills_keywords_en
-        return set()
+        if keyword_type not in _KEYWORDS_BY_TYPE:
+            return set()
+        keywords_es, keywords_en = _KEYWORDS_BY_TYPE[keyword_type]
+        return keywords_es if language == 'es' else keywords_en
     
     def _get_all_keywords(self, keyword_type: str) -> set:
         """Retorna keywords en ambos idiomas para buscar en cualquier idioma"""
-        if keyword_type == "education":
-            return self.education_keywords_es | self.education_keywords_en
-        elif keyword_type == "experience":
-            return self.experience_keywords_es | self.experience_keywords_en
-        elif keyword_type == "skills":
-            return self.skills_keywords_es | self.skills_keywords_en
-        return set()
+        if keyword_type not in _KEYWORDS_BY_TYPE:
+            return set()
+        keywords_es, keywords_en = _KEYWORDS_BY_TYPE[keyword_type]
+        return keywords_es | keywords_en
     
     def _extract_objective(self, text: str, sections: Dict[str, str]) -> str:
         """Extrae objetivo/resumen profesional"""
@@ -345,8 +354,8 @@ class CVExtractorV2:
         if not education_text:
             education_text = text  # Busca en todo el CV
         
-        # Obtiene todos los keywords de educación (ambos idiomas)
-        all_education_keywords = self._get_all_keywords("education")
+        # Keywords de educación (ambos idiomas), precompiladas
+        education_matcher = _ALL_KEYWORDS_MATCHERS["education"]
         
         lines = education_text.split('\n')
         
@@ -355,7 +364,7 @@ class CVExtractorV2:
                 continue
             
             # Busca si la línea contiene keywords de educación (en cualquier idioma)
-            if not any(kw in line.lower() for kw in all_education_keywords):
+            if not education_matcher.search(line.lower()):
                 continue
             
             # Extrae entidades de esta línea
@@ -368,7 +377,7 @@ class CVExtractorV2:
             start_year = None
             end_year = None
             for date_str in dates:
-                year_match = re.search(r'\b(19|20)\d{2}\b', date_str)
+                year_match = cv_patterns.YEAR.search(date_str)
                 if year_match:
                     year = int(year_match.group())
                     if start_year is None or year < start_year:
@@ -397,8 +406,8 @@ class CVExtractorV2:
         if not experience_text:
             experience_text = text  # Busca en todo el CV
         
-        # Obtiene todos los keywords de experiencia (ambos idiomas)
-        all_experience_keywords = self._get_all_keywords("experience")
+        # Keywords de experiencia (ambos idiomas), precompiladas
+        experience_matcher = _ALL_KEYWORDS_MATCHERS["experience"]
         
         lines = experience_text.split('\n')
         current_position = None
@@ -414,8 +423,9 @@ class CVExtractorV2:
             orgs = line_analysis.get("organizations", [])
             
             # Detecta si es línea de posición (contiene ORG o keywords de experiencia)
-            has_experience_keyword = any(kw in line_stripped.lower() for kw in all_experience_keywords)
-            has_role_keyword = any(kw in line_stripped.lower() for kw in ["engineer", "developer", "manager", "director", "ingeniero", "desarrollador", "gerente", "director"])
+            line_lower = line_stripped.lower()
+            has_experience_keyword = experience_matcher.search(line_lower) is not None
+            has_role_keyword = ROLE_KEYWORD_MATCHER.search(line_lower) is not None
             
             if (orgs or has_experience_keyword) and has_role_keyword:
                 if current_position and current_company:
@@ -453,7 +463,7 @@ class CVExtractorV2:
         if "skills" in sections:
             skills_text = sections["skills"]
             # Extrae palabras separadas por comas o bullets
-            items = re.split(r'[,;•\n]', skills_text)
+            items = cv_patterns.SKILL_ITEM_SEPARATORS.split(skills_text)
             for item in items:
                 item = item.strip()
                 if 3 <= len(item) <= 50:  # Valida longitud
@@ -500,7 +510,7 @@ class CVExtractorV2:
         
         if "certifications" in sections:
             certs_text = sections["certifications"]
-            items = re.split(r'[•\n-]', certs_text)
+            items = cv_patterns.BULLET_ITEM_SEPARATORS.split(certs_text)
             for item in items:
                 item = item.strip()
                 if 5 <= len(item) <= 200:
@@ -514,7 +524,7 @@ class CVExtractorV2:
         
         if "projects" in sections:
             projects_text = sections["projects"]
-            items = re.split(r'[•\n-]', projects_text)
+            items = cv_patterns.BULLET_ITEM_SEPARATORS.split(projects_text)
             for item in items:
                 item = item.strip()
                 if 5 <= len(item) <= 200:
@@ -535,3 +545,24 @@ class CVExtractorV2:
         """
         profile = self.extract(cv_text)
         return profile.to_dict()
+
+
+# Instancia compartida (perezosa: carga los modelos spaCy en el primer uso)
+_cv_extractor: Optional[CVExtractorV2] = None
+_cv_extractor_lock = threading.Lock()
+
+
+def get_cv_extractor() -> CVExtractorV2:
+    """
+    Extractor CVExtractorV2 compartido.
+    
+    El extractor no guarda estado entre llamadas a `extract`, así que una
+    sola instancia sirve a todas las solicitudes (antes se construía una
+    por CV subido).
+    """
+    global _cv_extractor
+    if _cv_extractor is None:
+        with _cv_extractor_lock:
+            if _cv_extractor is None:
+                _cv_extractor = CVExtractorV2()
+    return _cv_extractor
@@ -0,0 +1,169 @@
+"""
+📐 CV Patterns - Registro de patrones precompilados para extractores de CV
+
+Todas las expresiones regulares de extracción de CVs (CVExtractorV2,
+unsupervised_cv_extractor y los campos Harvard de students) se compilan
+UNA vez al importar este módulo.
+
+Antes cada línea del CV pasaba por `re.search(r'...')` con patrones
+literales (búsqueda en el cache interno de `re` en cada llamada) y por
+bucles `any(kw in line for kw in KEYWORDS)` que recorren el set completo
+en Python. Aquí:
+
+- Cada patrón es un `re.Pattern` de módulo.
+- `keyword_matcher` convierte un set de keywords en UNA regex equivalente
+  a `any(kw in text for kw in keywords)` (búsqueda por substring).
+- `word_matcher` hace lo mismo con límites de palabra (`\\b...\\b`).
+- Las keywords se compilan como trie (ver `_trie_pattern`).
+- `first_match_lines` recorre un documento completo y marca qué líneas
+  contienen el patrón (featurización por lotes).
+
+Uso:
+----
+from app.services.cv_patterns import YEAR, keyword_matcher
+
+ACTION_VERB_MATCHER = keyword_matcher(ACTION_VERBS)
+has_action = ACTION_VERB_MATCHER.search(line_lower) is not None
+"""
+
+import re
+from bisect import bisect_right
+from typing import Iterable, List, Pattern, Sequence, Tuple
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Alternación de keywords factorizada como trie: `(?:a(?:bc|d)|e)`.
+
+    `sre` prueba las ramas de una alternación en orden; con el trie cada
+    posición del texto descarta casi todas las keywords en el primer
+    carácter en lugar de probar cientos de literales. Las ramas más largas
+    se intentan primero (el final de keyword es opcional y codicioso), así
+    `match.group()` es la keyword más larga que empieza en esa posición.
+    """
+    trie: dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def keyword_matcher(keywords: Iterable[str], flags: int = 0) -> Pattern:
+    """
+    Regex equivalente a `any(kw in text for kw in keywords)`.
+
+    `match.group()` devuelve la keyword más larga que coincide en la posición.
+    """
+    return re.compile(f"(?:{_trie_pattern(keywords)})", flags)
+
+
+def word_matcher(keywords: Iterable[str], flags: int = 0) -> Pattern:
+    """Como `keyword_matcher` pero solo palabras completas (`\\b...\\b`)."""
+    return re.compile(rf"\b(?:{_trie_pattern(keywords)})\b", flags)
+
+
+def first_match_lines(pattern: Pattern, document: str, starts: Sequence[int]) -> List[bool]:
+    """
+    ¿Qué líneas de `document` contienen `pattern`?
+
+    `document` son las líneas unidas por un separador que el patrón no
+    puede cruzar y `starts` el offset de inicio de cada línea. Tras la
+    primera coincidencia en una línea la búsqueda salta a la siguiente, así
+    cada línea cuesta a lo más una coincidencia y las líneas sin ella se
+    descartan dentro de `sre` sin volver a Python.
+    """
+    hits = [False] * len(starts)
+    search = pattern.search
+    match = search(document)
+    while match is not None:
+        line = bisect_right(starts, match.start()) - 1
+        hits[line] = True
+        if line + 1 >= len(starts):
+            break
+        match = search(document, starts[line + 1])
+    return hits
+
+
+# ============================================================================
+# PATRONES COMUNES
+# ============================================================================
+
+# Año entre 1900-2099 como palabra completa (group() == group(1) == año)
+YEAR = re.compile(r"\b((?:19|20)\d{2})\b")
+DIGIT = re.compile(r"\d")
+METRIC = re.compile(r"\d+%|\d+\+")
+EMAIL = re.compile(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}")
+PHONE = re.compile(r"\(?[\d\s\-\+\.]+\)?")
+URL = re.compile(r"https?://|www\.")
+COMPANY_SUFFIX = re.compile(
+    r"\b(Ltd|Inc|Corp|LLC|GmbH|SA|AG|SPA|Co|Company|Corporation)\b",
+    re.IGNORECASE,
+)
+YEAR_ONLY_LINE = re.compile(r"^\d{4}(-\d{4})?$|^\d{4}$|presente|present|actualidad|current")
+POSITION_AT_COMPANY = re.compile(r"\s+at\s+", re.IGNORECASE)
+
+# Separadores de listas
+SKILL_SEPARATORS = re.compile(r"[,;]")
+SKILL_ITEM_SEPARATORS = re.compile(r"[,;•\n]")
+BULLET_ITEM_SEPARATORS = re.compile(r"[•\n-]")
+BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+# ============================================================================
+# HEADERS DE SECCIÓN (CVExtractorV2)
+# ============================================================================
+
+# En orden de prioridad: gana el primer patrón que coincide en la línea
+SECTION_HEADERS: List[Tuple[Pattern, str]] = [
+    (re.compile(pattern), section)
+    for pattern, section in (
+        (r"(OBJECTIVE|CAREER SUMMARY|PROFESSIONAL SUMMARY)", "objective"),
+        (r"(EDUCATION|EDUCACIÓN|FORMACIÓN)", "education"),
+        (r"(EXPERIENCE|EXPERIENCIA|PROFESSIONAL EXPERIENCE)", "experience"),
+        (r"(SKILLS|HABILIDADES|COMPETENCIAS|TECHNICAL SKILLS)", "skills"),
+        (r"(LANGUAGE|IDIOMAS|LANGUAGES)", "languages"),
+        (r"(CERTIFICATIONS?|CERTIFICACIONES?|CREDENTIALS?)", "certifications"),
+        (r"(PROJECTS?|PROYECTOS?|PORTFOLIO)", "projects"),
+    )
+]
+
+# Cualquier header (descarte rápido de líneas que no son header)
+ANY_SECTION_HEADER = re.compile("|".join(pattern.pattern for pattern, _ in SECTION_HEADERS))
+
+
+# ============================================================================
+# CAMPOS HARVARD (students._extract_harvard_cv_fields)
+# ============================================================================
+
+_SECTION_FLAGS = re.DOTALL | re.IGNORECASE
+
+HARVARD_EDUCATION_SECTION = re.compile(
+    r"(educación|education|formación|training)[\s\n]+(.*?)"
+    r"(?:experiencia|experience|habilidades|skills|certificado|certification|$)",
+    _SECTION_FLAGS,
+)
+HARVARD_EXPERIENCE_SECTION = re.compile(
+    r"(experiencia|experience|trabajos|jobs|profesional)[\s\n]+(.*?)"
+    r"(?:educación|education|habilidades|skills|certificado|certification|$)",
+    _SECTION_FLAGS,
+)
+HARVARD_CERTIFICATION_SECTION = re.compile(
+    r"(certificado|certification|cursos|courses|capacitación|training)[\s\n]+(.*?)"
+    r"(?:idiomas|languages|habilidades|skills|$)",
+    _SECTION_FLAGS,
+)
+HARVARD_LANGUAGE_SECTION = re.compile(r"(idioma|language|lengua)[\s\n]+(.*?)(?:$)", _SECTION_FLAGS)
+
+# Sin límites de palabra (compatibilidad con la extracción Harvard original)
+HARVARD_YEAR = re.compile(r"(20\d{2}|19\d{2})")
+HARVARD_DATE_RANGE = re.compile(r"(20\d{2})[/-]?(20\d{2})?")
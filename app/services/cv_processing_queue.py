@@ -0,0 +1,386 @@
+"""
+📬 CV Processing Queue - Cola persistente para procesar CVs fuera de la petición
+
+`POST /students/upload_resume` mantenía la petición HTTP abierta durante la
+extracción de texto y toda la cascada regex -> unsupervised -> spaCy. Con
+esta cola la subida solo guarda el archivo, crea una fila en
+`cv_processing_tasks` y responde 202 con el id de la tarea; los workers la
+procesan en segundo plano y `GET /students/upload_resume/{task_id}` reporta
+etapa, progreso y resultado.
+
+Características:
+- Sin broker externo: la cola es la tabla (sobrevive reinicios)
+- Concurrencia acotada: CV_QUEUE_WORKERS corrutinas worker por proceso; el
+  trabajo pesado sigue yendo al pool de procesos del CPU executor
+- Toma atómica de tareas (UPDATE ... WHERE status='queued'): varios
+  procesos de la app pueden compartir la misma tabla
+- Reintentos ante errores transitorios (5xx, executor ocupado) hasta
+  CV_QUEUE_MAX_ATTEMPTS; los errores del cliente (4xx) fallan de inmediato
+- Tareas abandonadas (caída del proceso) se re-encolan tras
+  CV_QUEUE_TASK_TIMEOUT_SECONDS
+- Emails solo encriptados (Fernet) + hash, como en el resto de la BD
+  (LFPDPPP); el procesador los lee con `task_meta`/`task_actor_email`
+- El archivo subido, los metadatos y el email de quien sube se borran al
+  terminar la tarea
+
+Uso:
+----
+from app.services.cv_processing_queue import cv_processing_queue
+
+cv_processing_queue.set_processor(process_resume_task)
+task = await cv_processing_queue.enqueue(filename, content, meta, actor)
+# ... en el procesador
+meta = cv_processing_queue.task_meta(task)
+# ... después
+task = await cv_processing_queue.get(task.task_id)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models.cv_task import CVProcessingTask
+from app.utils.datetime_utils import utc_now
+from app.utils.encryption import EncryptionService
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# (etapa, progreso 0-100) -> None
+ProgressCallback = Callable[[str, int], Awaitable[None]]
+# (tarea, bytes del archivo, progreso) -> resultado serializable a JSON
+TaskProcessor = Callable[[CVProcessingTask, bytes, ProgressCallback], Awaitable[Dict[str, Any]]]
+
+
+class CVProcessingQueue:
+    """Cola de tareas de CV respaldada por la tabla cv_processing_tasks."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        storage_dir: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        task_timeout_seconds: Optional[float] = None,
+        encryption: Optional[EncryptionService] = None,
+    ):
+        self._session_factory = session_factory
+        self._encryption = encryption
+        self.storage_dir = storage_dir or settings.CV_QUEUE_STORAGE_DIR
+        self.workers = settings.CV_QUEUE_WORKERS if workers is None else workers
+        self.max_attempts = max_attempts or settings.CV_QUEUE_MAX_ATTEMPTS
+        self.poll_seconds = poll_seconds or settings.CV_QUEUE_POLL_SECONDS
+        self.task_timeout_seconds = task_timeout_seconds or settings.CV_QUEUE_TASK_TIMEOUT_SECONDS
+
+        self._processor: Optional[TaskProcessor] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_stale_check = 0.0
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+        return self._session_factory()
+
+    def _cipher(self) -> EncryptionService:
+        if self._encryption is None:
+            self._encryption = EncryptionService()
+        return self._encryption
+
+    def set_processor(self, processor: TaskProcessor) -> None:
+        """Registra la función que procesa cada tarea."""
+        self._processor = processor
+
+    @property
+    def running(self) -> bool:
+        return any(not worker.done() for worker in self._worker_tasks)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    async def enqueue(self, filename: str, content: bytes, meta: Dict[str, Any], actor: Dict[str, Any]) -> CVProcessingTask:
+        """
+        Guarda el archivo y crea la tarea en estado queued.
+
+        Args:
+            filename: Nombre original (la extensión decide el parser)
+            content: Bytes del archivo ya validado
+            meta: Metadatos de la subida (serializables a JSON)
+            actor: {"role", "user_id", "email"} de quien sube el CV
+
+        Los emails se guardan encriptados; `meta["email"]` además como hash.
+        """
+        encryption = self._cipher()
+        meta, email_hash = dict(meta), None
+        if meta.get("email"):
+            email = str(meta["email"]).lower().strip()
+            meta["email"] = encryption.encrypt(email)
+            email_hash = hashlib.sha256(email.encode()).hexdigest()
+
+        task_id = uuid.uuid4().hex
+        extension = os.path.splitext(filename)[1].lower()
+        file_path = os.path.join(self.storage_dir, f"{task_id}{extension}")
+        await asyncio.to_thread(self._write_file, file_path, content)
+
+        task = CVProcessingTask(
+            task_id=task_id,
+            filename=filename,
+            file_path=file_path,
+            meta=json.dumps(meta, ensure_ascii=False),
+            email_hash=email_hash,
+            actor_role=actor.get("role", ""),
+            actor_id=actor.get("user_id"),
+            actor_email=encryption.encrypt_optional(actor.get("email")),
+        )
+        try:
+            async with self._session() as session:
+                session.add(task)
+                await session.commit()
+                await session.refresh(task)
+        except Exception:
+            await asyncio.to_thread(self._remove_file, file_path)
+            raise
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        logger.info(f"📬 Tarea de CV {task_id} encolada ({filename}, {len(content)} bytes)")
+        return task
+
+    def task_meta(self, task: CVProcessingTask) -> Dict[str, Any]:
+        """Metadatos de la subida con el email desencriptado (para el procesador)."""
+        meta = json.loads(task.meta)
+        if meta.get("email"):
+            meta["email"] = self._cipher().decrypt_email(meta["email"])
+        return meta
+
+    def task_actor_email(self, task: CVProcessingTask) -> Optional[str]:
+        """Email desencriptado de quien subió el CV."""
+        return self._cipher().decrypt_optional(task.actor_email)
+
+    async def get(self, task_id: str) -> Optional[CVProcessingTask]:
+        async with self._session() as session:
+            result = await session.execute(
+                select(CVProcessingTask).where(CVProcessingTask.task_id == task_id)
+            )
+            return result.scalars().first()
+
+    async def run_now(self, task_id: str) -> Optional[CVProcessingTask]:
+        """
+        Procesa una tarea en la corrutina actual (clientes que piden esperar).
+
+        Si un worker ya la tomó, solo devuelve su estado actual.
+        """
+        task = await self._claim(task_id=task_id)
+        if task is not None:
+            await self._run(task)
+        return await self.get(task_id)
+
+    async def process_pending(self, limit: Optional[int] = None) -> int:
+        """Procesa tareas en cola hasta vaciarla (o `limit`). Para scripts y tests."""
+        processed = 0
+        while limit is None or processed < limit:
+            task = await self._claim()
+            if task is None:
+                break
+            await self._run(task)
+            processed += 1
+        return processed
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Re-encola tareas abandonadas y lanza los workers."""
+        if self.running or self.workers <= 0:
+            return
+        if self._processor is None:
+            logger.warning("📬 Cola de CVs sin procesador registrado; no se inician workers")
+            return
+        self._wakeup = asyncio.Event()
+        await self._requeue_stale()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker_loop(index), name=f"cv-queue-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"📬 Cola de CVs iniciada con {self.workers} workers")
+
+    async def stop(self) -> None:
+        """Detiene los workers; una tarea interrumpida se re-encola al reiniciar."""
+        for worker in self._worker_tasks:
+            worker.cancel()
+        if self._worker_tasks:
+            await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._wakeup = None
+
+    async def _worker_loop(self, index: int) -> None:
+        while True:
+            try:
+                task = await self._claim()
+                if task is not None:
+                    await self._run(task)
+                    continue
+                await self._maybe_requeue_stale()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"📬 Worker {index} de la cola de CVs: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_seconds)
+
+    # ------------------------------------------------------------------
+    # Toma y ejecución de tareas
+    # ------------------------------------------------------------------
+
+    async def _claim(self, task_id: Optional[str] = None) -> Optional[CVProcessingTask]:
+        """
+        Toma atómicamente la tarea más antigua en cola (o `task_id`).
+
+        El UPDATE condicionado a status='queued' garantiza que solo un
+        worker (de cualquier proceso) gana cada tarea.
+        """
+        async with self._session() as session:
+            for _ in range(5):
+                query = select(CVProcessingTask.id).where(CVProcessingTask.status == QUEUED)
+                if task_id is not None:
+                    query = query.where(CVProcessingTask.task_id == task_id)
+                row_id = (await session.execute(query.order_by(CVProcessingTask.id).limit(1))).scalar()
+                if row_id is None:
+                    return None
+
+                claimed = await session.execute(
+                    update(CVProcessingTask)
+                    .where(CVProcessingTask.id == row_id, CVProcessingTask.status == QUEUED)
+                    .values(
+                        status=PROCESSING,
+                        stage="started",
+                        started_at=utc_now(),
+                        attempts=CVProcessingTask.attempts + 1,
+                    )
+                )
+                await session.commit()
+                if claimed.rowcount == 1:
+                    return await session.get(CVProcessingTask, row_id, populate_existing=True)
+        return None
+
+    async def _update(self, row_id: int, **values) -> None:
+        async with self._session() as session:
+            await session.execute(
+                update(CVProcessingTask).where(CVProcessingTask.id == row_id).values(**values)
+            )
+            await session.commit()
+
+    async def _run(self, task: CVProcessingTask) -> None:
+        async def report(stage: str, progress: int) -> None:
+            await self._update(task.id, stage=stage, progress=progress)
+
+        try:
+            if self._processor is None:
+                raise RuntimeError("Cola de CVs sin procesador registrado")
+            content = await asyncio.to_thread(self._read_file, task.file_path)
+            result = await self._processor(task, content, report)
+        except asyncio.CancelledError:
+            # Apagado: la tarea queda en processing y se re-encola como abandonada
+            raise
+        except Exception as e:
+            status_code = getattr(e, "status_code", 500)
+            detail = str(getattr(e, "detail", None) or e)
+            if status_code >= 500 and task.attempts < self.max_attempts:
+                logger.warning(f"📬 Tarea {task.task_id} falló (intento {task.attempts}), se re-encola: {detail}")
+                await self._update(task.id, status=QUEUED, stage="retrying", error=detail, error_status=status_code)
+                return
+            logger.error(f"📬 Tarea {task.task_id} falló: {detail}")
+            await self._finish(task, status=FAILED, error=detail, error_status=status_code)
+            return
+
+        await self._finish(
+            task, status=COMPLETED, progress=100, error=None, error_status=None,
+            result=json.dumps(result, ensure_ascii=False, default=str),
+        )
+        logger.info(f"📬 Tarea {task.task_id} completada")
+
+    async def _finish(self, task: CVProcessingTask, **values) -> None:
+        """Estado final: borra archivo, metadatos y email de quien subió (datos personales)."""
+        await self._update(task.id, stage="done", meta="{}", actor_email=None, finished_at=utc_now(), **values)
+        await asyncio.to_thread(self._remove_file, task.file_path)
+
+    # ------------------------------------------------------------------
+    # Tareas abandonadas
+    # ------------------------------------------------------------------
+
+    async def _maybe_requeue_stale(self) -> None:
+        now = time.monotonic()
+        if now - self._last_stale_check >= self.task_timeout_seconds / 2:
+            self._last_stale_check = now
+            await self._requeue_stale()
+
+    async def _requeue_stale(self) -> int:
+        """Re-encola (o da por fallidas) tareas en proceso más allá del timeout."""
+        cutoff = utc_now() - timedelta(seconds=self.task_timeout_seconds)
+        async with self._session() as session:
+            result = await session.execute(
+                select(CVProcessingTask).where(
+                    CVProcessingTask.status == PROCESSING,
+                    CVProcessingTask.started_at < cutoff,
+                )
+            )
+            stale = result.scalars().all()
+
+        for task in stale:
+            if task.attempts < self.max_attempts:
+                await self._update(task.id, status=QUEUED, stage="requeued")
+            else:
+                await self._finish(
+                    task, status=FAILED, error="La tarea se interrumpió demasiadas veces", error_status=500,
+                )
+        if stale:
+            logger.warning(f"📬 {len(stale)} tareas de CV abandonadas recuperadas")
+        return len(stale)
+
+    # ------------------------------------------------------------------
+    # Archivos
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _write_file(path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# Instancia global
+cv_processing_queue = CVProcessingQueue()
@@ -0,0 +1,404 @@
+"""
+🧮 Dedup Store - Ofertas ya vistas por el scraping, acotado y persistente
+
+`JobScraperWorker._seen_job_ids` era un set sin límite que crecía toda la
+vida del worker y se perdía al reiniciar. El DedupStore combina:
+
+- Filtros de Bloom escalables (app/utils/bloom_filter.py) por generación
+  de tiempo: un negativo ("seguro que no está") no toca la base.
+- La tabla `scraped_job_ids` (id externo + last_seen_at) que confirma los
+  positivos del filtro, así un falso positivo nunca descarta una oferta.
+- Expiración por tiempo: el TTL corre desde la última vez que se vio la
+  oferta. Las generaciones más viejas que el TTL se descartan enteras (los
+  Bloom no permiten borrar) y las filas vencidas se purgan; una oferta que
+  se re-publica después del TTL vuelve a contar como nueva.
+- Snapshot de los filtros en disco (`save_snapshot`, al apagar) y
+  restauración al iniciar: snapshot + filas vistas después de tomarlo, o
+  reconstrucción desde la tabla si no hay snapshot válido.
+
+Con persistent=False (default de JobScraperWorker) la confirmación es un
+dict en memoria acotado por el mismo TTL.
+
+Uso:
+----
+from app.services.dedup_store import job_dedup_store
+
+new_ids = await job_dedup_store.filter_unseen([offer.job_id for offer in offers])
+...  # guardar las ofertas nuevas
+await job_dedup_store.mark_seen(saved_ids)   # solo tras el commit
+
+# Sin paso de guardado: revisar y marcar en una sola llamada
+new_ids = await job_dedup_store.filter_new(ids)
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models import ScrapedJobId
+from app.utils.bloom_filter import ScalableBloomFilter
+from app.utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+_CHUNK = 500  # Ids por consulta IN (límite de parámetros de SQLite)
+
+
+def _chunks(items: List[str], size: int = _CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class DedupStore:
+    """Filtro de Bloom por generaciones + confirmación exacta con TTL."""
+
+    def __init__(
+        self,
+        source: str = "occ",
+        ttl_seconds: Optional[float] = None,
+        generations: Optional[int] = None,
+        initial_capacity: Optional[int] = None,
+        error_rate: Optional[float] = None,
+        persistent: bool = True,
+        session_factory: Optional[Callable] = None,
+        snapshot_path: Optional[str] = None,
+    ):
+        self.source = source
+        self.ttl = timedelta(seconds=ttl_seconds or settings.SCRAPER_DEDUP_TTL_HOURS * 3600)
+        self.generations = max(1, generations or settings.SCRAPER_DEDUP_GENERATIONS)
+        self.span = self.ttl / self.generations
+        self.initial_capacity = initial_capacity or settings.SCRAPER_DEDUP_INITIAL_CAPACITY
+        self.error_rate = error_rate or settings.SCRAPER_DEDUP_ERROR_RATE
+        self.persistent = persistent
+        self._session_factory = session_factory
+        self.snapshot_path = snapshot_path or os.path.join(settings.SCRAPER_DEDUP_SNAPSHOT_DIR, f"{source}.json")
+
+        self._filters: Deque[Tuple[datetime, ScalableBloomFilter]] = deque()
+        self._memory: Dict[str, datetime] = {}  # Confirmación sin base de datos
+        self._not_before = datetime.min.replace(tzinfo=timezone.utc)  # reset(): ignora lo visto antes
+        self._lock = asyncio.Lock()
+        self._started = False
+        self._purge_due = False
+        self.counters: Counter = Counter()
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+        return self._session_factory()
+
+    def _new_filter(self) -> ScalableBloomFilter:
+        return ScalableBloomFilter(self.initial_capacity, self.error_rate)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    async def filter_unseen(self, ids: Iterable[str]) -> List[str]:
+        """
+        Ids no vistos dentro del TTL (en orden, sin repetidos), sin marcarlos.
+
+        Solo lectura: el llamador confirma con mark_seen() cuando las ofertas
+        quedaron guardadas, así un lote que falla al guardar se vuelve a
+        procesar en la siguiente corrida.
+        """
+        unique = list(dict.fromkeys(str(job_id) for job_id in ids))
+        if not unique:
+            return []
+
+        async with self._lock:
+            await self.start()
+            now = utc_now()
+            self._rotate(now)
+            new, _ = await self._check(unique, now)
+            return new
+
+    async def mark_seen(self, ids: Iterable[str]) -> None:
+        """Marca los ids como vistos ahora (tabla o memoria y filtro actual)."""
+        unique = list(dict.fromkeys(str(job_id) for job_id in ids))
+        if not unique:
+            return
+
+        async with self._lock:
+            await self.start()
+            now = utc_now()
+            self._rotate(now)
+            existing = await self._existing([job_id for job_id in unique if self._maybe_seen(job_id)])
+            self._mark(unique)
+            await self._record(unique, existing or {}, now)
+            self.counters["marked"] += len(unique)
+
+    async def filter_new(self, ids: Iterable[str]) -> List[str]:
+        """
+        Ids no vistos dentro del TTL (en orden, sin repetidos) y marca todos
+        como vistos ahora: filter_unseen() + mark_seen() para quien no tiene
+        un paso de guardado que confirmar.
+        """
+        unique = list(dict.fromkeys(str(job_id) for job_id in ids))
+        if not unique:
+            return []
+
+        async with self._lock:
+            await self.start()
+            now = utc_now()
+            self._rotate(now)
+            new, existing = await self._check(unique, now)
+            self._mark(unique)
+            await self._record(unique, existing or {}, now)
+            return new
+
+    async def start(self) -> None:
+        """Restaura los filtros (snapshot o tabla) una sola vez."""
+        if self._started:
+            return
+        self._started = True
+        if self.persistent:
+            await self.restore()
+
+    def reset(self) -> None:
+        """Olvida todo lo visto hasta ahora (la tabla se ignora, no se borra)."""
+        self._filters.clear()
+        self._memory.clear()
+        self._not_before = utc_now()
+
+    async def close(self) -> None:
+        """Guarda el snapshot de los filtros (llamar al apagar)."""
+        if self.persistent and self._filters:
+            await self.save_snapshot()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "persistent": self.persistent,
+            "generations": len(self._filters),
+            "items": sum(len(bloom) for _, bloom in self._filters),
+            "bloom_bytes": sum(bloom.size_bytes for _, bloom in self._filters),
+            "memory_ids": len(self._memory),
+            **self.counters,
+        }
+
+    # ------------------------------------------------------------------
+    # Generaciones
+    # ------------------------------------------------------------------
+
+    def _rotate(self, now: datetime) -> None:
+        """Abre una generación por cada `span` y descarta las que ya vencieron."""
+        if not self._filters or now - self._filters[-1][0] >= self.span:
+            self._filters.append((now, self._new_filter()))
+        cutoff = now - self.ttl
+        expired = False
+        while len(self._filters) > 1 and self._filters[1][0] <= cutoff:
+            self._filters.popleft()  # Todo lo que contiene se vio antes del cutoff
+            expired = True
+        if expired:
+            self._memory = {job_id: seen for job_id, seen in self._memory.items() if seen >= cutoff}
+            self._purge_due = self.persistent
+
+    def _maybe_seen(self, job_id: str) -> bool:
+        return any(job_id in bloom for _, bloom in reversed(self._filters))
+
+    def _mark(self, ids: List[str]) -> None:
+        """Agrega los ids al filtro de la generación actual."""
+        current = self._filters[-1][1]
+        for job_id in ids:
+            current.add(job_id)
+
+    # ------------------------------------------------------------------
+    # Confirmación exacta
+    # ------------------------------------------------------------------
+
+    async def _check(self, ids: List[str], now: datetime) -> Tuple[List[str], Optional[Dict[str, datetime]]]:
+        """
+        Ids no vistos y last_seen_at de los que tienen fila (None si la base
+        falló: se confía en el filtro).
+        """
+        cutoff = max(now - self.ttl, self._not_before)
+        maybe = [job_id for job_id in ids if self._maybe_seen(job_id)]
+        existing = await self._existing(maybe)
+        if existing is None:
+            seen = set(maybe)
+        else:
+            seen = {job_id for job_id, last_seen in existing.items() if last_seen >= cutoff}
+        new = [job_id for job_id in ids if job_id not in seen]
+
+        self.counters["checked"] += len(ids)
+        self.counters["bloom_negative"] += len(ids) - len(maybe)
+        self.counters["false_positive"] += len(maybe) - len(seen)
+        self.counters["duplicate"] += len(seen)
+        self.counters["new"] += len(new)
+        return new, existing
+
+    async def _existing(self, ids: List[str]) -> Optional[Dict[str, datetime]]:
+        """last_seen_at de los ids que tienen fila (None si la base falló)."""
+        if not self.persistent:
+            return {job_id: self._memory[job_id] for job_id in ids if job_id in self._memory}
+        if not ids:
+            return {}
+        try:
+            async with self._session() as session:
+                found: Dict[str, datetime] = {}
+                for chunk in _chunks(ids):
+                    rows = await session.execute(
+                        select(ScrapedJobId.external_job_id, ScrapedJobId.last_seen_at).where(
+                            ScrapedJobId.source == self.source,
+                            ScrapedJobId.external_job_id.in_(chunk),
+                        )
+                    )
+                    found.update(rows.all())
+                return found
+        except Exception as e:
+            self.counters["db_errors"] += 1
+            logger.warning(f"🧮 No se pudo confirmar ids vistos ({self.source}): {e}")
+            return None
+
+    async def _record(self, ids: List[str], existing: Dict[str, datetime], now: datetime) -> None:
+        """Actualiza last_seen_at de los existentes e inserta el resto."""
+        if not self.persistent:
+            for job_id in ids:
+                self._memory[job_id] = now
+            return
+        try:
+            try:
+                await self._write(ids, set(existing), now)
+            except IntegrityError:
+                # Filas que el filtro no conocía (otro proceso, reset): se releen
+                everything = await self._existing(ids) or {}
+                await self._write(ids, set(everything), now)
+        except Exception as e:
+            self.counters["db_errors"] += 1
+            logger.warning(f"🧮 No se pudo registrar ids vistos ({self.source}): {e}")
+
+    async def _write(self, ids: List[str], existing: Set[str], now: datetime) -> None:
+        async with self._session() as session:
+            known = [job_id for job_id in ids if job_id in existing]
+            for chunk in _chunks(known):
+                await session.execute(
+                    update(ScrapedJobId)
+                    .where(ScrapedJobId.source == self.source, ScrapedJobId.external_job_id.in_(chunk))
+                    .values(last_seen_at=now)
+                )
+            missing = [job_id for job_id in ids if job_id not in existing]
+            if missing:
+                await session.execute(insert(ScrapedJobId), [
+                    {"source": self.source, "external_job_id": job_id, "first_seen_at": now, "last_seen_at": now}
+                    for job_id in missing
+                ])
+            if self._purge_due:
+                await session.execute(
+                    delete(ScrapedJobId).where(
+                        ScrapedJobId.source == self.source,
+                        ScrapedJobId.last_seen_at < now - self.ttl,
+                    )
+                )
+            await session.commit()
+        self._purge_due = False
+
+    # ------------------------------------------------------------------
+    # Snapshot y restauración
+    # ------------------------------------------------------------------
+
+    async def save_snapshot(self) -> str:
+        """Escribe los filtros en `snapshot_path` (escritura atómica)."""
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "source": self.source,
+            "ttl_seconds": self.ttl.total_seconds(),
+            "taken_at": utc_now().isoformat(),
+            "not_before": self._not_before.isoformat(),
+            "generations": [
+                {"started_at": started.isoformat(), "filter": bloom.to_dict()}
+                for started, bloom in self._filters
+            ],
+        }
+        await asyncio.to_thread(self._write_snapshot, payload)
+        logger.info(f"💾 Snapshot de dedup '{self.source}' guardado: {self.stats()['items']} ids")
+        return self.snapshot_path
+
+    def _write_snapshot(self, payload: Dict[str, Any]) -> None:
+        directory = os.path.dirname(self.snapshot_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        if not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    async def restore(self) -> str:
+        """
+        Carga el snapshot si es compatible y reciente, y agrega lo visto
+        después de tomarlo; si no, reconstruye los filtros desde la tabla.
+
+        Returns:
+            "snapshot" o "table"
+        """
+        now = utc_now()
+        try:
+            payload = await asyncio.to_thread(self._read_snapshot)
+            taken_at = self._load_snapshot(payload, now) if payload else None
+        except Exception as e:
+            logger.warning(f"🧮 Snapshot de dedup '{self.source}' inválido, se reconstruye: {e}")
+            taken_at = None
+
+        origin = "snapshot" if taken_at is not None else "table"
+        if taken_at is None:
+            self._filters.clear()
+        try:
+            await self._replay(since=taken_at or max(now - self.ttl, self._not_before), now=now)
+        except Exception as e:
+            self.counters["db_errors"] += 1
+            logger.warning(f"🧮 No se pudo leer ids vistos ({self.source}) al restaurar: {e}")
+        logger.info(f"🧮 Dedup '{self.source}' restaurado desde {origin}: {self.stats()['items']} ids")
+        return origin
+
+    def _load_snapshot(self, payload: Dict[str, Any], now: datetime) -> Optional[datetime]:
+        """Aplica el snapshot; None si no sirve (otra fuente, TTL o versión, o muy viejo)."""
+        taken_at = datetime.fromisoformat(payload["taken_at"])
+        compatible = (
+            payload.get("version") == SNAPSHOT_VERSION
+            and payload.get("source") == self.source
+            and payload.get("ttl_seconds") == self.ttl.total_seconds()
+            and taken_at >= now - self.ttl
+        )
+        if not compatible:
+            return None
+        self._not_before = datetime.fromisoformat(payload["not_before"])
+        self._filters = deque(
+            (datetime.fromisoformat(item["started_at"]), ScalableBloomFilter.from_dict(item["filter"]))
+            for item in payload["generations"]
+        )
+        self._rotate(now)
+        return taken_at
+
+    async def _replay(self, since: datetime, now: datetime) -> None:
+        """Agrega a los filtros las filas vistas desde `since`, en su generación."""
+        async with self._session() as session:
+            result = await session.stream(
+                select(ScrapedJobId.external_job_id, ScrapedJobId.last_seen_at)
+                .where(ScrapedJobId.source == self.source, ScrapedJobId.last_seen_at >= since)
+                .order_by(ScrapedJobId.last_seen_at)
+            )
+            async for job_id, last_seen in result:
+                if not self._filters or last_seen - self._filters[-1][0] >= self.span:
+                    self._filters.append((last_seen, self._new_filter()))
+                self._filters[-1][1].add(job_id)
+        self._rotate(now)
+
+
+# Instancia global (persistente) para workers de larga duración
+job_dedup_store = DedupStore()
@@ -0,0 +1,108 @@
+"""
+✂️ Document Chunker - Procesamiento de documentos largos con memoria acotada
+
+Divide textos largos (CVs de muchas páginas, descripciones de OCC) en
+fragmentos de tamaño máximo NLP_CHUNK_MAX_CHARS respetando, en orden de
+preferencia:
+
+1. Límites de sección/párrafo (línea en blanco)
+2. Saltos de línea
+3. Fin de oración
+4. Espacios (nunca se corta una palabra salvo que no haya alternativa)
+
+Los fragmentos se generan de forma perezosa (generador) y conservan su
+offset en el texto original, así los servicios NLP pueden procesarlos como
+stream (p. ej. `nlp.pipe`) y re-proyectar entidades al documento completo.
+La memoria por documento queda acotada por el tamaño de fragmento x lote,
+no por el tamaño del documento.
+
+Uso:
+----
+from app.services.document_chunker import iter_chunks
+
+for chunk in iter_chunks(long_text):
+    doc = nlp(chunk.text)
+    for ent in doc.ents:
+        start = chunk.start + ent.start_char  # offset en el documento completo
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Separadores en orden de preferencia (el corte queda DESPUÉS del separador)
+_BOUNDARIES = ("\n\n", "\n", ". ", "? ", "! ", "; ", " ")
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """Fragmento de un documento con su posición en el texto original."""
+    text: str
+    start: int
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+def _find_split(text: str, start: int, limit: int, min_size: int) -> int:
+    """
+    Posición de corte en text[start:limit] con el mejor separador disponible.
+
+    Solo se aceptan cortes que dejen al menos `min_size` caracteres, para no
+    generar una cola de fragmentos diminutos.
+    """
+    for boundary in _BOUNDARIES:
+        position = text.rfind(boundary, start + min_size, limit)
+        if position != -1:
+            return position + len(boundary)
+    return limit
+
+
+def iter_chunks(
+    text: str,
+    max_chars: Optional[int] = None,
+    max_total_chars: Optional[int] = None,
+) -> Iterator[TextChunk]:
+    """
+    Genera fragmentos de a lo más `max_chars` caracteres.
+
+    Args:
+        text: Documento completo
+        max_chars: Tamaño máximo por fragmento (default: settings)
+        max_total_chars: Tope de caracteres procesados por documento
+            (protección DoS; default: settings.NLP_MAX_DOCUMENT_CHARS)
+
+    Yields:
+        TextChunk en orden; los fragmentos solo con espacios se omiten
+    """
+    if not text:
+        return
+
+    max_chars = max_chars or settings.NLP_CHUNK_MAX_CHARS
+    max_total_chars = max_total_chars or settings.NLP_MAX_DOCUMENT_CHARS
+    if len(text) > max_total_chars:
+        logger.warning(
+            f"✂️ Documento de {len(text)} caracteres excede el tope de "
+            f"{max_total_chars}; se procesa solo el inicio"
+        )
+    total = min(len(text), max_total_chars)
+    min_size = max_chars // 4
+
+    position = 0
+    while position < total:
+        limit = min(position + max_chars, total)
+        split = limit if limit == total else _find_split(text, position, limit, min_size)
+        piece = text[position:split]
+        if piece.strip():
+            yield TextChunk(text=piece, start=position)
+        position = split
+
+
+def chunk_text(text: str, max_chars: Optional[int] = None) -> List[TextChunk]:
+    """Versión no perezosa de iter_chunks (para textos ya acotados/tests)."""
+    return list(iter_chunks(text, max_chars=max_chars))
@@ -0,0 +1,149 @@
+"""
+🧾 Document Context - Representaciones de un CV calculadas una sola vez
+
+Una subida de CV normalizaba y tokenizaba el mismo texto varias veces:
+`analyze_document` normalizaba cada fragmento dos veces, cada método de
+`TermExtractor` volvía a normalizar, `_extract_harvard_cv_fields` y
+`CVExtractorV2._split_sections` re-partían líneas y
+`UnsupervisedCVExtractor._preprocess` aplicaba NFKD otra vez.
+
+`DocumentContext` se construye una vez por texto y expone, de forma
+perezosa y cacheada, cada representación derivada:
+
+- lower: texto en minúsculas
+- lines / clean_lines: líneas crudas / NFKD sin vacías (extractor unsupervised)
+- chunks: fragmentos de document_chunker
+- normalized_chunks(tipo) / tokens(tipo): normalize_text por fragmento
+- sections: offsets (inicio, fin) del contenido de cada sección del CV
+- language: idioma detectado ('es' | 'en')
+
+Todos los extractores aceptan un `str` o un `DocumentContext`
+(`DocumentContext.of`), así que el código existente sigue funcionando.
+
+Uso:
+----
+context = DocumentContext(resume_text)
+analysis = _extract_resume_analysis(context)
+harvard = _extract_harvard_cv_fields(context)   # reutiliza lines / lower
+profile = unsupervised_cv_extractor.extract(context)
+"""
+
+import unicodedata
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from app.services import cv_patterns
+from app.services.document_chunker import TextChunk, iter_chunks
+from app.services.language_id_service import detect_language
+
+
+def section_header(line: str) -> Optional[str]:
+    """
+    Nombre de la sección si `line` es un encabezado de CV (EDUCACIÓN, SKILLS...).
+
+    Descarte rápido con una sola regex; si coincide, gana el primer patrón
+    de cv_patterns.SECTION_HEADERS en orden de prioridad.
+    """
+    line_upper = line.upper().strip()
+    if not cv_patterns.ANY_SECTION_HEADER.search(line_upper):
+        return None
+    return next(
+        section_name for pattern, section_name in cv_patterns.SECTION_HEADERS
+        if pattern.search(line_upper)
+    )
+
+
+class DocumentContext:
+    """Texto de un documento y sus representaciones derivadas (cacheadas)."""
+
+    def __init__(self, text: str, language: Optional[str] = None):
+        self.text = text or ""
+        self._language = language
+        self._normalized: Dict[str, List[str]] = {}
+        self._tokens: Dict[str, List[str]] = {}
+
+    @classmethod
+    def of(cls, source: Union[str, "DocumentContext"]) -> "DocumentContext":
+        """Contexto de `source` (lo reutiliza si ya es un DocumentContext)."""
+        return source if isinstance(source, DocumentContext) else cls(source)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.split("\n")
+
+    @cached_property
+    def clean_lines(self) -> List[str]:
+        """Líneas NFKD, sin espacios extremos, descartando vacías y de 1 carácter."""
+        stripped = (line.strip() for line in unicodedata.normalize("NFKD", self.text).split("\n"))
+        return [line for line in stripped if len(line) > 1]
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    @cached_property
+    def language(self) -> str:
+        return self._language or detect_language(self.text).language
+
+    @cached_property
+    def chunks(self) -> List[TextChunk]:
+        max_chars = min(settings.NLP_CHUNK_MAX_CHARS, settings.NLP_MAX_TEXT_LENGTH)
+        return list(iter_chunks(self.text, max_chars=max_chars))
+
+    @staticmethod
+    def _normalization_key(normalization_type):
+        # Import diferido: text_vectorization_service importa este módulo
+        from app.services.text_vectorization_service import NormalizationType
+
+        # normalize_text aplica exactamente los mismos pasos a AGGRESSIVE y TECHNICAL
+        key = NormalizationType(normalization_type)
+        return NormalizationType.TECHNICAL if key == NormalizationType.AGGRESSIVE else key
+
+    def normalized_chunks(self, normalization_type) -> List[str]:
+        """`normalize_text` de cada fragmento no vacío, una vez por tipo."""
+        from app.services.text_vectorization_service import normalize_text
+
+        key = self._normalization_key(normalization_type)
+        if key not in self._normalized:
+            normalized = (normalize_text(chunk.text, key) for chunk in self.chunks)
+            self._normalized[key] = [text for text in normalized if text]
+        return self._normalized[key]
+
+    def tokens(self, normalization_type) -> List[str]:
+        """Tokens del texto normalizado (todos los fragmentos), una vez por tipo."""
+        key = self._normalization_key(normalization_type)
+        if key not in self._tokens:
+            self._tokens[key] = [
+                token for text in self.normalized_chunks(key) for token in text.split()
+            ]
+        return self._tokens[key]
+
+    @cached_property
+    def sections(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Offsets (inicio, fin) en `text` del contenido de cada sección.
+
+        El contenido va desde la línea siguiente al encabezado hasta la línea
+        anterior al próximo encabezado; si una sección se repite, gana la última.
+        """
+        sections: Dict[str, Tuple[int, int]] = {}
+        current, start, offset = None, 0, 0
+        for line in self.lines:
+            header = section_header(line)
+            if header:
+                if current:
+                    sections[current] = (start, max(start, offset - 1))
+                current, start = header, min(offset + len(line) + 1, len(self.text))
+            offset += len(line) + 1
+        if current:
+            sections[current] = (start, len(self.text))
+        return sections
+
+    def section_text(self, name: str) -> str:
+        start, end = self.sections.get(name, (0, 0))
+        return self.text[start:end]
@@ -15,13 +15,79 @@ Este módulo es crítico para Phase 2A - sin parsing correcto, no hay datos.
 
 import re
 import logging
+from functools import lru_cache
 from typing import List, Optional, Dict, Tuple
 from datetime import datetime
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, builder_registry
 from pydantic import BaseModel, Field, validator
 
+from app.core.config import settings
+
+try:
+    import lxml.html as lxml_html
+    from lxml import etree
+except ImportError:  # lxml es opcional: sin él se parsea el documento completo con html.parser
+    lxml_html = None
+
 logger = logging.getLogger(__name__)
 
+FALLBACK_PARSER_BACKEND = "html.parser"
+
+
+# ============================================================================
+# Backend de parseo
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def parser_backend(name: Optional[str] = None) -> str:
+    """
+    Tree builder de BeautifulSoup a usar para HTML del scraping.
+    
+    lxml (C) construye el árbol varias veces más rápido que html.parser
+    (Python puro). Si el backend pedido no está instalado se usa html.parser.
+    """
+    name = name or settings.HTML_PARSER_BACKEND
+    if builder_registry.lookup(name) is None:
+        logger.warning(f"Backend HTML '{name}' no disponible, usando {FALLBACK_PARSER_BACKEND}")
+        return FALLBACK_PARSER_BACKEND
+    return name
+
+
+def make_soup(markup, parse_only=None, backend: Optional[str] = None) -> BeautifulSoup:
+    """
+    BeautifulSoup con el backend configurado.
+    
+    Args:
+        markup: HTML (str o bytes)
+        parse_only: SoupStrainer/filtro para construir solo parte del árbol
+        backend: Backend explícito (por defecto HTML_PARSER_BACKEND)
+    """
+    return BeautifulSoup(markup, parser_backend(backend), parse_only=parse_only)
+
+
+def select_fragments(markup: str, xpath: str) -> Optional[str]:
+    """
+    HTML de solo los nodos que coinciden con `xpath`, recortado con lxml.
+    
+    lxml parsea y serializa en C, así BeautifulSoup (que procesa cada
+    etiqueta en Python) solo construye los nodos que se van a usar.
+    
+    Returns:
+        Fragmentos concatenados ("" si no hay coincidencias), o None si lxml
+        no está disponible o no pudo parsear el documento
+    """
+    if lxml_html is None or not markup:
+        return None
+    try:
+        document = lxml_html.document_fromstring(markup)
+    except (etree.ParserError, ValueError) as e:
+        logger.debug(f"lxml no pudo parsear el documento: {e}")
+        return None
+    return "".join(
+        lxml_html.tostring(node, encoding="unicode", with_tail=False)
+        for node in document.xpath(xpath)
+    )
+
 
 # ============================================================================
 # Data Models
@@ -236,7 +302,7 @@ class HTMLParserService:
             ValueError: Si no se pueden extraer datos requeridos
         """
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = make_soup(html)
             
             # Extraer campos principales (adaptar selectores según estructura HTML)
             title = self._extract_text(soup, 'h1.job-title, .titulo-puesto, h1')
@@ -0,0 +1,346 @@
+"""
+🔀 Hybrid Retrieval - Pipeline de dos etapas para matching de empleos
+
+Etapa 1 (léxica, barata): índice invertido de términos normalizados sobre
+los empleos cacheados. Recupera un conjunto ACOTADO de candidatos por
+solapamiento de términos/skills ponderado por IDF.
+
+Etapa 2 (semántica, cara): re-rankea SOLO los mejores candidatos de la
+etapa 1 con similitud coseno de vectores spaCy (job_embedding_index).
+
+Cada etapa tiene límite de candidatos y presupuesto de tiempo propios
+(settings.HYBRID_*). Si una etapa agota su presupuesto se detiene y
+entrega lo que alcanzó a procesar; los tiempos por etapa se devuelven
+en el resultado para poder ajustar los límites.
+
+Uso:
+----
+from app.services.hybrid_retrieval_service import hybrid_retrieval_service
+
+hybrid_retrieval_service.index_texts({job.id: job_document_text(job)})
+result = hybrid_retrieval_service.retrieve("python fastapi docker", limit=10)
+# result.candidates -> [RetrievalCandidate(job_id, score, ...), ...]
+# result.stages     -> {"lexical": {...elapsed_ms...}, "semantic": {...}}
+"""
+
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.services.job_embedding_index import job_embedding_index, job_document_text
+from app.services.text_vectorization_service import normalize_text, NormalizationType
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# ESTRUCTURAS DE RESULTADO
+# ============================================================================
+
+@dataclass
+class RetrievalCandidate:
+    """Candidato del pipeline con los scores de cada etapa."""
+    job_id: int
+    lexical_score: float
+    matched_terms: List[str] = field(default_factory=list)
+    semantic_score: Optional[float] = None
+    score: float = 0.0
+
+    @property
+    def reranked(self) -> bool:
+        return self.semantic_score is not None
+
+    def to_details(self) -> Dict:
+        return {
+            "lexical_score": round(self.lexical_score, 4),
+            "semantic_score": round(self.semantic_score, 4) if self.reranked else None,
+            "matched_terms": self.matched_terms,
+            "reranked": self.reranked,
+        }
+
+
+@dataclass
+class RetrievalResult:
+    """Resultado del pipeline: candidatos ordenados + métricas por etapa."""
+    candidates: List[RetrievalCandidate]
+    stages: Dict[str, Dict]
+    total_ms: float
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+# ============================================================================
+# ETAPA 1: ÍNDICE LÉXICO
+# ============================================================================
+
+class LexicalJobIndex:
+    """
+    Índice invertido término -> {job_id: tf} sobre textos normalizados.
+
+    El score de un empleo es la suma del IDF de los términos de la consulta
+    que contiene, dividida por el IDF total de la consulta (rango [0, 1]).
+    Los términos se recorren de mayor a menor IDF, así que al cortar por
+    presupuesto se descartan primero los términos menos informativos.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._terms_by_job: Dict[int, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._terms_by_job)
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        normalized = normalize_text(text, NormalizationType.AGGRESSIVE)
+        return normalized.split() if normalized else []
+
+    def add(self, job_id: int, text: str) -> None:
+        """Agrega o reemplaza el documento de un empleo."""
+        counts = Counter(self.tokenize(text))
+        with self._lock:
+            self._remove_unlocked(job_id)
+            for term, tf in counts.items():
+                self._postings[term][job_id] = tf
+            self._terms_by_job[job_id] = list(counts)
+
+    def remove(self, job_ids: Iterable[int]) -> int:
+        removed = 0
+        with self._lock:
+            for job_id in job_ids:
+                removed += self._remove_unlocked(job_id)
+        return removed
+
+    def _remove_unlocked(self, job_id: int) -> int:
+        terms = self._terms_by_job.pop(job_id, None)
+        if terms is None:
+            return 0
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(job_id, None)
+                if not posting:
+                    del self._postings[term]
+        return 1
+
+    def idf(self, term: str) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (len(self._terms_by_job) - df + 0.5) / (df + 0.5))
+
+    def search(
+        self,
+        query_text: str,
+        limit: int,
+        budget_ms: float,
+    ) -> Dict:
+        """
+        Recupera hasta `limit` candidatos por solapamiento de términos.
+
+        Returns:
+            Dict con `candidates` (ordenados) y métricas de la etapa
+        """
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        terms = list(dict.fromkeys(self.tokenize(query_text)))
+
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, List[str]] = defaultdict(list)
+        terms_scanned = 0
+        truncated = False
+
+        with self._lock:
+            weighted_terms = sorted(
+                ((term, self.idf(term)) for term in terms if term in self._postings),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            query_weight = sum(self.idf(term) for term in terms) or 1.0
+
+            for term, idf in weighted_terms:
+                if time.perf_counter() > deadline:
+                    truncated = True
+                    break
+                for job_id in self._postings[term]:
+                    scores[job_id] += idf
+                    matched[job_id].append(term)
+                terms_scanned += 1
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        candidates = [
+            RetrievalCandidate(
+                job_id=job_id,
+                lexical_score=min(1.0, score / query_weight),
+                matched_terms=matched[job_id],
+            )
+            for job_id, score in best
+        ]
+
+        return {
+            "candidates": candidates,
+            "stats": {
+                "query_terms": len(terms),
+                "terms_scanned": terms_scanned,
+                "matched_jobs": len(scores),
+                "candidates": len(candidates),
+                "limit": limit,
+                "budget_ms": budget_ms,
+                "elapsed_ms": _elapsed_ms(start),
+                "truncated": truncated,
+            },
+        }
+
+
+# ============================================================================
+# PIPELINE HÍBRIDO
+# ============================================================================
+
+class HybridRetrievalService:
+    """
+    Orquesta las dos etapas: candidatos léxicos -> re-rank semántico.
+
+    El re-rank solo reordena el prefijo de candidatos que alcanzó a
+    procesar; el resto conserva el orden léxico detrás de ellos.
+    """
+
+    RERANK_BATCH_SIZE = 64
+
+    def __init__(self, lexical_index: Optional[LexicalJobIndex] = None, embedding_index=None):
+        # `is None`: los índices vacíos son falsy (__len__ == 0)
+        self.lexical_index = LexicalJobIndex() if lexical_index is None else lexical_index
+        self.embedding_index = job_embedding_index if embedding_index is None else embedding_index
+        # Si ya se cargaron los empleos de la BD (el índice puede tener solo
+        # los de un scrape reciente y aun así no estar completo)
+        self.warmed = False
+
+    # ------------------------------------------------------------------
+    # Mantenimiento del índice léxico
+    # ------------------------------------------------------------------
+
+    def index_texts(self, texts_by_id: Dict[int, str]) -> int:
+        for job_id, text in texts_by_id.items():
+            self.lexical_index.add(job_id, text)
+        return len(texts_by_id)
+
+    def index_jobs(self, jobs: Iterable) -> int:
+        """Indexa objetos JobPosition en la etapa léxica (requiere `id`)."""
+        return self.index_texts({job.id: job_document_text(job) for job in jobs if job.id})
+
+    def warm(self, jobs: Iterable) -> int:
+        """Carga inicial desde la BD: indexa `jobs` y marca el índice como completo."""
+        indexed = self.index_jobs(jobs)
+        self.warmed = True
+        return indexed
+
+    def remove_jobs(self, job_ids: Iterable[int]) -> int:
+        return self.lexical_index.remove(job_ids)
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def _rerank(
+        self,
+        query_text: str,
+        candidates: List[RetrievalCandidate],
+        limit: int,
+        budget_ms: float,
+    ) -> Dict:
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        pool = candidates[:limit]
+        stats = {
+            "candidates": len(pool),
+            "reranked": 0,
+            "limit": limit,
+            "budget_ms": budget_ms,
+            "truncated": False,
+            "skipped": None,
+        }
+
+        if not pool:
+            stats["skipped"] = "sin candidatos"
+        elif not len(self.embedding_index):
+            stats["skipped"] = "índice de embeddings vacío"
+        else:
+            try:
+                query_vector = self.embedding_index.encode_texts([query_text])[0]
+                for offset in range(0, len(pool), self.RERANK_BATCH_SIZE):
+                    if time.perf_counter() > deadline:
+                        stats["truncated"] = True
+                        break
+                    batch = pool[offset:offset + self.RERANK_BATCH_SIZE]
+                    scores = self.embedding_index.score_ids(
+                        query_vector, [candidate.job_id for candidate in batch]
+                    )
+                    for candidate in batch:
+                        if candidate.job_id in scores:
+                            candidate.semantic_score = max(0.0, scores[candidate.job_id])
+                            stats["reranked"] += 1
+            except Exception as e:
+                # Sin modelo spaCy con vectores: se conserva el orden léxico
+                logger.warning(f"⚠️  Re-rank semántico omitido: {e}")
+                stats["skipped"] = str(e)
+
+        stats["elapsed_ms"] = _elapsed_ms(start)
+        return stats
+
+    def retrieve(
+        self,
+        query_text: str,
+        limit: int = 10,
+        lexical_limit: Optional[int] = None,
+        lexical_budget_ms: Optional[float] = None,
+        semantic_limit: Optional[int] = None,
+        semantic_budget_ms: Optional[float] = None,
+        semantic_weight: Optional[float] = None,
+    ) -> RetrievalResult:
+        """
+        Ejecuta el pipeline completo.
+
+        Args:
+            query_text: Texto del perfil (skills + proyectos + objetivo)
+            limit: Número de resultados finales
+            lexical_limit / lexical_budget_ms: Límites de la etapa 1
+            semantic_limit / semantic_budget_ms: Límites de la etapa 2
+            semantic_weight: Peso del score semántico en el score final
+
+        Returns:
+            RetrievalResult con candidatos ordenados y métricas por etapa
+        """
+        start = time.perf_counter()
+        lexical_limit = lexical_limit or settings.HYBRID_LEXICAL_CANDIDATES
+        lexical_budget_ms = lexical_budget_ms or settings.HYBRID_LEXICAL_BUDGET_MS
+        semantic_limit = semantic_limit or settings.HYBRID_SEMANTIC_CANDIDATES
+        semantic_budget_ms = semantic_budget_ms or settings.HYBRID_SEMANTIC_BUDGET_MS
+        weight = settings.HYBRID_SEMANTIC_WEIGHT if semantic_weight is None else semantic_weight
+
+        lexical = self.lexical_index.search(query_text, lexical_limit, lexical_budget_ms)
+        candidates = lexical["candidates"]
+        semantic_stats = self._rerank(query_text, candidates, semantic_limit, semantic_budget_ms)
+
+        reranked = [c for c in candidates if c.reranked]
+        remaining = [c for c in candidates if not c.reranked]
+        for candidate in reranked:
+            candidate.score = weight * candidate.semantic_score + (1 - weight) * candidate.lexical_score
+        for candidate in remaining:
+            candidate.score = candidate.lexical_score
+        reranked.sort(key=lambda c: c.score, reverse=True)
+
+        return RetrievalResult(
+            candidates=(reranked + remaining)[:limit],
+            stages={"lexical": lexical["stats"], "semantic": semantic_stats},
+            total_ms=_elapsed_ms(start),
+        )
+
+
+# Instancia compartida del pipeline
+hybrid_retrieval_service = HybridRetrievalService()
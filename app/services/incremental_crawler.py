@@ -0,0 +1,265 @@
+"""
+🧭 Incremental Crawler - Actualizaciones de búsquedas de OCC solo con el delta
+
+Cada alerta o seguimiento de una búsqueda volvía a paginar OCC desde la
+página 1 y a pedir el detalle de ofertas que ya estaban en `job_positions`.
+El crawler incremental recuerda, por búsqueda (keyword + ubicación +
+filtros) y consumidor (`scope`: cada alerta, el tracker), la huella de cada
+tarjeta del listado ya vista (tabla `occ_crawl_states`):
+
+1. Pagina ordenando por fecha (lo más nuevo primero).
+2. Clasifica cada tarjeta: nueva, modificada (cambió su huella) o conocida.
+3. Deja de paginar en la primera página cuyas tarjetas son todas conocidas
+   y sin cambios: lo que sigue ya se vio en corridas anteriores.
+4. Pide detalles (en paralelo, OCCScraper._fetch_detail_outcomes) solo de
+   tarjetas nuevas o modificadas. Si un detalle falla su huella no se
+   guarda, así se reintenta en la siguiente corrida.
+
+La huella no incluye campos que cambian solos con el tiempo ("Hace 2
+días", destacada, nueva). Los errores al leer o guardar el estado nunca
+rompen la búsqueda: se registran y la corrida se trata como la primera.
+
+Uso:
+----
+from app.services.incremental_crawler import incremental_crawler
+
+result = await incremental_crawler.crawl(filters, scope=f"alert:{alert.id}")
+for job in result.delta:          # nuevas + modificadas
+    await app_manager.save_job_offer(job)
+"""
+
+import hashlib
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from app.core.config import settings
+from app.models import OCCCrawlState
+from app.services.occ_scraper_service import JobOffer, OCCScraper, SearchFilters
+from app.utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+# Campos de la tarjeta que definen si una oferta cambió
+CARD_FIELDS = (
+    "title", "company", "company_verified", "location", "salary", "description",
+    "benefits", "job_type", "work_mode", "category", "experience_required",
+    "education_required", "skills", "company_logo",
+)
+
+
+# ============================================================================
+# HUELLAS
+# ============================================================================
+
+def card_fingerprint(job: JobOffer) -> str:
+    """SHA-256 de los campos estables de la tarjeta del listado."""
+    data = {name: getattr(job, name) for name in CARD_FIELDS}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def crawl_key(filters: SearchFilters, scope: str) -> str:
+    """SHA-256 de alcance + filtros de la búsqueda (sin la página)."""
+    data = {"scope": scope, **filters.dict(exclude={"page"})}
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CrawlResult:
+    """Resultado de una actualización incremental."""
+    new: List[JobOffer] = field(default_factory=list)
+    changed: List[JobOffer] = field(default_factory=list)
+    unchanged: int = 0
+    pages_fetched: int = 0
+    total_results: int = 0
+    first_run: bool = True
+    stopped_early: bool = False
+    details: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def delta(self) -> List[JobOffer]:
+        return self.new + self.changed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "new": len(self.new),
+            "changed": len(self.changed),
+            "unchanged": self.unchanged,
+            "pages_fetched": self.pages_fetched,
+            "total_results": self.total_results,
+            "first_run": self.first_run,
+            "stopped_early": self.stopped_early,
+            "details": self.details,
+        }
+
+
+# ============================================================================
+# CRAWLER
+# ============================================================================
+
+class IncrementalCrawler:
+    """Pagina búsquedas de OCC hasta llegar a tarjetas ya conocidas."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        max_pages: Optional[int] = None,
+        max_cards: Optional[int] = None,
+    ):
+        self._session_factory = session_factory
+        self.max_pages = max(1, max_pages or settings.OCC_INCREMENTAL_MAX_PAGES)
+        self.max_cards = max(1, max_cards or settings.OCC_INCREMENTAL_MAX_CARDS)
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+        return self._session_factory()
+
+    async def crawl(
+        self,
+        filters: SearchFilters,
+        scope: str = "default",
+        scraper: Optional[OCCScraper] = None,
+        fetch_details: bool = True,
+        baseline_pages: Optional[int] = None,
+    ) -> CrawlResult:
+        """
+        Actualiza una búsqueda: solo tarjetas nuevas o modificadas.
+
+        Args:
+            filters: Filtros de la búsqueda (se fuerza sort_by="date")
+            scope: Consumidor del estado (p. ej. "alert:12"); cada uno ve su propio delta
+            scraper: OCCScraper abierto a reutilizar (si no, se abre uno)
+            fetch_details: Pedir detalles completos de las tarjetas nuevas/modificadas
+            baseline_pages: Páginas a recorrer si la búsqueda aún no tiene
+                estado (por defecto max_pages)
+        """
+        if scraper is None:
+            async with OCCScraper() as scraper:
+                return await self.crawl(filters, scope, scraper, fetch_details, baseline_pages)
+
+        filters = filters.copy(update={"sort_by": "date", "page": 1})
+        key = crawl_key(filters, scope)
+        known = await self._load_cards(key)
+        result = CrawlResult(first_run=known is None)
+        known = known or {}
+        max_pages = self.max_pages if known else min(self.max_pages, baseline_pages or self.max_pages)
+
+        seen: Dict[str, str] = {}
+        newest_job_ids: List[str] = []
+        for page in range(1, max_pages + 1):
+            jobs, total = await scraper.search_jobs(filters.copy(update={"page": page}))
+            result.pages_fetched += 1
+            if page == 1:
+                result.total_results = total
+                newest_job_ids = [job.job_id for job in jobs]
+            if not jobs:
+                break
+
+            page_unchanged = True
+            for job in jobs:
+                if job.job_id in seen:  # Repetida entre páginas
+                    continue
+                seen[job.job_id] = card_fingerprint(job)
+                if job.job_id not in known:
+                    result.new.append(job)
+                elif known[job.job_id] != seen[job.job_id]:
+                    result.changed.append(job)
+                else:
+                    result.unchanged += 1
+                    continue
+                page_unchanged = False
+
+            if page_unchanged:
+                result.stopped_early = page < max_pages
+                break
+
+        if fetch_details and result.delta:
+            await self._fetch_details(scraper, result, seen)
+
+        await self._save(key, scope, filters, known, seen, newest_job_ids, result)
+        logger.info(f"Crawl incremental '{filters.keyword}' [{scope}]: {result.to_dict()}")
+        return result
+
+    async def _fetch_details(self, scraper: OCCScraper, result: CrawlResult, seen: Dict[str, str]) -> None:
+        """Detalles del delta; las huellas de los que fallan no se guardan (se reintentan)."""
+        outcomes = await scraper._fetch_detail_outcomes(result.delta)
+        by_id = {job.job_id: job for job, _ in outcomes}
+        for job, outcome in outcomes:
+            if outcome != "enriched":
+                seen.pop(job.job_id, None)
+        result.new = [by_id.get(job.job_id, job) for job in result.new]
+        result.changed = [by_id.get(job.job_id, job) for job in result.changed]
+        result.details = dict(Counter(outcome for _, outcome in outcomes))
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+
+    async def _load_cards(self, key: str) -> Optional[Dict[str, str]]:
+        """Huellas conocidas de la búsqueda, o None si nunca se recorrió."""
+        try:
+            async with self._session() as session:
+                state = (await session.execute(
+                    select(OCCCrawlState).where(OCCCrawlState.query_key == key)
+                )).scalars().first()
+        except Exception as e:
+            logger.warning(f"No se pudo leer el estado de crawling {key[:12]}: {e}")
+            return None
+        return json.loads(state.cards) if state is not None else None
+
+    def _merge_cards(self, known: Dict[str, str], seen: Dict[str, str]) -> Dict[str, str]:
+        """Huellas conocidas + vistas ahora (al final: las más recientes), acotadas."""
+        cards = {job_id: fingerprint for job_id, fingerprint in known.items() if job_id not in seen}
+        cards.update(seen)
+        if len(cards) > self.max_cards:
+            cards = dict(list(cards.items())[-self.max_cards:])
+        return cards
+
+    async def _save(
+        self,
+        key: str,
+        scope: str,
+        filters: SearchFilters,
+        known: Dict[str, str],
+        seen: Dict[str, str],
+        newest_job_ids: List[str],
+        result: CrawlResult,
+    ) -> None:
+        try:
+            async with self._session() as session:
+                state = (await session.execute(
+                    select(OCCCrawlState).where(OCCCrawlState.query_key == key)
+                )).scalars().first()
+                if state is None:
+                    state = OCCCrawlState(
+                        query_key=key,
+                        scope=scope,
+                        keyword=filters.keyword,
+                        location=filters.location,
+                        filters=json.dumps(filters.dict(exclude={"page"}), default=str),
+                    )
+                state.cards = json.dumps(self._merge_cards(known, seen))
+                state.newest_job_ids = json.dumps(newest_job_ids)
+                state.runs += 1
+                state.last_pages_fetched = result.pages_fetched
+                state.last_new = len(result.new)
+                state.last_changed = len(result.changed)
+                state.last_crawled_at = utc_now()
+                session.add(state)
+                await session.commit()
+        except IntegrityError:
+            # Otra corrida creó el estado de la misma búsqueda al mismo tiempo
+            logger.warning(f"Estado de crawling {key[:12]} creado en paralelo; se conserva el otro")
+        except Exception as e:
+            logger.warning(f"No se pudo guardar el estado de crawling {key[:12]}: {e}")
+
+
+# Instancia global
+incremental_crawler = IncrementalCrawler()
@@ -3,7 +3,7 @@ Servicio para gestionar aplicaciones de empleo y seguimiento de solicitudes
 Versión asincrónica para FastAPI/PostgreSQL con asyncpg
 """
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Dict, List, Optional, Tuple
 import asyncio
 import logging
@@ -20,7 +20,11 @@ from ..models.job_scraping import (
     ScrapingLogDB
 )
 from ..models import JobPosition  # Usar modelo unificado
+from ..utils.datetime_utils import utc_now
 from .occ_scraper_service import OCCScraper, SearchFilters, JobOffer
+from .job_embedding_index import job_embedding_index
+from .hybrid_retrieval_service import hybrid_retrieval_service
+from .incremental_crawler import incremental_crawler
 
 logger = logging.getLogger(__name__)
 
@@ -81,10 +85,10 @@ class JobApplicationManager:
                 
                 # ✅ Metadatos de cache
                 existing_job.source = "occ"
-                existing_job.scraped_at = datetime.utcnow()
+                existing_job.scraped_at = utc_now()
                 existing_job.is_active = True
-                existing_job.expires_at = datetime.utcnow() + timedelta(days=7)
-                existing_job.updated_at = datetime.utcnow()
+                existing_job.expires_at = utc_now() + timedelta(days=7)
+                existing_job.updated_at = utc_now()
                 
                 self.db_session.add(existing_job)
                 # ✅ NO hacer commit aquí, lo hace save_scraped_jobs()
@@ -123,9 +127,9 @@ class JobApplicationManager:
                 
                 # ✅ Metadatos de cache
                 source="occ",
-                scraped_at=datetime.utcnow(),
+                scraped_at=utc_now(),
                 is_active=True,
-                expires_at=datetime.utcnow() + timedelta(days=7),
+                expires_at=utc_now() + timedelta(days=7),
             )
             
             self.db_session.add(job_db)
@@ -186,7 +190,7 @@ class JobApplicationManager:
                 raise ValueError("Aplicación no encontrada")
             
             application.status = status
-            application.updated_at = datetime.utcnow()
+            application.updated_at = utc_now()
             if notes:
                 application.notes = notes
             
@@ -240,7 +244,7 @@ class JobApplicationManager:
             status_counts = dict(result.all())
             
             # Aplicaciones recientes (último mes) (ASYNC)
-            last_month = datetime.utcnow() - timedelta(days=30)
+            last_month = utc_now() - timedelta(days=30)
             recent_query = select(func.count(JobApplicationDB.id)).where(
                 JobApplicationDB.user_id == user_id,
                 JobApplicationDB.created_at >= last_month
@@ -345,7 +349,7 @@ class JobSearchManager:
     async def get_popular_searches(self, days: int = 7, limit: int = 10) -> List[Dict]:
         """Obtiene las búsquedas más populares en los últimos días"""
         try:
-            start_date = datetime.utcnow() - timedelta(days=days)
+            start_date = utc_now() - timedelta(days=days)
             
             query = select(
                 SearchQueryDB.keyword,
@@ -452,7 +456,7 @@ class JobAlertManager:
     
     async def _get_alerts_to_check(self) -> List[UserJobAlertDB]:
         """Obtiene alertas que necesitan ser verificadas"""
-        now = datetime.utcnow()
+        now = utc_now()
         
         # Calcular tiempo mínimo desde última notificación según frecuencia
         daily_cutoff = now - timedelta(hours=24)
@@ -481,7 +485,8 @@ class JobAlertManager:
         try:
             new_jobs = []
             
-            # Buscar empleos para cada keyword
+            # Buscar empleos para cada keyword: solo el delta desde la última
+            # verificación de esta alerta (crawling incremental)
             for keyword in alert.keywords:
                 filters = SearchFilters(
                     keyword=keyword,
@@ -491,24 +496,27 @@ class JobAlertManager:
                     page=1
                 )
                 
-                jobs, _ = await self.search_manager.perform_search_and_save(
-                    alert.user_id, filters
+                crawl = await incremental_crawler.crawl(
+                    filters, scope=f"alert:{alert.id}", fetch_details=False, baseline_pages=1
                 )
+                for job in crawl.delta:
+                    await self.search_manager.app_manager.save_job_offer(job)
                 
-                # Filtrar solo empleos nuevos (últimas 24h)
-                recent_jobs = [
-                    job for job in jobs 
-                    if any(term in job.publication_date.lower() 
-                          for term in ["hoy", "ayer"])
-                ]
-                
-                new_jobs.extend(recent_jobs)
+                if crawl.first_run:
+                    # Sin estado previo: solo empleos de las últimas 24h
+                    new_jobs.extend(
+                        job for job in crawl.new
+                        if any(term in (job.publication_date or "").lower()
+                              for term in ["hoy", "ayer"])
+                    )
+                else:
+                    new_jobs.extend(crawl.new)
                 
                 # Delay para no sobrecargar el servidor
                 await asyncio.sleep(2)
             
             # Actualizar última notificación (ASYNC)
-            alert.last_notification = datetime.utcnow()
+            alert.last_notification = utc_now()
             self.db_session.add(alert)
             await self.db_session.commit()
             
@@ -556,17 +564,19 @@ class JobCacheManager:
         """
         try:
             saved_count = 0
+            saved_jobs = []
             
             for job in jobs:
                 try:
                     # Reutiliza save_job_offer() que ya hace deduplicación (ASYNC)
                     job_db = await self.app_manager.save_job_offer(job)
+                    saved_jobs.append(job_db)
                     
                     # Actualizar campos de cache específicos
                     job_db.source = source
-                    job_db.scraped_at = datetime.utcnow()
+                    job_db.scraped_at = utc_now()
                     job_db.is_active = True
-                    job_db.expires_at = datetime.utcnow() + timedelta(days=self.cache_ttl_days)
+                    job_db.expires_at = utc_now() + timedelta(days=self.cache_ttl_days)
                     
                     self.db_session.add(job_db)
                     saved_count += 1
@@ -584,6 +594,8 @@ class JobCacheManager:
                 logger.error(f"❌ Error al commitear empleos en cache: {e}")
                 raise
             
+            await self._index_jobs(saved_jobs)
+            
             return saved_count
             
         except Exception as e:
@@ -591,6 +603,23 @@ class JobCacheManager:
             logger.error(f"Error guardando empleos scrapeados: {e}")
             raise
     
+    async def _index_jobs(self, jobs: List[JobPosition]) -> None:
+        """
+        Agrega/actualiza empleos en los índices de matching (léxico y
+        de embeddings semántico).
+        
+        Best-effort: si no hay modelos spaCy con vectores, el matching
+        semántico simplemente queda deshabilitado y el cache sigue funcionando.
+        """
+        if not jobs:
+            return
+        try:
+            await asyncio.to_thread(hybrid_retrieval_service.index_jobs, jobs)
+            indexed = await asyncio.to_thread(job_embedding_index.upsert_jobs, jobs)
+            logger.debug(f"🧭 {indexed} empleos indexados para matching semántico")
+        except Exception as e:
+            logger.warning(f"⚠️  No se pudo actualizar el índice de embeddings: {e}")
+    
     async def get_cached_jobs(self, filters: Optional[Dict] = None, 
                        limit: int = 100, offset: int = 0) -> Tuple[List[JobPosition], int]:
         """
@@ -618,7 +647,7 @@ class JobCacheManager:
             query = select(JobPosition).where(
                 JobPosition.source == "occ",
                 JobPosition.is_active == True,
-                JobPosition.expires_at > datetime.utcnow()
+                JobPosition.expires_at > utc_now()
             )
             
             # Aplicar filtros
@@ -652,7 +681,7 @@ class JobCacheManager:
             count_query = select(func.count(JobPosition.id)).select_from(JobPosition).where(
                 JobPosition.source == "occ",
                 JobPosition.is_active == True,
-                JobPosition.expires_at > datetime.utcnow()
+                JobPosition.expires_at > utc_now()
             )
             
             # Aplicar los mismos filtros al conteo
@@ -700,7 +729,7 @@ class JobCacheManager:
             Cantidad de empleos invalidados
         """
         try:
-            cutoff_date = datetime.utcnow() - timedelta(days=max_age_days)
+            cutoff_date = utc_now() - timedelta(days=max_age_days)
             
             # Query para encontrar empleos expirados (ASYNC)
             query = select(JobPosition).where(
@@ -715,11 +744,16 @@ class JobCacheManager:
             # Soft-delete: marcar como inactivos (ASYNC)
             for job in expired_jobs:
                 job.is_active = False
-                job.updated_at = datetime.utcnow()
+                job.updated_at = utc_now()
                 self.db_session.add(job)
             
             await self.db_session.commit()
             
+            # Los empleos expirados dejan de ser candidatos (léxicos y semánticos)
+            expired_ids = [job.id for job in expired_jobs]
+            await asyncio.to_thread(job_embedding_index.remove, expired_ids)
+            hybrid_retrieval_service.remove_jobs(expired_ids)
+            
             logger.info(f"♻️  {len(expired_jobs)} empleos invalidados (edad > {max_age_days} días)")
             
             return len(expired_jobs)
@@ -753,7 +787,7 @@ class JobCacheManager:
             expired_query = select(func.count(JobPosition.id)).where(
                 JobPosition.is_active == True,
                 JobPosition.source == "occ",
-                JobPosition.expires_at <= datetime.utcnow()
+                JobPosition.expires_at <= utc_now()
             )
             result = await self.db_session.execute(expired_query)
             expired_count = result.scalar() or 0
@@ -780,7 +814,7 @@ class JobCacheManager:
             
             # Edad promedio (ASYNC)
             avg_age_query = select(
-                func.avg(func.extract('epoch', datetime.utcnow() - JobPosition.scraped_at))
+                func.avg(func.extract('epoch', utc_now() - JobPosition.scraped_at))
             ).where(
                 JobPosition.is_active == True,
                 JobPosition.source == "occ"
@@ -798,7 +832,7 @@ class JobCacheManager:
                 "top_locations": top_locations,
                 "cache_efficiency": round((total_active / max(total_active + inactive_count, 1)) * 100, 2),
                 "next_cleanup_recommended": expired_count > 100,  # Recomendar si hay >100 expirados
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now().isoformat()
             }
             
         except Exception as e:
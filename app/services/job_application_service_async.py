@@ -21,6 +21,8 @@ from ..models.job_scraping import (
 )
 from ..models import JobPosition  # Usar modelo unificado
 from .occ_scraper_service import OCCScraper, SearchFilters, JobOffer
+from .job_embedding_index import job_embedding_index
+from .hybrid_retrieval_service import hybrid_retrieval_service
 
 logger = logging.getLogger(__name__)
 
@@ -556,11 +558,13 @@ class JobCacheManager:
         """
         try:
             saved_count = 0
+            saved_jobs = []
             
             for job in jobs:
                 try:
                     # Reutiliza save_job_offer() que ya hace deduplicación (ASYNC)
                     job_db = await self.app_manager.save_job_offer(job)
+                    saved_jobs.append(job_db)
                     
                     # Actualizar campos de cache específicos
                     job_db.source = source
@@ -584,6 +588,8 @@ class JobCacheManager:
                 logger.error(f"❌ Error al commitear empleos en cache: {e}")
                 raise
             
+            await self._index_jobs(saved_jobs)
+            
             return saved_count
             
         except Exception as e:
@@ -591,6 +597,23 @@ class JobCacheManager:
             logger.error(f"Error guardando empleos scrapeados: {e}")
             raise
     
+    async def _index_jobs(self, jobs: List[JobPosition]) -> None:
+        """
+        Agrega/actualiza empleos en los índices de matching (léxico y
+        de embeddings semántico).
+        
+        Best-effort: si no hay modelos spaCy con vectores, el matching
+        semántico simplemente queda deshabilitado y el cache sigue funcionando.
+        """
+        if not jobs:
+            return
+        try:
+            await asyncio.to_thread(hybrid_retrieval_service.index_jobs, jobs)
+            indexed = await asyncio.to_thread(job_embedding_index.upsert_jobs, jobs)
+            logger.debug(f"🧭 {indexed} empleos indexados para matching semántico")
+        except Exception as e:
+            logger.warning(f"⚠️  No se pudo actualizar el índice de embeddings: {e}")
+    
     async def get_cached_jobs(self, filters: Optional[Dict] = None, 
                        limit: int = 100, offset: int = 0) -> Tuple[List[JobPosition], int]:
         """
@@ -720,6 +743,11 @@ class JobCacheManager:
             
             await self.db_session.commit()
             
+            # Los empleos expirados dejan de ser candidatos (léxicos y semánticos)
+            expired_ids = [job.id for job in expired_jobs]
+            await asyncio.to_thread(job_embedding_index.remove, expired_ids)
+            hybrid_retrieval_service.remove_jobs(expired_ids)
+            
             logger.info(f"♻️  {len(expired_jobs)} empleos invalidados (edad > {max_age_days} días)")
             
             return len(expired_jobs)
@@ -0,0 +1,450 @@
+"""
+🧪 Job Background Enrichment - Enriquecimiento de empleos tras la ingesta
+
+Los empleos se guardan tal como llegan del scraping y skills, salario o
+modalidad se derivaban sobre la marcha al consultarlos. Este servicio los
+enriquece una sola vez, en segundo plano:
+
+1. Lectura por lotes con keyset pagination de empleos activos sin
+   enriquecer, enriquecidos con otra versión o actualizados después de la
+   última revisión (job_positions LEFT JOIN job_enrichments).
+2. Hash de contenido (título, empresa, descripción, salario... + versión):
+   si un re-scrape dejó el empleo igual solo se actualiza checked_at.
+3. Análisis del lote en un CPU executor propio, de prioridad baja y con
+   JOB_ENRICHMENT_WORKERS procesos (no compite con el pool de peticiones),
+   con un solo `analyze_many` de spaCy (si hay modelos): skills (keywords + términos técnicos), salario,
+   modalidad y tipo de contrato normalizados e idioma.
+4. Vectorización del lote en el índice de embeddings con el mismo texto
+   que `job_document_text` (best-effort) y
+   escritura de todas las filas de job_enrichments en una transacción.
+
+El worker corre cada JOB_ENRICHMENT_POLL_SECONDS y `notify()` lo despierta
+en cuanto el scraping guarda empleos nuevos.
+
+Uso:
+----
+from app.services.job_background_enrichment import job_background_enricher
+
+stats = await job_background_enricher.run_once()
+enrichments = await job_background_enricher.get([job.id for job in jobs])
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.cpu_executor import CPUExecutor, PROCESS
+from app.models import JobEnrichment, JobPosition
+from app.utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+ENRICHMENT_VERSION = "1"  # Subirla re-enriquece todos los empleos
+ENRICHED = "enriched"
+FAILED = "failed"
+
+_WORK_MODES = {"Remoto": "remoto", "Híbrido": "híbrido", "Presencial": "presencial"}
+_JOB_TYPES = {
+    "Tiempo Completo": "full-time",
+    "Tiempo Parcial": "part-time",
+    "Freelance": "freelance",
+    "Temporal": "temporary",
+}
+_SALARY_AMOUNT = re.compile(r"(\d[\d.,]*)\s*(k\b|mil\b)?")
+_SALARY_PERIODS = [
+    (re.compile(r"hora"), "hour"),
+    (re.compile(r"quincena|quincenal"), "biweekly"),
+    (re.compile(r"semana|semanal"), "week"),
+    (re.compile(r"anual|al año|por año"), "year"),
+    (re.compile(r"mensual|al mes|por mes"), "month"),
+]
+_SKILL_ESCAPES = re.compile(r"\\b|\\|\?")  # Restos de los patrones de _extract_skills_from_text
+
+
+# ============================================================================
+# DERIVACIÓN DE CAMPOS (funciones puras, se ejecutan en el CPU executor)
+# ============================================================================
+
+def job_content_hash(job: Dict[str, Any]) -> str:
+    """SHA-256 del contenido que alimenta el enriquecimiento (y su versión)."""
+    fields = [
+        ENRICHMENT_VERSION,
+        job.get("title"), job.get("company"), job.get("location"), job.get("description"),
+        job.get("requirements"), job.get("salary_range"), job.get("job_type"), job.get("work_mode"),
+        job.get("skills"),
+    ]
+    return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _to_amount(number: str, thousands: str) -> Optional[float]:
+    digits = number.rstrip(".,")
+    if "," in digits and "." in digits:
+        digits = digits.replace(",", "")
+    elif "," in digits:
+        digits = digits.replace(",", "") if re.fullmatch(r"\d{1,3}(,\d{3})+", digits) else digits.replace(",", ".")
+    elif re.fullmatch(r"\d{1,3}(\.\d{3})+", digits) and not thousands:
+        digits = digits.replace(".", "")
+    try:
+        value = float(digits)
+    except ValueError:
+        return None
+    return value * 1000 if thousands else value
+
+
+def parse_salary(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Rango salarial de un texto como "$35,000 - $45,000 MXN Mensual" o "30k-40k".
+
+    Returns:
+        {"min", "max", "currency", "period"} o None si no hay montos
+        (p. ej. "Sueldo no mostrado por la empresa")
+    """
+    if not text:
+        return None
+    lowered = text.lower()
+    amounts = [
+        amount for amount in (_to_amount(number, thousands) for number, thousands in _SALARY_AMOUNT.findall(lowered))
+        if amount and amount >= 1
+    ][:2]
+    if not amounts:
+        return None
+    return {
+        "min": min(amounts),
+        "max": max(amounts),
+        "currency": "USD" if re.search(r"usd|us\$|d[oó]lar", lowered) else "MXN",
+        "period": next((period for pattern, period in _SALARY_PERIODS if pattern.search(lowered)), None),
+    }
+
+
+def _merge_skills(*groups: Iterable[str]) -> List[str]:
+    """Une listas de skills sin duplicados (sin distinguir mayúsculas), en orden."""
+    seen, merged = set(), []
+    for group in groups:
+        for skill in group or []:
+            name = _SKILL_ESCAPES.sub("", str(skill)).strip()
+            if name and name.lower() not in seen:
+                seen.add(name.lower())
+                merged.append(name)
+    return merged
+
+
+def _stored_skills(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    try:
+        skills = json.loads(value)
+    except (TypeError, ValueError):
+        return [part.strip() for part in value.split(",")]
+    return skills if isinstance(skills, list) else []
+
+
+def derive_fields(job: Dict[str, Any], analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Campos normalizados de un empleo (dict con las columnas de JobPosition).
+
+    Reutiliza los detectores por keywords de OCCScraper; `analysis` (salida
+    de SpacyNLPService.analyze) agrega sus términos técnicos a las skills.
+    """
+    from app.services.language_id_service import detect_language
+    from app.services.occ_scraper_service import OCCScraper
+
+    detectors = OCCScraper()
+    title, description = job.get("title") or "", job.get("description") or ""
+    text = " ".join(part for part in (title, description, job.get("requirements") or "") if part)
+
+    work_mode = _WORK_MODES.get(detectors._detect_work_mode(job.get("work_mode") or ""))
+    work_mode = work_mode or _WORK_MODES.get(detectors._detect_work_mode(text))
+    job_type = _JOB_TYPES.get(detectors._detect_job_type(f"{job.get('job_type') or ''} {text}"))
+    tech_terms = sorted(term.title() for term in (analysis or {}).get("tech_terms", []))
+    language = detect_language(f"{title}. {description}")
+
+    return {
+        "skills": _merge_skills(_stored_skills(job.get("skills")), detectors._extract_skills_from_text(text), tech_terms),
+        "salary": parse_salary(job.get("salary_range")),
+        "work_mode": work_mode,
+        "job_type": job_type,
+        "language": language.language,
+        "language_confidence": round(language.confidence, 3),
+    }
+
+
+def _analyze_texts(texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Un `analyze_many` de spaCy para todo el lote; sin modelos, None por texto."""
+    try:
+        from app.services.spacy_nlp_service import get_nlp_service
+
+        nlp = get_nlp_service()
+        if nlp.model is not None:
+            return nlp.analyze_many(texts)
+    except Exception as e:
+        logger.warning(f"⚠️  Enriquecimiento sin spaCy (solo keywords): {e}")
+    return [None] * len(texts)
+
+
+def enrich_batch(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Deriva los campos de un lote de empleos (se ejecuta en el CPU executor).
+
+    Returns:
+        Por empleo, en el mismo orden: los campos de `derive_fields` o
+        {"error": mensaje} si ese empleo falló
+    """
+    texts = [f"{job.get('title') or ''}\n{job.get('description') or ''}" for job in jobs]
+    results = []
+    for job, analysis in zip(jobs, _analyze_texts(texts)):
+        try:
+            results.append(derive_fields(job, analysis))
+        except Exception as e:
+            results.append({"error": (str(e) or type(e).__name__)[:500]})
+    return results
+
+
+def _job_values(job: JobPosition) -> Dict[str, Any]:
+    columns = ("id", "title", "company", "location", "description", "requirements",
+               "salary_range", "job_type", "work_mode", "skills")
+    return {column: getattr(job, column) for column in columns}
+
+
+# ============================================================================
+# ENRIQUECEDOR EN SEGUNDO PLANO
+# ============================================================================
+
+class JobBackgroundEnricher:
+    """Enriquece por lotes los empleos nuevos o cambiados (tabla job_enrichments)."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        batch_size: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        vectorize: Optional[bool] = None,
+        workers: Optional[int] = None,
+        cpu_kind: str = PROCESS,
+    ):
+        self._session_factory = session_factory
+        self.batch_size = max(1, batch_size or settings.JOB_ENRICHMENT_BATCH_SIZE)
+        self.poll_seconds = poll_seconds or settings.JOB_ENRICHMENT_POLL_SECONDS
+        self.vectorize = settings.JOB_ENRICHMENT_VECTORIZE if vectorize is None else vectorize
+        self.workers = settings.JOB_ENRICHMENT_WORKERS if workers is None else workers
+        self.cpu_kind = cpu_kind
+        # Pool propio (no el del servidor): pocos procesos, prioridad baja, sin timeout por lote
+        self.executor = CPUExecutor(
+            process_workers=self.workers,
+            max_queue=max(1, self.workers) * 2,
+            default_timeout=0,
+            nice=settings.JOB_ENRICHMENT_NICE,
+        )
+        self.counts: Counter = Counter()  # selected, enriched, skipped, failed, vectorized
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock = asyncio.Lock()
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+        return self._session_factory()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Una pasada sobre todos los empleos pendientes, lote por lote.
+
+        Returns:
+            Conteos de la pasada (selected, enriched, skipped, failed, vectorized)
+        """
+        async with self._lock:
+            counts: Counter = Counter()
+            after_id = 0
+            while True:
+                rows = await self._next_batch(after_id)
+                if not rows:
+                    break
+                after_id = rows[-1][0].id
+                counts.update(await self._process(rows))
+            self.counts.update(counts)
+            if counts["selected"]:
+                logger.info(f"🧪 Enriquecimiento de empleos: {dict(counts)}")
+            return dict(counts)
+
+    async def get(self, job_ids: Iterable[int]) -> Dict[int, JobEnrichment]:
+        """Enriquecimientos guardados por job_position_id."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return {}
+        async with self._session() as session:
+            result = await session.execute(
+                select(JobEnrichment).where(JobEnrichment.job_position_id.in_(job_ids))
+            )
+            return {row.job_position_id: row for row in result.scalars().all()}
+
+    def notify(self) -> None:
+        """Despierta al worker (p. ej. tras guardar empleos nuevos)."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self.running, "version": ENRICHMENT_VERSION, **self.counts}
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._loop(), name="job-enrichment")
+        logger.info("🧪 Enriquecimiento de empleos en segundo plano iniciado")
+
+    async def stop(self) -> None:
+        """Detiene el worker; un lote a medias se vuelve a tomar en la siguiente pasada."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._wakeup = None
+        self.executor.shutdown(wait=False)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                self._wakeup.clear()
+                await self.run_once()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"🧪 Error en el enriquecimiento de empleos: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_seconds)
+
+    # ------------------------------------------------------------------
+    # Lotes
+    # ------------------------------------------------------------------
+
+    async def _next_batch(self, after_id: int) -> List[Tuple[JobPosition, Optional[JobEnrichment]]]:
+        """Empleos activos sin enriquecer, con otra versión o actualizados desde la última revisión."""
+        async with self._session() as session:
+            result = await session.execute(
+                select(JobPosition, JobEnrichment)
+                .outerjoin(JobEnrichment, JobEnrichment.job_position_id == JobPosition.id)
+                .where(
+                    JobPosition.id > after_id,
+                    JobPosition.is_active == True,  # noqa: E712
+                    or_(
+                        JobEnrichment.id.is_(None),
+                        JobEnrichment.version != ENRICHMENT_VERSION,
+                        JobPosition.updated_at > JobEnrichment.checked_at,
+                    ),
+                )
+                .order_by(JobPosition.id)
+                .limit(self.batch_size)
+            )
+            return [(row[0], row[1]) for row in result.all()]
+
+    async def _process(self, rows: List[Tuple[JobPosition, Optional[JobEnrichment]]]) -> Counter:
+        counts: Counter = Counter(selected=len(rows))
+        now = utc_now()
+        pending: List[Tuple[Dict[str, Any], str, Optional[JobEnrichment]]] = []
+        skipped: List[JobEnrichment] = []
+        for job, enrichment in rows:
+            values = _job_values(job)
+            digest = job_content_hash(values)
+            if enrichment is not None and enrichment.content_hash == digest:
+                skipped.append(enrichment)
+            else:
+                pending.append((values, digest, enrichment))
+        counts["skipped"] = len(skipped)
+
+        results: List[Dict[str, Any]] = []
+        if pending:
+            try:
+                results = await self.executor.run(
+                    enrich_batch, [values for values, _, _ in pending], kind=self.cpu_kind
+                )
+            except Exception as e:
+                # Executor ocupado, timeout...: el lote se reintenta en la siguiente pasada
+                logger.error(f"❌ Lote de {len(pending)} empleos sin enriquecer: {e}")
+                counts["deferred"] = len(pending)
+                pending = []
+
+        jobs = {job.id: job for job, _ in rows}
+        vectorized = await self._vectorize(jobs, pending, results) if pending else set()
+        counts["vectorized"] = len(vectorized)
+
+        async with self._session() as session:
+            for enrichment in skipped:
+                enrichment.checked_at = now
+                session.add(enrichment)
+            for (values, digest, enrichment), fields in zip(pending, results):
+                enrichment = enrichment or JobEnrichment(job_position_id=values["id"], content_hash=digest,
+                                                         version=ENRICHMENT_VERSION)
+                self._apply(enrichment, digest, fields, values["id"] in vectorized, now)
+                counts[enrichment.status] += 1
+                session.add(enrichment)
+            await session.commit()
+        return counts
+
+    @staticmethod
+    def _apply(enrichment: JobEnrichment, digest: str, fields: Dict[str, Any], vectorized: bool, now: datetime) -> None:
+        enrichment.content_hash = digest
+        enrichment.version = ENRICHMENT_VERSION
+        enrichment.enriched_at = enrichment.checked_at = now
+        enrichment.vectorized = vectorized
+        if "error" in fields:
+            enrichment.status, enrichment.error = FAILED, fields["error"]
+            return
+        salary = fields["salary"] or {}
+        enrichment.status, enrichment.error = ENRICHED, None
+        enrichment.skills = json.dumps(fields["skills"], ensure_ascii=False)
+        enrichment.salary_min = salary.get("min")
+        enrichment.salary_max = salary.get("max")
+        enrichment.salary_currency = salary.get("currency")
+        enrichment.salary_period = salary.get("period")
+        enrichment.work_mode = fields["work_mode"]
+        enrichment.job_type = fields["job_type"]
+        enrichment.language = fields["language"]
+        enrichment.language_confidence = fields["language_confidence"]
+
+    async def _vectorize(
+        self, jobs: Dict[int, JobPosition], pending: List[tuple], results: List[Dict[str, Any]]
+    ) -> set:
+        """Agrega el lote al índice de embeddings (mismo texto que `upsert_jobs`)."""
+        if not self.vectorize:
+            return set()
+        try:
+            from app.services.job_embedding_index import job_document_text, job_embedding_index
+
+            texts = {
+                values["id"]: job_document_text(jobs[values["id"]])
+                for (values, _, _), fields in zip(pending, results)
+                if "error" not in fields
+            }
+            await asyncio.to_thread(job_embedding_index.upsert_texts, texts)
+        except Exception as e:
+            logger.warning(f"⚠️  Empleos enriquecidos sin vectorizar: {e}")
+            return set()
+        return set(texts)
+
+
+# Instancia global
+job_background_enricher = JobBackgroundEnricher()
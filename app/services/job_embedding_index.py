@@ -0,0 +1,551 @@
+"""
+🧭 Job Embedding Index - Matching semántico por vecinos más cercanos
+
+Mantiene los vectores de documento de todos los empleos activos en una única
+matriz NumPy L2-normalizada y responde consultas top-k a partir del vector del
+perfil de un estudiante.
+
+Por qué existe:
+- `SpacyNLPService.similarity()` parsea ambos textos por cada par
+  (estudiante, empleo), inviable para rankear miles de vacantes.
+- Aquí los vectores de empleos se calculan UNA vez (al ingerir) y cada
+  consulta es un producto matriz-vector sobre datos contiguos.
+
+Características:
+- Matriz float32, opcionalmente cuantizada a float16 o int8 (escala por fila)
+- Índice IVF (inverted file) implementado localmente con k-means en NumPy;
+  por debajo de EMBEDDING_INDEX_MIN_TRAIN_SIZE se usa búsqueda exacta
+- Altas/bajas incrementales (ingesta de empleos / expiración)
+- Persistencia a disco (.npz) y recarga sin recomputar vectores
+
+Uso:
+----
+from app.services.job_embedding_index import job_embedding_index
+
+job_embedding_index.upsert_texts({job.id: f"{job.title} {job.description}"})
+matches = job_embedding_index.search_text("Python FastAPI Docker", top_k=10)
+# -> [(job_id, score), ...] con score coseno en [-1, 1]
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+SUPPORTED_DTYPES = {"float32", "float16", "int8"}
+INT8_SCALE = 127.0
+
+
+# ============================================================================
+# FUNCIONES AUXILIARES
+# ============================================================================
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Normaliza filas a norma L2 unitaria (float32).
+
+    Las filas con norma cero se dejan en cero para que nunca aparezcan
+    como vecinos relevantes.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors.reshape(1, -1)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _kmeans(
+    data: np.ndarray, n_clusters: int, n_iter: int = 10, seed: int = 42
+) -> np.ndarray:
+    """
+    K-means esférico mínimo para entrenar los centroides IVF.
+
+    Como los datos están L2-normalizados, se asigna por producto punto
+    (equivalente a coseno) y los centroides se re-normalizan en cada paso.
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = min(n_clusters, len(data))
+    centroids = data[rng.choice(len(data), size=n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments = np.argmax(data @ centroids.T, axis=1)
+        for cluster in range(n_clusters):
+            members = data[assignments == cluster]
+            if len(members):
+                centroids[cluster] = members.mean(axis=0)
+            else:
+                # Centroide vacío: re-sembrar con un punto aleatorio
+                centroids[cluster] = data[rng.integers(len(data))]
+        centroids = l2_normalize(centroids)
+
+    return centroids
+
+
+def job_document_text(job) -> str:
+    """Texto representativo de un empleo para vectorizar (título + descripción + skills)."""
+    parts = [job.title or "", job.description or ""]
+    if getattr(job, "skills", None):
+        parts.append(str(job.skills))
+    return " ".join(part for part in parts if part)
+
+
+# ============================================================================
+# ÍNDICE DE EMBEDDINGS
+# ============================================================================
+
+class JobEmbeddingIndex:
+    """
+    Índice vectorial de empleos con búsqueda top-k por similitud coseno.
+
+    Almacenamiento:
+    - `_matrix`: filas contiguas (dtype configurable), capacidad amortizada
+    - `_scales`: escala por fila (solo int8)
+    - `_active`: máscara de filas vigentes (las bajas son tombstones)
+    - `_row_by_id` / `_ids`: mapeo job_id <-> fila
+
+    Las bajas no mueven datos; cuando los tombstones superan el 25% de las
+    filas se compacta la matriz y se reconstruyen las listas IVF.
+    """
+
+    COMPACT_RATIO = 0.25
+
+    def __init__(
+        self,
+        dtype: Optional[str] = None,
+        nlist: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        min_train_size: Optional[int] = None,
+    ):
+        dtype = dtype or settings.EMBEDDING_INDEX_DTYPE
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"dtype no soportado: {dtype}. Usa uno de {sorted(SUPPORTED_DTYPES)}"
+            )
+
+        self.dtype = dtype
+        self.nlist = nlist or settings.EMBEDDING_INDEX_NLIST
+        self.nprobe = nprobe or settings.EMBEDDING_INDEX_NPROBE
+        self.min_train_size = (
+            min_train_size if min_train_size is not None
+            else settings.EMBEDDING_INDEX_MIN_TRAIN_SIZE
+        )
+
+        self._lock = threading.RLock()
+        self._reset(dim=0)
+
+    def _reset(self, dim: int) -> None:
+        """Vacía el índice (mantiene configuración)."""
+        self.dim = dim
+        self._size = 0  # Filas usadas (incluye tombstones)
+        self._matrix = np.zeros((0, dim), dtype=self._storage_dtype)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._active = np.zeros(0, dtype=bool)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._row_by_id: Dict[int, int] = {}
+
+        # Estado IVF
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: List[List[int]] = []
+        self._list_cache: Dict[int, np.ndarray] = {}
+
+    # ------------------------------------------------------------------
+    # Propiedades
+    # ------------------------------------------------------------------
+
+    @property
+    def _storage_dtype(self):
+        return {"float32": np.float32, "float16": np.float16, "int8": np.int8}[self.dtype]
+
+    @property
+    def is_trained(self) -> bool:
+        """True si el índice IVF tiene centroides entrenados."""
+        return self._centroids is not None
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    def __contains__(self, job_id: int) -> bool:
+        return int(job_id) in self._row_by_id
+
+    # ------------------------------------------------------------------
+    # Cuantización
+    # ------------------------------------------------------------------
+
+    def _encode_rows(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Convierte filas normalizadas al dtype de almacenamiento."""
+        if self.dtype == "int8":
+            max_abs = np.abs(vectors).max(axis=1, initial=0.0)  # initial: filas de dimensión 0
+            max_abs[max_abs == 0] = 1.0
+            quantized = np.round(vectors / max_abs[:, None] * INT8_SCALE).astype(np.int8)
+            return quantized, (max_abs / INT8_SCALE).astype(np.float32)
+        return vectors.astype(self._storage_dtype), np.ones(len(vectors), dtype=np.float32)
+
+    def _scores_for_rows(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Producto punto de `query` contra las filas indicadas (float32)."""
+        block = self._matrix[rows]
+        scores = block.astype(np.float32, copy=False) @ query
+        if self.dtype == "int8":
+            scores *= self._scales[rows]
+        return scores
+
+    # ------------------------------------------------------------------
+    # Altas y bajas
+    # ------------------------------------------------------------------
+
+    def _ensure_capacity(self, extra: int) -> None:
+        needed = self._size + extra
+        capacity = len(self._matrix)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 64)
+
+        matrix = np.zeros((new_capacity, self.dim), dtype=self._storage_dtype)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+        for name, dtype in (("_scales", np.float32), ("_active", bool),
+                            ("_ids", np.int64), ("_assignments", np.int32)):
+            grown = np.zeros(new_capacity, dtype=dtype)
+            grown[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, grown)
+
+    def add(self, job_ids: Iterable[int], vectors: np.ndarray) -> int:
+        """
+        Agrega (o reemplaza) vectores de empleos.
+
+        Args:
+            job_ids: IDs de JobPosition
+            vectors: Matriz (n, dim) sin normalizar
+
+        Returns:
+            Número de vectores agregados
+        """
+        job_ids = [int(job_id) for job_id in job_ids]
+        if not job_ids:
+            return 0
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        if len(vectors) != len(job_ids):
+            raise ValueError("job_ids y vectors deben tener la misma longitud")
+        if vectors.shape[1] == 0:
+            # Modelo spaCy sin vectores (p. ej. *_sm): no hay nada que indexar
+            logger.warning(f"⚠️  {len(job_ids)} empleos sin indexar: el modelo no tiene vectores (dim 0)")
+            return 0
+
+        with self._lock:
+            if self.dim == 0:
+                self._reset(dim=vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Dimensión inválida: {vectors.shape[1]} (índice: {self.dim})"
+                )
+
+            # Reemplazo: dar de baja versiones anteriores
+            self._remove_rows([self._row_by_id[j] for j in job_ids if j in self._row_by_id])
+
+            normalized = l2_normalize(vectors)
+            encoded, scales = self._encode_rows(normalized)
+
+            self._ensure_capacity(len(job_ids))
+            start, end = self._size, self._size + len(job_ids)
+            self._matrix[start:end] = encoded
+            self._scales[start:end] = scales
+            self._active[start:end] = True
+            self._ids[start:end] = job_ids
+            for offset, job_id in enumerate(job_ids):
+                self._row_by_id[job_id] = start + offset
+            self._size = end
+
+            if self.is_trained:
+                assignments = np.argmax(normalized @ self._centroids.T, axis=1)
+                self._assignments[start:end] = assignments
+                for offset, cluster in enumerate(assignments):
+                    self._lists[cluster].append(start + offset)
+                    self._list_cache.pop(int(cluster), None)
+            elif len(self) >= self.min_train_size:
+                self.train()
+
+        return len(job_ids)
+
+    def _remove_rows(self, rows: List[int]) -> None:
+        for row in rows:
+            self._active[row] = False
+            self._row_by_id.pop(int(self._ids[row]), None)
+            if self.is_trained:
+                cluster = int(self._assignments[row])
+                self._lists[cluster].remove(row)
+                self._list_cache.pop(cluster, None)
+
+    def remove(self, job_ids: Iterable[int]) -> int:
+        """
+        Da de baja empleos (p. ej. al expirar o desactivarse).
+
+        Returns:
+            Número de empleos efectivamente removidos
+        """
+        with self._lock:
+            rows = [self._row_by_id[int(j)] for j in job_ids if int(j) in self._row_by_id]
+            self._remove_rows(rows)
+            tombstones = self._size - len(self)
+            if self._size and tombstones / self._size > self.COMPACT_RATIO:
+                self._compact()
+        return len(rows)
+
+    def _compact(self) -> None:
+        """Elimina tombstones y reconstruye el índice IVF si existía."""
+        live = np.flatnonzero(self._active[:self._size])
+        matrix = self._matrix[live].copy()
+        scales = self._scales[live].copy()
+        ids = self._ids[live].copy()
+        was_trained = self.is_trained
+
+        self._reset(dim=self.dim)
+        self._matrix = matrix
+        self._scales = scales
+        self._ids = ids
+        self._active = np.ones(len(live), dtype=bool)
+        self._assignments = np.zeros(len(live), dtype=np.int32)
+        self._size = len(live)
+        self._row_by_id = {int(job_id): row for row, job_id in enumerate(ids)}
+
+        if was_trained and len(self) >= self.min_train_size:
+            self.train()
+
+    # ------------------------------------------------------------------
+    # Entrenamiento IVF
+    # ------------------------------------------------------------------
+
+    def _decoded_rows(self, rows: np.ndarray) -> np.ndarray:
+        block = self._matrix[rows].astype(np.float32)
+        if self.dtype == "int8":
+            block *= self._scales[rows][:, None]
+        return block
+
+    def train(self, n_iter: int = 10) -> None:
+        """
+        Entrena centroides IVF sobre los vectores activos y reasigna listas.
+
+        Se llama automáticamente al alcanzar `min_train_size`; puede
+        invocarse manualmente tras una carga masiva para re-balancear.
+        """
+        with self._lock:
+            live = np.flatnonzero(self._active[:self._size])
+            if len(live) == 0:
+                return
+            data = l2_normalize(self._decoded_rows(live))
+            nlist = max(1, min(self.nlist, len(live) // 8 or 1))
+            self._centroids = _kmeans(data, nlist, n_iter=n_iter)
+
+            assignments = np.argmax(data @ self._centroids.T, axis=1).astype(np.int32)
+            self._assignments[live] = assignments
+            self._lists = [[] for _ in range(len(self._centroids))]
+            for row, cluster in zip(live.tolist(), assignments.tolist()):
+                self._lists[cluster].append(row)
+            self._list_cache = {}
+
+            logger.info(f"🧭 Índice IVF entrenado: {len(live)} vectores, {len(self._centroids)} listas")
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        if not self.is_trained:
+            return np.flatnonzero(self._active[:self._size])
+
+        centroid_scores = self._centroids @ query
+        nprobe = min(nprobe, len(self._centroids))
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+
+        arrays = []
+        for cluster in probes.tolist():
+            cached = self._list_cache.get(cluster)
+            if cached is None:
+                cached = np.asarray(self._lists[cluster], dtype=np.int64)
+                self._list_cache[cluster] = cached
+            arrays.append(cached)
+        return np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int64)
+
+    def search(
+        self,
+        query_vector: np.ndarray,
+        top_k: int = 10,
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Devuelve los `top_k` empleos más similares al vector de consulta.
+
+        Args:
+            query_vector: Vector del perfil del estudiante (sin normalizar)
+            top_k: Número de resultados
+            nprobe: Listas IVF a explorar (default: settings)
+
+        Returns:
+            Lista de (job_id, score_coseno) ordenada de mayor a menor
+        """
+        with self._lock:
+            if not len(self) or top_k <= 0:
+                return []
+
+            query = l2_normalize(query_vector)[0]
+            if query.shape[0] != self.dim:
+                raise ValueError(f"Dimensión inválida: {query.shape[0]} (índice: {self.dim})")
+            if not query.any():
+                return []
+
+            rows = self._candidate_rows(query, nprobe or self.nprobe)
+            if len(rows) == 0:
+                return []
+
+            scores = self._scores_for_rows(rows, query)
+            k = min(top_k, len(rows))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return [(int(self._ids[rows[i]]), float(scores[i])) for i in top]
+
+    def score_ids(self, query_vector: np.ndarray, job_ids: Iterable[int]) -> Dict[int, float]:
+        """
+        Similitud coseno de `query_vector` contra un subconjunto de empleos.
+
+        Usado para re-rankear candidatos ya filtrados (p. ej. por la etapa
+        léxica del pipeline híbrido). Los IDs no indexados se omiten.
+        """
+        with self._lock:
+            pairs = [(int(job_id), self._row_by_id.get(int(job_id))) for job_id in job_ids]
+            pairs = [(job_id, row) for job_id, row in pairs if row is not None]
+            if not pairs:
+                return {}
+
+            query = l2_normalize(query_vector)[0]
+            if query.shape[0] != self.dim:
+                raise ValueError(f"Dimensión inválida: {query.shape[0]} (índice: {self.dim})")
+
+            rows = np.fromiter((row for _, row in pairs), dtype=np.int64, count=len(pairs))
+            scores = self._scores_for_rows(rows, query)
+            return {job_id: float(score) for (job_id, _), score in zip(pairs, scores)}
+
+    # ------------------------------------------------------------------
+    # Integración con spaCy
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def encode_texts(texts: List[str]) -> np.ndarray:
+        """Vectoriza textos con el servicio spaCy (tokenizer + vectores)."""
+        from app.services.spacy_nlp_service import get_nlp_service
+
+        return get_nlp_service().get_document_vectors(texts)
+
+    def upsert_texts(self, texts_by_id: Dict[int, str]) -> int:
+        """Vectoriza y agrega/reemplaza empleos a partir de su texto."""
+        if not texts_by_id:
+            return 0
+        job_ids = list(texts_by_id.keys())
+        vectors = self.encode_texts([texts_by_id[job_id] for job_id in job_ids])
+        return self.add(job_ids, vectors)
+
+    def upsert_jobs(self, jobs: Iterable) -> int:
+        """Indexa objetos JobPosition (requiere `id` asignado)."""
+        return self.upsert_texts({job.id: job_document_text(job) for job in jobs if job.id})
+
+    def search_text(self, text: str, top_k: int = 10) -> List[Tuple[int, float]]:
+        """Atajo: vectoriza `text` y consulta el índice."""
+        if not len(self):
+            return []
+        return self.search(self.encode_texts([text])[0], top_k=top_k)
+
+    # ------------------------------------------------------------------
+    # Persistencia
+    # ------------------------------------------------------------------
+
+    def save(self, path: Optional[str] = None) -> str:
+        """
+        Persiste el índice en un archivo .npz (sin tombstones).
+
+        Returns:
+            Ruta del archivo escrito
+        """
+        path = path or settings.EMBEDDING_INDEX_PATH
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            live = np.flatnonzero(self._active[:self._size])
+            payload = {
+                "dtype": np.array(self.dtype),
+                "dim": np.array(self.dim),
+                "ids": self._ids[live],
+                "matrix": self._matrix[live],
+                "scales": self._scales[live],
+            }
+            if self.is_trained:
+                payload["centroids"] = self._centroids
+                payload["assignments"] = self._assignments[live]
+
+            # Escritura atómica: evita índices truncados si el proceso muere
+            tmp_path = f"{path}.tmp.npz"
+            np.savez(tmp_path, **payload)
+            os.replace(tmp_path, path)
+
+        logger.info(f"💾 Índice de embeddings guardado: {len(live)} vectores en {path}")
+        return path
+
+    def load(self, path: Optional[str] = None) -> bool:
+        """
+        Carga un índice persistido. Retorna False si el archivo no existe.
+        """
+        path = path or settings.EMBEDDING_INDEX_PATH
+        if not os.path.exists(path):
+            return False
+
+        with np.load(path, allow_pickle=False) as data, self._lock:
+            self.dtype = str(data["dtype"])
+            self._reset(dim=int(data["dim"]))
+            ids = data["ids"].astype(np.int64)
+
+            self._matrix = data["matrix"].astype(self._storage_dtype)
+            self._scales = data["scales"].astype(np.float32)
+            self._ids = ids
+            self._active = np.ones(len(ids), dtype=bool)
+            self._assignments = np.zeros(len(ids), dtype=np.int32)
+            self._size = len(ids)
+            self._row_by_id = {int(job_id): row for row, job_id in enumerate(ids)}
+
+            if "centroids" in data:
+                self._centroids = data["centroids"].astype(np.float32)
+                self._assignments = data["assignments"].astype(np.int32)
+                self._lists = [[] for _ in range(len(self._centroids))]
+                for row, cluster in enumerate(self._assignments.tolist()):
+                    self._lists[cluster].append(row)
+
+        logger.info(f"📂 Índice de embeddings cargado: {len(self)} vectores desde {path}")
+        return True
+
+    def stats(self) -> Dict[str, object]:
+        """Estadísticas para monitoreo/debug."""
+        return {
+            "vectors": len(self),
+            "rows_allocated": self._size,
+            "dim": self.dim,
+            "dtype": self.dtype,
+            "trained": self.is_trained,
+            "nlist": len(self._centroids) if self.is_trained else 0,
+            "nprobe": self.nprobe,
+            "matrix_bytes": int(self._matrix[:self._size].nbytes),
+        }
+
+
+# Instancia compartida del índice
+job_embedding_index = JobEmbeddingIndex()
@@ -11,11 +11,14 @@ This is a minimal MVP implementation focusing on core functionality.
 """
 
 import asyncio
+import json
 from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 import httpx
 from app.core.session_manager import get_session_manager
+from app.services.dedup_store import DedupStore, job_dedup_store
+from app.services.job_background_enrichment import derive_fields, job_background_enricher
 
 
 # ============================================================================
@@ -73,16 +76,21 @@ class JobScraperWorker:
         jobs = await worker.search_jobs("Python", "Remote", limit=20)
     """
     
-    def __init__(self, session_manager=None):
+    def __init__(self, session_manager=None, session_factory=None, dedup_store=None):
         """
         Initialize scraper worker.
         
         Args:
             session_manager: Optional custom SessionManager (for testing)
+            session_factory: Optional async session factory for the DB writer stage
+            dedup_store: Optional DedupStore; long-running workers should pass
+                the persistent `job_dedup_store` (default: in-memory, TTL-bounded)
         """
         self.session_manager = session_manager or get_session_manager()
-        self._seen_job_ids = set()  # Track seen jobs for deduplication
+        self._session_factory = session_factory
+        self.dedup_store = dedup_store or DedupStore(persistent=False)
         self._occ_scraper = None  # Lazy load OCCScraper when needed
+        self.last_pipeline_stats = None  # Per-stage metrics of the last scrape_occ_batch
     
     async def search_jobs(
         self,
@@ -108,18 +116,14 @@ class JobScraperWorker:
         jobs = []
         
         try:
-            # 1. Enforce rate limiting
-            await self.session_manager.adaptive_delay()
-            
-            # 2. Build search URL
+            # 1. Build search URL
             url = self._build_search_url(keyword, location)
             
-            # 3. Make HTTP request
-            session = await self.session_manager.get_session()
-            response = await session.get(url, timeout=30.0)
+            # 2. Make HTTP request (per-host rate limiting via SessionManager)
+            response = await self.session_manager.request("GET", url, timeout=30.0)
             response.raise_for_status()
             
-            # 4. Parse results (basic for MVP)
+            # 3. Parse results (basic for MVP)
             jobs = self._parse_jobs_basic(response.text, keyword)
             
             return jobs[:limit]
@@ -144,12 +148,13 @@ class JobScraperWorker:
         Returns:
             Tuple of (unique_jobs, num_duplicates_removed)
         """
+        new_ids = set(await self.dedup_store.filter_new(job.external_job_id for job in jobs))
         unique = []
         initial_count = len(jobs)
         
         for job in jobs:
-            if job.external_job_id not in self._seen_job_ids:
-                self._seen_job_ids.add(job.external_job_id)
+            if job.external_job_id in new_ids:
+                new_ids.discard(job.external_job_id)  # Repeated within the batch
                 unique.append(job)
         
         duplicates_removed = initial_count - len(unique)
@@ -159,11 +164,11 @@ class JobScraperWorker:
         """
         Enrich job data with additional information.
         
-        This is a placeholder for MVP. In production, this would:
-        - Extract skills using NLP
-        - Categorize job type
-        - Calculate salary range
-        - etc.
+        Applies the keyword-based part of the background enrichment
+        (app/services/job_background_enrichment.py): skills merged with
+        the detected ones, and normalized work mode and job type when the
+        source did not provide them. Stored jobs get the full enrichment
+        (spaCy, salary, language, vectors) in the background.
         
         Args:
             job: Job to enrich
@@ -171,9 +176,18 @@ class JobScraperWorker:
         Returns:
             Enriched job object
         """
-        # MVP: Just return as-is
-        # TODO: Implement NLP extraction
-        return job
+        fields = derive_fields({
+            "title": job.title,
+            "description": job.description,
+            "skills": json.dumps(job.skills),
+            "work_mode": job.work_mode,
+            "job_type": job.job_type,
+        })
+        return job.copy(update={
+            "skills": fields["skills"],
+            "work_mode": job.work_mode or fields["work_mode"],
+            "job_type": job.job_type or fields["job_type"],
+        })
     
     def _build_search_url(self, keyword: str, location: Optional[str]) -> str:
         """
@@ -223,7 +237,7 @@ class JobScraperWorker:
     
     def reset_duplicates_cache(self) -> None:
         """Reset the duplicates cache (useful for testing)"""
-        self._seen_job_ids.clear()
+        self.dedup_store.reset()
     
     # ============================================================================
     # OCC-SPECIFIC SCRAPING METHODS
@@ -273,22 +287,9 @@ class JobScraperWorker:
             # Transform to JobPostingMinimal
             results = []
             for offer in offers[:limit]:
-                try:
-                    minimal = JobPostingMinimal(
-                        external_job_id=offer.job_id,
-                        title=offer.title,
-                        company=offer.company,
-                        location=offer.location,
-                        description=offer.description or offer.full_description or "No description",
-                        skills=offer.skills or [],
-                        work_mode=offer.work_mode,
-                        job_type=offer.job_type,
-                        published_at=offer.publication_date or datetime.now(),
-                    )
+                minimal = self._to_minimal(offer)
+                if minimal is not None:
                     results.append(minimal)
-                except Exception as e:
-                    print(f"⚠️  Error transforming OCC job {offer.job_id}: {e}")
-                    continue
             
             return results
             
@@ -340,60 +341,166 @@ class JobScraperWorker:
             print(f"❌ Error fetching OCC job detail {job_id}: {e}")
             return None
 
+    @staticmethod
+    def _to_minimal(offer) -> Optional[JobPostingMinimal]:
+        """Converts an OCC JobOffer to JobPostingMinimal (None if it does not validate)."""
+        try:
+            return JobPostingMinimal(
+                external_job_id=offer.job_id,
+                title=offer.title,
+                company=offer.company,
+                location=offer.location,
+                description=offer.description or offer.full_description or "No description",
+                skills=offer.skills or [],
+                work_mode=offer.work_mode,
+                job_type=offer.job_type,
+                published_at=offer.publication_date or datetime.now(),
+            )
+        except Exception as e:
+            print(f"⚠️  Error transforming OCC job {offer.job_id}: {e}")
+            return None
+
     async def scrape_occ_batch(
         self,
         skill_location_pairs: List[tuple],
         limit_per_pair: int = 20,
+        pages: int = 1,
+        persist: bool = False,
+        config=None,
     ) -> JobScraperResult:
         """
         Batch scrapes multiple skill/location combinations.
         Useful for initial load or full catalog updates.
         
+        Runs as a staged pipeline (see app/services/scraping_pipeline.py):
+        fetch pool (SessionManager, per-host rate limits) → parse (CPU
+        executor) → transform (JobPostingMinimal + dedup) → batched DB
+        writer. Stages are connected by bounded queues, so a slow writer
+        slows fetching down instead of piling pages up in memory.
+        
         Args:
             skill_location_pairs: [("python", "mexico-city"), ("javascript", "remote"), ...]
-            limit_per_pair: Jobs to fetch per combination
+            limit_per_pair: Jobs to keep per page of each combination
+            pages: Result pages to fetch per combination
+            persist: Save the offers in job_positions (batched transactions)
+            config: Optional PipelineConfig (concurrency and queue sizes)
         
         Returns:
             JobScraperResult with aggregated results
+            (per-stage metrics in self.last_pipeline_stats)
             
         Example:
             pairs = [("python", "remote"), ("javascript", "mexico-city")]
             result = await worker.scrape_occ_batch(pairs, limit_per_pair=20)
         """
-        import time
-        
-        start_time = time.time()
-        all_jobs = []
+        from app.services.occ_scraper_service import OCCScraper, SearchFilters
+        from app.services.scraping_pipeline import ScrapingPipeline
+
+        parser = OCCScraper()
         duplicate_count = 0
-        
-        for skill, location in skill_location_pairs:
-            try:
-                jobs = await self.scrape_occ_jobs_by_skill(
-                    skill=skill,
-                    location=location,
-                    limit=limit_per_pair,
-                )
-                
-                # Deduplicate and add
-                unique_jobs, dupes = await self.deduplicate_jobs(jobs)
-                all_jobs.extend(unique_jobs)
-                duplicate_count += dupes
-                
-                # Respect rate limiting
-                await asyncio.sleep(1.5)
-                
-            except Exception as e:
-                print(f"⚠️  Error in batch for {skill}/{location}: {e}")
-                continue
-        
-        execution_time = time.time() - start_time
-        
+
+        async def fetch(filters: SearchFilters) -> tuple:
+            response = await self.session_manager.request(
+                "GET", parser._build_search_url(filters), timeout=30.0,
+            )
+            response.raise_for_status()
+            return filters.keyword, parser._decode_html(response.content)
+
+        def parse(raw: tuple) -> list:
+            keyword, html = raw
+            offers, _ = parser._parse_search_page(html, keyword)
+            return offers[:limit_per_pair]
+
+        claimed = set()  # Ids already emitted by this run (marked as seen only once saved)
+
+        async def transform(offers: list) -> list:
+            nonlocal duplicate_count
+            # Read-only check: a batch whose commit fails is scraped again next run
+            unseen = set(await self.dedup_store.filter_unseen(offer.job_id for offer in offers))
+            records = []
+            for offer in offers:
+                if offer.job_id not in unseen or offer.job_id in claimed:
+                    duplicate_count += 1
+                    continue
+                claimed.add(offer.job_id)
+                # Offers whose date does not validate as JobPostingMinimal are still saved
+                records.append((offer, self._to_minimal(offer)))
+            if not persist:
+                await self.dedup_store.mark_seen(offer.job_id for offer, _ in records)
+            return records
+
+        async def persist_batch(records: list) -> int:
+            saved = await self._persist_occ_offers(records)
+            await self.dedup_store.mark_seen(offer.job_id for offer, _ in records)
+            return saved
+
+        pipeline = ScrapingPipeline(
+            fetch=fetch,
+            parse=parse,
+            transform=transform,
+            persist=persist_batch if persist else None,
+            collect=True,
+            config=config,
+        )
+        items = (
+            SearchFilters(keyword=skill, location=location, page=page, sort_by="relevance")
+            for skill, location in skill_location_pairs
+            for page in range(1, max(1, pages) + 1)
+        )
+        result = await pipeline.run(items)
+        self.last_pipeline_stats = result.to_dict()  # Stage errors are already logged by the pipeline
+
+        all_jobs = [minimal for _, minimal in result.collected if minimal is not None]
         return JobScraperResult(
             query="batch_occ_scrape",
-            total_found=len(all_jobs) + duplicate_count,
+            total_found=len(result.collected) + duplicate_count,
             jobs=all_jobs,
             duplicates_removed=duplicate_count,
-            execution_time_ms=execution_time * 1000,
+            execution_time_ms=result.elapsed_seconds * 1000,
+        )
+
+    async def _persist_occ_offers(self, records: list) -> int:
+        """Batched writer stage: saves a batch of offers in one transaction."""
+        from app.services.job_application_service import JobApplicationManager
+
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+
+        async with self._session_factory() as session:
+            manager = JobApplicationManager(session)
+            for offer, _ in records:
+                await manager.save_job_offer(offer)
+            await session.commit()
+        job_background_enricher.notify()
+        return len(records)
+
+    async def enqueue_occ_batch(
+        self,
+        skill_location_pairs: List[tuple],
+        pages: int = 1,
+        priority: int = 0,
+        recrawl_seconds: int = 0,
+    ) -> int:
+        """
+        Queues skill/location combinations in the persistent crawl frontier
+        instead of scraping them in this process.
+
+        Any number of frontier workers (scripts/utilities/crawl_frontier_worker.py)
+        on one or more hosts drain the frontier in parallel; progress survives
+        crashes because it lives in the database.
+
+        Returns:
+            Number of new frontier pages
+
+        Example:
+            pairs = [("python", "remote"), ("javascript", "mexico-city")]
+            await worker.enqueue_occ_batch(pairs, pages=3, recrawl_seconds=6 * 3600)
+        """
+        from app.services.crawl_frontier import crawl_frontier
+
+        return await crawl_frontier.enqueue_many(
+            skill_location_pairs, pages=pages, priority=priority, recrawl_seconds=recrawl_seconds,
         )
 
 
@@ -404,7 +511,8 @@ class JobScraperWorker:
 async def scrape_jobs_service(
     keyword: str,
     location: Optional[str] = None,
-    limit: int = 20
+    limit: int = 20,
+    dedup_store: Optional[DedupStore] = None
 ) -> JobScraperResult:
     """
     Service function to scrape jobs with deduplication.
@@ -415,6 +523,8 @@ async def scrape_jobs_service(
         keyword: Search keyword
         location: Optional location filter
         limit: Max results to return
+        dedup_store: DedupStore to check ids against (default: the persistent
+            `job_dedup_store`, shared across calls and restarts)
         
     Returns:
         JobScraperResult with jobs and metrics
@@ -427,7 +537,7 @@ async def scrape_jobs_service(
     
     try:
         # Initialize worker
-        worker = JobScraperWorker()
+        worker = JobScraperWorker(dedup_store=dedup_store or job_dedup_store)
         
         # Search jobs
         jobs = await worker.search_jobs(keyword, location, limit)
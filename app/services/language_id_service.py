@@ -0,0 +1,236 @@
+"""
+🌐 Language ID - Identificación rápida de idioma (español / inglés)
+
+Componente ÚNICO de detección de idioma para el router de modelos spaCy
+(`SpacyNLPService.get_model_for_text`) y los extractores de CV.
+
+Antes cada componente buscaba por substring un puñado de palabras
+indicadoras sobre el texto COMPLETO en cada llamada, y podían discrepar
+(p. ej. el router elegía el modelo primario en empate y el extractor 'es').
+
+Método:
+- Perfiles de trigramas de caracteres por idioma, precalculados UNA vez al
+  importar el módulo a partir de un corpus semilla embebido.
+- Solo se analiza un prefijo acotado del texto (LANGUAGE_ID_PREFIX_CHARS).
+- Clasificador Naive Bayes sobre trigramas con suavizado; la confianza es
+  la probabilidad posterior del idioma ganador.
+- Cache LRU por hash del contenido analizado (blake2b del prefijo): un
+  mismo CV consultado N veces (router + extractores) se clasifica una vez.
+
+Uso:
+----
+from app.services.language_id_service import detect_language
+
+guess = detect_language(cv_text)
+guess.language     # 'es' | 'en'
+guess.confidence   # [0.5, 1.0]
+guess.reliable     # confidence >= LANGUAGE_ID_MIN_CONFIDENCE
+"""
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+
+SUPPORTED_LANGUAGES = ("es", "en")
+DEFAULT_LANGUAGE = "es"  # Plataforma UNRC: la mayoría de los CVs son en español
+
+_NON_LETTERS = re.compile(r"[^a-záéíóúüñ]+")
+
+# Corpus semilla para los perfiles: prosa general + vocabulario de CVs y
+# vacantes. Ampliarlo mejora la precisión sin cambiar el costo por consulta.
+_SEED_CORPUS = {
+    "es": """
+        El candidato cuenta con experiencia profesional en el desarrollo de
+        aplicaciones web y móviles. Durante los últimos años trabajé en una
+        empresa de tecnología donde lideré un equipo de cinco personas y
+        gestioné proyectos para clientes del sector financiero. Me gradué de
+        la licenciatura en ingeniería en sistemas de la universidad y
+        actualmente estudio una maestría en ciencia de datos. Mis
+        habilidades incluyen programación, análisis de información,
+        comunicación efectiva y trabajo en equipo. Busco una posición que me
+        permita crecer profesionalmente y aportar a los objetivos de la
+        organización. Educación, experiencia laboral, certificaciones,
+        idiomas: español nativo, inglés avanzado. Responsable de la
+        implementación de nuevas herramientas y de la mejora continua de los
+        procesos del área. Desarrollé un sistema para la administración de
+        inventarios que redujo los tiempos de entrega. También participé en
+        la capacitación del personal y en la elaboración de reportes para la
+        dirección general. La vacante requiere conocimientos de bases de
+        datos, disponibilidad para trabajar de manera presencial o remota y
+        capacidad para resolver problemas. Ofrecemos prestaciones de ley,
+        seguro de gastos médicos y un ambiente de trabajo agradable. Los
+        estudiantes de la universidad pueden postularse a las ofertas de
+        empleo publicadas por las empresas. Es importante que el perfil
+        del aspirante sea claro y que describa sus logros con detalle.
+        Nuestra compañía está ubicada en la ciudad de México y contamos con
+        oficinas en otras regiones del país.
+    """,
+    "en": """
+        The candidate has professional experience in the development of web
+        and mobile applications. Over the last few years I worked at a
+        technology company where I led a team of five people and managed
+        projects for clients in the financial sector. I graduated with a
+        bachelor's degree in computer engineering from the university and I
+        am currently pursuing a master's degree in data science. My skills
+        include programming, data analysis, effective communication and
+        teamwork. I am looking for a position that allows me to grow
+        professionally and contribute to the goals of the organization.
+        Education, work experience, certifications, languages: Spanish
+        native, English advanced. Responsible for the implementation of new
+        tools and the continuous improvement of the processes of the area. I
+        developed a system for inventory management that reduced delivery
+        times. I also participated in staff training and in the preparation
+        of reports for the executive board. The position requires knowledge
+        of databases, availability to work on site or remotely and the
+        ability to solve problems. We offer competitive benefits, health
+        insurance and a friendly work environment. Students of the
+        university can apply to the job offers published by the companies.
+        It is important that the profile of the applicant is clear and that
+        it describes their achievements in detail. Our company is located in
+        the city and we have offices in other regions of the country.
+    """,
+}
+
+
+@dataclass(frozen=True)
+class LanguageGuess:
+    """Resultado de la identificación de idioma."""
+    language: str
+    confidence: float
+
+    @property
+    def reliable(self) -> bool:
+        return self.confidence >= settings.LANGUAGE_ID_MIN_CONFIDENCE
+
+
+# ============================================================================
+# PERFILES DE TRIGRAMAS
+# ============================================================================
+
+def _normalize(text: str) -> str:
+    """Minúsculas, solo letras (con acentos/ñ) y un espacio como separador."""
+    return " " + _NON_LETTERS.sub(" ", text.lower()).strip() + " "
+
+
+def _trigrams(text: str) -> Counter:
+    normalized = _normalize(text)
+    return Counter(normalized[i:i + 3] for i in range(len(normalized) - 2))
+
+
+def _build_profile(corpus: str):
+    """
+    (log-probabilidades por trigrama, log-probabilidad de trigrama no visto).
+
+    Los no vistos reciben una fracción de la masa de un trigrama visto una
+    sola vez, para penalizarlos sin anular el resto de la evidencia.
+    """
+    counts = _trigrams(corpus)
+    denominator = sum(counts.values()) + len(counts)
+    log_probs = {gram: math.log(count / denominator) for gram, count in counts.items()}
+    return log_probs, math.log(0.1 / denominator)
+
+
+def _build_log_ratios() -> Dict[str, float]:
+    """
+    Tabla trigrama -> log P(t|es) - log P(t|en).
+
+    Con 2 idiomas el clasificador solo necesita la diferencia de
+    log-verosimilitudes, así que cada trigrama cuesta UNA búsqueda en dict.
+    Los trigramas que no aparecen en ningún perfil no aportan evidencia.
+    """
+    (es_probs, es_unseen), (en_probs, en_unseen) = (
+        _build_profile(_SEED_CORPUS["es"]), _build_profile(_SEED_CORPUS["en"])
+    )
+    return {
+        gram: es_probs.get(gram, es_unseen) - en_probs.get(gram, en_unseen)
+        for gram in es_probs.keys() | en_probs.keys()
+    }
+
+
+_LOG_RATIOS = _build_log_ratios()
+
+
+# ============================================================================
+# IDENTIFICADOR
+# ============================================================================
+
+class LanguageIdentifier:
+    """
+    Clasificador de idioma por trigramas con cache LRU por hash de contenido.
+
+    Thread-safe: el cache se protege con un lock (se usa desde el pool de
+    hilos del CPU executor y desde el event loop).
+    """
+
+    def __init__(self, prefix_chars: Optional[int] = None, cache_size: Optional[int] = None):
+        self.prefix_chars = prefix_chars or settings.LANGUAGE_ID_PREFIX_CHARS
+        self.cache_size = cache_size or settings.LANGUAGE_ID_CACHE_SIZE
+        self._cache: "OrderedDict[bytes, LanguageGuess]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _classify(self, text: str) -> LanguageGuess:
+        normalized = _normalize(text)
+        if len(normalized) < 3:
+            return LanguageGuess(DEFAULT_LANGUAGE, 0.5)
+
+        ratios = _LOG_RATIOS
+        diff = sum(ratios.get(normalized[i:i + 3], 0.0) for i in range(len(normalized) - 2))
+
+        # Posterior de 2 clases con prior uniforme: sigmoide de la diferencia
+        p_es = 1.0 / (1.0 + math.exp(-max(-50.0, min(50.0, diff))))
+        if p_es >= 0.5:
+            return LanguageGuess("es", round(p_es, 4))
+        return LanguageGuess("en", round(1.0 - p_es, 4))
+
+    def detect(self, text: str) -> LanguageGuess:
+        """Idioma del texto (solo se analiza el prefijo acotado)."""
+        prefix = (text or "")[:self.prefix_chars]
+        key = hashlib.blake2b(prefix.encode("utf-8", "ignore"), digest_size=16).digest()
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        guess = self._classify(prefix)
+
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = guess
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return guess
+
+    def cache_info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+            }
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+
+# Instancia compartida
+language_identifier = LanguageIdentifier()
+
+
+def detect_language(text: str) -> LanguageGuess:
+    """Atajo sobre `language_identifier.detect`."""
+    return language_identifier.detect(text)
@@ -4,22 +4,29 @@ Algoritmos de compatibilidad y recomendación
 Completamente asincrónico con AsyncSession
 """
 from typing import List, Dict, Tuple, Optional
+import asyncio
 import json
+import logging
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
 
-from app.models import Student, JobMatchEvent
+from app.models import Student, JobMatchEvent, JobPosition
 from app.schemas import JobItem, MatchResult, StudentPublic, MatchingCriteria
 from app.services.text_vectorization_service import text_vectorization_service
+from app.services.job_embedding_index import job_embedding_index
+from app.services.hybrid_retrieval_service import hybrid_retrieval_service
 from app.providers import job_provider_manager
 
+logger = logging.getLogger(__name__)
+
 
 class MatchingService:
     """Servicio principal de matching y recomendaciones"""
     
     def __init__(self):
         self.min_match_score = 0.1  # Puntuación mínima para considerar match
+        self._warm_lock = asyncio.Lock()
     
     def calculate_match_score(
         self,
@@ -188,6 +195,122 @@ class MatchingService:
             "generated_at": datetime.utcnow()
         }
     
+    def build_student_profile_text(self, student: Student) -> str:
+        """Texto del perfil usado como consulta semántica (skills + proyectos + objetivo)."""
+        parts = json.loads(student.skills or "[]") + json.loads(student.projects or "[]")
+        if student.objective:
+            parts.append(student.objective)
+        return " ".join(str(p) for p in parts if p)
+    
+    async def find_semantic_job_matches(self, session: AsyncSession, student_id: int,
+                                        top_k: int = 10) -> Dict[str, any]:
+        """
+        Recomendaciones semánticas contra el índice de embeddings de empleos - ASYNC
+        
+        A diferencia de find_job_recommendations (búsqueda externa + TF-IDF por par),
+        aquí solo se vectoriza el perfil del estudiante y se consulta el índice
+        precomputado (job_embedding_index); los empleos se cargan en una sola query.
+        """
+        student = await session.get(Student, student_id)
+        if not student:
+            raise ValueError(f"Estudiante con ID {student_id} no encontrado")
+        
+        profile_text = self.build_student_profile_text(student)
+        matches = job_embedding_index.search_text(profile_text, top_k=top_k) if profile_text else []
+        
+        jobs_by_id = {}
+        if matches:
+            result = await session.execute(
+                select(JobPosition).where(
+                    JobPosition.id.in_([job_id for job_id, _ in matches]),
+                    JobPosition.is_active == True
+                )
+            )
+            jobs_by_id = {job.id: job for job in result.scalars().all()}
+        
+        return {
+            "student_id": student_id,
+            "matches": [
+                {"job": jobs_by_id[job_id], "score": round(score, 4)}
+                for job_id, score in matches if job_id in jobs_by_id
+            ],
+            "index": job_embedding_index.stats(),
+            "generated_at": datetime.utcnow()
+        }
+
+    async def _warm_lexical_index(self, session: AsyncSession) -> None:
+        """
+        Carga los empleos activos al índice léxico una vez por proceso.
+
+        No basta con que el índice esté vacío: tras reiniciar, un scrape
+        puede indexar sus empleos antes de la primera consulta híbrida.
+        """
+        if hybrid_retrieval_service.warmed:
+            return
+        async with self._warm_lock:
+            if hybrid_retrieval_service.warmed:
+                return
+            result = await session.execute(
+                select(JobPosition).where(JobPosition.is_active == True)
+            )
+            indexed = await asyncio.to_thread(hybrid_retrieval_service.warm, result.scalars().all())
+            logger.info(f"🔀 Índice léxico inicializado con {indexed} empleos")
+
+    async def find_hybrid_job_matches(self, session: AsyncSession, student_id: int,
+                                      limit: int = 10,
+                                      lexical_limit: Optional[int] = None,
+                                      semantic_limit: Optional[int] = None) -> Dict[str, any]:
+        """
+        Recomendaciones con pipeline híbrido de dos etapas - ASYNC
+
+        1. Etapa léxica: candidatos acotados por solapamiento de términos/skills
+        2. Etapa semántica: re-rank de los mejores candidatos con vectores spaCy
+
+        Los límites y presupuestos por etapa vienen de settings.HYBRID_*;
+        los tiempos medidos se devuelven en `pipeline` para ajustarlos.
+        """
+        student = await session.get(Student, student_id)
+        if not student:
+            raise ValueError(f"Estudiante con ID {student_id} no encontrado")
+
+        await self._warm_lexical_index(session)
+
+        profile_text = self.build_student_profile_text(student)
+        retrieval = await asyncio.to_thread(
+            hybrid_retrieval_service.retrieve,
+            profile_text,
+            limit=limit,
+            lexical_limit=lexical_limit,
+            semantic_limit=semantic_limit,
+        )
+
+        jobs_by_id = {}
+        if retrieval.candidates:
+            result = await session.execute(
+                select(JobPosition).where(
+                    JobPosition.id.in_([c.job_id for c in retrieval.candidates]),
+                    JobPosition.is_active == True
+                )
+            )
+            jobs_by_id = {job.id: job for job in result.scalars().all()}
+
+        return {
+            "student_id": student_id,
+            "matches": [
+                {
+                    "job": jobs_by_id[c.job_id],
+                    "score": round(c.score, 4),
+                    "details": c.to_details()
+                }
+                for c in retrieval.candidates if c.job_id in jobs_by_id
+            ],
+            "pipeline": {
+                "stages": retrieval.stages,
+                "total_ms": retrieval.total_ms
+            },
+            "generated_at": datetime.utcnow()
+        }
+
     def _calculate_job_match_score(self, student: Student, job: JobItem) -> Tuple[float, Dict]:
         """
         Calcular score de compatibilidad entre estudiante y trabajo.
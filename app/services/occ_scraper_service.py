@@ -6,6 +6,9 @@ Permite extraer información de ofertas de trabajo y realizar búsquedas automat
 import asyncio
 import re
 import html
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlencode, urlparse, parse_qs
@@ -13,12 +16,15 @@ import json
 import logging
 
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from pydantic import BaseModel, Field
 from sqlmodel import SQLModel, Session, create_engine, select
 
 from ..core.database import get_session
 from ..core.config import settings
+from ..core.cpu_executor import run_cpu, THREAD
+from ..core.http_cache import caching_transport
+from .html_parser_service import make_soup, parser_backend, select_fragments
 
 # Configurar logging
 logger = logging.getLogger(__name__)
@@ -75,6 +81,63 @@ class SearchFilters(BaseModel):
     page: int = 1
 
 
+class HostLimiter:
+    """
+    Semáforo por host (cortesía con cada servidor de OCC) con métricas de
+    peticiones en vuelo.
+    """
+    
+    def __init__(self, per_host: int):
+        self.per_host = max(1, per_host)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.in_flight: Counter = Counter()
+        self.max_in_flight = 0
+        self.requests = 0
+    
+    @asynccontextmanager
+    async def slot(self, url: str):
+        host = urlparse(url).netloc
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            self.in_flight[host] += 1
+            self.requests += 1
+            self.max_in_flight = max(self.max_in_flight, sum(self.in_flight.values()))
+            try:
+                yield
+            finally:
+                self.in_flight[host] -= 1
+
+
+# Nodos de una página de resultados que usa el parser; el resto no se construye
+OFFER_CONTAINER_ATTR = "data-offers-grid-offer-item-container"
+TOTAL_OFFERS_ATTR = "data-total-offers"
+RESULTS_TEXT_PATTERN = re.compile(r'\d+\s+resultados?')
+_SEARCH_PAGE_NODE = f"@{OFFER_CONTAINER_ATTR} or @{TOTAL_OFFERS_ATTR}"
+SEARCH_PAGE_XPATH = f"//*[{_SEARCH_PAGE_NODE}][not(ancestor::*[{_SEARCH_PAGE_NODE}])]"
+
+
+def _is_search_page_node(attrs) -> bool:
+    attrs = attrs or {}
+    return OFFER_CONTAINER_ATTR in attrs or TOTAL_OFFERS_ATTR in attrs
+
+
+try:
+    from bs4.filter import ElementFilter
+except ImportError:  # bs4 < 4.13: SoupStrainer llama a la función con (nombre, atributos)
+    SEARCH_PAGE_STRAINER = SoupStrainer(lambda name, attrs: _is_search_page_node(attrs))
+else:
+    class _SearchPageFilter(ElementFilter):
+        """Solo crea contenedores de ofertas y el total (con todo su contenido)."""
+
+        def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+            return _is_search_page_node(attrs)
+
+        def allow_string_creation(self, string) -> bool:
+            return False
+
+    SEARCH_PAGE_STRAINER = _SearchPageFilter()
+
+
 class OCCScraper:
     """Servicio principal para web scraping de OCC.com.mx"""
     
@@ -94,12 +157,15 @@ class OCCScraper:
             'Cache-Control': 'no-cache',
             'Pragma': 'no-cache'
         }
+        self.host_limiter = HostLimiter(settings.OCC_DETAIL_PER_HOST_LIMIT)
+        self.detail_stats: Counter = Counter()  # Resultado de cada detalle pedido
     
     async def __aenter__(self):
         self.session = httpx.AsyncClient(
             headers=self.headers, 
             timeout=30.0,
-            follow_redirects=True  # Seguir redirects automáticamente
+            follow_redirects=True,  # Seguir redirects automáticamente
+            transport=caching_transport()  # Búsquedas y detalles repetidos: 304 o sin red
         )
         return self
     
@@ -167,22 +233,12 @@ class OCCScraper:
             if 'text/html' not in content_type:
                 logger.warning(f"Content-Type inesperado: {content_type}")
             
-            # Intentar decodificar el contenido correctamente
-            try:
-                html_content = response.content.decode('utf-8')
-            except UnicodeDecodeError:
-                try:
-                    html_content = response.content.decode('latin-1')
-                except UnicodeDecodeError:
-                    html_content = response.content.decode('utf-8', errors='ignore')
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
+            html_content = self._decode_html(response.content)
             
-            # Extraer total de resultados
-            total_results = self._extract_total_results(soup)
-            
-            # Extraer ofertas de trabajo
-            job_offers = self._extract_job_offers(soup, filters.keyword)
+            # Parseo HTML fuera del event loop (pool de hilos del CPU executor)
+            job_offers, total_results = await run_cpu(
+                self._parse_search_page, html_content, filters.keyword, kind=THREAD
+            )
             
             logger.info(f"Encontradas {len(job_offers)} ofertas de {total_results} totales")
             return job_offers, total_results
@@ -194,8 +250,49 @@ class OCCScraper:
             logger.error(f"Error inesperado al buscar empleos: {e}")
             raise
     
-    def _extract_total_results(self, soup: BeautifulSoup) -> int:
-        """Extrae el número total de resultados"""
+    @staticmethod
+    def _decode_html(content: bytes) -> str:
+        """Decodifica el HTML: UTF-8, luego latin-1, luego UTF-8 ignorando errores"""
+        try:
+            return content.decode('utf-8')
+        except UnicodeDecodeError:
+            try:
+                return content.decode('latin-1')
+            except UnicodeDecodeError:
+                return content.decode('utf-8', errors='ignore')
+    
+    def _parse_search_page(self, html_content: str, search_keyword: str,
+                           backend: Optional[str] = None) -> Tuple[List[JobOffer], int]:
+        """
+        Parsea una página de resultados: (ofertas, total_resultados). CPU-bound.
+        
+        Solo se construyen los contenedores de ofertas y el total: con lxml
+        se recortan primero en C (SEARCH_PAGE_XPATH) y BeautifulSoup parsea
+        solo esos fragmentos; con html.parser, SEARCH_PAGE_STRAINER descarta
+        el resto de la página (scripts, estilos, navegación) al parsear.
+        """
+        backend = parser_backend(backend)
+        markup = html_content
+        if backend == "lxml":
+            fragments = select_fragments(html_content, SEARCH_PAGE_XPATH)
+            markup = html_content if fragments is None else fragments
+        soup = make_soup(markup, parse_only=SEARCH_PAGE_STRAINER, backend=backend)
+        
+        # Extraer total de resultados
+        total_results = self._extract_total_results(soup, html_content)
+        
+        # Extraer ofertas de trabajo
+        job_offers = self._extract_job_offers(soup, search_keyword)
+        
+        return job_offers, total_results
+    
+    def _extract_total_results(self, soup: BeautifulSoup, html_content: Optional[str] = None) -> int:
+        """
+        Extrae el número total de resultados
+        
+        Con `html_content` (soup parcial) el método alternativo busca en los
+        nodos de texto del HTML crudo en lugar del árbol.
+        """
         try:
             # Buscar el elemento que contiene el total de ofertas
             total_elem = soup.find('p', {'data-total-offers': True})
@@ -207,7 +304,13 @@ class OCCScraper:
                     return int(numbers[0])
             
             # Método alternativo: buscar en el texto
-            results_text = soup.find(text=re.compile(r'\d+\s+resultados?'))
+            if html_content is not None:
+                results_text = next((
+                    text for text in map(html.unescape, re.findall(r'>([^<]+)<', html_content))
+                    if RESULTS_TEXT_PATTERN.search(text)
+                ), None)
+            else:
+                results_text = soup.find(text=RESULTS_TEXT_PATTERN)
             if results_text:
                 numbers = re.findall(r'\d+', results_text)
                 if numbers:
@@ -314,7 +417,7 @@ class OCCScraper:
         job_offers = []
         
         # Buscar todos los contenedores de ofertas
-        job_containers = soup.find_all('div', {'data-offers-grid-offer-item-container': ''})
+        job_containers = soup.find_all('div', {OFFER_CONTAINER_ATTR: ''})
         
         for container in job_containers:
             try:
@@ -542,11 +645,12 @@ class OCCScraper:
         }
         
         try:
-            response = await self.session.get(api_url, headers=headers, params={"ipo": "41", "iapo": "1"})
+            async with self.host_limiter.slot(api_url):
+                response = await self.session.get(api_url, headers=headers, params={"ipo": "41", "iapo": "1"})
             response.raise_for_status()
             
             data = response.json()
-            job_offer = self._parse_job_detail_from_api(data, job_id)
+            job_offer = await run_cpu(self._parse_job_detail_from_api, data, job_id, kind=THREAD)
             
             if job_offer:
                 logger.info(f"Job details retrieved from API for job_id: {job_id}")
@@ -557,16 +661,16 @@ class OCCScraper:
             
         except httpx.HTTPStatusError as e:
             logger.warning(f"API endpoint returned {e.response.status_code} for job_id {job_id}, falling back to HTML scraping")
-            return await self.get_job_details(job_id)
+            return await self._get_job_details_html(job_id)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to decode JSON response for job_id {job_id}: {e}")
-            return await self.get_job_details(job_id)
+            return await self._get_job_details_html(job_id)
         except httpx.RequestError as e:
             logger.error(f"Network error retrieving API job details for {job_id}: {e}")
-            return await self.get_job_details(job_id)
+            return await self._get_job_details_html(job_id)
         except Exception as e:
             logger.error(f"Unexpected error retrieving API job details for {job_id}: {e}")
-            return await self.get_job_details(job_id)
+            return await self._get_job_details_html(job_id)
     
     def _parse_job_detail_from_api(self, data: dict, job_id: str) -> Optional[JobOffer]:
         """
@@ -793,20 +897,24 @@ class OCCScraper:
         Obtiene los detalles completos de una oferta específica.
         Primero intenta usar el API endpoint alternativo, luego fallback a HTML scraping.
         """
-        # Intentar primero con el API endpoint (más confiable)
+        # Intentar primero con el API endpoint (más confiable; si falla la
+        # petición ya hace su propio fallback a HTML)
         job_offer = await self.get_job_details_api(job_id)
         if job_offer:
             return job_offer
         
-        # Fallback a HTML scraping si el API falla
+        return await self._get_job_details_html(job_id)
+    
+    async def _get_job_details_html(self, job_id: str) -> Optional[JobOffer]:
+        """Fallback: scraping de la página HTML de la oferta."""
         detail_url = f"{self.BASE_URL}/empleo/{job_id}"
         
         try:
-            response = await self.session.get(detail_url)
+            async with self.host_limiter.slot(detail_url):
+                response = await self.session.get(detail_url)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return self._parse_job_detail(soup, job_id)
+            return await run_cpu(self._parse_job_detail_html, response.content, job_id, kind=THREAD)
             
         except httpx.RequestError as e:
             logger.error(f"Error al obtener detalles del trabajo {job_id}: {e}")
@@ -815,6 +923,11 @@ class OCCScraper:
             logger.error(f"Error inesperado al obtener detalles: {e}")
             return None
     
+    def _parse_job_detail_html(self, content: bytes, job_id: str) -> Optional[JobOffer]:
+        """Parsea el HTML crudo de la página de detalles. CPU-bound."""
+        soup = BeautifulSoup(content, 'html.parser')
+        return self._parse_job_detail(soup, job_id)
+    
     def _parse_job_detail(self, soup: BeautifulSoup, job_id: str) -> Optional[JobOffer]:
         """Parsea la página de detalles de una oferta específica"""
         try:
@@ -1101,7 +1214,8 @@ class OCCScraper:
         
         NOTA sobre velocidad:
         - Sin fetch_full_details (default): 2-3 segundos (20 resultados)
-        - Con fetch_full_details=True: 4-7 segundos (100-200ms × 20 jobs adicionales)
+        - Con fetch_full_details=True: + 1-2 round trips (detalles en paralelo,
+          ver _fetch_full_details); nunca más de OCC_DETAIL_DEADLINE_SECONDS
         - Se recomienda usar caché para optimizar (PASO 5)
         """
         logger.info(f"Starting job search with filters: {filters.dict()}")
@@ -1120,33 +1234,97 @@ class OCCScraper:
             logger.debug("fetch_full_details=False, retorno datos enriquecidos del contenedor")
             return jobs, total_results
         
-        # Paso 3: fetch_full_details=True → Obtener datos completos vía API para cada job
-        logger.info(f"Fetching full details for {len(jobs)} jobs via API (this will take ~100-200ms per job)")
-        enriched_jobs = []
+        # Paso 3: fetch_full_details=True → Obtener datos completos vía API (en paralelo)
+        enriched_jobs = await self._fetch_full_details(jobs)
+        return enriched_jobs, total_results
+    
+    async def _fetch_full_details(
+        self,
+        jobs: List[JobOffer],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> List[JobOffer]:
+        """
+        Detalles completos vía API para cada job, en paralelo y acotado.
         
-        for idx, job in enumerate(jobs, 1):
-            try:
-                logger.debug(f"Fetching full details for job {idx}/{len(jobs)}: {job.job_id}")
-                
-                # Obtener detalles completos via API OCC
-                full_job = await self.get_job_details_api(job.job_id)
-                
-                if full_job:
-                    logger.debug(f"✓ Full details retrieved for job {job.job_id}")
-                    enriched_jobs.append(full_job)
-                else:
-                    logger.warning(f"⚠ Could not parse API response for {job.job_id}, using container data")
-                    enriched_jobs.append(job)
-                    
-            except asyncio.TimeoutError:
-                logger.warning(f"⏱ Timeout fetching details for {job.job_id}, using container data")
-                enriched_jobs.append(job)
-            except Exception as e:
-                logger.warning(f"Error fetching full details for {job.job_id}: {e}, using container data")
-                enriched_jobs.append(job)  # Fallback a data del contenedor
+        - Hasta `concurrency` detalles a la vez (y OCC_DETAIL_PER_HOST_LIMIT por host)
+        - Cada detalle tiene `timeout` segundos (API + fallback HTML)
+        - Al vencer `deadline` se cancelan los pendientes: resultado parcial
         
-        logger.info(f"Enrichment complete: {len(enriched_jobs)} jobs with full details")
-        return enriched_jobs, total_results
+        Returns:
+            Jobs en el mismo orden; los que no obtuvieron detalle (error,
+            timeout o deadline) conservan los datos del contenedor
+        """
+        outcomes = await self._fetch_detail_outcomes(jobs, concurrency, timeout, deadline)
+        return [job for job, _ in outcomes]
+    
+    async def _fetch_detail_outcomes(
+        self,
+        jobs: List[JobOffer],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        deadline: Optional[float] = None,
+    ) -> List[Tuple[JobOffer, str]]:
+        """
+        Como `_fetch_full_details`, con el resultado de cada job:
+        enriched | fallback | error | timeout | deadline.
+        """
+        concurrency = max(1, concurrency or settings.OCC_DETAIL_CONCURRENCY)
+        timeout = timeout or settings.OCC_DETAIL_TIMEOUT_SECONDS
+        deadline = settings.OCC_DETAIL_DEADLINE_SECONDS if deadline is None else deadline
+        if not jobs:
+            return []
+        
+        logger.info(f"Fetching full details for {len(jobs)} jobs via API ({concurrency} concurrent)")
+        started = time.perf_counter()
+        slots = asyncio.Semaphore(concurrency)
+        
+        async def fetch(job: JobOffer) -> Optional[JobOffer]:
+            async with slots:
+                return await asyncio.wait_for(self.get_job_details_api(job.job_id), timeout=timeout)
+        
+        tasks = [asyncio.create_task(fetch(job)) for job in jobs]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=deadline or None)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        results = []
+        outcomes: Counter = Counter()
+        for job, task in zip(jobs, tasks):
+            if task in pending:
+                outcome = "deadline"
+            elif isinstance(task.exception(), asyncio.TimeoutError):
+                outcome = "timeout"
+            elif task.exception() is not None:
+                logger.warning(f"Error fetching full details for {job.job_id}: {task.exception()}, using container data")
+                outcome = "error"
+            elif task.result() is None:
+                outcome = "fallback"
+            else:
+                outcome = "enriched"
+            outcomes[outcome] += 1
+            results.append((task.result() if outcome == "enriched" else job, outcome))
+        self.detail_stats.update(outcomes)
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Enrichment complete in {elapsed_ms:.0f}ms: {dict(outcomes)}, "
+            f"max in flight {self.host_limiter.max_in_flight}"
+        )
+        return results
+    
+    def fetch_stats(self) -> Dict[str, object]:
+        """Métricas de peticiones de detalle (en vuelo por host, resultados acumulados)."""
+        return {
+            "in_flight": {host: count for host, count in self.host_limiter.in_flight.items() if count},
+            "max_in_flight": self.host_limiter.max_in_flight,
+            "requests": self.host_limiter.requests,
+            "details": dict(self.detail_stats),
+        }
     
     async def get_trending_jobs(self, limit: int = 20) -> List[JobOffer]:
         """Obtiene empleos en tendencia (más recientes y destacados)"""
@@ -1264,10 +1442,31 @@ class OCCJobTracker:
     
     async def track_search_results(self, 
                                  filters: SearchFilters, 
-                                 max_pages: int = 5) -> Dict[str, any]:
+                                 max_pages: int = 5,
+                                 incremental: bool = False,
+                                 fetch_details: bool = False) -> Dict[str, any]:
         """
         Rastrea los resultados de una búsqueda específica
+        
+        Con `incremental=True` solo devuelve ofertas nuevas o modificadas desde
+        el último rastreo y deja de paginar al llegar a ofertas conocidas
+        (ver incremental_crawler); `fetch_details` pide detalles solo de ese delta.
         """
+        if incremental:
+            from .incremental_crawler import IncrementalCrawler
+            
+            crawl = await IncrementalCrawler(max_pages=max_pages).crawl(
+                filters, scope="tracker", fetch_details=fetch_details
+            )
+            return {
+                "search_filters": filters.dict(),
+                "total_results": crawl.total_results,
+                "jobs_found": len(crawl.delta),
+                "jobs": crawl.delta,
+                "incremental": crawl.to_dict(),
+                "timestamp": datetime.now().isoformat()
+            }
+        
         all_jobs = []
         total_results = 0
         
@@ -0,0 +1,309 @@
+"""
+🏭 Scraping Pipeline - fetch → parse → transform → persist por etapas
+
+`JobScraperWorker` hacía fetch, parseo, deduplicación y guardado en una sola
+corrutina por búsqueda: una escritura lenta en la base frenaba las
+descargas y el parseo (CPU) congelaba el event loop. El pipeline separa
+cada paso en una etapa con sus propios workers, conectadas por colas
+asyncio acotadas:
+
+    items ─▶ fetch (pool async) ─▶ parse (CPU executor) ─▶ transform ─▶ persist (por lotes)
+
+- Cada etapa tiene su concurrencia (`PipelineConfig`).
+- Las colas son acotadas (queue_size): si una etapa se atrasa, las
+  anteriores esperan en `put` (backpressure) y la memoria no crece.
+- El writer junta registros hasta write_batch_size o write_batch_seconds y
+  los guarda en una sola transacción.
+- Un error en un elemento se registra y el elemento se descarta; el
+  pipeline sigue.
+- `stats()` expone por etapa: procesados, errores, tiempo ocupado y
+  profundidad (actual y máxima) de su cola de entrada.
+
+Uso:
+----
+from app.services.scraping_pipeline import ScrapingPipeline
+
+pipeline = ScrapingPipeline(fetch=fetch_page, parse=parse_page, transform=to_records, persist=save_batch)
+result = await pipeline.run(queries)
+print(result.to_dict())
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.cpu_executor import THREAD, run_cpu
+
+logger = logging.getLogger(__name__)
+
+# Marca de fin de flujo que cada etapa pasa a la siguiente
+_DONE = object()
+
+FETCH = "fetch"
+PARSE = "parse"
+TRANSFORM = "transform"
+PERSIST = "persist"
+
+
+@dataclass
+class PipelineConfig:
+    """Concurrencia por etapa y tamaño de colas (default: settings)."""
+    fetch_concurrency: int = field(default_factory=lambda: settings.SCRAPER_PIPELINE_FETCH_CONCURRENCY)
+    parse_concurrency: int = field(default_factory=lambda: settings.SCRAPER_PIPELINE_PARSE_CONCURRENCY)
+    transform_concurrency: int = field(default_factory=lambda: settings.SCRAPER_PIPELINE_TRANSFORM_CONCURRENCY)
+    write_concurrency: int = field(default_factory=lambda: settings.SCRAPER_PIPELINE_WRITE_CONCURRENCY)
+    queue_size: int = field(default_factory=lambda: settings.SCRAPER_PIPELINE_QUEUE_SIZE)
+    write_batch_size: int = field(default_factory=lambda: settings.SCRAPER_PIPELINE_WRITE_BATCH_SIZE)
+    write_batch_seconds: float = field(default_factory=lambda: settings.SCRAPER_PIPELINE_WRITE_BATCH_SECONDS)
+    parse_kind: str = THREAD
+
+
+@dataclass
+class StageStats:
+    """Métricas de una etapa y de su cola de entrada."""
+    workers: int
+    queue: Optional[asyncio.Queue] = None
+    processed: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_depth: int = 0
+
+    def observe_depth(self) -> None:
+        if self.queue is not None:
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "queue_max_depth": self.max_depth,
+        }
+
+
+@dataclass
+class PipelineResult:
+    """Resultado de una corrida del pipeline."""
+    items: int = 0
+    records: int = 0
+    saved: int = 0
+    collected: List[Any] = field(default_factory=list)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    latencies: List[float] = field(default_factory=list)  # Inicio del fetch → registro guardado (s)
+
+    def latency_ms(self) -> Dict[str, float]:
+        """p50/p95/máximo de la latencia de extremo a extremo por registro."""
+        if not self.latencies:
+            return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+        ordered = sorted(self.latencies)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {"p50": round(pick(0.5) * 1000, 2), "p95": round(pick(0.95) * 1000, 2),
+                "max": round(ordered[-1] * 1000, 2)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "records": self.records,
+            "saved": self.saved,
+            "errors": self.errors,
+            "stages": self.stages,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "latency_ms": self.latency_ms(),
+        }
+
+
+class ScrapingPipeline:
+    """
+    Pipeline de scraping por etapas con colas acotadas.
+
+    Args:
+        fetch: async (item) -> crudo (p. ej. HTML)
+        parse: (crudo) -> parseado; síncrona, corre en el CPU executor
+        transform: (parseado) -> lista de registros; barata (puede ser async, p. ej. dedup)
+        persist: async (lote de registros) -> guardados; None = no guardar
+        collect: Conservar los registros en PipelineResult.collected
+        config: Concurrencias y colas (default: settings)
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Any], Awaitable[Any]],
+        parse: Callable[[Any], Any],
+        transform: Callable[[Any], Any],
+        persist: Optional[Callable[[List[Any]], Awaitable[int]]] = None,
+        collect: bool = False,
+        config: Optional[PipelineConfig] = None,
+    ):
+        self.fetch = fetch
+        self.parse = parse
+        self.transform = transform
+        self.persist = persist
+        self.collect = collect
+        self.config = config or PipelineConfig()
+        self._stats: Dict[str, StageStats] = {}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas por etapa (también durante la corrida)."""
+        return {name: stage.to_dict() for name, stage in self._stats.items()}
+
+    async def run(self, items: Iterable[Any]) -> PipelineResult:
+        """Procesa `items` por todas las etapas y espera a que terminen."""
+        config = self.config
+        queues = {
+            name: asyncio.Queue(maxsize=max(1, config.queue_size))
+            for name in (FETCH, PARSE, TRANSFORM, PERSIST)
+        }
+        self._stats = {
+            FETCH: StageStats(max(1, config.fetch_concurrency), queues[FETCH]),
+            PARSE: StageStats(max(1, config.parse_concurrency), queues[PARSE]),
+            TRANSFORM: StageStats(max(1, config.transform_concurrency), queues[TRANSFORM]),
+            PERSIST: StageStats(max(1, config.write_concurrency), queues[PERSIST]),
+        }
+        result = PipelineResult()
+        started = time.perf_counter()
+
+        async def produce() -> None:
+            for item in items:
+                await queues[FETCH].put((None, item))
+                self._stats[FETCH].observe_depth()
+                result.items += 1
+            await queues[FETCH].put(_DONE)
+
+        async def fetch(entered: float, item: Any) -> None:
+            await self._emit(queues[PARSE], PARSE, entered, await self.fetch(item))
+
+        async def parse(entered: float, raw: Any) -> None:
+            parsed = await run_cpu(self.parse, raw, kind=config.parse_kind)
+            await self._emit(queues[TRANSFORM], TRANSFORM, entered, parsed)
+
+        async def transform(entered: float, parsed: Any) -> None:
+            records = self.transform(parsed)
+            if inspect.isawaitable(records):
+                records = await records
+            for record in records:
+                result.records += 1
+                await self._emit(queues[PERSIST], PERSIST, entered, record)
+
+        tasks = [
+            asyncio.create_task(produce(), name="pipeline-produce"),
+            asyncio.create_task(self._stage(FETCH, queues[FETCH], queues[PARSE], fetch, result)),
+            asyncio.create_task(self._stage(PARSE, queues[PARSE], queues[TRANSFORM], parse, result)),
+            asyncio.create_task(self._stage(TRANSFORM, queues[TRANSFORM], queues[PERSIST], transform, result)),
+            asyncio.create_task(self._stage(PERSIST, queues[PERSIST], None, None, result)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for queue in queues.values():  # Marcas de fin (o restos si se canceló)
+                while not queue.empty():
+                    queue.get_nowait()
+
+        result.stages = self.stats()
+        result.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"🏭 Pipeline: {result.items} items, {result.records} registros, {result.saved} guardados "
+                    f"en {result.elapsed_seconds:.2f}s")
+        return result
+
+    async def _emit(self, queue: asyncio.Queue, name: str, entered: float, value: Any) -> None:
+        """Pasa un valor a la siguiente etapa (espera si su cola está llena)."""
+        await queue.put((entered, value))
+        self._stats[name].observe_depth()
+
+    # ------------------------------------------------------------------
+    # Etapas
+    # ------------------------------------------------------------------
+
+    async def _stage(
+        self,
+        name: str,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        handle: Optional[Callable[[float, Any], Awaitable[None]]],
+        result: PipelineResult,
+    ) -> None:
+        """Corre los workers de una etapa y, al terminar todos, cierra la siguiente."""
+        stage = self._stats[name]
+        worker = self._write_worker if handle is None else self._worker
+        workers = [
+            asyncio.create_task(worker(name, inbox, handle, result), name=f"pipeline-{name}-{index}")
+            for index in range(stage.workers)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+        if outbox is not None:
+            await outbox.put(_DONE)
+
+    async def _worker(self, name: str, inbox: asyncio.Queue, handle, result: PipelineResult) -> None:
+        stage = self._stats[name]
+        while True:
+            envelope = await inbox.get()
+            if envelope is _DONE:
+                await inbox.put(_DONE)  # Para los demás workers de la etapa
+                return
+            started = time.perf_counter()
+            entered, value = envelope
+            try:
+                # La latencia de extremo a extremo corre desde el inicio del fetch
+                await handle(entered or started, value)
+                stage.processed += 1
+            except Exception as e:
+                stage.errors += 1
+                result.errors.append({"stage": name, "item": str(value)[:200], "error": str(e) or type(e).__name__})
+                logger.warning(f"🏭 Error en etapa {name}: {e}")
+            finally:
+                stage.busy_seconds += time.perf_counter() - started
+
+    async def _write_worker(self, name: str, inbox: asyncio.Queue, _handle, result: PipelineResult) -> None:
+        """Junta registros hasta write_batch_size o write_batch_seconds y los guarda juntos."""
+        stage = self._stats[name]
+        finished = False
+        while not finished:
+            batch: List[Any] = []
+            value = await inbox.get()
+            deadline = time.monotonic() + self.config.write_batch_seconds
+            while True:
+                if value is _DONE:
+                    await inbox.put(_DONE)
+                    finished = True
+                    break
+                batch.append(value)
+                if len(batch) >= self.config.write_batch_size:
+                    break
+                try:
+                    value = await asyncio.wait_for(inbox.get(), timeout=max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    break
+            if batch:
+                await self._write(batch, stage, result)
+
+    async def _write(self, envelopes: List[Any], stage: StageStats, result: PipelineResult) -> None:
+        started = time.perf_counter()
+        batch = [record for _, record in envelopes]
+        try:
+            if self.persist is not None:
+                result.saved += await self.persist(batch)
+            if self.collect:
+                result.collected.extend(batch)
+            stage.processed += len(batch)
+            written = time.perf_counter()
+            result.latencies.extend(written - entered for entered, _ in envelopes)
+        except Exception as e:
+            stage.errors += 1
+            result.errors.append({"stage": PERSIST, "item": f"lote de {len(batch)}", "error": str(e) or type(e).__name__})
+            logger.error(f"🏭 Error guardando lote de {len(batch)} registros: {e}")
+        finally:
+            stage.busy_seconds += time.perf_counter() - started
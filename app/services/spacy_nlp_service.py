@@ -8,14 +8,41 @@ IMPORTANTE: La carga inicial (~500ms) ocurre solo una vez por sesión.
 Las llamadas subsecuentes son <1ms.
 """
 
+import numpy as np
 import spacy
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import logging
 
+from app.core.config import settings
+from app.services.document_chunker import iter_chunks
+from app.services.language_id_service import detect_language
+
 logger = logging.getLogger(__name__)
 
 
+# Términos técnicos conocidos (extract_technical_terms / analyze)
+DEFAULT_TECH_TERMS = {
+    # Lenguajes
+    "python", "javascript", "typescript", "java", "cpp", "csharp",
+    "go", "rust", "ruby", "php", "kotlin", "swift", "scala",
+    # Frameworks
+    "react", "vue", "angular", "fastapi", "django", "spring boot",
+    "express", "next.js", "nuxt", "laravel", "rails",
+    # Bases de datos
+    "postgresql", "mongodb", "mysql", "redis", "cassandra",
+    "elasticsearch", "dynamodb", "firestore",
+    # DevOps/Cloud
+    "docker", "kubernetes", "aws", "gcp", "azure", "terraform",
+    "jenkins", "gitlab", "github", "circleci",
+    # ML/AI
+    "tensorflow", "pytorch", "scikit-learn", "keras", "nltk",
+    "spacy", "huggingface", "transformers",
+    # Otros
+    "git", "sql", "bash", "linux", "agile", "microservices",
+}
+
+
 @dataclass
 class Entity:
     """Representa una entidad nombrada extraída"""
@@ -137,36 +164,63 @@ class SpacyNLPService:
         if not self._models:
             return self.model
         
-        # Análisis simple de idioma basado en palabras clave
-        text_lower = text.lower()
-        
-        # Palabras indicadoras de español
-        spanish_indicators = {
-            "educación", "experiencia", "habilidades", "certificaciones",
-            "objetivo", "trabaje", "desarrolle", "lidere", "gestioné",
-            "graduado", "licenciatura", "maestría", "doctorado", "universidad",
-            "empresa", "empresa", "departamento", "proyecto", "equipo",
-        }
-        
-        # Palabras indicadoras de inglés
-        english_indicators = {
-            "education", "experience", "skills", "certifications",
-            "objective", "worked", "developed", "led", "managed",
-            "bachelor", "master", "degree", "university",
-            "company", "department", "project", "team",
-        }
+        # Identificación de idioma por trigramas (cacheada por contenido)
+        guess = detect_language(text)
+        if guess.reliable and guess.language in self._models:
+            return self._models[guess.language]
         
-        spanish_score = sum(1 for indicator in spanish_indicators if indicator in text_lower)
-        english_score = sum(1 for indicator in english_indicators if indicator in text_lower)
+        # Fallback al modelo primario (idioma incierto o modelo no cargado)
+        return self.model
+    
+    # ------------------------------------------------------------------
+    # Procesamiento por fragmentos (memoria acotada)
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def _iter_docs(text: str, model):
+        """
+        Procesa `text` como stream de fragmentos con `model.pipe`.
         
-        # Selecciona modelo basado en score
-        if spanish_score > english_score and "es" in self._models:
-            return self._models["es"]
-        elif english_score > spanish_score and "en" in self._models:
-            return self._models["en"]
-        else:
-            # Fallback al modelo primario
-            return self.model
+        Yields:
+            (Doc, TextChunk): el Doc de cada fragmento y su offset en `text`.
+            Solo NLP_CHUNK_BATCH_SIZE fragmentos están en memoria a la vez.
+        """
+        return model.pipe(
+            ((chunk.text, chunk) for chunk in iter_chunks(text)),
+            as_tuples=True,
+            batch_size=settings.NLP_CHUNK_BATCH_SIZE,
+        )
+    
+    @staticmethod
+    def _entities_from_doc(doc, offset: int = 0) -> List[Entity]:
+        """Entidades del Doc con offsets re-proyectados al documento completo."""
+        return [
+            Entity(
+                text=ent.text,
+                label=ent.label_,
+                start_char=offset + ent.start_char,
+                end_char=offset + ent.end_char,
+            )
+            for ent in doc.ents
+        ]
+    
+    @staticmethod
+    def _tokens_from_doc(doc, remove_stop: bool = False) -> List[Token]:
+        return [
+            Token(
+                text=token.text,
+                lemma=token.lemma_,
+                pos=token.pos_,
+                is_stop=token.is_stop,
+                is_alpha=token.is_alpha,
+            )
+            for token in doc
+            if not (remove_stop and token.is_stop)
+        ]
+    
+    @staticmethod
+    def _tech_terms_from_doc(doc, tech_set: set) -> set:
+        return {token.lower_ for token in doc if token.is_alpha and token.lower_ in tech_set}
     
     def extract_entities(self, text: str) -> List[Entity]:
         """
@@ -178,16 +232,9 @@ class SpacyNLPService:
             Lista de Entity objects con label (ORG, PERSON, GPE, DATE, etc)
         """
         model = self.get_model_for_text(text)
-        doc = model(text)
-        entities = [
-            Entity(
-                text=ent.text,
-                label=ent.label_,
-                start_char=ent.start_char,
-                end_char=ent.end_char,
-            )
-            for ent in doc.ents
-        ]
+        entities = []
+        for doc, chunk in self._iter_docs(text, model):
+            entities.extend(self._entities_from_doc(doc, chunk.start))
         return entities
     
     def extract_entities_by_label(
@@ -220,18 +267,9 @@ class SpacyNLPService:
             Lista de Token objects
         """
         model = self.get_model_for_text(text)
-        doc = model(text)
-        tokens = [
-            Token(
-                text=token.text,
-                lemma=token.lemma_,
-                pos=token.pos_,
-                is_stop=token.is_stop,
-                is_alpha=token.is_alpha,
-            )
-            for token in doc
-            if not (remove_stop and token.is_stop)
-        ]
+        tokens = []
+        for doc, _ in self._iter_docs(text, model):
+            tokens.extend(self._tokens_from_doc(doc, remove_stop))
         return tokens
     
     def extract_technical_terms(
@@ -247,44 +285,25 @@ class SpacyNLPService:
         Returns:
             Lista de términos técnicos encontrados
         """
-        # Términos técnicos conocidos
-        DEFAULT_TECH_TERMS = {
-            # Lenguajes
-            "python", "javascript", "typescript", "java", "cpp", "csharp",
-            "go", "rust", "ruby", "php", "kotlin", "swift", "scala",
-            # Frameworks
-            "react", "vue", "angular", "fastapi", "django", "spring boot",
-            "express", "next.js", "nuxt", "laravel", "rails",
-            # Bases de datos
-            "postgresql", "mongodb", "mysql", "redis", "cassandra",
-            "elasticsearch", "dynamodb", "firestore",
-            # DevOps/Cloud
-            "docker", "kubernetes", "aws", "gcp", "azure", "terraform",
-            "jenkins", "gitlab", "github", "circleci",
-            # ML/AI
-            "tensorflow", "pytorch", "scikit-learn", "keras", "nltk",
-            "spacy", "huggingface", "transformers",
-            # Otros
-            "git", "sql", "bash", "linux", "agile", "microservices",
-        }
-        
         tech_set = DEFAULT_TECH_TERMS.copy()
         if custom_terms:
             tech_set.update(term.lower() for term in custom_terms)
         
-        doc = self.model(text.lower())
-        found_terms = [
-            token.text for token in doc
-            if token.text.lower() in tech_set and token.is_alpha
-        ]
-        return list(set(found_terms))  # Devuelve únicos
+        found_terms = set()
+        for doc, _ in self._iter_docs(text.lower(), self.model):
+            found_terms.update(self._tech_terms_from_doc(doc, tech_set))
+        return list(found_terms)  # Devuelve únicos
     
-    def analyze(self, text: str) -> Dict[str, Any]:
+    def analyze(self, text: str, deadline=None) -> Dict[str, Any]:
         """
         Análisis completo del texto.
         
         Auto-detecta el idioma y aplica el modelo más apropiado.
         
+        Args:
+            deadline: Objeto con `.expired()` (ver cv_extraction_cascade.Deadline);
+                al vencer deja de procesar fragmentos y analiza lo ya leído
+        
         Returns:
             Diccionario con:
             - entities: Entidades nombradas
@@ -296,20 +315,75 @@ class SpacyNLPService:
             - date_entities: Solo DATE
         """
         model = self.get_model_for_text(text)
-        doc = model(text)
+        
+        # Una sola pasada por fragmento: entidades, tokens y términos técnicos
+        # salen del mismo Doc (antes se re-procesaba el texto 9 veces)
+        parts = self._new_analysis_parts()
+        for doc, chunk in self._iter_docs(text, model):
+            self._add_doc_to_parts(parts, doc, chunk.start)
+            if deadline is not None and deadline.expired():
+                logger.info("⏱️  Deadline vencido: análisis parcial del texto")
+                break
+        return self._analysis_from_parts(text, model, parts)
+    
+    def analyze_many(self, texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        `analyze` para un lote de textos con un solo `model.pipe` por modelo.
+        
+        Los fragmentos de todos los textos de un mismo idioma comparten los
+        lotes de spaCy, en lugar de un pipe por documento.
+        
+        Returns:
+            Un dict de `analyze` por texto, en el mismo orden
+        """
+        batch_size = batch_size or settings.NLP_CHUNK_BATCH_SIZE
+        models = [self.get_model_for_text(text) for text in texts]
+        parts = [self._new_analysis_parts() for _ in texts]
+        
+        for model in {id(model): model for model in models}.values():
+            rows = [row for row, candidate in enumerate(models) if candidate is model]
+            stream = (
+                (chunk.text, (row, chunk.start))
+                for row in rows
+                for chunk in iter_chunks(texts[row])
+            )
+            for doc, (row, offset) in model.pipe(stream, as_tuples=True, batch_size=batch_size):
+                self._add_doc_to_parts(parts[row], doc, offset)
+        
+        return [
+            self._analysis_from_parts(text, model, text_parts)
+            for text, model, text_parts in zip(texts, models, parts)
+        ]
+    
+    @staticmethod
+    def _new_analysis_parts() -> Dict[str, Any]:
+        return {"entities": [], "tokens": [], "tech_terms": set()}
+    
+    @classmethod
+    def _add_doc_to_parts(cls, parts: Dict[str, Any], doc, offset: int) -> None:
+        parts["entities"].extend(cls._entities_from_doc(doc, offset))
+        parts["tokens"].extend(cls._tokens_from_doc(doc, remove_stop=True))
+        parts["tech_terms"].update(cls._tech_terms_from_doc(doc, DEFAULT_TECH_TERMS))
+    
+    @staticmethod
+    def _analysis_from_parts(text: str, model, parts: Dict[str, Any]) -> Dict[str, Any]:
+        entities: List[Entity] = parts["entities"]
+        
+        def by_label(label: str) -> List[str]:
+            return [e.text for e in entities if e.label == label]
         
         return {
             "text": text,
-            "language": doc.lang_,
+            "language": model.lang,
             "model_used": model.meta.get("name", "unknown"),
-            "entities": [e.to_dict() for e in self.extract_entities(text)],
-            "tokens": [t.to_dict() for t in self.tokenize(text, remove_stop=True)],
-            "tech_terms": self.extract_technical_terms(text),
-            "organizations": self.extract_entities_by_label(text, "ORG"),
-            "persons": self.extract_entities_by_label(text, "PERSON"),
-            "locations": self.extract_entities_by_label(text, "GPE"),
-            "dates": self.extract_entities_by_label(text, "DATE"),
-            "languages": self.extract_entities_by_label(text, "LANGUAGE"),
+            "entities": [e.to_dict() for e in entities],
+            "tokens": [t.to_dict() for t in parts["tokens"]],
+            "tech_terms": list(parts["tech_terms"]),
+            "organizations": by_label("ORG"),
+            "persons": by_label("PERSON"),
+            "locations": by_label("GPE"),
+            "dates": by_label("DATE"),
+            "languages": by_label("LANGUAGE"),
         }
     
     def similarity(self, text1: str, text2: str) -> float:
@@ -332,7 +406,63 @@ class SpacyNLPService:
             return 0.0
         
         return doc1.similarity(doc2)
-    
+
+    def get_document_vectors(
+        self, texts: List[str], batch_size: int = 64
+    ) -> np.ndarray:
+        """
+        Calcula vectores de documento para un lote de textos.
+
+        Solo ejecuta el tokenizer (sin parser ni NER) y promedia los vectores
+        del vocabulario, por lo que es órdenes de magnitud más rápido que
+        llamar a `similarity()` por pares. Usa siempre el modelo primario para
+        que todos los vectores compartan el mismo espacio y sean comparables
+        dentro de un mismo índice.
+
+        Args:
+            texts: Textos a vectorizar
+            batch_size: Tamaño de lote para `tokenizer.pipe`
+
+        Returns:
+            Matriz float32 de forma (len(texts), dim). Las filas de textos sin
+            vectores quedan en cero.
+
+        La memoria de tokenización queda acotada por fragmento
+        (NLP_CHUNK_MAX_CHARS), no por el tamaño de cada texto.
+        """
+        model = self.model
+        if model is None:
+            raise RuntimeError("No hay modelos spaCy disponibles para vectorizar")
+
+        dim = model.vocab.vectors_length
+        vectors = np.zeros((len(texts), dim), dtype=np.float32)
+        if dim == 0:
+            logger.warning("El modelo spaCy primario no incluye vectores")
+            return vectors
+
+        # Textos largos se tokenizan por fragmentos; el vector del documento
+        # es el promedio de los fragmentos ponderado por número de tokens
+        # (equivale al promedio sobre todos los tokens del texto completo).
+        rows: List[int] = []
+
+        def chunk_stream():
+            for row, text in enumerate(texts):
+                for chunk in iter_chunks(text):
+                    rows.append(row)
+                    yield chunk.text
+
+        weights = np.zeros(len(texts), dtype=np.float32)
+        docs = model.tokenizer.pipe(chunk_stream(), batch_size=batch_size)
+        for index, doc in enumerate(docs):
+            if doc.has_vector and len(doc):
+                row = rows[index]
+                vectors[row] += doc.vector * len(doc)
+                weights[row] += len(doc)
+
+        has_tokens = weights > 0
+        vectors[has_tokens] /= weights[has_tokens, None]
+        return vectors
+
     @staticmethod
     def get_instance(primary_lang: str = "auto") -> "SpacyNLPService":
         """
@@ -0,0 +1,388 @@
+"""
+🔁 Student Reanalysis - Re-análisis masivo de CVs en segundo plano
+
+`POST /students/bulk-reanalyze` acepta hasta 50 ids, carga cada estudiante
+con `session.get`, analiza dentro de la petición y hace un solo commit al
+final. Para re-procesar toda la base (p. ej. 50k perfiles tras actualizar
+un extractor) este servicio corre un job en segundo plano:
+
+1. Lectura por lotes con keyset pagination (`id > último id ORDER BY id
+   LIMIT n`), solo columnas id + profile_text: memoria acotada por lote y
+   sin cursor abierto entre transacciones de escritura.
+2. Análisis en un pool de procesos propio (students._analyze_resume_batch),
+   separado del pool que atiende peticiones: la latencia de la API no cambia.
+3. Escritura por lote: un UPDATE masivo por clave primaria y, en la misma
+   transacción, el avance del checkpoint (`last_student_id`) del job.
+4. Reanudación: un job interrumpido (reinicio, caída) queda en `running`
+   sin heartbeat y se retoma desde su checkpoint al arrancar la app. El
+   heartbeat se refresca también mientras se analiza un lote, así un lote
+   lento no deja el job como abandonado para otro proceso.
+5. Progreso: `GET /students/reanalysis-jobs/{job_id}`; cancelación con
+   `POST /students/reanalysis-jobs/{job_id}/cancel`.
+
+Uso:
+----
+from app.services.student_reanalysis import student_reanalysis_jobs
+
+job = await student_reanalysis_jobs.create(actor={"user_id": 1, "email": "admin@unrc.edu.mx"})
+job = await student_reanalysis_jobs.get(job.job_id)
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, update
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.cpu_executor import CPUExecutor, PROCESS
+from app.models import Student, StudentReanalysisJob
+from app.utils.datetime_utils import utc_now
+from app.utils.encryption import EncryptionService
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+MAX_STORED_ERRORS = 50  # Muestra de errores por estudiante guardada en el job
+
+
+class ReanalysisJobConflictError(Exception):
+    """Ya hay un job de re-análisis activo."""
+
+    def __init__(self, job: StudentReanalysisJob):
+        super().__init__(f"Ya hay un re-análisis en curso: {job.job_id}")
+        self.job = job
+
+
+def _reanalyze_texts(texts: List[str]) -> List[Tuple[dict, dict]]:
+    """Análisis + campos Harvard de un sub-lote (se ejecuta en un proceso hijo)."""
+    # Import diferido: la lógica de análisis vive en el endpoint de estudiantes
+    from app.api.endpoints.students import _analyze_resume_batch
+
+    return _analyze_resume_batch(texts)
+
+
+def _student_values(student_id: int, analysis: dict, harvard_fields: dict, updated_at: datetime) -> Dict[str, Any]:
+    """Columnas de Student a actualizar (mismos campos que una subida de CV)."""
+    return {
+        "id": student_id,
+        "skills": json.dumps(analysis["skills"]),
+        "soft_skills": json.dumps(analysis["soft_skills"]),
+        "projects": json.dumps(analysis["projects"]),
+        "objective": harvard_fields["objective"],
+        "education": json.dumps(harvard_fields["education"]),
+        "experience": json.dumps(harvard_fields["experience"]),
+        "certifications": json.dumps(harvard_fields["certifications"]),
+        "languages": json.dumps(harvard_fields["languages"]),
+        "updated_at": updated_at,
+    }
+
+
+class StudentReanalysisJobs:
+    """Crea, ejecuta y reanuda jobs de re-análisis (tabla student_reanalysis_jobs)."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        chunk_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        stale_seconds: Optional[float] = None,
+    ):
+        self._session_factory = session_factory
+        self.chunk_size = max(1, chunk_size or settings.REANALYSIS_JOB_CHUNK_SIZE)
+        self.workers = settings.REANALYSIS_JOB_WORKERS if workers is None else workers
+        self.stale_seconds = stale_seconds or settings.REANALYSIS_JOB_STALE_SECONDS
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _session(self):
+        if self._session_factory is None:
+            from app.core.database import async_session
+            self._session_factory = async_session
+        return self._session_factory()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+
+    async def create(self, actor: Dict[str, Any], start: bool = True) -> StudentReanalysisJob:
+        """
+        Crea un job (uno activo a la vez) y lo lanza en segundo plano.
+
+        Raises:
+            ReanalysisJobConflictError: si ya hay un job en cola o en curso
+        """
+        async with self._session() as session:
+            active = (await session.execute(
+                select(StudentReanalysisJob).where(StudentReanalysisJob.status.in_(ACTIVE_STATUSES))
+            )).scalars().first()
+            if active is not None and not self._is_stale(active):
+                raise ReanalysisJobConflictError(active)
+
+            total = (await session.execute(
+                select(func.count()).select_from(Student).where(self._has_resume())
+            )).scalar() or 0
+            job = StudentReanalysisJob(
+                job_id=uuid.uuid4().hex,
+                chunk_size=self.chunk_size,
+                total=total,
+                actor_id=actor.get("user_id"),
+                actor_email=EncryptionService().encrypt_optional(actor.get("email")),
+            )
+            session.add(job)
+            await session.commit()
+            await session.refresh(job)
+
+        logger.info(f"🔁 Job de re-análisis {job.job_id} creado ({total} estudiantes con CV)")
+        if start:
+            self.launch(job.job_id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[StudentReanalysisJob]:
+        async with self._session() as session:
+            result = await session.execute(
+                select(StudentReanalysisJob).where(StudentReanalysisJob.job_id == job_id)
+            )
+            return result.scalars().first()
+
+    async def cancel(self, job_id: str) -> Optional[StudentReanalysisJob]:
+        """Cancela un job activo; el lote en curso se descarta (no avanza el checkpoint)."""
+        async with self._session() as session:
+            await session.execute(
+                update(StudentReanalysisJob)
+                .where(
+                    StudentReanalysisJob.job_id == job_id,
+                    StudentReanalysisJob.status.in_(ACTIVE_STATUSES),
+                )
+                .values(status=CANCELLED, finished_at=utc_now())
+            )
+            await session.commit()
+        return await self.get(job_id)
+
+    def launch(self, job_id: str) -> None:
+        """Ejecuta el job en una tarea asyncio de este proceso."""
+        if job_id in self._tasks and not self._tasks[job_id].done():
+            return
+        self._tasks[job_id] = asyncio.create_task(self.run(job_id), name=f"reanalysis-{job_id}")
+
+    async def run(self, job_id: str) -> Optional[StudentReanalysisJob]:
+        """Toma el job y lo procesa en la corrutina actual (scripts y tests)."""
+        job = await self._claim(job_id)
+        if job is None:
+            return await self.get(job_id)
+
+        # Pool propio (no el del servidor): lotes largos, sin timeout por tarea
+        executor = CPUExecutor(
+            process_workers=self.workers,
+            max_queue=max(1, self.workers) * 2,
+            default_timeout=0,
+        )
+        heartbeat = asyncio.create_task(self._heartbeat(job), name=f"reanalysis-heartbeat-{job_id}")
+        try:
+            while True:
+                rows = await self._next_chunk(job.last_student_id)
+                if not rows:
+                    await self._finish(job, status=COMPLETED)
+                    break
+                results = await self._analyze_chunk(executor, rows)
+                if not await self._save_chunk(job, rows, results):
+                    logger.info(f"🔁 Job de re-análisis {job_id} cancelado")
+                    break
+        except asyncio.CancelledError:
+            # Apagado: queda en running y se reanuda desde el checkpoint
+            raise
+        except Exception as e:
+            logger.error(f"❌ Job de re-análisis {job_id} falló: {e}", exc_info=True)
+            await self._finish(job, status=FAILED, error=str(e))
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            executor.shutdown()
+        return await self.get(job_id)
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def resume(self) -> int:
+        """Relanza jobs en cola o abandonados (sin heartbeat reciente). Al arrancar la app."""
+        async with self._session() as session:
+            jobs = (await session.execute(
+                select(StudentReanalysisJob).where(StudentReanalysisJob.status.in_(ACTIVE_STATUSES))
+            )).scalars().all()
+        resumable = [job for job in jobs if job.status == QUEUED or self._is_stale(job)]
+        for job in resumable:
+            logger.info(f"🔁 Reanudando job de re-análisis {job.job_id} desde el estudiante {job.last_student_id}")
+            self.launch(job.job_id)
+        return len(resumable)
+
+    async def stop(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._tasks = {}
+
+    # ------------------------------------------------------------------
+    # Ejecución por lotes
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _has_resume():
+        return Student.profile_text.is_not(None) & (Student.profile_text != "")
+
+    def _is_stale(self, job: StudentReanalysisJob) -> bool:
+        if job.status != RUNNING:
+            return False
+        cutoff = utc_now() - timedelta(seconds=self.stale_seconds)
+        return job.heartbeat_at is None or job.heartbeat_at < cutoff
+
+    async def _claim(self, job_id: str) -> Optional[StudentReanalysisJob]:
+        """
+        Pasa el job a running si está en cola o abandonado.
+
+        El UPDATE condicionado garantiza que un solo proceso lo ejecuta.
+        """
+        now = utc_now()
+        cutoff = now - timedelta(seconds=self.stale_seconds)
+        async with self._session() as session:
+            claimed = await session.execute(
+                update(StudentReanalysisJob)
+                .where(
+                    StudentReanalysisJob.job_id == job_id,
+                    or_(
+                        StudentReanalysisJob.status == QUEUED,
+                        (StudentReanalysisJob.status == RUNNING) & or_(
+                            StudentReanalysisJob.heartbeat_at.is_(None),
+                            StudentReanalysisJob.heartbeat_at < cutoff,
+                        ),
+                    ),
+                )
+                .values(
+                    status=RUNNING,
+                    started_at=func.coalesce(StudentReanalysisJob.started_at, now),
+                    heartbeat_at=now,
+                )
+            )
+            await session.commit()
+            if claimed.rowcount != 1:
+                return None
+        return await self.get(job_id)
+
+    async def _heartbeat(self, job: StudentReanalysisJob) -> None:
+        """Refresca heartbeat_at mientras el job corre (un lote puede tardar más que stale_seconds)."""
+        while True:
+            await asyncio.sleep(self.stale_seconds / 3)
+            try:
+                async with self._session() as session:
+                    await session.execute(
+                        update(StudentReanalysisJob)
+                        .where(StudentReanalysisJob.id == job.id, StudentReanalysisJob.status == RUNNING)
+                        .values(heartbeat_at=utc_now())
+                    )
+                    await session.commit()
+            except Exception as e:
+                logger.warning(f"⚠️  Heartbeat del job de re-análisis {job.job_id} no guardado: {e}")
+
+    async def _next_chunk(self, after_id: int) -> List[Tuple[int, str]]:
+        async with self._session() as session:
+            result = await session.execute(
+                select(Student.id, Student.profile_text)
+                .where(Student.id > after_id, self._has_resume())
+                .order_by(Student.id)
+                .limit(self.chunk_size)
+            )
+            return [(row[0], row[1]) for row in result.all()]
+
+    async def _analyze_chunk(
+        self, executor: CPUExecutor, rows: List[Tuple[int, str]]
+    ) -> List[Tuple[int, Any]]:
+        """
+        Reparte el lote entre los procesos del job.
+
+        Returns:
+            [(student_id, (analysis, harvard_fields) | Exception)]
+        """
+        parts = max(1, self.workers)
+        size = -(-len(rows) // parts)
+        batches = [rows[i:i + size] for i in range(0, len(rows), size)]
+        outputs = await asyncio.gather(
+            *(executor.run(_reanalyze_texts, [text for _, text in batch], kind=PROCESS) for batch in batches),
+            return_exceptions=True,
+        )
+
+        results: List[Tuple[int, Any]] = []
+        for batch, output in zip(batches, outputs):
+            if isinstance(output, Exception):
+                logger.error(f"❌ Sub-lote de {len(batch)} estudiantes falló en el análisis: {output}")
+                results.extend((student_id, output) for student_id, _ in batch)
+            else:
+                results.extend((student_id, result) for (student_id, _), result in zip(batch, output))
+        return results
+
+    async def _save_chunk(
+        self, job: StudentReanalysisJob, rows: List[Tuple[int, str]], results: List[Tuple[int, Any]]
+    ) -> bool:
+        """
+        Guarda el lote y avanza el checkpoint en una sola transacción.
+
+        Returns:
+            False si el job dejó de estar en running (cancelado): el lote se descarta
+        """
+        now = utc_now()
+        values = []
+        errors = json.loads(job.errors or "[]")
+        for student_id, result in results:
+            if isinstance(result, Exception):
+                if len(errors) < MAX_STORED_ERRORS:
+                    errors.append({"student_id": student_id, "error": (str(result) or repr(result)).splitlines()[0]})
+                continue
+            values.append(_student_values(student_id, *result, now))
+
+        progress = {
+            "processed": job.processed + len(rows),
+            "updated": job.updated + len(values),
+            "failed": job.failed + len(results) - len(values),
+            "last_student_id": rows[-1][0],
+            "errors": json.dumps(errors, ensure_ascii=False),
+            "heartbeat_at": now,
+        }
+        async with self._session() as session:
+            if values:
+                await session.execute(update(Student), values)
+            advanced = await session.execute(
+                update(StudentReanalysisJob)
+                .where(StudentReanalysisJob.id == job.id, StudentReanalysisJob.status == RUNNING)
+                .values(**progress)
+            )
+            if advanced.rowcount != 1:
+                await session.rollback()
+                return False
+            await session.commit()
+
+        for key, value in progress.items():
+            setattr(job, key, value)
+        logger.info(f"🔁 Re-análisis {job.job_id}: {job.processed}/{job.total} estudiantes")
+        return True
+
+    async def _finish(self, job: StudentReanalysisJob, **values) -> None:
+        async with self._session() as session:
+            await session.execute(
+                update(StudentReanalysisJob)
+                .where(StudentReanalysisJob.id == job.id, StudentReanalysisJob.status == RUNNING)
+                .values(finished_at=utc_now(), **values)
+            )
+            await session.commit()
+
+
+# Instancia compartida
+student_reanalysis_jobs = StudentReanalysisJobs()
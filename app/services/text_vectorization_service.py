@@ -23,7 +23,7 @@ Casos de uso:
 5. Análisis comparativo entre documentos
 """
 
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional, Set, Union
 import re
 import unicodedata
 import math
@@ -33,6 +33,7 @@ from collections import Counter
 from enum import Enum
 
 from app.core.config import settings
+from app.services.document_context import DocumentContext
 
 
 # ============================================================================
@@ -46,6 +47,10 @@ MAX_TOKENS = settings.NLP_MAX_VOCAB_SIZE          # Máximo de tokens únicos en
 MAX_NGRAM_SIZE = settings.NLP_MAX_NGRAM_SIZE      # Máximo n-gramas (1=unigramas, 2=bigramas, etc.)
 MIN_TOKEN_LENGTH = settings.NLP_MIN_TOKEN_LENGTH  # Longitud mínima de tokens
 
+# Versión del análisis: subirla al cambiar vocabularios, normalización o
+# ranking (invalida los análisis cacheados en cv_analysis_cache)
+ANALYZER_VERSION = "1"
+
 # Stopwords técnicos a excluir (en inglés y español)
 TECHNICAL_STOPWORDS = {
     # Inglés
@@ -539,34 +544,53 @@ class TermExtractor:
         self.min_term_length = min_term_length
         self.extracted_terms: Dict[str, float] = {}
     
-    def extract_technical_terms(self, text: str) -> List[Tuple[str, float]]:
+    @staticmethod
+    def rank_vocab_terms(counts: Counter, vocab: Set[str]) -> List[Tuple[str, float]]:
         """
-        Extraer términos técnicos de un texto.
+        Ranking de términos de `vocab` a partir de conteos de tokens.
+        
+        Relevancia = 1.0 + 0.1 * apariciones. Trabajar sobre conteos (en
+        lugar de `tokens.count` por token) hace la extracción lineal y permite
+        sumar conteos de varios fragmentos de un documento largo.
+        """
+        terms = [
+            (token, 1.0 + count * 0.1)
+            for token, count in counts.items()
+            if token in vocab or any(term in token for term in vocab)
+        ]
+        return sorted(terms, key=lambda x: x[1], reverse=True)
+    
+    def count_phrases(self, tokens: List[str], max_phrase_length: int = 3) -> Counter:
+        """Frecuencia de n-gramas (2..max_phrase_length) de una lista de tokens."""
+        phrases: Counter = Counter()
+        for n in range(2, min(max_phrase_length + 1, len(tokens) + 1)):
+            for i in range(len(tokens) - n + 1):
+                phrase = " ".join(tokens[i:i+n])
+                if len(phrase) >= self.min_term_length:
+                    phrases[phrase] += 1
+        return phrases
+    
+    @staticmethod
+    def rank_phrases(phrases: Counter) -> List[Tuple[str, float]]:
+        """Frases ordenadas por frecuencia normalizada al máximo."""
+        max_freq = max(phrases.values()) if phrases else 1
+        return sorted(
+            [(phrase, freq / max_freq) for phrase, freq in phrases.items()],
+            key=lambda x: x[1],
+            reverse=True
+        )
+    
+    def extract_technical_terms(self, text: Union[str, DocumentContext]) -> List[Tuple[str, float]]:
+        """
+        Extraer términos técnicos de un texto (o de su DocumentContext ya normalizado).
         
         Returns:
             Lista de (término, relevancia) ordenada por relevancia descendente
         """
-        normalized = normalize_text(text, NormalizationType.TECHNICAL)
-        tokens = normalized.split()
-        
-        technical_terms = []
-        for token in tokens:
-            if token in TECHNICAL_VOCAB or any(tech in token for tech in TECHNICAL_VOCAB):
-                relevance = 1.0  # Base
-                
-                # Aumentar relevancia si aparece múltiples veces
-                relevance += tokens.count(token) * 0.1
-                
-                technical_terms.append((token, relevance))
-        
-        # Deduplicar y ordenar
-        unique_terms = {}
-        for term, relevance in technical_terms:
-            unique_terms[term] = max(unique_terms.get(term, 0), relevance)
-        
-        return sorted(unique_terms.items(), key=lambda x: x[1], reverse=True)
+        tokens = DocumentContext.of(text).tokens(NormalizationType.TECHNICAL)
+        return self.rank_vocab_terms(Counter(tokens), TECHNICAL_VOCAB)
     
-    def extract_soft_skills(self, text: str) -> List[Tuple[str, float]]:
+    def extract_soft_skills(self, text: Union[str, DocumentContext]) -> List[Tuple[str, float]]:
         """
         Extraer habilidades blandas (soft skills) de un texto.
         
@@ -577,60 +601,28 @@ class TermExtractor:
         
         Ejemplo:
             Input: "Tengo excelentes habilidades de comunicación y liderazgo..."
-            Output: [("comunicación", 1.1), ("liderazgo", 1.0), ...]
+            Output: [("comunicación", 1.1), ("liderazgo", 1.1), ...]
         """
-        normalized = normalize_text(text, NormalizationType.TECHNICAL)
-        tokens = normalized.split()
-        
-        soft_skills = []
-        for token in tokens:
-            if token in SOFT_SKILLS_VOCAB or any(skill in token for skill in SOFT_SKILLS_VOCAB):
-                relevance = 1.0  # Base
-                
-                # Aumentar relevancia si aparece múltiples veces
-                relevance += tokens.count(token) * 0.1
-                
-                soft_skills.append((token, relevance))
-        
-        # Deduplicar y ordenar
-        unique_skills = {}
-        for skill, relevance in soft_skills:
-            unique_skills[skill] = max(unique_skills.get(skill, 0), relevance)
-        
-        return sorted(unique_skills.items(), key=lambda x: x[1], reverse=True)
-    
-    def extract_keyphrases(self, text: str, max_phrase_length: int = 3) -> List[Tuple[str, float]]:
+        tokens = DocumentContext.of(text).tokens(NormalizationType.TECHNICAL)
+        return self.rank_vocab_terms(Counter(tokens), SOFT_SKILLS_VOCAB)
+    
+    def extract_keyphrases(self, text: Union[str, DocumentContext], max_phrase_length: int = 3) -> List[Tuple[str, float]]:
         """
         Extraer frases clave (n-gramas significativos).
         
         Args:
-            text: Texto a procesar
+            text: Texto a procesar (o su DocumentContext)
             max_phrase_length: Máximo de palabras por frase
             
         Returns:
             Lista de (frase, score) ordenada por score descendente
         """
-        normalized = normalize_text(text, NormalizationType.AGGRESSIVE)
-        tokens = normalized.split()
+        tokens = DocumentContext.of(text).tokens(NormalizationType.AGGRESSIVE)
         
         if len(tokens) < 2:
             return []
         
-        phrases = {}
-        for n in range(2, min(max_phrase_length + 1, len(tokens) + 1)):
-            for i in range(len(tokens) - n + 1):
-                phrase = " ".join(tokens[i:i+n])
-                if len(phrase) >= self.min_term_length:
-                    # Score basado en frecuencia
-                    phrases[phrase] = phrases.get(phrase, 0) + 1
-        
-        # Normalizar scores
-        max_freq = max(phrases.values()) if phrases else 1
-        return sorted(
-            [(phrase, freq / max_freq) for phrase, freq in phrases.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )
+        return self.rank_phrases(self.count_phrases(tokens, max_phrase_length))
 
 
 # ============================================================================
@@ -707,10 +699,13 @@ class TextVectorizationService:
         
         return self.vectorizer.cosine_similarity(vec1, vec2)
     
-    def analyze_document(self, text: str) -> Dict:
+    def analyze_document(self, text: Union[str, DocumentContext]) -> Dict:
         """
         Análisis completo de un documento (Genérico: CV, oferta de trabajo, etc).
         
+        Acepta un DocumentContext para reutilizar la normalización con otros
+        extractores del mismo documento.
+        
         Returns:
             Dict con:
             - normalized_text: Texto normalizado
@@ -723,23 +718,34 @@ class TextVectorizationService:
             - text_length: Largo original del texto
             - normalized_length: Largo del texto normalizado
         """
-        normalized = normalize_text(text, NormalizationType.TECHNICAL)
-        tokens = normalized.split() if normalized else []
-        
-        technical_terms = self.term_extractor.extract_technical_terms(text)
-        soft_skills = self.term_extractor.extract_soft_skills(text)
-        keyphrases = self.term_extractor.extract_keyphrases(text)
+        context = DocumentContext.of(text)
+        extractor = self.term_extractor
+        phrase_counts: Counter = Counter()
+        normalized_parts: List[str] = []
+        normalized_length = 0
+        
+        # Documentos largos se procesan por fragmentos y se suman los conteos:
+        # el texto ya no se trunca en MAX_TEXT_LEN. Los n-gramas no cruzan
+        # fragmentos; AGGRESSIVE y TECHNICAL comparten la normalización.
+        for normalized in context.normalized_chunks(NormalizationType.TECHNICAL):
+            phrase_counts.update(extractor.count_phrases(normalized.split()))
+            if normalized_length < MAX_TEXT_LEN:
+                normalized_parts.append(normalized)
+            normalized_length += len(normalized) + (1 if normalized_length else 0)
+        token_counts = Counter(context.tokens(NormalizationType.TECHNICAL))
+        
+        normalized_text = " ".join(normalized_parts)[:MAX_TEXT_LEN]
         
         return {
-            "normalized_text": normalized,
-            "token_count": len(tokens),
-            "unique_tokens": len(set(tokens)),
-            "tokens": tokens[:50],  # Primeros 50 para preview
-            "technical_terms": technical_terms[:10],
-            "soft_skills": soft_skills[:10],
-            "keyphrases": keyphrases[:10],
-            "text_length": len(text),
-            "normalized_length": len(normalized),
+            "normalized_text": normalized_text,
+            "token_count": sum(token_counts.values()),
+            "unique_tokens": len(token_counts),
+            "tokens": normalized_text.split()[:50],  # Primeros 50 para preview
+            "technical_terms": extractor.rank_vocab_terms(token_counts, TECHNICAL_VOCAB)[:10],
+            "soft_skills": extractor.rank_vocab_terms(token_counts, SOFT_SKILLS_VOCAB)[:10],
+            "keyphrases": extractor.rank_phrases(phrase_counts)[:10],
+            "text_length": len(context.text),
+            "normalized_length": normalized_length,
         }
     
     # ❌ ELIMINADO: calculate_match_score()
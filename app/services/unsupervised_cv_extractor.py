@@ -20,14 +20,17 @@ Filosofía:
 "Analizar CÓMO se escribe el CV, no DÓNDE está escrito"
 """
 
-import re
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from collections import Counter
-import unicodedata
+
+import numpy as np
 
 from app.core.config import settings
+from app.services import cv_patterns
+from app.services.cv_patterns import first_match_lines, keyword_matcher, word_matcher
+from app.services.document_context import DocumentContext
 
 logger = logging.getLogger(__name__)
 
@@ -165,6 +168,43 @@ TECH_TERMS = {
     "linux", "unix", "windows", "macos", "docker", "cicd",
 }
 
+# Matchers precompilados (equivalen a `any(kw in line for kw in KEYWORDS)`)
+ACTION_VERB_MATCHER = keyword_matcher(ACTION_VERBS)
+TECH_TERM_MATCHER = keyword_matcher(TECH_TERMS)
+EDUCATION_KEYWORD_MATCHER = keyword_matcher(EDUCATION_KEYWORDS)
+CERTIFICATION_KEYWORD_MATCHER = keyword_matcher(CERTIFICATION_KEYWORDS)
+LANGUAGE_KEYWORD_MATCHER = keyword_matcher(LANGUAGE_KEYWORDS)
+
+# Headers core (aplicable a cualquier CV) para LineClassifier
+CORE_HEADER_MATCHER = keyword_matcher([
+    "education", "experiencia", "experience", "skills", "habilidades",
+    "objective", "objetivo", "languages", "idiomas", "certification",
+    "certificación", "projects", "proyectos", "summary", "resumen",
+])
+
+# Columnas booleanas regex de LineFeatureExtractor (sobre texto en minúsculas;
+# mismo orden que el desempaquetado en `_feature_rows`)
+LINE_PATTERNS = (
+    ("has_dates", cv_patterns.YEAR),
+    ("has_action_verbs", ACTION_VERB_MATCHER),
+    ("has_tech_terms", TECH_TERM_MATCHER),
+    ("has_education_kw", EDUCATION_KEYWORD_MATCHER),
+    ("has_company_signals", cv_patterns.COMPANY_SUFFIX),
+    ("has_metrics", cv_patterns.METRIC),
+    ("has_email", cv_patterns.EMAIL),
+    ("has_url", cv_patterns.URL),
+)
+
+# Variante de idioma (palabra completa) -> idioma; una sola pasada por texto
+LANGUAGE_VARIANT_MATCHER = word_matcher(
+    keyword for keywords in LANGUAGE_KEYWORDS_MAP.values() for keyword in keywords
+)
+LANGUAGE_BY_VARIANT = {
+    keyword: lang_name
+    for lang_name, keywords in LANGUAGE_KEYWORDS_MAP.items()
+    for keyword in keywords
+}
+
 
 # ============================================================================
 # DATACLASSES
@@ -203,6 +243,7 @@ class ExtractedCV:
     overall_confidence: float = 0.0
     extraction_method: str = "unsupervised_hybrid"
     method_used_for_each: Dict[str, str] = None  # Qué método se usó para cada campo
+    detected_language: Optional[str] = None  # Idioma del CV ('es' | 'en')
     
     def __post_init__(self):
         if self.education is None:
@@ -229,7 +270,8 @@ class ExtractedCV:
             "languages": self.languages,
             "overall_confidence": round(self.overall_confidence, 2),
             "extraction_method": self.extraction_method,
-            "method_used_for_each": self.method_used_for_each
+            "method_used_for_each": self.method_used_for_each,
+            "detected_language": self.detected_language
         }
 
 
@@ -238,7 +280,20 @@ class ExtractedCV:
 # ============================================================================
 
 class LineFeatureExtractor:
-    """Extrae características de cada línea del CV"""
+    """
+    Extrae características de cada línea del CV.
+    
+    Featurización por lotes: las líneas de uno o varios CVs se unen en un
+    solo texto y cada patrón de LINE_PATTERNS lo recorre UNA vez con
+    `first_match_lines` (a lo más una coincidencia por línea).
+    """
+    
+    FEATURE_NAMES = (
+        "has_dates", "has_action_verbs", "has_tech_terms", "has_education_kw",
+        "has_company_signals", "num_numbers", "pct_capitals", "line_length",
+        "is_bullet", "has_metrics", "has_email", "has_phone", "has_url",
+        "num_words", "avg_word_length",
+    )
     
     @staticmethod
     def extract(line: str) -> Dict[str, any]:
@@ -248,83 +303,73 @@ class LineFeatureExtractor:
         Returns:
             Dict con características booleanas y numéricas
         """
-        if not line:
-            return {}
-        
-        line_lower = line.lower()
-        
-        # Fecha: años entre 1900-2100
-        has_dates = bool(re.search(r'\b(19\d{2}|20\d{2})\b', line))
-        
-        # Verbos de acción
-        has_action_verbs = any(verb in line_lower for verb in ACTION_VERBS)
-        
-        # Términos técnicos
-        has_tech_terms = any(term in line_lower for term in TECH_TERMS)
-        
-        # Keywords de educación
-        has_education_kw = any(kw in line_lower for kw in EDUCATION_KEYWORDS)
-        
-        # Señales de empresa (Ltd, Inc, Corp, etc)
-        has_company_signals = bool(re.search(
-            r'\b(Ltd|Inc|Corp|LLC|GmbH|SA|AG|SPA|Co|Company|Corporation)\b',
-            line,
-            re.IGNORECASE
-        ))
-        
-        # Cantidad de números
-        num_numbers = len(re.findall(r'\d', line))
-        
-        # Porcentaje de mayúsculas
-        pct_capitals = (
-            sum(1 for c in line if c.isupper()) / len(line)
-            if line else 0
-        )
-        
-        # Longitud de línea
-        line_length = len(line)
-        
-        # Es bullet point
-        is_bullet = line.strip().startswith(("-", "*", "•", "→", "◦", "+"))
-        
-        # Contiene métricas (números con % o +)
-        has_metrics = bool(re.search(r'\d+%|\d+\+', line))
-        
-        # Contiene email
-        has_email = bool(re.search(r'[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}', line_lower))
-        
-        # Contiene teléfono
-        has_phone = bool(re.search(r'\(?[\d\s\-\+\.]+\)?', line))
-        
-        # Contiene URL
-        has_url = bool(re.search(r'https?://|www\.', line_lower))
-        
-        # Número de palabras
-        num_words = len(line.split())
-        
-        # Promedio de longitud de palabras
-        avg_word_length = (
-            sum(len(w) for w in line.split()) / len(line.split())
-            if line.split() else 0
-        )
+        return LineFeatureExtractor.extract_lines([line])[0]
+    
+    @staticmethod
+    def extract_lines(lines: List[str]) -> List[Dict[str, any]]:
+        """Features de varias líneas en una sola pasada ({} para líneas vacías)."""
+        names = LineFeatureExtractor.FEATURE_NAMES
+        return [
+            dict(zip(names, row)) if row else {}
+            for row in LineFeatureExtractor._feature_rows(lines)
+        ]
+    
+    @staticmethod
+    def feature_matrix(lines: List[str]) -> np.ndarray:
+        """
+        Matriz compacta (len(lines), len(FEATURE_NAMES)) float32.
         
-        return {
-            "has_dates": has_dates,
-            "has_action_verbs": has_action_verbs,
-            "has_tech_terms": has_tech_terms,
-            "has_education_kw": has_education_kw,
-            "has_company_signals": has_company_signals,
-            "num_numbers": num_numbers,
-            "pct_capitals": pct_capitals,
-            "line_length": line_length,
-            "is_bullet": is_bullet,
-            "has_metrics": has_metrics,
-            "has_email": has_email,
-            "has_phone": has_phone,
-            "has_url": has_url,
-            "num_words": num_words,
-            "avg_word_length": avg_word_length,
-        }
+        Las filas de líneas vacías quedan en cero.
+        """
+        matrix = np.zeros((len(lines), len(LineFeatureExtractor.FEATURE_NAMES)), dtype=np.float32)
+        for index, row in enumerate(LineFeatureExtractor._feature_rows(lines)):
+            if row:
+                matrix[index] = row
+        return matrix
+    
+    @staticmethod
+    def _feature_rows(lines: List[str]) -> List[Optional[tuple]]:
+        """Tupla de features (orden FEATURE_NAMES) por línea; None si está vacía."""
+        lowered = [line.lower() for line in lines]
+        starts = []
+        offset = 0
+        for line_lower in lowered:
+            starts.append(offset)
+            offset += len(line_lower) + 1
+        # "\x00" no coincide con ningún patrón ni keyword: nada cruza líneas
+        document = "\x00".join(lowered)
+        
+        (
+            has_dates, has_action, has_tech, has_education,
+            has_company, has_metrics, has_email, has_url,
+        ) = (first_match_lines(pattern, document, starts) for _, pattern in LINE_PATTERNS)
+        
+        rows = []
+        for index, line in enumerate(lines):
+            if not line:
+                rows.append(None)
+                continue
+            
+            words = line.split()
+            num_words = len(words)
+            rows.append((
+                has_dates[index],
+                has_action[index],
+                has_tech[index],
+                has_education[index],
+                has_company[index],
+                sum(map(str.isdecimal, line)),                          # num_numbers (\d)
+                sum(map(str.isupper, line)) / len(line),                # pct_capitals
+                len(line),                                              # line_length
+                line.strip().startswith(("-", "*", "•", "→", "◦", "+")),  # is_bullet
+                has_metrics[index],
+                has_email[index],
+                cv_patterns.PHONE.search(line) is not None,             # has_phone
+                has_url[index],
+                num_words,
+                sum(len(w) for w in words) / num_words if words else 0,  # avg_word_length
+            ))
+        return rows
 
 
 # ============================================================================
@@ -365,13 +410,7 @@ class LineClassifier:
         is_mostly_caps = features["pct_capitals"] > 0.4
         
         # Headers core (aplicable a cualquier CV)
-        core_headers = [
-            "education", "experiencia", "experience", "skills", "habilidades",
-            "objective", "objetivo", "languages", "idiomas", "certification",
-            "certificación", "projects", "proyectos", "summary", "resumen",
-        ]
-        
-        has_core_header = any(kw in line_lower for kw in core_headers)
+        has_core_header = CORE_HEADER_MATCHER.search(line_lower) is not None
         
         if has_core_header and is_short_line:
             return ("header", 0.95)
@@ -404,11 +443,11 @@ class LineClassifier:
             return ("skill", 0.80)
         
         # ========== CERTIFICACIÓN ==========
-        if any(kw in line_lower for kw in CERTIFICATION_KEYWORDS):
+        if CERTIFICATION_KEYWORD_MATCHER.search(line_lower):
             return ("certification", 0.75)
         
         # ========== IDIOMA ==========
-        if any(kw in line_lower for kw in LANGUAGE_KEYWORDS):
+        if LANGUAGE_KEYWORD_MATCHER.search(line_lower):
             return ("language", 0.70)
         
         # ========== PÁRRAFO NARRATIVO (OBJETIVO) ==========
@@ -481,6 +520,29 @@ class SectionDetector:
         'c++', 'c#', 'r', 'scala', 'go', 'rust', 'kotlin', 'swift',
     }
     
+    # Verbos de acción que distinguen experiencia de educación / certificaciones
+    EDU_EXCLUDED_VERBS = {
+        'develop', 'manage', 'lead', 'analyze', 'architect', 'implement',
+        'trabajé', 'dirigí', 'lideré', 'diseñé', 'gestioné', 'built',
+    }
+    EXPERIENCE_VERBS = {
+        'develop', 'manage', 'lead', 'analyze', 'architected',
+        'implement', 'design', 'engineer', 'built', 'worked',
+        'trabajé', 'dirigí', 'lideré', 'diseñé', 'gestioné',
+        'desarrollé', 'implementé', 'administré',
+    }
+    CERT_KEYWORDS = {
+        'certified', 'certification', 'certificate', 'award',
+        'certificado', 'certificación', 'acreditación',
+    }
+    
+    # Matchers precompilados de los sets anteriores
+    EDU_MATCHER = keyword_matcher(EDU_KEYWORDS)
+    POSITION_MATCHER = keyword_matcher(POSITION_KEYWORDS)
+    EDU_EXCLUDED_VERB_MATCHER = keyword_matcher(EDU_EXCLUDED_VERBS)
+    EXPERIENCE_VERB_MATCHER = keyword_matcher(EXPERIENCE_VERBS)
+    CERT_MATCHER = keyword_matcher(CERT_KEYWORDS)
+    
     @staticmethod
     def _count_tech_terms(line: str) -> int:
         """Contar cuántos términos técnicos hay en una línea"""
@@ -507,16 +569,11 @@ class SectionDetector:
         line_lower = line.lower()
         
         # Debe tener keywords de educación
-        has_edu_kw = any(kw in line_lower for kw in SectionDetector.EDU_KEYWORDS)
-        if not has_edu_kw:
+        if not SectionDetector.EDU_MATCHER.search(line_lower):
             return False
         
         # NO debe tener verbos de acción (eso sería experiencia)
-        action_verbs = {'develop', 'manage', 'lead', 'analyze', 'architect', 'implement',
-                       'trabajé', 'dirigí', 'lideré', 'diseñé', 'gestioné', 'built'}
-        has_action = any(verb in line_lower for verb in action_verbs)
-        
-        return not has_action
+        return SectionDetector.EDU_EXCLUDED_VERB_MATCHER.search(line_lower) is None
     
     @staticmethod
     def _has_experience_pattern(line: str) -> bool:
@@ -536,9 +593,7 @@ class SectionDetector:
         line_lower = line.lower()
         
         # EXCLUIR certificaciones
-        cert_keywords = {'certified', 'certification', 'certificate', 'award',
-                        'certificado', 'certificación', 'acreditación'}
-        if any(kw in line_lower for kw in cert_keywords):
+        if SectionDetector.CERT_MATCHER.search(line_lower):
             return False
         
         # Patrón "X - Y" (empresa - puesto)
@@ -546,17 +601,11 @@ class SectionDetector:
             return True
         
         # Tiene verbos de acción
-        action_verbs = {'develop', 'manage', 'lead', 'analyze', 'architected',
-                       'implement', 'design', 'engineer', 'built', 'worked',
-                       'trabajé', 'dirigí', 'lideré', 'diseñé', 'gestioné',
-                       'desarrollé', 'implementé', 'administré'}
-        if any(verb in line_lower for verb in action_verbs):
+        if SectionDetector.EXPERIENCE_VERB_MATCHER.search(line_lower):
             return True
         
         # Posición keyword (pero solo si hay indicadores de empresa)
-        has_position = any(kw in line_lower for kw in SectionDetector.POSITION_KEYWORDS)
-        
-        return has_position
+        return SectionDetector.POSITION_MATCHER.search(line_lower) is not None
     
     @staticmethod
     def _has_skills_pattern(line: str) -> bool:
@@ -585,10 +634,7 @@ class SectionDetector:
     def _is_year_line(line: str) -> bool:
         """¿Es una línea que contiene solo año(s)?"""
         line_strip = line.strip()
-        return bool(re.match(
-            r'^\d{4}(-\d{4})?$|^\d{4}$|presente|present|actualidad|current',
-            line_strip.lower()
-        ))
+        return cv_patterns.YEAR_ONLY_LINE.match(line_strip.lower()) is not None
     
     @staticmethod
     def group_lines(classified_lines: List[Dict]) -> Dict[str, List[Dict]]:
@@ -910,7 +956,7 @@ class FieldExtractor:
         if "skill" in sections:
             for skill_block in sections["skill"]:
                 # Divide por comas o punto y coma
-                items = re.split(r'[,;]', skill_block["content"])
+                items = cv_patterns.SKILL_SEPARATORS.split(skill_block["content"])
                 skills.extend([s.strip() for s in items if s.strip()])
         
         return skills[:30]  # Max 30
@@ -934,19 +980,13 @@ class FieldExtractor:
         
         Retorna lista de strings como: ["English", "Spanish", "French"]
         """
-        languages = []
-        text_lower = full_text.lower()
-        
-        # Buscar cada idioma en el mapa
-        for lang_name, keywords in LANGUAGE_KEYWORDS_MAP.items():
-            # Buscar si alguna variante del idioma aparece en el texto
-            for keyword in keywords:
-                # Usar word boundary para evitar match parciales
-                pattern = r'\b' + re.escape(keyword) + r'\b'
-                if re.search(pattern, text_lower):
-                    # Encontrado - agregar idioma una sola vez
-                    languages.append(lang_name)
-                    break  # No repetir el mismo idioma con otras variantes
+        # Una sola pasada con todas las variantes (word boundary para evitar
+        # matches parciales); el resultado conserva el orden del mapa
+        found = {
+            LANGUAGE_BY_VARIANT[match.group()]
+            for match in LANGUAGE_VARIANT_MATCHER.finditer(full_text.lower())
+        }
+        languages = [lang_name for lang_name in LANGUAGE_KEYWORDS_MAP if lang_name in found]
         
         return languages[:15]  # Max 15 idiomas
     
@@ -1021,7 +1061,7 @@ class FieldExtractor:
                 break
         
         # 3. Buscar año de graduación
-        year_match = re.search(r'\b(20\d{2}|19\d{2})\b', text)
+        year_match = cv_patterns.YEAR.search(text)
         if year_match:
             edu.graduation_year = int(year_match.group(1))
         
@@ -1081,7 +1121,7 @@ class FieldExtractor:
                 exp.position = parts[0].strip()
                 exp.company = parts[1].strip()
         elif " at " in first_line.lower() and len(first_line) < 100:
-            parts = re.split(r'\s+at\s+', first_line, flags=re.IGNORECASE)
+            parts = cv_patterns.POSITION_AT_COMPANY.split(first_line)
             exp.position = parts[0].strip()
             exp.company = parts[1].strip() if len(parts) > 1 else ""
         elif len(first_line) < 100:
@@ -1094,7 +1134,7 @@ class FieldExtractor:
             exp.position = " ".join(words)
         
         # 2. Buscar fechas (años)
-        year_matches = re.findall(r'\b(20\d{2}|19\d{2})\b', text)
+        year_matches = cv_patterns.YEAR.findall(text)
         if len(year_matches) >= 2:
             exp.start_date = year_matches[0]
             exp.end_date = year_matches[1]
@@ -1135,7 +1175,7 @@ class UnsupervisedCVExtractor:
         self.detector = SectionDetector()
         self.field_extractor = FieldExtractor()
     
-    def extract(self, text: str) -> ExtractedCV:
+    def extract(self, text: Union[str, DocumentContext]) -> ExtractedCV:
         """
         Extrae CV completo desde texto.
         
@@ -1148,95 +1188,136 @@ class UnsupervisedCVExtractor:
         6. Calcula confianza
         
         Args:
-            text: Texto completo del CV
+            text: Texto completo del CV (o su DocumentContext)
             
         Returns:
             ExtractedCV con todos los campos
         """
         try:
             # Paso 1: Preprocesamiento
-            lines = self._preprocess(text)
+            context = DocumentContext.of(text)
+            lines = self._preprocess(context)
             
             if not lines:
                 logger.warning("CV vacío o sin contenido válido")
                 return ExtractedCV()
             
-            # Paso 2: Extrae features
-            classified_lines = []
-            for line in lines:
-                features = self.feature_extractor.extract(line)
-                category, confidence = self.classifier.classify(line, features)
-                
-                classified_lines.append({
-                    "line": line,
-                    "category": category,
-                    "confidence": confidence,
-                    "features": features
-                })
-            
-            # Paso 3: Agrupa en secciones
-            sections = self.detector.group_lines(classified_lines)
-            
-            # Paso 4: Extrae campos
-            objective = self.field_extractor.extract_objective(sections, text)
-            education = self.field_extractor.extract_education(sections)
-            experience = self.field_extractor.extract_experience(sections)
-            skills = self.field_extractor.extract_skills(sections)
-            certifications = self.field_extractor.extract_certifications(sections)
-            languages = self.field_extractor.extract_languages(sections, text)  # Pasar texto completo
-            
-            # Paso 5: Calcula confianza
-            overall_confidence = self._calculate_confidence(
-                objective, education, experience, skills
-            )
-            
-            # Paso 6: Construye resultado
-            result = ExtractedCV(
-                objective=objective,
-                education=education,
-                experience=experience,
-                skills=skills,
-                certifications=certifications,
-                languages=languages,
-                overall_confidence=overall_confidence,
-                extraction_method="unsupervised_hybrid",
-                method_used_for_each={
-                    "objective": "unsupervised",
-                    "education": "unsupervised",
-                    "experience": "unsupervised",
-                    "skills": "unsupervised",
-                    "certifications": "unsupervised",
-                    "languages": "unsupervised",
-                }
-            )
-            
-            return result
+            # Paso 2: Extrae features (una pasada por todo el CV)
+            features = self.feature_extractor.extract_lines(lines)
+            return self._extract_from_lines(context, lines, features)
             
         except Exception as e:
             logger.error(f"Error en extracción unsupervised: {e}", exc_info=True)
             return ExtractedCV()
     
-    def _preprocess(self, text: str) -> List[str]:
+    def extract_many(self, texts: Iterable[str], batch_size: Optional[int] = None) -> List[ExtractedCV]:
         """
-        Preprocesa texto en líneas válidas.
+        Extrae varios CVs (re-procesamiento masivo de la base de estudiantes).
+        
+        Los CVs se procesan en lotes de `batch_size`: las líneas de todo el
+        lote se featurizan en una sola pasada. Un CV que falla produce un
+        ExtractedCV vacío sin afectar al resto del lote.
+        
+        Returns:
+            Un ExtractedCV por texto, en el mismo orden
         """
-        if not text:
-            return []
+        batch_size = batch_size or settings.CV_EXTRACTION_BATCH_SIZE
+        results: List[ExtractedCV] = []
+        batch: List[str] = []
+        for text in texts:
+            batch.append(text)
+            if len(batch) >= batch_size:
+                results.extend(self._extract_batch(batch))
+                batch = []
+        if batch:
+            results.extend(self._extract_batch(batch))
+        return results
+    
+    def _extract_batch(self, texts: List[str]) -> List[ExtractedCV]:
+        texts = [DocumentContext.of(text) for text in texts]
+        documents = [self._preprocess(text) for text in texts]
+        try:
+            all_features = self.feature_extractor.extract_lines(
+                [line for lines in documents for line in lines]
+            )
+        except Exception as e:
+            logger.error(f"Error featurizando lote de CVs, se procesan uno a uno: {e}")
+            return [self.extract(text) for text in texts]
+        
+        results = []
+        offset = 0
+        for text, lines in zip(texts, documents):
+            features = all_features[offset:offset + len(lines)]
+            offset += len(lines)
+            if not lines:
+                results.append(ExtractedCV())
+                continue
+            try:
+                results.append(self._extract_from_lines(text, lines, features))
+            except Exception as e:
+                logger.error(f"Error en extracción unsupervised: {e}", exc_info=True)
+                results.append(ExtractedCV())
+        return results
+    
+    def _extract_from_lines(self, context: DocumentContext, lines: List[str], features: List[Dict]) -> ExtractedCV:
+        """Pasos 3-6 sobre líneas ya preprocesadas y featurizadas."""
+        text = context.text
+        # Paso 3: Clasifica líneas
+        classified_lines = []
+        for line, line_features in zip(lines, features):
+            category, confidence = self.classifier.classify(line, line_features)
+            
+            classified_lines.append({
+                "line": line,
+                "category": category,
+                "confidence": confidence,
+                "features": line_features
+            })
         
-        # Normaliza unicode
-        text = unicodedata.normalize("NFKD", text)
+        # Paso 4: Agrupa en secciones
+        sections = self.detector.group_lines(classified_lines)
         
-        # Divide por líneas
-        lines = text.split("\n")
+        # Paso 5: Extrae campos
+        objective = self.field_extractor.extract_objective(sections, text)
+        education = self.field_extractor.extract_education(sections)
+        experience = self.field_extractor.extract_experience(sections)
+        skills = self.field_extractor.extract_skills(sections)
+        certifications = self.field_extractor.extract_certifications(sections)
+        languages = self.field_extractor.extract_languages(sections, text)  # Pasar texto completo
         
-        # Limpia y filtra líneas vacías
-        lines = [
-            line.strip()
-            for line in lines
-            if line.strip() and len(line.strip()) > 1
-        ]
+        # Paso 6: Calcula confianza
+        overall_confidence = self._calculate_confidence(
+            objective, education, experience, skills
+        )
+        
+        # Construye resultado
+        return ExtractedCV(
+            objective=objective,
+            education=education,
+            experience=experience,
+            skills=skills,
+            certifications=certifications,
+            languages=languages,
+            overall_confidence=overall_confidence,
+            extraction_method="unsupervised_hybrid",
+            detected_language=context.language,
+            method_used_for_each={
+                "objective": "unsupervised",
+                "education": "unsupervised",
+                "experience": "unsupervised",
+                "skills": "unsupervised",
+                "certifications": "unsupervised",
+                "languages": "unsupervised",
+            }
+        )
+    
+    def _preprocess(self, text: Union[str, DocumentContext]) -> List[str]:
+        """
+        Preprocesa texto en líneas válidas (NFKD, sin vacías).
         
-        return lines
+        Las líneas se calculan una vez por documento (DocumentContext.clean_lines).
+        """
+        return DocumentContext.of(text).clean_lines
     
     def _calculate_confidence(
         self,
@@ -1245,29 +1326,39 @@ class UnsupervisedCVExtractor:
         experience: List[Dict],
         skills: List[str]
     ) -> float:
-        """
-        Calcula confianza general de la extracción.
-        
-        Basada en:
-        - Presencia de cada campo
-        - Cantidad de elementos
-        """
-        confidence_score = 0.0
-        
-        # Objetivo: 10%
-        if objective:
-            confidence_score += 0.10
-        
-        # Educación: 20%
-        confidence_score += min(0.20, len(education) * 0.04)
-        
-        # Experiencia: 30% (más peso que educación)
-        confidence_score += min(0.30, len(experience) * 0.06)
-        
-        # Skills: 40%
-        confidence_score += min(0.40, len(skills) * 0.013)
-        
-        return min(1.0, max(0.0, confidence_score))
+        """Calcula confianza general de la extracción (ver extraction_confidence)."""
+        return extraction_confidence(objective, education, experience, skills)
+
+
+def extraction_confidence(
+    objective: Optional[str],
+    education: List[Dict],
+    experience: List[Dict],
+    skills: List[str]
+) -> float:
+    """
+    Confianza general de una extracción de CV (0-1).
+    
+    Basada en:
+    - Presencia de cada campo
+    - Cantidad de elementos
+    """
+    confidence_score = 0.0
+    
+    # Objetivo: 10%
+    if objective:
+        confidence_score += 0.10
+    
+    # Educación: 20%
+    confidence_score += min(0.20, len(education) * 0.04)
+    
+    # Experiencia: 30% (más peso que educación)
+    confidence_score += min(0.30, len(experience) * 0.06)
+    
+    # Skills: 40%
+    confidence_score += min(0.40, len(skills) * 0.013)
+    
+    return min(1.0, max(0.0, confidence_score))
 
 
 # Instancia compartida
@@ -0,0 +1,129 @@
+"""
+Filtros de Bloom para consultas rápidas de pertenencia (deduplicación)
+
+Un filtro de Bloom responde "seguro que no está" o "quizá está" con
+memoria fija: ~1.2 bytes por elemento con 0.1% de falsos positivos. La
+versión escalable encadena filtros cada vez más grandes (y más estrictos)
+para no tener que conocer la cantidad de elementos de antemano; la tasa
+total de falsos positivos queda acotada por error_rate / (1 - tightening).
+
+Los falsos positivos se confirman contra una fuente exacta (ver
+app/services/dedup_store.py); un negativo nunca es incorrecto.
+"""
+import base64
+import hashlib
+import math
+import zlib
+from typing import Any, Dict, List
+
+
+class BloomFilter:
+    """Filtro de Bloom de capacidad fija (doble hashing sobre BLAKE2b)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: str) -> bool:
+        """Agrega `key`; devuelve False si (quizá) ya estaba."""
+        added = False
+        for p in self._positions(key):
+            mask = 1 << (p & 7)
+            if not self.bits[p >> 3] & mask:
+                self.bits[p >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "count": self.count,
+            "bits": base64.b64encode(zlib.compress(bytes(self.bits))).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BloomFilter":
+        bloom = cls(data["capacity"], data["error_rate"])
+        bits = zlib.decompress(base64.b64decode(data["bits"]))
+        if len(bits) != len(bloom.bits):
+            raise ValueError("Tamaño de bits incompatible con capacidad y tasa de error")
+        bloom.bits = bytearray(bits)
+        bloom.count = data["count"]
+        return bloom
+
+
+class ScalableBloomFilter:
+    """
+    Filtro de Bloom que crece: al llenarse uno se agrega otro con
+    `growth` veces la capacidad y `tightening` veces la tasa de error.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 10000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in bloom for bloom in reversed(self.filters))
+
+    def __len__(self) -> int:
+        return sum(bloom.count for bloom in self.filters)
+
+    def add(self, key: str) -> bool:
+        """Agrega `key`; devuelve False si (quizá) ya estaba."""
+        if key in self:
+            return False
+        if not self.filters or self.filters[-1].full:
+            level = len(self.filters)
+            self.filters.append(BloomFilter(
+                self.initial_capacity * self.growth ** level,
+                self.error_rate * (1 - self.tightening) * self.tightening ** level,
+            ))
+        return self.filters[-1].add(key)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self.filters)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "initial_capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "growth": self.growth,
+            "tightening": self.tightening,
+            "filters": [bloom.to_dict() for bloom in self.filters],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScalableBloomFilter":
+        scalable = cls(data["initial_capacity"], data["error_rate"], data["growth"], data["tightening"])
+        scalable.filters = [BloomFilter.from_dict(item) for item in data["filters"]]
+        return scalable
@@ -0,0 +1,14 @@
+"""
+Fechas en UTC con zona horaria
+
+Las columnas `datetime` de SQLModel se mapean a UTCDateTime, que rechaza
+valores naive ("Datetime values must have timezone information"). Los
+defaults y asignaciones de esas columnas usan `utc_now()` en lugar de
+`datetime.utcnow()`.
+"""
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """Fecha y hora actual en UTC (aware)."""
+    return datetime.now(timezone.utc)
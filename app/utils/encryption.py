@@ -8,7 +8,7 @@ from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 import base64
 import os
-from typing import Optional
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -228,6 +228,25 @@ class EncryptionService:
         """
         return self.decrypt(ciphertext) if ciphertext else None
 
+    def encrypt_many(self, plaintexts: List[str]) -> List[str]:
+        """
+        Encriptar un lote de valores con el mismo cipher.
+
+        Para cargas masivas: evita crear un EncryptionService (y un Fernet)
+        por valor, como hacen `Student.set_email`/`set_phone`.
+
+        Returns:
+            Valores encriptados, en el mismo orden
+        """
+        encrypt = self.cipher.encrypt
+        try:
+            return [encrypt(plaintext.encode('utf-8')).decode('utf-8') for plaintext in plaintexts]
+        except AttributeError:
+            raise TypeError("Se esperaba una lista de strings")
+        except Exception as e:
+            logger.error(f"Error al encriptar lote: {e}")
+            raise
+
     def encrypt_email(self, email: str) -> str:
         """
         Encriptar un email con validación adicional.
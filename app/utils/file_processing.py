@@ -18,16 +18,23 @@ USO:
     # Extraer
     text = await extract_text_from_upload(file)
 """
+import asyncio
 import io
-import os
-import tempfile
 import logging
+import time
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Dict, Optional, Tuple, List
 from fastapi import UploadFile, HTTPException
 
+from app.core.config import settings
+from app.core.cpu_executor import CPUExecutor, cpu_executor, run_cpu, CPUExecutorBusyError, THREAD
+
 logger = logging.getLogger(__name__)
 
+# Versión de la extracción de texto: subirla al cambiar cómo se extrae
+# (invalida el texto cacheado por hash en cv_analysis_cache)
+TEXT_EXTRACTOR_VERSION = "2"
+
 # Importaciones de librerías de procesamiento de archivos (con fallbacks)
 try:
     import pdfplumber
@@ -137,57 +144,120 @@ class CVFileValidator:
 # EXTRACTORES DE TEXTO POR FORMATO
 # ============================================================================
 
-def _extract_text_from_pdf(content: bytes) -> str:
+def _pdf_page_backends() -> List[str]:
+    """Backends disponibles que permiten extraer página a página (en orden de calidad)."""
+    backends = []
+    if PDF_PLUMBER_AVAILABLE:
+        backends.append("pdfplumber")
+    if PYPDF2_AVAILABLE:
+        backends.append("PyPDF2")
+    return backends
+
+
+def _extract_pdf_pages(
+    content: bytes,
+    backend: str,
+    start: int = 0,
+    stop: Optional[int] = None,
+    max_chars: int = 0,
+) -> List[str]:
     """
-    Extraer texto de archivo PDF
+    Extraer el texto de las páginas [start, stop) de un PDF con un backend
     
-    Intenta:
+    Se detiene en cuanto reúne `max_chars` caracteres (0 = sin límite):
+    para el análisis basta con el inicio del documento.
+    
+    Returns:
+        Lista con el texto de cada página no vacía, en orden
+    """
+    pages: List[str] = []
+    collected = 0
+    
+    if backend == "pdfplumber":
+        with pdfplumber.open(io.BytesIO(content)) as pdf:
+            for page in pdf.pages[start:stop]:
+                page_text = page.extract_text()
+                if page_text:
+                    pages.append(page_text)
+                    collected += len(page_text)
+                if max_chars and collected >= max_chars:
+                    break
+    elif backend == "PyPDF2":
+        reader = PdfReader(io.BytesIO(content))
+        for page in reader.pages[start:stop]:
+            page_text = page.extract_text()
+            if page_text:
+                pages.append(page_text)
+                collected += len(page_text)
+            if max_chars and collected >= max_chars:
+                break
+    else:
+        raise ValueError(f"Backend PDF desconocido: {backend}")
+    
+    return pages
+
+
+def _pdf_page_count(content: bytes) -> int:
+    """Número de páginas del PDF (0 si no se puede determinar)."""
+    try:
+        if PYPDF2_AVAILABLE:
+            return len(PdfReader(io.BytesIO(content)).pages)
+        if PDF_PLUMBER_AVAILABLE:
+            with pdfplumber.open(io.BytesIO(content)) as pdf:
+                return len(pdf.pages)
+    except Exception as e:
+        logger.warning(f"No se pudo contar páginas del PDF: {e}")
+    return 0
+
+
+def extract_pdf_text(content: bytes, max_chars: Optional[int] = None) -> Tuple[str, Dict[str, float]]:
+    """
+    Extraer texto de un PDF registrando el tiempo de cada backend
+    
+    Intenta, en orden, hasta obtener MIN_TEXT_LENGTH caracteres:
     1. pdfplumber (mejor calidad)
     2. PyPDF2
     3. pdfminer
+    
+    Args:
+        content: Bytes del PDF
+        max_chars: Corte de extracción (default: settings.PDF_MAX_TEXT_CHARS)
+    
+    Returns:
+        (texto, {backend: milisegundos}) con los backends intentados
     """
-    # Intento 1: pdfplumber
-    if PDF_PLUMBER_AVAILABLE:
-        try:
-            text = ""
-            with pdfplumber.open(io.BytesIO(content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            
-            if text and len(text.strip()) >= CVFileValidator.MIN_TEXT_LENGTH:
-                logger.info("PDF procesado con pdfplumber")
-                return text.strip()
-        except Exception as e:
-            logger.warning(f"Error con pdfplumber: {e}")
+    max_chars = settings.PDF_MAX_TEXT_CHARS if max_chars is None else max_chars
+    timings: Dict[str, float] = {}
     
-    # Intento 2: PyPDF2
-    if PYPDF2_AVAILABLE:
+    # Intentos 1 y 2: backends página a página
+    for backend in _pdf_page_backends():
+        started = time.perf_counter()
         try:
-            text = ""
-            pdf_reader = PdfReader(io.BytesIO(content))
-            for page in pdf_reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            
-            if text and len(text.strip()) >= CVFileValidator.MIN_TEXT_LENGTH:
-                logger.info("PDF procesado con PyPDF2")
-                return text.strip()
+            text = "\n".join(_extract_pdf_pages(content, backend, max_chars=max_chars)).strip()
         except Exception as e:
-            logger.warning(f"Error con PyPDF2: {e}")
+            logger.warning(f"Error con {backend}: {e}")
+            text = ""
+        timings[backend] = round((time.perf_counter() - started) * 1000, 1)
+        
+        if len(text) >= CVFileValidator.MIN_TEXT_LENGTH:
+            logger.info(f"PDF procesado con {backend} ({timings})")
+            return text, timings
     
-    # Intento 3: pdfminer
+    # Intento 3: pdfminer (documento completo)
     if PDF_MINER_AVAILABLE:
+        started = time.perf_counter()
         try:
-            text = pdf_extract_text(io.BytesIO(content))
-            if text and len(text.strip()) >= CVFileValidator.MIN_TEXT_LENGTH:
-                logger.info("PDF procesado con pdfminer")
-                return text.strip()
+            text = (pdf_extract_text(io.BytesIO(content)) or "").strip()
         except Exception as e:
             logger.warning(f"Error con pdfminer: {e}")
+            text = ""
+        timings["pdfminer"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        if len(text) >= CVFileValidator.MIN_TEXT_LENGTH:
+            logger.info(f"PDF procesado con pdfminer ({timings})")
+            return text, timings
     
+    logger.warning(f"Ningún backend PDF obtuvo texto suficiente ({timings})")
     # Si ninguno está disponible
     raise HTTPException(
         status_code=500,
@@ -195,6 +265,12 @@ def _extract_text_from_pdf(content: bytes) -> str:
     )
 
 
+def _extract_text_from_pdf(content: bytes) -> str:
+    """Extraer texto de archivo PDF (ver extract_pdf_text)."""
+    text, _ = extract_pdf_text(content)
+    return text
+
+
 def _extract_text_from_docx(content: bytes) -> str:
     """
     Extraer texto de archivo DOCX/DOC
@@ -290,9 +366,11 @@ def extract_text_from_upload(file: UploadFile) -> str:
     if not file.filename:
         raise HTTPException(status_code=400, detail="Nombre de archivo requerido")
     
-    # Leer contenido del archivo
+    _check_declared_size(file)
+    
+    # Leer contenido del archivo (como máximo un byte más del límite)
     try:
-        content = file.file.read()
+        content = file.file.read(CVFileValidator.MAX_SIZE_BYTES + 1)
         file.file.seek(0)  # Reset para futuras lecturas
     except Exception as e:
         raise HTTPException(
@@ -300,6 +378,30 @@ def extract_text_from_upload(file: UploadFile) -> str:
             detail=f"Error leyendo archivo: {str(e)}"
         )
     
+    if len(content) > CVFileValidator.MAX_SIZE_BYTES:
+        raise _file_too_large()
+    
+    _validate_upload(file, content)
+    
+    return extract_text_from_bytes(file.filename, content)
+
+
+def _file_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Archivo muy grande. Máximo: {CVFileValidator.MAX_SIZE_MB}MB"
+    )
+
+
+def _check_declared_size(file) -> None:
+    """Rechazar antes de leer si el tamaño declarado ya excede el máximo."""
+    size = getattr(file, 'size', None)
+    if size and size > CVFileValidator.MAX_SIZE_BYTES:
+        raise _file_too_large()
+
+
+def _validate_upload(file, content: bytes) -> None:
+    """Validaciones comunes (seguridad, extensión, tamaño, content-type)."""
     # Validar archivo por seguridad si security_middleware está disponible
     if SECURITY_MIDDLEWARE_AVAILABLE:
         try:
@@ -316,9 +418,19 @@ def extract_text_from_upload(file: UploadFile) -> str:
     # Validar content-type
     if hasattr(file, 'content_type'):
         CVFileValidator.validate_content_type(file.content_type)
+
+
+def extract_text_from_bytes(filename: str, content: bytes) -> str:
+    """
+    Extraer texto según la extensión del archivo (PDF, DOCX o TXT)
     
-    # Determinar tipo de archivo y extraer texto
-    filename_lower = file.filename.lower()
+    Función pura sobre (nombre, bytes): serializable, por lo que puede
+    ejecutarse en el pool de procesos del CPU executor.
+    
+    Raises:
+        HTTPException: Tipo no soportado o error en el procesamiento
+    """
+    filename_lower = filename.lower()
     
     try:
         if filename_lower.endswith('.pdf'):
@@ -330,65 +442,191 @@ def extract_text_from_upload(file: UploadFile) -> str:
         else:
             raise HTTPException(
                 status_code=400,
-                detail=f"Tipo de archivo no soportado: {file.filename}"
+                detail=f"Tipo de archivo no soportado: {filename}"
             )
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error procesando archivo {file.filename}: {str(e)}")
+        logger.error(f"Error procesando archivo {filename}: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Error procesando archivo: {str(e)}"
         )
 
 
-async def extract_text_from_upload_async(file: UploadFile) -> str:
+def _extract_text_in_worker(filename: str, content: bytes) -> Tuple[Optional[str], Optional[Tuple[int, str]]]:
     """
-    Extraer texto de archivo subido (versión ASINCRÓNICA)
+    Wrapper de extract_text_from_bytes para el pool de procesos.
     
-    Para uso en endpoints async
+    HTTPException no es serializable (pickle), así que los errores viajan
+    de vuelta al proceso padre como (status_code, detail).
+    """
+    try:
+        return extract_text_from_bytes(filename, content), None
+    except HTTPException as e:
+        return None, (e.status_code, e.detail)
+
+
+async def read_upload_async(file: UploadFile) -> bytes:
+    """
+    Leer y validar un archivo subido sin parsearlo (versión ASINCRÓNICA)
+    
+    Permite consultar el cache por hash de bytes antes de extraer texto.
     
-    Args:
-        file: Archivo subido a través de FastAPI
-        
     Returns:
-        str: Texto extraído del archivo
+        bytes: Contenido del archivo
     """
-    # Crear archivo temporal
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Nombre de archivo requerido")
+    
+    _check_declared_size(file)
+    
+    # Lectura por bloques desde el archivo spooled de Starlette: se corta
+    # en cuanto se supera el máximo, sin cargar el resto del archivo
+    chunk_size = max(1, settings.UPLOAD_READ_CHUNK_BYTES)
+    chunks: List[bytes] = []
+    size = 0
     try:
-        content = await file.read()
-        file_ext = Path(file.filename).suffix.lower()
-        
-        # Escribir en archivo temporal
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-        
+        while True:
+            chunk = await file.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > CVFileValidator.MAX_SIZE_BYTES:
+                raise _file_too_large()
+            chunks.append(chunk)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error leyendo archivo: {str(e)}"
+        )
+    
+    content = b"".join(chunks)
+    _validate_upload(file, content)
+    return content
+
+
+def _extract_pdf_range_in_worker(
+    content: bytes, backend: str, start: int, stop: int, max_chars: int
+) -> Optional[List[str]]:
+    """Extraer un rango de páginas en el pool de procesos (None si falla)."""
+    try:
+        return _extract_pdf_pages(content, backend, start, stop, max_chars)
+    except Exception as e:
+        logger.warning(f"Error con {backend} en páginas {start}-{stop}: {e}")
+        return None
+
+
+async def _extract_pdf_parallel(content: bytes, executor: Optional[CPUExecutor] = None) -> Optional[str]:
+    """
+    Repartir las páginas de un PDF grande entre los procesos del CPU executor
+    
+    Se envían tandas de rangos de PDF_PAGES_PER_TASK páginas (una tanda =
+    un rango por proceso) y se deja de enviar al reunir PDF_MAX_TEXT_CHARS.
+    
+    Returns:
+        Texto extraído, o None si el PDF no califica o algún rango falló
+        (el llamador usa entonces la extracción secuencial con fallbacks)
+    """
+    executor = executor or cpu_executor
+    backends = _pdf_page_backends()
+    workers = executor.process_workers
+    if not backends or workers < 2 or settings.PDF_PARALLEL_MIN_PAGES <= 0:
+        return None
+    
+    try:
+        total = await executor.run(_pdf_page_count, content, kind=THREAD)
+    except Exception as e:
+        logger.warning(f"No se pudo contar páginas del PDF: {e}")
+        return None
+    if total < settings.PDF_PARALLEL_MIN_PAGES:
+        return None
+    
+    backend = backends[0]
+    max_chars = settings.PDF_MAX_TEXT_CHARS
+    per_task = max(1, settings.PDF_PAGES_PER_TASK)
+    ranges = [(start, min(start + per_task, total)) for start in range(0, total, per_task)]
+    
+    started = time.perf_counter()
+    pages: List[str] = []
+    collected = 0
+    for i in range(0, len(ranges), workers):
         try:
-            # Procesar como si fuera upload synchrono
-            class FakeFile:
-                def __init__(self, filename, content):
-                    self.filename = filename
-                    self.file = io.BytesIO(content)
-                    self.content_type = file.content_type if hasattr(file, 'content_type') else None
-                
-                def read(self):
-                    return self.file.getvalue()
-            
-            fake_file = FakeFile(file.filename, content)
-            return extract_text_from_upload(fake_file)
-        finally:
-            # Limpiar archivo temporal
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+            results = await asyncio.gather(*(
+                executor.run(_extract_pdf_range_in_worker, content, backend, start, stop, max_chars)
+                for start, stop in ranges[i:i + workers]
+            ))
+        except Exception as e:
+            logger.warning(f"Extracción paralela de PDF interrumpida: {e}")
+            return None
+        
+        for chunk in results:
+            if chunk is None:
+                return None
+            pages.extend(chunk)
+            collected += sum(len(page) for page in chunk)
+        if max_chars and collected >= max_chars:
+            break
+    
+    text = "\n".join(pages).strip()
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    if len(text) < CVFileValidator.MIN_TEXT_LENGTH:
+        logger.info(f"PDF paralelo sin texto suficiente con {backend} ({elapsed_ms} ms)")
+        return None
+    
+    logger.info(f"PDF procesado en paralelo con {backend}: {total} páginas, {workers} procesos ({elapsed_ms} ms)")
+    return text
+
+
+async def extract_text_from_bytes_async(filename: str, content: bytes) -> str:
+    """
+    Extraer texto de (nombre, bytes) en el pool de procesos del CPU executor
+    
+    PDFs de muchas páginas se reparten entre procesos; si eso no aplica o
+    falla, se usa la extracción secuencial con todos los backends.
+    
+    Raises:
+        HTTPException: 503 si el executor está saturado; errores de extracción
+    """
+    if filename.lower().endswith('.pdf'):
+        text = await _extract_pdf_parallel(content)
+        if text is not None:
+            return text
+    
+    try:
+        text, error = await run_cpu(_extract_text_in_worker, filename, content)
+    except CPUExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=f"Servidor ocupado, intenta de nuevo: {str(e)}")
     except Exception as e:
         logger.error(f"Error en extracción async: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Error procesando archivo: {str(e)}"
         )
+    
+    if error:
+        raise HTTPException(status_code=error[0], detail=error[1])
+    return text
+
+
+async def extract_text_from_upload_async(file: UploadFile) -> str:
+    """
+    Extraer texto de archivo subido (versión ASINCRÓNICA)
+    
+    Para uso en endpoints async: la lectura es async y el parseo
+    (PDF/DOCX, CPU-bound) corre en el pool de procesos del CPU executor,
+    sin bloquear el event loop.
+    
+    Args:
+        file: Archivo subido a través de FastAPI
+        
+    Returns:
+        str: Texto extraído del archivo
+    """
+    content = await read_upload_async(file)
+    return await extract_text_from_bytes_async(file.filename, content)
 
 
 # ============================================================================
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de extracción de CVs (patrones precompilados)
+
+Mide el tiempo por CV de las rutas regex/keywords de extracción:
+- LineFeatureExtractor.extract (por línea)
+- UnsupervisedCVExtractor.extract (singleton compartido)
+- UnsupervisedCVExtractor.extract_many (lote de CVs, featurización conjunta)
+- students._extract_harvard_cv_fields
+
+Referencia (CV de ejemplo, 25 líneas), antes -> después del registro
+cv_patterns: unsupervised_cv_extractor.extract 4.1 -> 1.6 ms/CV y
+line_features 0.9 -> 0.5 ms/CV. La featurización por lotes mantiene
+line_features en ~0.5 ms/CV (el costo está en `sre`, no en Python) y deja
+extract / extract_many en ~1.0-1.5 ms/CV (medidas ruidosas; comparar con
+varias corridas).
+
+Uso:
+    python scripts/utilities/benchmark_cv_patterns.py [--iterations 200]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+SAMPLE_CV = """Juan Pérez García
+juan.perez@example.com | +52 55 1234 5678 | www.linkedin.com/in/juanperez
+
+OBJETIVO
+Ingeniero de software con 5 años de experiencia desarrollando APIs y
+plataformas de datos, buscando un rol de liderazgo técnico.
+
+EXPERIENCIA
+Empresa Tecnológica SA - Senior Backend Engineer
+2020 - 2024
+- Desarrollé microservicios en Python y FastAPI que redujeron la latencia 40%
+- Lideré un equipo de 5 ingenieros y gestioné despliegues en AWS con Docker
+
+Startup Inc - Desarrollador Full Stack
+2018 - 2020
+- Implementé dashboards en React y APIs REST con Django y PostgreSQL
+- Diseñé pipelines de CI/CD con GitHub Actions y Kubernetes
+
+EDUCACIÓN
+Universidad Nacional Autónoma de México
+Licenciatura en Ingeniería en Computación
+2014 - 2018
+
+HABILIDADES
+Python, Java, JavaScript, SQL, Docker, Kubernetes, AWS, React, Git
+
+CERTIFICACIONES
+AWS Certified Solutions Architect - 2022
+Certified Kubernetes Administrator - 2023
+
+IDIOMAS
+Español nativo, Inglés avanzado (C1), Francés básico
+"""
+
+
+def _time_per_call(fn, iterations: int) -> float:
+    """Milisegundos promedio por llamada (tras una llamada de calentamiento)."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.services.unsupervised_cv_extractor import LineFeatureExtractor, unsupervised_cv_extractor
+    from app.api.endpoints.students import _extract_harvard_cv_fields
+
+    lines = [line.strip() for line in SAMPLE_CV.split("\n") if line.strip()]
+    results = {
+        "line_features (CV completo)": _time_per_call(
+            lambda: LineFeatureExtractor.extract_lines(lines), args.iterations
+        ),
+        "unsupervised_cv_extractor.extract": _time_per_call(
+            lambda: unsupervised_cv_extractor.extract(SAMPLE_CV), args.iterations
+        ),
+        "unsupervised extract_many (lote de 64)": _time_per_call(
+            lambda: unsupervised_cv_extractor.extract_many([SAMPLE_CV] * 64), max(1, args.iterations // 64)
+        ) / 64,
+        "_extract_harvard_cv_fields": _time_per_call(
+            lambda: _extract_harvard_cv_fields(SAMPLE_CV), args.iterations
+        ),
+    }
+
+    print(f"\n📐 Extracción de CV - {args.iterations} iteraciones, {len(lines)} líneas por CV\n")
+    for name, ms in results.items():
+        print(f"  {name:<40} {ms:8.3f} ms/CV")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
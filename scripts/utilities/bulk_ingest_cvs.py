@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Ingesta masiva de CVs de una generación (directorio + CSV de metadatos)
+
+Extrae y analiza los CVs en un pool de procesos por lotes, guarda los
+estudiantes con un commit por lote y anota el progreso en un checkpoint:
+si se interrumpe, volver a ejecutar el mismo comando continúa donde quedó.
+
+CSV de metadatos (encabezados): filename, name, email[, program]
+
+Uso:
+    python scripts/utilities/bulk_ingest_cvs.py cvs/2025-1 --metadata cvs/2025-1/alumnos.csv
+    python scripts/utilities/bulk_ingest_cvs.py cvs/2025-1 --metadata alumnos.csv --workers 4 --batch-size 32
+    python scripts/utilities/bulk_ingest_cvs.py cvs/2025-1 --metadata alumnos.csv --dry-run
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def _print_progress(report) -> None:
+    done = report.skipped + report.processed
+    print(
+        f"   {done}/{report.total} CVs | creados {report.created} | actualizados {report.updated} "
+        f"| fallidos {report.failed} | {report.throughput:.2f} CVs/s",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Ingesta masiva de CVs (PDF/DOCX/TXT) con metadatos en CSV",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("directory", help="Directorio con los CVs")
+    parser.add_argument("--metadata", required=True, help="CSV con filename, name, email[, program]")
+    parser.add_argument("--batch-size", type=int, default=None, help="CVs por lote (default: settings)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos de análisis (default: settings)")
+    parser.add_argument(
+        "--checkpoint", default=None,
+        help="Archivo de progreso (default: <directory>/.ingest_progress.jsonl)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Solo validar directorio y CSV")
+    parser.add_argument("--json", action="store_true", help="Imprimir el reporte final en JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    from app.core.database import create_db_and_tables
+    from app.services.cv_bulk_ingestion import BulkCVIngestion, load_manifest
+
+    items, problems = load_manifest(args.directory, args.metadata)
+    print(f"\n📥 {len(items)} CVs listos para ingerir desde {args.directory}")
+    for problem in problems:
+        print(f"   ⚠️  {problem}")
+    if args.dry_run or not items:
+        return 0 if items else 1
+
+    checkpoint = args.checkpoint or str(Path(args.directory) / ".ingest_progress.jsonl")
+    ingestion = BulkCVIngestion(
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=checkpoint,
+    )
+
+    async def run():
+        await create_db_and_tables()
+        return await ingestion.run(items, on_progress=_print_progress)
+
+    report = asyncio.run(run())
+    summary = report.to_dict()
+
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+        return 0 if not report.failed else 2
+
+    print(f"\n✅ Ingesta terminada en {summary['elapsed_seconds']}s ({summary['cvs_per_second']} CVs/s)")
+    print(f"   Omitidos (checkpoint): {report.skipped}")
+    print(f"   Creados: {report.created} | Actualizados: {report.updated} | Fallidos: {report.failed}")
+    print("   Tiempo por etapa (s, acumulado entre procesos):")
+    for stage, seconds in summary["stage_seconds"].items():
+        print(f"      {stage:<8} {seconds}")
+    for error in summary["errors"]:
+        print(f"   ❌ {error['filename']}: {error['error']}")
+    print(f"   Progreso guardado en {checkpoint}")
+    return 0 if not report.failed else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
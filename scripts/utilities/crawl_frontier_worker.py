@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Worker independiente de la frontera de crawling (tabla crawl_frontier)
+
+Toma lotes de páginas de búsqueda vencidas con un lease, las recorre en OCC,
+guarda las ofertas y registra el resultado. Se pueden lanzar varios procesos
+en uno o más hosts contra la misma base de datos: cada página la procesa un
+solo worker y, si uno cae, su lease expira y otro la retoma.
+
+Uso:
+    python scripts/utilities/crawl_frontier_worker.py --enqueue python:remote --enqueue java --pages 3
+    python scripts/utilities/crawl_frontier_worker.py --concurrency 4
+    python scripts/utilities/crawl_frontier_worker.py --once           # hasta vaciar lo vencido
+    python scripts/utilities/crawl_frontier_worker.py --stats
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+
+def _parse_pair(value: str):
+    keyword, _, location = value.partition(":")
+    return keyword.strip(), (location.strip() or None)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Worker de la frontera de crawling de OCC",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "--enqueue", action="append", default=[], metavar="KEYWORD[:UBICACION]",
+        help="Búsqueda a agregar a la frontera (repetible); solo encola, no procesa",
+    )
+    parser.add_argument("--pages", type=int, default=1, help="Páginas por búsqueda encolada")
+    parser.add_argument("--priority", type=int, default=0, help="Prioridad de lo encolado (mayor = antes)")
+    parser.add_argument(
+        "--recrawl-hours", type=float, default=0,
+        help="Volver a visitar lo encolado cada N horas (0 = una sola vez)",
+    )
+    parser.add_argument("--owner", default=None, help="Identificador del worker (default: host:pid:aleatorio)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Páginas por lote (default: settings)")
+    parser.add_argument("--concurrency", type=int, default=None, help="Páginas en paralelo (default: settings)")
+    parser.add_argument("--once", action="store_true", help="Terminar cuando no queden páginas vencidas")
+    parser.add_argument("--stats", action="store_true", help="Solo mostrar el estado de la frontera")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from app.core.database import create_db_and_tables
+    from app.services.crawl_frontier import CrawlFrontierWorker, crawl_frontier
+
+    async def run():
+        await create_db_and_tables()
+        if args.stats:
+            return await crawl_frontier.stats()
+        if args.enqueue:
+            added = await crawl_frontier.enqueue_many(
+                [_parse_pair(value) for value in args.enqueue],
+                pages=args.pages, priority=args.priority, recrawl_seconds=int(args.recrawl_hours * 3600),
+            )
+            return {"enqueued": added}
+        worker = CrawlFrontierWorker(owner=args.owner, batch_size=args.batch_size, concurrency=args.concurrency)
+        print(f"🗺️ Worker {worker.owner} procesando la frontera (Ctrl+C para detener)", flush=True)
+        try:
+            return await worker.run(stop_when_empty=args.once)
+        finally:
+            await worker.dedup_store.close()  # Snapshot de los filtros para el próximo arranque
+
+    try:
+        result = asyncio.run(run())
+    except KeyboardInterrupt:
+        # Los leases del lote en curso se liberan al cancelar; otro worker los retoma
+        print("\n🛑 Worker detenido")
+        return 0
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -78,13 +78,14 @@ class TestUploadResumeEndpoint:
             response = client.post(
                 "/api/v1/students/upload_resume",
                 headers=HEADERS,
+                params={"wait": "true"},
                 files=files
             )
         
         # Validaciones
         assert response.status_code == 200, f"Esperado 200, obtenido {response.status_code}"
         
-        data = response.json()
+        data = response.json()["result"]
         assert "student" in data
         assert "extracted_skills" in data
         assert "extracted_soft_skills" in data
@@ -129,13 +130,14 @@ class TestUploadResumeEndpoint:
             response1 = client.post(
                 "/api/v1/students/upload_resume",
                 headers=HEADERS,
+                params={"wait": "true"},
                 files=files
             )
         
         assert response1.status_code == 200
-        student1 = response1.json()["student"]
+        student1 = response1.json()["result"]["student"]
         original_id = student1["id"]
-        original_skills_count = len(response1.json()["extracted_skills"])
+        original_skills_count = len(response1.json()["result"]["extracted_skills"])
         
         # 2️⃣ Segundo upload - actualizar estudiante
         with open(test_cv_file, "rb") as f:
@@ -150,13 +152,14 @@ class TestUploadResumeEndpoint:
             response2 = client.post(
                 "/api/v1/students/upload_resume",
                 headers=HEADERS,
+                params={"wait": "true"},
                 files=files
             )
         
         # Validaciones
         assert response2.status_code == 200, f"Esperado 200 en actualización, obtenido {response2.status_code}"
         
-        student2 = response2.json()["student"]
+        student2 = response2.json()["result"]["student"]
         
         # El ID debe ser el mismo (mismo estudiante)
         assert student2["id"] == original_id, "El ID debe ser el mismo después de actualización"
@@ -165,7 +168,7 @@ class TestUploadResumeEndpoint:
         assert student2["name"] == "Henry Updated", "El nombre debe haberse actualizado"
         
         # Las habilidades deben haberse analizado nuevamente
-        skills2 = response2.json()["extracted_skills"]
+        skills2 = response2.json()["result"]["extracted_skills"]
         assert len(skills2) > 0, "Debe extraer habilidades en la actualización"
     
     def test_upload_resume_invalid_metadata(self, test_cv_file):
@@ -179,6 +182,7 @@ class TestUploadResumeEndpoint:
             response = client.post(
                 "/api/v1/students/upload_resume",
                 headers=HEADERS,
+                params={"wait": "true"},
                 files=files
             )
         
@@ -221,12 +225,13 @@ class TestUploadResumeEndpoint:
             response = client.post(
                 "/api/v1/students/upload_resume",
                 headers=HEADERS,
+                params={"wait": "true"},
                 files=files
             )
         
         assert response.status_code == 200
         
-        data = response.json()
+        data = response.json()["result"]
         
         # Validar estructura completa
         assert "student" in data
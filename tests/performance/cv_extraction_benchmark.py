@@ -0,0 +1,331 @@
+"""
+Benchmark y control de regresión de extracción de CVs
+
+Corre sobre un corpus local fijo (tests/performance/cv_corpus: CVs en
+español e inglés, PDF y texto, con sus campos esperados en expected.json):
+
+- Latencia por etapa (ms/CV): extracción de texto, campos regex
+  (students._extract_harvard_cv_fields + _extract_resume_analysis),
+  UnsupervisedCVExtractor y CVExtractorV2 (spaCy)
+- Throughput (CVs/s) de UnsupervisedCVExtractor.extract_many y
+  CVExtractorV2.extract_many con distintos tamaños de lote
+- Memoria pico (tracemalloc) de cada extractor con el lote más grande
+- Exactitud por campo de cada extractor, lado a lado
+
+`compare_to_baseline` compara contra cv_extraction_baseline.json: la
+exactitud no puede bajar más de ACCURACY_TOLERANCE y latencia/memoria no
+pueden crecer más del factor de tolerancia (las máquinas varían, por eso
+es holgado). Si un extractor no está disponible (p. ej. sin modelos spaCy)
+sus métricas se omiten de la comparación.
+
+Uso:
+    python -m tests.performance.cv_extraction_benchmark            # reporte + comparación
+    python -m tests.performance.cv_extraction_benchmark --update-baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+import unicodedata
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+CORPUS_DIR = Path(__file__).parent / "cv_corpus"
+BASELINE_PATH = Path(__file__).parent / "cv_extraction_baseline.json"
+
+EXTRACTORS = ("regex", "unsupervised", "spacy")
+FIELDS = ("skills", "education", "experience", "languages", "certifications")
+BATCH_SIZES = (1, 8, 32)
+
+# Tolerancias de compare_to_baseline
+ACCURACY_TOLERANCE = 0.05  # caída absoluta permitida por campo (0-1)
+LATENCY_TOLERANCE = 2.0    # latencia/memoria: hasta (1 + tolerancia) x baseline
+MIN_LATENCY_MS = 1.0       # por debajo de esto la medición es ruido
+
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+
+def load_corpus(corpus_dir: Path = CORPUS_DIR) -> List[Dict[str, Any]]:
+    """Documentos del corpus: {"name", "filename", "content", "expected"}."""
+    expected = json.loads((corpus_dir / "expected.json").read_text(encoding="utf-8"))
+    return [
+        {
+            "name": Path(filename).stem,
+            "filename": filename,
+            "content": (corpus_dir / filename).read_bytes(),
+            "expected": fields,
+        }
+        for filename, fields in sorted(expected.items())
+    ]
+
+
+def _fold(value: Any) -> str:
+    """Texto en minúsculas y sin acentos para comparar campos."""
+    text = json.dumps(value, ensure_ascii=False, default=str).lower()
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def field_accuracy(extracted: Dict[str, Any], expected: Dict[str, List[str]]) -> Dict[str, float]:
+    """Fracción de valores esperados presentes en cada campo extraído."""
+    scores = {}
+    for field in FIELDS:
+        wanted = expected.get(field) or []
+        if not wanted:
+            continue
+        haystack = _fold(extracted.get(field) or [])
+        scores[field] = sum(_fold(value).strip('"') in haystack for value in wanted) / len(wanted)
+    return scores
+
+
+# ============================================================================
+# EXTRACTORES
+# ============================================================================
+
+def _regex_extract(text: str) -> Dict[str, Any]:
+    from app.api.endpoints.students import _extract_harvard_cv_fields, _extract_resume_analysis
+
+    fields = dict(_extract_harvard_cv_fields(text))
+    fields["skills"] = _extract_resume_analysis(text)["skills"]
+    return fields
+
+
+def _unsupervised_extract(text: str) -> Dict[str, Any]:
+    from app.services.unsupervised_cv_extractor import unsupervised_cv_extractor
+
+    return unsupervised_cv_extractor.extract(text).to_dict()
+
+
+def _spacy_extract(text: str) -> Dict[str, Any]:
+    from app.services.cv_extractor_v2_spacy import get_cv_extractor
+
+    return get_cv_extractor().extract(text).to_dict()
+
+
+def _unsupervised_many(texts: List[str]) -> None:
+    from app.services.unsupervised_cv_extractor import unsupervised_cv_extractor
+
+    unsupervised_cv_extractor.extract_many(texts, batch_size=len(texts))
+
+
+def _spacy_many(texts: List[str]) -> None:
+    from app.services.cv_extractor_v2_spacy import get_cv_extractor
+
+    get_cv_extractor().extract_many(texts)
+
+
+SINGLE: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "regex": _regex_extract,
+    "unsupervised": _unsupervised_extract,
+    "spacy": _spacy_extract,
+}
+BATCHED: Dict[str, Callable[[List[str]], None]] = {
+    "unsupervised": _unsupervised_many,
+    "spacy": _spacy_many,
+}
+
+
+# ============================================================================
+# MEDICIÓN
+# ============================================================================
+
+def _timed_ms(fn: Callable, *args, repeats: int) -> float:
+    """Mediana en ms de `repeats` ejecuciones."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def _peak_memory_mb(fn: Callable, *args) -> float:
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def run_benchmark(
+    corpus: Optional[List[Dict[str, Any]]] = None,
+    repeats: int = 5,
+    batch_sizes=BATCH_SIZES,
+) -> Dict[str, Any]:
+    """
+    Ejecutar el benchmark completo.
+
+    Returns:
+        {"corpus", "available", "stages_ms", "throughput", "peak_memory_mb", "accuracy"}
+    """
+    from app.utils.file_processing import extract_text_from_bytes
+
+    corpus = corpus if corpus is not None else load_corpus()
+    texts = [extract_text_from_bytes(doc["filename"], doc["content"]) for doc in corpus]
+
+    results: Dict[str, Any] = {
+        "corpus": [doc["filename"] for doc in corpus],
+        "available": {},
+        "stages_ms": {},
+        "throughput": {},
+        "peak_memory_mb": {},
+        "accuracy": {},
+    }
+
+    results["stages_ms"]["text_extraction"] = round(statistics.mean(
+        _timed_ms(extract_text_from_bytes, doc["filename"], doc["content"], repeats=repeats)
+        for doc in corpus
+    ), 3)
+
+    for name in EXTRACTORS:
+        extract = SINGLE[name]
+        try:
+            outputs = [extract(text) for text in texts]  # también sirve de warm-up
+        except Exception as e:
+            results["available"][name] = f"no disponible: {type(e).__name__}: {e}"
+            continue
+        results["available"][name] = True
+
+        results["stages_ms"][name] = round(statistics.mean(
+            _timed_ms(extract, text, repeats=repeats) for text in texts
+        ), 3)
+
+        per_field: Dict[str, List[float]] = {}
+        for doc, output in zip(corpus, outputs):
+            for field, score in field_accuracy(output, doc["expected"]).items():
+                per_field.setdefault(field, []).append(score)
+        results["accuracy"][name] = {
+            field: round(statistics.mean(scores), 3) for field, scores in sorted(per_field.items())
+        }
+
+        if name in BATCHED:
+            batched = BATCHED[name]
+            results["throughput"][name] = {}
+            for size in batch_sizes:
+                batch = list(islice(cycle(texts), size))
+                elapsed_ms = _timed_ms(batched, batch, repeats=max(1, repeats // 2))
+                results["throughput"][name][str(size)] = round(size / (elapsed_ms / 1000), 1)
+            largest = list(islice(cycle(texts), max(batch_sizes)))
+            results["peak_memory_mb"][name] = round(_peak_memory_mb(batched, largest), 2)
+
+    return results
+
+
+# ============================================================================
+# BASELINE
+# ============================================================================
+
+def compare_to_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    accuracy_tolerance: float = ACCURACY_TOLERANCE,
+    latency_tolerance: float = LATENCY_TOLERANCE,
+) -> List[str]:
+    """
+    Desviaciones respecto al baseline (lista vacía = sin regresión).
+
+    Solo se comparan extractores disponibles en ambas corridas.
+    """
+    drifts: List[str] = []
+    available = {
+        name for name in EXTRACTORS
+        if results["available"].get(name) is True and baseline.get("available", {}).get(name) is True
+    }
+    limit = 1 + latency_tolerance
+
+    for name in sorted(available):
+        for field, expected in baseline["accuracy"].get(name, {}).items():
+            current = results["accuracy"].get(name, {}).get(field, 0.0)
+            if current < expected - accuracy_tolerance:
+                drifts.append(f"exactitud {name}.{field}: {current:.3f} < baseline {expected:.3f}")
+
+    for stage, expected in baseline["stages_ms"].items():
+        if stage in EXTRACTORS and stage not in available:
+            continue
+        current = results["stages_ms"].get(stage)
+        if current is not None and current > max(expected, MIN_LATENCY_MS) * limit:
+            drifts.append(f"latencia {stage}: {current:.2f} ms > {limit:.1f}x baseline {expected:.2f} ms")
+
+    for name, expected in baseline.get("peak_memory_mb", {}).items():
+        current = results["peak_memory_mb"].get(name)
+        if name in available and current is not None and current > max(expected, 1.0) * limit:
+            drifts.append(f"memoria {name}: {current:.2f} MB > {limit:.1f}x baseline {expected:.2f} MB")
+
+    for name, by_size in baseline.get("throughput", {}).items():
+        for size, expected in by_size.items():
+            current = results["throughput"].get(name, {}).get(size)
+            if name in available and current is not None and current * limit < expected:
+                drifts.append(f"throughput {name}[{size}]: {current:.1f} CVs/s < baseline {expected:.1f} / {limit:.1f}")
+
+    return drifts
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    print(f"\n📊 Corpus: {len(results['corpus'])} CVs")
+    for name, status in results["available"].items():
+        if status is not True:
+            print(f"   ⚠️  {name}: {status}")
+    print("\n⏱️  Latencia por etapa (ms/CV)")
+    for stage, ms in results["stages_ms"].items():
+        print(f"   {stage:<16} {ms:>9.2f}")
+    print("\n🚀 Throughput (CVs/s) por tamaño de lote")
+    for name, by_size in results["throughput"].items():
+        row = "  ".join(f"{size:>3}: {value:>8.1f}" for size, value in by_size.items())
+        print(f"   {name:<16} {row}")
+    print("\n💾 Memoria pico (MB, lote más grande)")
+    for name, mb in results["peak_memory_mb"].items():
+        print(f"   {name:<16} {mb:>9.2f}")
+    print("\n🎯 Exactitud por campo")
+    print("   " + " " * 16 + "".join(f"{field:>15}" for field in FIELDS))
+    for name, scores in results["accuracy"].items():
+        print(f"   {name:<16}" + "".join(
+            f"{scores[field]:>15.2f}" if field in scores else f"{'-':>15}" for field in FIELDS
+        ))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark y regresión de extracción de CVs")
+    parser.add_argument("--repeats", type=int, default=5, help="Repeticiones por medición")
+    parser.add_argument("--update-baseline", action="store_true", help="Guardar esta corrida como baseline")
+    parser.add_argument("--json", action="store_true", help="Imprimir resultados en JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(repeats=args.repeats)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        _print_report(results)
+
+    if args.update_baseline:
+        BASELINE_PATH.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\n💾 Baseline actualizado: {BASELINE_PATH}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print("\n⚠️  Sin baseline: ejecuta con --update-baseline")
+        return 0
+    drifts = compare_to_baseline(results, load_baseline())
+    for drift in drifts:
+        print(f"   ❌ {drift}")
+    print("\n✅ Sin regresiones" if not drifts else f"\n❌ {len(drifts)} regresiones respecto al baseline")
+    return 1 if drifts else 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Benchmark de parseo de páginas de resultados de OCC
+
+Corre sobre páginas guardadas (tests/performance/occ_pages/*.html) y mide
+el tiempo por página de `OCCScraper._parse_search_page` con cada
+configuración:
+
+- full/html.parser: árbol completo con html.parser (implementación anterior)
+- full/lxml: árbol completo con lxml
+- strained/html.parser: solo contenedores de ofertas y total, html.parser
+- strained/lxml: solo contenedores de ofertas y total, lxml (por defecto)
+
+Además verifica que cada configuración produzca exactamente las mismas
+ofertas (JobOffer) y el mismo total que la implementación anterior.
+
+Las páginas se pueden reemplazar o ampliar con capturas reales de
+https://www.occ.com.mx/empleos/de-<keyword>/ guardadas como .html.
+
+Uso:
+    python -m tests.performance.occ_parse_benchmark
+    python -m tests.performance.occ_parse_benchmark --repeats 20 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+PAGES_DIR = Path(__file__).parent / "occ_pages"
+BASELINE = "full/html.parser"
+
+
+def load_pages(pages_dir: Path = PAGES_DIR) -> Dict[str, str]:
+    """Páginas guardadas: {nombre: html}."""
+    return {path.stem: path.read_text(encoding="utf-8") for path in sorted(pages_dir.glob("*.html"))}
+
+
+def _configurations(scraper) -> Dict[str, Callable[[str], Tuple[list, int]]]:
+    from bs4 import BeautifulSoup
+
+    from app.services.html_parser_service import parser_backend
+
+    def full(backend: str) -> Callable[[str], Tuple[list, int]]:
+        def parse(html: str) -> Tuple[list, int]:
+            soup = BeautifulSoup(html, backend)
+            return scraper._extract_job_offers(soup, "benchmark"), scraper._extract_total_results(soup)
+        return parse
+
+    def strained(backend: str) -> Callable[[str], Tuple[list, int]]:
+        return lambda html: scraper._parse_search_page(html, "benchmark", backend=backend)
+
+    backends = ["html.parser"] + (["lxml"] if parser_backend("lxml") == "lxml" else [])
+    configurations = {}
+    for backend in backends:
+        configurations[f"full/{backend}"] = full(backend)
+        configurations[f"strained/{backend}"] = strained(backend)
+    return configurations
+
+
+def _timed_ms(fn: Callable, *args, repeats: int) -> float:
+    """Mediana en ms de `repeats` ejecuciones."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def run_benchmark(repeats: int = 10, pages: Dict[str, str] = None) -> Dict[str, Any]:
+    """ms/página por configuración y página, y diferencias de salida vs la anterior."""
+    from app.services.occ_scraper_service import OCCScraper
+
+    pages = pages or load_pages()
+    configurations = _configurations(OCCScraper())
+    expected = {name: configurations[BASELINE](html) for name, html in pages.items()}
+
+    results: Dict[str, Any] = {
+        "pages": {name: len(html) for name, html in pages.items()},
+        "ms_per_page": {},
+        "mismatches": [],
+    }
+    for config, parse in configurations.items():
+        per_page = {name: _timed_ms(parse, html, repeats=repeats) for name, html in pages.items()}
+        results["ms_per_page"][config] = {"mean": statistics.mean(per_page.values()), **per_page}
+        results["mismatches"] += [
+            f"{config}: {name}" for name, html in pages.items() if parse(html) != expected[name]
+        ]
+    return results
+
+
+def _print_report(results: Dict[str, Any]) -> None:
+    print(f"\n📄 Páginas: {len(results['pages'])}")
+    for name, size in results["pages"].items():
+        print(f"   {name:<32} {size / 1024:>7.1f} KB")
+    baseline = results["ms_per_page"][BASELINE]["mean"]
+    print("\n⏱️  Parseo (ms/página, mediana por página; promedio)")
+    for config, by_page in results["ms_per_page"].items():
+        print(f"   {config:<22} {by_page['mean']:>9.2f}   x{baseline / by_page['mean']:.1f}")
+    for mismatch in results["mismatches"]:
+        print(f"   ❌ Salida distinta: {mismatch}")
+    print("\n✅ Misma salida en todas las configuraciones" if not results["mismatches"]
+          else f"\n❌ {len(results['mismatches'])} páginas con salida distinta")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de parseo de páginas de resultados de OCC")
+    parser.add_argument("--repeats", type=int, default=10, help="Repeticiones por medición")
+    parser.add_argument("--json", action="store_true", help="Imprimir resultados en JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(repeats=args.repeats)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        _print_report(results)
+    return 1 if results["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Servidor de réplica de OCC para benchmarks y pruebas de carga sin red
+
+`OCCReplay` es un transporte httpx (httpx.MockTransport) que responde como
+OCC con capturas guardadas:
+
+- https://www.occ.com.mx/empleos/de-<keyword>/?page=N → páginas de
+  tests/performance/occ_pages/*.html (la que coincide con el keyword o una
+  fija por keyword). Con `unique_ids` los ids de cada (keyword, página) se
+  desplazan para que no se repitan entre páginas, como en OCC real.
+- https://oferta.occ.com.mx/offer/{job_id}/d/j → JSON de detalle de
+  tests/performance/occ_details/offer.json con el id pedido.
+- Cualquier otra URL (p. ej. /empleo/{job_id} en HTML) → 404.
+
+Simula además latencia (fija + jitter), errores 503 y 429 con Retry-After
+con probabilidades configurables y semilla fija (resultados reproducibles).
+
+Uso:
+    replay = OCCReplay(latency=0.05, rate_limit_rate=0.02)
+    client = httpx.AsyncClient(transport=replay.transport())
+    ...
+    print(replay.stats)
+"""
+
+import asyncio
+import copy
+import json
+import random
+import re
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from tests.performance.occ_parse_benchmark import load_pages
+
+DETAILS_DIR = Path(__file__).parent / "occ_details"
+
+_SEARCH_PATH = re.compile(r"^/empleos/de-(?P<keyword>[^/]+)/?$")
+_DETAIL_PATH = re.compile(r"^/offer/(?P<job_id>[^/]+)/d/j$")
+_JOB_ID = re.compile(r"\b2\d{7}\b")  # Ids de las capturas (8 dígitos)
+_ID_STRIDE = 1_000_000  # Desplazamiento por (keyword, página) con unique_ids
+
+
+def load_detail(details_dir: Path = DETAILS_DIR) -> Dict[str, Any]:
+    """Plantilla de respuesta del API de detalle."""
+    return json.loads((details_dir / "offer.json").read_text(encoding="utf-8"))
+
+
+class OCCReplay:
+    """Transporte httpx que replica búsquedas y detalles de OCC con fallas inyectadas."""
+
+    def __init__(
+        self,
+        pages: Optional[Dict[str, str]] = None,
+        detail: Optional[Dict[str, Any]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        unique_ids: bool = True,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            pages: {nombre: html} de búsqueda (por defecto las capturas guardadas)
+            detail: Plantilla JSON de detalle (por defecto occ_details/offer.json)
+            latency: Segundos de espera por respuesta
+            jitter: Segundos extra aleatorios (uniforme 0..jitter)
+            error_rate: Probabilidad de responder 503
+            rate_limit_rate: Probabilidad de responder 429 con Retry-After
+            retry_after: Valor del encabezado Retry-After (segundos)
+            unique_ids: Ids distintos por (keyword, página)
+            seed: Semilla de latencias y fallas
+        """
+        self.pages = pages or load_pages()
+        self.detail = detail or load_detail()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.unique_ids = unique_ids
+        self._random = random.Random(seed)
+        self._names = sorted(self.pages)
+        self._slots: Dict[Tuple[str, int], int] = {}
+        self.rendered: Dict[Tuple[str, int], bytes] = {}  # Páginas de búsqueda servidas
+        self.stats: Counter = Counter()  # Peticiones por ruta y por status
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        response = self._route(request)
+        self.stats[str(response.status_code)] += 1
+        return response
+
+    # ------------------------------------------------------------------
+    # Rutas
+    # ------------------------------------------------------------------
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        host, path = request.url.host, request.url.path
+        search = _SEARCH_PATH.match(path) if host == "www.occ.com.mx" else None
+        detail = _DETAIL_PATH.match(path) if host == "oferta.occ.com.mx" else None
+        route = "search" if search else "detail" if detail else "other"
+        self.stats[route] += 1
+
+        roll = self._random.random()
+        if route != "other" and roll < self.rate_limit_rate:
+            return httpx.Response(429, headers={"Retry-After": f"{self.retry_after:g}"}, text="Too Many Requests")
+        if route != "other" and roll < self.rate_limit_rate + self.error_rate:
+            return httpx.Response(503, text="Service Unavailable")
+
+        if search:
+            page = int(request.url.params.get("page", "1") or 1)
+            return httpx.Response(
+                200,
+                headers={"Content-Type": "text/html; charset=utf-8"},
+                content=self._search_page(search["keyword"].lower(), page),
+            )
+        if detail:
+            return httpx.Response(200, json=self._detail(detail["job_id"]))
+        return httpx.Response(404, text="Not Found")
+
+    def _search_page(self, keyword: str, page: int) -> bytes:
+        key = (keyword, page)
+        if key not in self.rendered:
+            name = f"empleos_de_{keyword.replace('-', '_')}"
+            if name not in self.pages:
+                name = self._names[zlib.crc32(keyword.encode("utf-8")) % len(self._names)]
+            html = self.pages[name]
+            if self.unique_ids:
+                offset = self._slots.setdefault(key, len(self._slots)) * _ID_STRIDE
+                html = _JOB_ID.sub(lambda m: str(int(m.group()) + offset), html)
+            self.rendered[key] = html.encode("utf-8")
+        return self.rendered[key]
+
+    def _detail(self, job_id: str) -> Dict[str, Any]:
+        data = copy.deepcopy(self.detail)
+        offer = data.setdefault("o", {})
+        offer["id"] = int(job_id) if job_id.isdigit() else job_id
+        offer["ur"] = f"/empleo/oferta/{job_id}/"
+        return data
@@ -0,0 +1,270 @@
+"""
+Benchmark de throughput del scraping de OCC (sin red)
+
+Corre `JobScraperWorker.scrape_occ_batch` completo (SessionManager con
+límites por host → parseo → dedup → writer por lotes) contra la réplica de
+OCC de tests/performance/occ_replay.py, con latencia, errores 503 y 429
+inyectados, y opcionalmente los detalles vía API
+(`OCCScraper._fetch_detail_outcomes`). Reporta:
+
+- páginas/s y jobs/s de extremo a extremo
+- CPU por página (tiempo de proceso, incluye los hilos de parseo)
+- latencia de extremo a extremo por registro (inicio del fetch → escrito)
+- respuestas de la réplica por status y tasa final por host (AIMD)
+
+Los límites por host se suben para medir el scraper y no el rate limit;
+`--host-rate` los devuelve a valores realistas.
+
+Uso:
+    python -m tests.performance.occ_scrape_benchmark
+    python -m tests.performance.occ_scrape_benchmark --queries 20 --pages 5 --latency-ms 80 --rate-limit-rate 0.02
+    python -m tests.performance.occ_scrape_benchmark --details --persist --json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+OCC_HOSTS = ("www.occ.com.mx", "oferta.occ.com.mx")
+KEYWORDS = [
+    "python", "contador", "ingeniero-devops", "java", "ventas", "recursos-humanos",
+    "enfermera", "almacen", "diseño-grafico", "marketing", "logistica", "abogado",
+]
+
+
+@contextlib.contextmanager
+def _replay_settings(host_rate: float, max_connections: int) -> Iterator[None]:
+    """Sin cache HTTP y con límites por host propios mientras dura el benchmark."""
+    from app.core.config import settings
+
+    previous = settings.HTTP_CACHE_ENABLED, settings.SCRAPER_HOST_OVERRIDES
+    limits = {"rate": host_rate, "burst": max_connections, "max_rate": host_rate * 2,
+              "max_connections": max_connections}
+    settings.HTTP_CACHE_ENABLED = False
+    settings.SCRAPER_HOST_OVERRIDES = {**previous[1], **{host: dict(limits) for host in OCC_HOSTS}}
+    try:
+        yield
+    finally:
+        settings.HTTP_CACHE_ENABLED, settings.SCRAPER_HOST_OVERRIDES = previous
+
+
+@contextlib.asynccontextmanager
+async def _temporary_database():
+    """session_factory sobre un SQLite temporal con todas las tablas."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlmodel import SQLModel
+
+    import app.models  # noqa: F401  (registra las tablas)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'benchmark.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        try:
+            yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        finally:
+            await engine.dispose()
+
+
+async def _run(
+    replay,
+    pairs: List[tuple],
+    pages: int,
+    config,
+    details: bool,
+    detail_concurrency: int,
+    session_factory=None,
+) -> Dict[str, Any]:
+    import httpx
+
+    from app.core.session_manager import SessionManager
+    from app.services.dedup_store import DedupStore
+    from app.services.job_scraper_worker import JobScraperWorker
+    from app.services.occ_scraper_service import OCCScraper
+
+    session_manager = SessionManager()
+    session_manager.session = httpx.AsyncClient(
+        transport=replay.transport(), headers=session_manager.get_headers(), follow_redirects=True,
+    )
+    worker = JobScraperWorker(
+        session_manager=session_manager,
+        session_factory=session_factory,
+        dedup_store=DedupStore(persistent=False),
+    )
+
+    cpu_started, started = time.process_time(), time.perf_counter()
+    result = await worker.scrape_occ_batch(
+        pairs, limit_per_pair=100, pages=pages, persist=session_factory is not None, config=config,
+    )
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    await session_manager.close()
+
+    stats = worker.last_pipeline_stats
+    fetched = stats["stages"]["fetch"]["processed"]
+    report: Dict[str, Any] = {
+        "pages_requested": stats["items"],
+        "pages_fetched": fetched,
+        "jobs": stats["records"],
+        "jobs_saved": stats["saved"],
+        "duplicates": result.duplicates_removed,
+        "errors": len(stats["errors"]),
+        "elapsed_seconds": round(elapsed, 3),
+        "pages_per_second": round(fetched / elapsed, 2) if elapsed else 0.0,
+        "jobs_per_second": round(stats["records"] / elapsed, 2) if elapsed else 0.0,
+        "cpu_ms_per_page": round(cpu * 1000 / fetched, 2) if fetched else 0.0,
+        "latency_ms": stats["latency_ms"],
+        "stages": stats["stages"],
+        "hosts": session_manager.rate_stats(),
+    }
+
+    if details:
+        scraper = OCCScraper()
+        scraper.session = httpx.AsyncClient(transport=replay.transport(), headers=scraper.headers)
+        # Ofertas de las páginas servidas (con o sin fecha válida para JobPostingMinimal)
+        offers = {
+            offer.job_id: offer
+            for (keyword, _), html in replay.rendered.items()
+            for offer in scraper._parse_search_page(html.decode("utf-8"), keyword)[0]
+        }
+        offers = list(offers.values())
+        started = time.perf_counter()
+        outcomes = await scraper._fetch_detail_outcomes(offers, concurrency=detail_concurrency, deadline=0)
+        detail_elapsed = time.perf_counter() - started
+        await scraper.session.aclose()
+        report["details"] = {
+            "jobs": len(outcomes),
+            "elapsed_seconds": round(detail_elapsed, 3),
+            "jobs_per_second": round(len(outcomes) / detail_elapsed, 2) if detail_elapsed else 0.0,
+            "outcomes": dict(scraper.detail_stats),
+        }
+
+    report["replay"] = dict(replay.stats)
+    return report
+
+
+def run_benchmark(
+    queries: int = 6,
+    pages: int = 3,
+    latency_ms: float = 50.0,
+    jitter_ms: float = 20.0,
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    retry_after: float = 1.0,
+    fetch_concurrency: int = 8,
+    parse_concurrency: int = 2,
+    write_batch_size: int = 50,
+    host_rate: float = 1000.0,
+    details: bool = False,
+    detail_concurrency: int = 8,
+    persist: bool = False,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Métricas de throughput de una corrida contra la réplica."""
+    from app.services.scraping_pipeline import PipelineConfig
+    from tests.performance.occ_replay import OCCReplay
+
+    replay = OCCReplay(
+        latency=latency_ms / 1000, jitter=jitter_ms / 1000, error_rate=error_rate,
+        rate_limit_rate=rate_limit_rate, retry_after=retry_after, seed=seed,
+    )
+    pairs = [(KEYWORDS[i % len(KEYWORDS)] + (f"-{i // len(KEYWORDS)}" if i >= len(KEYWORDS) else ""), None)
+             for i in range(queries)]
+    config = PipelineConfig(
+        fetch_concurrency=fetch_concurrency,
+        parse_concurrency=parse_concurrency,
+        write_batch_size=write_batch_size,
+    )
+
+    async def main() -> Dict[str, Any]:
+        if not persist:
+            return await _run(replay, pairs, pages, config, details, detail_concurrency)
+        async with _temporary_database() as session_factory:
+            return await _run(replay, pairs, pages, config, details, detail_concurrency, session_factory)
+
+    with _replay_settings(host_rate, max(fetch_concurrency, detail_concurrency)):
+        report = asyncio.run(main())
+    report["parameters"] = {
+        "queries": queries, "pages": pages, "latency_ms": latency_ms, "jitter_ms": jitter_ms,
+        "error_rate": error_rate, "rate_limit_rate": rate_limit_rate, "fetch_concurrency": fetch_concurrency,
+        "parse_concurrency": parse_concurrency, "host_rate": host_rate, "persist": persist,
+    }
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    parameters = report["parameters"]
+    print(
+        f"\n🔁 Réplica OCC: {parameters['queries']} búsquedas x {parameters['pages']} páginas, "
+        f"latencia {parameters['latency_ms']:g}±{parameters['jitter_ms']:g} ms, "
+        f"503 {parameters['error_rate']:.0%}, 429 {parameters['rate_limit_rate']:.0%}"
+    )
+    print(f"\n📄 Páginas: {report['pages_fetched']}/{report['pages_requested']} "
+          f"({report['errors']} con error) en {report['elapsed_seconds']:.2f}s")
+    print(f"   páginas/s     {report['pages_per_second']:>10.2f}")
+    print(f"   jobs/s        {report['jobs_per_second']:>10.2f}   ({report['jobs']} jobs, "
+          f"{report['duplicates']} duplicados, {report['jobs_saved']} guardados)")
+    print(f"   CPU/página    {report['cpu_ms_per_page']:>10.2f} ms")
+    latency = report["latency_ms"]
+    print(f"   latencia      p50 {latency['p50']:.1f} ms · p95 {latency['p95']:.1f} ms · máx {latency['max']:.1f} ms")
+
+    print("\n🏭 Etapas (procesados · ocupado · cola máx)")
+    for name, stage in report["stages"].items():
+        print(f"   {name:<10} {stage['processed']:>6} · {stage['busy_seconds']:>7.2f}s · {stage['queue_max_depth']:>3}")
+
+    if "details" in report:
+        details = report["details"]
+        print(f"\n🔎 Detalles: {details['jobs']} en {details['elapsed_seconds']:.2f}s "
+              f"({details['jobs_per_second']:.1f}/s) {details['outcomes']}")
+    print(f"\n🌐 Réplica: {report['replay']}")
+    for host, limiter in report["hosts"].items():
+        print(f"   {host:<22} tasa {limiter['rate']:g}/s · pausa {limiter['blocked_for']:g}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de throughput del scraping de OCC contra una réplica local")
+    parser.add_argument("--queries", type=int, default=6, help="Búsquedas (keywords) distintas")
+    parser.add_argument("--pages", type=int, default=3, help="Páginas por búsqueda")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Latencia de cada respuesta")
+    parser.add_argument("--jitter-ms", type=float, default=20.0, help="Latencia extra aleatoria")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probabilidad de 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probabilidad de 429 con Retry-After")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After de los 429 (s)")
+    parser.add_argument("--fetch-concurrency", type=int, default=8, help="Workers de fetch")
+    parser.add_argument("--parse-concurrency", type=int, default=2, help="Workers de parseo")
+    parser.add_argument("--write-batch-size", type=int, default=50, help="Registros por lote del writer")
+    parser.add_argument("--host-rate", type=float, default=1000.0, help="Peticiones/s iniciales por host")
+    parser.add_argument("--details", action="store_true", help="Pedir también el detalle de cada oferta")
+    parser.add_argument("--detail-concurrency", type=int, default=8, help="Detalles simultáneos")
+    parser.add_argument("--persist", action="store_true", help="Guardar las ofertas en un SQLite temporal")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de latencias y fallas")
+    parser.add_argument("--json", action="store_true", help="Imprimir resultados en JSON")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        queries=args.queries, pages=args.pages, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        fetch_concurrency=args.fetch_concurrency, parse_concurrency=args.parse_concurrency,
+        write_batch_size=args.write_batch_size, host_rate=args.host_rate, details=args.details,
+        detail_concurrency=args.detail_concurrency, persist=args.persist, seed=args.seed,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Regresión de extracción de CVs contra el baseline guardado
+
+Corre tests/performance/cv_extraction_benchmark sobre el corpus fijo y
+falla si la exactitud por campo o la latencia/memoria se desvían del
+baseline. Regenerar el baseline tras un cambio intencional:
+
+    python -m tests.performance.cv_extraction_benchmark --update-baseline
+
+La suite por defecto solo compara exactitud (determinista). Las
+comparaciones de latencia, memoria y throughput dependen de la máquina y
+corren con RUN_PERF=1; CV_BENCH_LATENCY_TOLERANCE ajusta su holgura en
+máquinas lentas.
+"""
+import os
+
+import pytest
+
+from tests.performance.cv_extraction_benchmark import (
+    LATENCY_TOLERANCE,
+    compare_to_baseline,
+    field_accuracy,
+    load_baseline,
+    load_corpus,
+    run_benchmark,
+)
+
+
+# Comparaciones de reloj de pared: solo bajo demanda (RUN_PERF=1)
+RUN_PERF = os.getenv("RUN_PERF") == "1"
+
+
+def _accuracy_drifts(drifts):
+    return [drift for drift in drifts if drift.startswith("exactitud")]
+
+
+@pytest.fixture(scope="module")
+def results():
+    return run_benchmark(repeats=3, batch_sizes=(1, 8))
+
+
+class TestCVExtractionRegression:
+    """Exactitud y rendimiento de los extractores de CV"""
+
+    def test_corpus_covers_languages_and_formats(self):
+        corpus = load_corpus()
+        assert {doc["expected"]["language"] for doc in corpus} == {"es", "en"}
+        assert {doc["filename"].rsplit(".", 1)[1] for doc in corpus} == {"pdf", "txt"}
+
+    def test_no_accuracy_drift_against_baseline(self, results):
+        drifts = _accuracy_drifts(compare_to_baseline(results, load_baseline()))
+        assert not drifts, "\n".join(drifts)
+
+    @pytest.mark.skipif(not RUN_PERF, reason="Latencia/memoria/throughput solo con RUN_PERF=1")
+    def test_no_performance_drift_against_baseline(self, results):
+        tolerance = float(os.getenv("CV_BENCH_LATENCY_TOLERANCE", LATENCY_TOLERANCE))
+        drifts = compare_to_baseline(results, load_baseline(), latency_tolerance=tolerance)
+        assert not drifts, "\n".join(drifts)
+
+    def test_compare_flags_accuracy_drop(self, results):
+        degraded = {**results, "accuracy": {
+            name: {field: 0.0 for field in scores} for name, scores in results["accuracy"].items()
+        }}
+        assert _accuracy_drifts(compare_to_baseline(degraded, load_baseline()))
+
+    def test_field_accuracy_ignores_case_and_accents(self):
+        extracted = {"languages": ["Espanol", "INGLÉS"], "skills": ["Python"]}
+        expected = {"languages": ["español", "inglés"], "skills": ["python", "sql"]}
+
+        assert field_accuracy(extracted, expected) == {"skills": 0.5, "languages": 1.0}
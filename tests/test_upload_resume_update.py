@@ -83,6 +83,7 @@ with open(CV_PATH, "rb") as f:
     response = requests.post(
         f"{BASE_URL}/api/v1/students/upload_resume",
         headers=HEADERS,
+        params={"wait": "true"},
         files=files
     )
 
@@ -90,7 +91,7 @@ print(f"Status Code: {response.status_code}")
 print(f"Response: {json.dumps(response.json(), indent=2)}")
 
 if response.status_code == 200:
-    first_response = response.json()
+    first_response = response.json()["result"]
     student_id = first_response.get("student", {}).get("id")
     initial_skills = first_response.get("extracted_skills", [])
     print(f"\n✅ Creación exitosa - Student ID: {student_id}")
@@ -121,6 +122,7 @@ with open(CV_PATH, "rb") as f:
     response = requests.post(
         f"{BASE_URL}/api/v1/students/upload_resume",
         headers=HEADERS,
+        params={"wait": "true"},
         files=files
     )
 
@@ -128,7 +130,7 @@ print(f"Status Code: {response.status_code}")
 print(f"Response: {json.dumps(response.json(), indent=2)}")
 
 if response.status_code == 200:
-    second_response = response.json()
+    second_response = response.json()["result"]
     student_id_updated = second_response.get("student", {}).get("id")
     updated_name = second_response.get("student", {}).get("name")
     updated_skills = second_response.get("extracted_skills", [])
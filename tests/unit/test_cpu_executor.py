@@ -0,0 +1,100 @@
+"""
+Tests para el CPU executor (pools de procesos/hilos con cola y timeouts)
+"""
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.core.cpu_executor import (
+    CPUExecutor,
+    CPUExecutorBusyError,
+    CPUTaskTimeoutError,
+    PROCESS,
+    THREAD,
+)
+
+
+def _add(a, b=0):
+    return a + b
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+class TestCPUExecutor:
+    """Tests del ejecutor CPU"""
+
+    @pytest.mark.asyncio
+    async def test_thread_pool_runs_off_loop_thread(self):
+        executor = CPUExecutor(process_workers=0, thread_workers=2, max_queue=4)
+        try:
+            name = await executor.run(lambda: threading.current_thread().name, kind=THREAD)
+            assert name.startswith("cpu-executor")
+            assert await executor.run(_add, 1, b=2, kind=THREAD) == 3
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_kind_falls_back_to_threads_without_processes(self):
+        executor = CPUExecutor(process_workers=0, thread_workers=1, max_queue=4)
+        try:
+            assert await executor.run(_add, 2, 3, kind=PROCESS) == 5
+            assert executor.stats()["started"] == [THREAD]
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_pool_runs_in_child_process(self):
+        executor = CPUExecutor(process_workers=1, max_queue=4, default_timeout=120)
+        try:
+            child_pid = await executor.run(os.getpid, kind=PROCESS)
+            assert child_pid != os.getpid()
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_is_full(self):
+        executor = CPUExecutor(process_workers=0, thread_workers=1, max_queue=1)
+        try:
+            running = asyncio.ensure_future(executor.run(_sleep, 0.2, kind=THREAD))
+            await asyncio.sleep(0.01)
+            with pytest.raises(CPUExecutorBusyError):
+                await executor.run(_add, 1, kind=THREAD)
+            assert await running == 0.2
+            assert executor.stats()["rejected"][THREAD] == 1
+            assert executor.stats()["in_flight"][THREAD] == 0
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_slot_until_task_finishes(self):
+        executor = CPUExecutor(process_workers=0, thread_workers=1, max_queue=2)
+        try:
+            with pytest.raises(CPUTaskTimeoutError):
+                await executor.run(_sleep, 0.3, kind=THREAD, timeout=0.05)
+            assert executor.stats()["in_flight"][THREAD] == 1
+            await asyncio.sleep(0.4)
+            assert executor.stats()["in_flight"][THREAD] == 0
+            assert executor.stats()["timeouts"][THREAD] == 1
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate(self):
+        executor = CPUExecutor(process_workers=0, thread_workers=1)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                await executor.run(divmod, 1, 0, kind=THREAD)
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_invalid_kind(self):
+        executor = CPUExecutor(process_workers=0)
+        with pytest.raises(ValueError):
+            await executor.run(_add, 1, kind="gpu")
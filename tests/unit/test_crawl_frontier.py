@@ -0,0 +1,165 @@
+"""
+Tests para la frontera de crawling con leases
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+from app.models import CrawlFrontierEntry, JobPosition
+from app.services.crawl_frontier import (
+    DONE,
+    FAILED,
+    PENDING,
+    CrawlFrontier,
+    CrawlFrontierWorker,
+    occ_page_handler,
+)
+from app.services.dedup_store import DedupStore
+from app.services.occ_scraper_service import JobOffer
+
+
+@pytest_asyncio.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'frontier.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _entries(factory):
+    async with factory() as session:
+        rows = (await session.execute(select(CrawlFrontierEntry).order_by(CrawlFrontierEntry.id))).scalars().all()
+    return {(row.keyword, row.page): row for row in rows}
+
+
+class TestCrawlFrontier:
+    """Encolado, leases exclusivos, resultados y liberación"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_is_idempotent_and_reactivates_done_pages(self, factory):
+        frontier = CrawlFrontier(session_factory=factory)
+        assert await frontier.enqueue_many([("python", "remote"), ("java", None)], pages=2) == 4
+        assert await frontier.enqueue("Python", "Remote", pages=3, priority=5) == 1
+
+        async with factory() as session:
+            await session.execute(update(CrawlFrontierEntry).values(status=DONE, next_due=None))
+            await session.commit()
+        await frontier.enqueue("java")
+
+        entries = await _entries(factory)
+        assert len(entries) == 5
+        assert entries[("python", 1)].priority == 5
+        assert (entries[("java", 1)].status, entries[("java", 2)].status) == (PENDING, DONE)
+
+    @pytest.mark.asyncio
+    async def test_leases_are_exclusive_until_they_expire(self, factory):
+        frontier = CrawlFrontier(session_factory=factory, lease_seconds=60)
+        await frontier.enqueue("python", pages=3)
+        await frontier.enqueue("java", priority=10)
+
+        first = await frontier.lease("a", 2)
+        second = await frontier.lease("b", 5)
+        assert [(e.keyword, e.page) for e in first] == [("java", 1), ("python", 1)]
+        assert [(e.keyword, e.page) for e in second] == [("python", 2), ("python", 3)]
+        assert await frontier.lease("c", 5) == []
+
+        # El lease de "a" expira: "c" toma sus páginas y "a" ya no puede registrarlas
+        async with factory() as session:
+            await session.execute(
+                update(CrawlFrontierEntry)
+                .where(CrawlFrontierEntry.lease_owner == "a")
+                .values(lease_expiry=datetime.now(timezone.utc) - timedelta(seconds=1))
+            )
+            await session.commit()
+        assert len(await frontier.lease("c", 5)) == 2
+        assert await frontier.renew([e.id for e in first], "a") == set()
+        assert not await frontier.complete(first[0], "a", found=3)
+        assert await frontier.complete(first[0], "c", found=3, new=1)
+        assert (await frontier.stats())["leased"] == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers_process_each_page_once(self, factory):
+        frontier = CrawlFrontier(session_factory=factory)
+        await frontier.enqueue_many([(f"skill{i}", "remote") for i in range(6)], pages=2, recrawl_seconds=3600)
+        processed = []
+
+        async def handler(entry):
+            processed.append((entry.keyword, entry.page))
+            await asyncio.sleep(0.01)
+            return {"found": 20, "new": 3}
+
+        workers = [
+            CrawlFrontierWorker(frontier, handler, owner=f"w{i}", batch_size=3, concurrency=2)
+            for i in range(3)
+        ]
+        await asyncio.gather(*(worker.run(stop_when_empty=True) for worker in workers))
+
+        assert sorted(processed) == sorted({(f"skill{i}", p) for i in range(6) for p in (1, 2)})
+        assert sum(worker.processed["ok"] for worker in workers) == 12
+        entries = await _entries(factory)
+        assert all(e.lease_owner is None and e.status == PENDING for e in entries.values())
+        assert all(e.next_due > datetime.now(timezone.utc) + timedelta(minutes=59) for e in entries.values())
+        assert {(e.runs, e.last_found, e.last_new) for e in entries.values()} == {(1, 20, 3)}
+
+    @pytest.mark.asyncio
+    async def test_failures_back_off_and_cancellation_releases_leases(self, factory):
+        frontier = CrawlFrontier(session_factory=factory, max_attempts=2, retry_backoff_seconds=0)
+        await frontier.enqueue("roto")
+        await frontier.enqueue("lento")
+
+        async def handler(entry):
+            if entry.keyword == "roto":
+                raise RuntimeError("503 de OCC")
+            await asyncio.sleep(10)
+
+        worker = CrawlFrontierWorker(frontier, handler, owner="w", batch_size=5)
+        task = asyncio.create_task(worker.run_batch())
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        entries = await _entries(factory)
+        assert entries[("lento", 1)].lease_owner is None  # Liberada sin contar intento
+        assert entries[("lento", 1)].attempts == 0
+        assert (entries[("roto", 1)].attempts, entries[("roto", 1)].last_error) == (1, "503 de OCC")
+
+        retried = {entry.keyword: entry for entry in await frontier.lease("w", 2)}
+        await frontier.fail(retried["roto"], "w", "503 de OCC")
+        assert (await _entries(factory))[("roto", 1)].status == FAILED
+
+    @pytest.mark.asyncio
+    async def test_occ_handler_dedups_across_a_store_reload(self, factory, tmp_path):
+        offers = [
+            JobOffer(job_id=str(30000000 + i), title=f"Desarrollador Python {i}", company="ACME", location="CDMX")
+            for i in range(4)
+        ]
+
+        class Scraper:
+            async def search_jobs(self, filters):
+                return offers[:2 + filters.page], len(offers)  # p1: 3 ofertas, p2: las 4
+
+        def store():
+            return DedupStore(ttl_seconds=3600, session_factory=factory, snapshot_path=str(tmp_path / "occ.json"))
+
+        first = store()
+        handler = occ_page_handler(Scraper(), factory, first)
+        assert await handler(CrawlFrontierEntry(keyword="python", page=1)) == {"found": 3, "new": 3}
+
+        # Otro proceso (o un reinicio sin snapshot): los filtros se reconstruyen desde la tabla
+        reloaded = store()
+        assert await reloaded.restore() == "table"
+        handler = occ_page_handler(Scraper(), factory, reloaded)
+        assert await handler(CrawlFrontierEntry(keyword="python", page=2)) == {"found": 4, "new": 1}
+
+        assert reloaded.stats()["duplicate"] == 3 and reloaded.stats()["marked"] == 1
+        async with factory() as session:
+            assert len((await session.execute(select(JobPosition))).scalars().all()) == 4
+        assert CrawlFrontierWorker(CrawlFrontier(session_factory=factory)).dedup_store.persistent
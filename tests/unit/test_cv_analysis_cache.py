@@ -0,0 +1,97 @@
+"""
+Tests para el cache de extracción/análisis de CVs por hash de contenido
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+
+from app.models.cv_cache import CVExtractionCache
+from app.services.cv_analysis_cache import (
+    CVAnalysisCache,
+    analysis_hash,
+    content_hash,
+    versions_fingerprint,
+)
+
+
+@pytest_asyncio.fixture
+async def cache():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield CVAnalysisCache(session_factory=factory, enabled=True)
+    await engine.dispose()
+
+
+class TestKeys:
+    """Claves y huellas de versión"""
+
+    def test_content_hash_is_sha256_of_bytes(self):
+        assert content_hash(b"abc") == "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+
+    def test_analysis_hash_depends_on_text_and_versions(self):
+        versions = {"b": "1", "a": "2"}
+        assert versions_fingerprint(versions) == "a=2;b=1"
+        assert analysis_hash("cv", versions) == analysis_hash("cv", {"a": "2", "b": "1"})
+        assert analysis_hash("cv", versions) != analysis_hash("cv", {"a": "3", "b": "1"})
+        assert analysis_hash("cv", versions) != analysis_hash("cv2", versions)
+
+
+class TestCVAnalysisCache:
+    """Lecturas, escrituras e invalidación por versión"""
+
+    @pytest.mark.asyncio
+    async def test_text_roundtrip_and_hits(self, cache):
+        key = content_hash(b"%PDF-1.4 ...")
+        assert await cache.get_text(key) is None
+
+        await cache.put_text(key, "Juan Pérez\nPython")
+        assert await cache.get_text(key) == "Juan Pérez\nPython"
+
+        async with cache._session() as session:
+            entry = (await session.execute(select(CVExtractionCache))).scalars().one()
+        assert entry.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_analysis_invalidated_by_version_change(self, cache):
+        value = {"skills": ["python"], "confidence": 0.1}
+        await cache.put_analysis("resume_analysis", "texto", {"analyzer": "1"}, value)
+
+        assert await cache.get_analysis("resume_analysis", "texto", {"analyzer": "1"}) == value
+        assert await cache.get_analysis("resume_analysis", "texto", {"analyzer": "2"}) is None
+
+    @pytest.mark.asyncio
+    async def test_stale_version_row_is_a_miss_and_replaced(self, cache):
+        await cache.put("text", "k", "0", "texto viejo")
+        assert await cache.get("text", "k", "1") is None
+
+        await cache.put("text", "k", "1", "texto nuevo")
+        assert await cache.get("text", "k", "1") == "texto nuevo"
+
+    @pytest.mark.asyncio
+    async def test_purge_stale_removes_old_versions_and_unused_rows(self, cache):
+        await cache.put_analysis("resume_analysis", "a", {"analyzer": "1"}, {})
+        await cache.put_analysis("resume_analysis", "b", {"analyzer": "2"}, {})
+        await cache.put_text("c", "texto")
+        async with cache._session() as session:
+            entry = (await session.execute(
+                select(CVExtractionCache).where(CVExtractionCache.content_hash == "c")
+            )).scalars().one()
+            entry.last_used_at = datetime.now(timezone.utc) - timedelta(days=400)
+            await session.commit()
+
+        cache.register("resume_analysis", {"analyzer": "2"})
+        assert await cache.purge_stale(max_age_days=90) == 2
+        assert await cache.get_analysis("resume_analysis", "b", {"analyzer": "2"}) == {}
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_never_stores(self, cache):
+        cache.enabled = False
+        await cache.put_text("k", "texto")
+        assert await cache.get_text("k") is None
@@ -0,0 +1,196 @@
+"""
+Tests para la ingesta masiva de CVs (manifiesto, checkpoint, lotes)
+"""
+import pytest
+import pytest_asyncio
+import spacy
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+from app.models import AuditLog, Student
+from app.services.cv_bulk_ingestion import (
+    BulkCVIngestion,
+    IngestionCheckpoint,
+    IngestionItem,
+    IngestionReport,
+    _process_batch,
+    load_manifest,
+)
+from app.services.spacy_nlp_service import SpacyNLPService
+from app.utils.encryption import EncryptionService
+
+
+CV_TEXT = (
+    "Ana López\nEXPERIENCIA\nDesarrolladora backend en Python y FastAPI, 2020 - 2024.\n"
+    "EDUCACIÓN\nUniversidad Nacional, Ingeniería en Computación, 2016 - 2020.\n"
+    "HABILIDADES\nPython, SQL, Docker, Git, trabajo en equipo y liderazgo.\n"
+)
+
+
+@pytest_asyncio.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'students.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _write(tmp_path, filename, text=CV_TEXT):
+    (tmp_path / filename).write_text(text, encoding="utf-8")
+    return str(tmp_path / filename)
+
+
+def _write_cohort(tmp_path, rows, files):
+    for filename, text in files.items():
+        (tmp_path / filename).write_text(text, encoding="utf-8")
+    csv_path = tmp_path / "alumnos.csv"
+    csv_path.write_text(
+        "filename,name,email,program\n" + "".join(f"{','.join(row)}\n" for row in rows),
+        encoding="utf-8",
+    )
+    return str(csv_path)
+
+
+class TestManifest:
+    """Cruce de directorio y CSV"""
+
+    def test_matches_files_and_reports_problems(self, tmp_path):
+        csv_path = _write_cohort(
+            tmp_path,
+            rows=[
+                ("ana.txt", "Ana López", "ana@unrc.edu.mx", "ISC"),
+                ("falta.pdf", "Luis Pérez", "luis@unrc.edu.mx", "ISC"),
+                ("ana.txt", "Ana López", "ana@unrc.edu.mx", "ISC"),
+                ("beto.txt", "", "beto@unrc.edu.mx", ""),
+                ("carla.txt", "Carla Ruiz", "carla-sin-dominio", "ISC"),
+            ],
+            files={
+                "ana.txt": CV_TEXT, "beto.txt": CV_TEXT, "carla.txt": CV_TEXT,
+                "extra.txt": CV_TEXT, "notas.md": "x",
+            },
+        )
+
+        items, problems = load_manifest(str(tmp_path), csv_path)
+
+        assert [(item.filename, item.email, item.program) for item in items] == [
+            ("ana.txt", "ana@unrc.edu.mx", "ISC")
+        ]
+        # sin archivo, duplicado, incompleta, email inválido, beto y extra sin fila
+        assert len(problems) == 6
+        assert any("carla.txt" in problem and "email" in problem for problem in problems)
+
+
+class TestCheckpoint:
+    """Progreso reanudable"""
+
+    def test_marked_files_survive_reload_and_truncated_lines(self, tmp_path):
+        path = tmp_path / "progress.jsonl"
+        checkpoint = IngestionCheckpoint(str(path))
+        checkpoint.mark(["a.pdf", "b.pdf"])
+        checkpoint.mark(["c.pdf"])
+        with open(path, "a") as handle:
+            handle.write('{"files": ["d.p')  # Interrumpido a mitad de línea
+
+        reloaded = IngestionCheckpoint(str(path))
+        assert {"a.pdf", "b.pdf", "c.pdf"} <= reloaded.done
+        assert "d.pdf" not in reloaded
+
+    @pytest.mark.asyncio
+    async def test_run_skips_checkpointed_files_and_reports_failures(self, tmp_path, factory):
+        csv_path = _write_cohort(
+            tmp_path,
+            rows=[
+                ("hecho.txt", "Ana López", "ana@unrc.edu.mx", "ISC"),
+                ("corto.txt", "Luis Pérez", "luis@unrc.edu.mx", "ISC"),
+            ],
+            files={"hecho.txt": CV_TEXT, "corto.txt": "CV"},
+        )
+        items, _ = load_manifest(str(tmp_path), csv_path)
+        progress = str(tmp_path / "progress.jsonl")
+        IngestionCheckpoint(progress).mark(["hecho.txt"])
+
+        ingestion = BulkCVIngestion(session_factory=factory, workers=0, checkpoint_path=progress)
+        report = await ingestion.run(items)
+
+        assert (report.total, report.skipped, report.failed, report.created) == (2, 1, 1, 0)
+        assert report.errors[0][0] == "corto.txt"
+        assert report.timings["extract"] >= 0 and "corto.txt" not in IngestionCheckpoint(progress)
+        async with factory() as session:
+            audit = (await session.execute(select(AuditLog))).scalars().one()
+        assert (audit.resource, audit.success) == ("file:corto.txt", False)
+
+
+class TestSaveBatch:
+    """Guardado por lote: validación por fila, altas/actualizaciones y auditoría"""
+
+    @pytest.mark.asyncio
+    async def test_saves_valid_rows_with_audit_and_reports_invalid_ones(self, tmp_path, factory):
+        output = _process_batch([("ana.txt", _write(tmp_path, "ana.txt")), ("luis.txt", _write(tmp_path, "luis.txt"))])
+        results = output["results"] + [output["results"][0]]
+        batch = [
+            IngestionItem("ana.txt", "", "Ana López", "Ana@UNRC.edu.mx", "ISC"),
+            IngestionItem("luis.txt", "", "Luis Pérez", "no-es-email"),
+            IngestionItem("ana2.txt", "", "Ana López", "ana@unrc.edu.mx"),  # Mismo email: actualiza
+        ]
+        ingestion = BulkCVIngestion(
+            session_factory=factory, checkpoint_path=str(tmp_path / "progress.jsonl"),
+            encryption=EncryptionService(EncryptionService.generate_key()),
+        )
+        report = IngestionReport(total=3)
+
+        await ingestion._save_batch(batch, results, report)
+
+        assert (report.created, report.updated, report.failed) == (1, 1, 1)
+        assert report.errors[0][0] == "luis.txt" and "email" in report.errors[0][1]
+        async with factory() as session:
+            students = (await session.execute(select(Student))).scalars().all()
+            audits = (await session.execute(select(AuditLog).order_by(AuditLog.id))).scalars().all()
+        assert len(students) == 1 and students[0].cv_filename == "ana2.txt" and students[0].program == "ISC"
+        assert [(audit.action, audit.resource, audit.success) for audit in audits] == [
+            ("UPLOAD_RESUME", f"student_id:{students[0].id}", True),
+            ("UPLOAD_RESUME", f"student_id:{students[0].id}", True),
+            ("UPLOAD_RESUME", "file:luis.txt", False),
+        ]
+        assert {audit.actor_role for audit in audits} == {"system"}
+        assert "luis.txt" not in ingestion.checkpoint and "ana2.txt" in ingestion.checkpoint
+
+
+class TestBatchProcessing:
+    """Extracción + análisis por lote y encriptación en lote"""
+
+    def test_process_batch_analyzes_valid_files_and_flags_errors(self, tmp_path):
+        (tmp_path / "ana.txt").write_text(CV_TEXT, encoding="utf-8")
+        (tmp_path / "vacio.txt").write_text("CV", encoding="utf-8")
+
+        output = _process_batch([
+            ("ana.txt", str(tmp_path / "ana.txt")),
+            ("vacio.txt", str(tmp_path / "vacio.txt")),
+            ("perdido.txt", str(tmp_path / "perdido.txt")),
+        ])
+
+        ana, vacio, perdido = output["results"]
+        assert "python" in [skill.lower() for skill in ana["analysis"]["skills"]]
+        assert "education" in ana["harvard_fields"]
+        assert "error" in vacio and "error" in perdido
+        assert set(output["timings"]) == {"extract", "analyze"}
+
+    def test_encrypt_many_round_trips(self):
+        service = EncryptionService(EncryptionService.generate_key())
+        emails = ["ana@unrc.edu.mx", "luis@unrc.edu.mx"]
+
+        encrypted = service.encrypt_many(emails)
+
+        assert [service.decrypt(value) for value in encrypted] == emails
+        with pytest.raises(TypeError):
+            service.encrypt_many([None])
+
+    def test_analyze_many_matches_analyze(self, monkeypatch):
+        model = spacy.blank("es")
+        monkeypatch.setattr(SpacyNLPService, "_models", {"es": model})
+        monkeypatch.setattr(SpacyNLPService, "_primary_model", model)
+        service = SpacyNLPService()
+        texts = [CV_TEXT, "Experiencia con Docker y Kubernetes en AWS", CV_TEXT * 3]
+
+        assert service.analyze_many(texts, batch_size=2) == [service.analyze(text) for text in texts]
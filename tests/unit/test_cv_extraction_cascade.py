@@ -0,0 +1,105 @@
+"""
+Tests para la cascada de extracción de CVs (umbral de confianza y deadlines)
+"""
+import time
+
+import spacy
+
+from app.services.cv_extraction_cascade import (
+    CascadeTier,
+    Deadline,
+    ExtractionCascade,
+    fields_confidence,
+)
+from app.services.spacy_nlp_service import SpacyNLPService
+
+
+SKILLS = [f"skill{i}" for i in range(10)]
+EXPERIENCE = [{"position": "Dev", "company": f"Empresa {i}"} for i in range(4)]
+
+
+def _tier(name, fields, calls, sleep=0.0, deadline_seconds=None, min_words=0):
+    def extract(text, deadline):
+        calls.append(name)
+        time.sleep(sleep)
+        if isinstance(fields, Exception):
+            raise fields
+        return fields
+    return CascadeTier(name, extract, deadline_seconds=deadline_seconds, min_words=min_words)
+
+
+class TestExtractionCascade:
+    """Escalamiento por confianza, fusión y traza de niveles"""
+
+    def test_stops_once_threshold_is_reached(self):
+        calls = []
+        cascade = ExtractionCascade([
+            _tier("regex", {"experience": EXPERIENCE, "objective": "Backend"}, calls),
+            _tier("spacy", {"education": [{"institution": "UNRC"}]}, calls),
+        ], confidence_threshold=0.3)
+
+        result = cascade.run("texto", seed={"skills": SKILLS})
+
+        assert calls == ["regex"]
+        assert result.method == "regex"
+        assert result.confidence == round(fields_confidence(result.fields), 3) >= 0.3
+        assert [run.name for run in result.tiers] == ["regex"]
+
+    def test_escalates_and_merges_partial_results(self):
+        calls = []
+        cascade = ExtractionCascade([
+            _tier("regex", {"objective": "Backend", "experience": EXPERIENCE[:1]}, calls),
+            _tier("unsupervised", {"objective": "Otro", "experience": EXPERIENCE}, calls),
+        ], confidence_threshold=0.9)
+
+        result = cascade.run("texto")
+
+        assert calls == ["regex", "unsupervised"]
+        assert result.fields["objective"] == "Backend"  # Primer nivel que lo encontró
+        assert result.fields["experience"] == EXPERIENCE  # Lista más larga
+        assert result.tiers[0].confidence < result.tiers[1].confidence
+
+    def test_deadline_marks_partial_tier_and_errors_are_recorded(self):
+        calls = []
+        cascade = ExtractionCascade([
+            _tier("regex", RuntimeError("patrón inválido"), calls),
+            _tier("slow", {"skills": SKILLS}, calls, sleep=0.05, deadline_seconds=0.01),
+        ], confidence_threshold=0.9)
+
+        result = cascade.run("texto")
+
+        regex, slow = result.tiers
+        assert regex.error == "patrón inválido" and not regex.timed_out
+        assert slow.timed_out and slow.duration_ms >= 10
+        assert result.fields["skills"] == SKILLS and result.timed_out
+
+    def test_skips_tiers_by_name_and_min_words(self):
+        calls = []
+        cascade = ExtractionCascade([
+            _tier("unsupervised", {}, calls),
+            _tier("spacy", {}, calls, min_words=50),
+        ], confidence_threshold=0.9)
+
+        cascade.run("CV corto")
+        cascade.run("palabra " * 60, skip=("unsupervised",))
+
+        assert calls == ["unsupervised", "spacy"]
+
+
+class TestCooperativeDeadline:
+    """spaCy deja de procesar fragmentos al vencer el deadline"""
+
+    def test_analyze_stops_after_first_chunk(self, monkeypatch):
+        model = spacy.blank("es")
+        monkeypatch.setattr(SpacyNLPService, "_models", {"es": model})
+        monkeypatch.setattr(SpacyNLPService, "_primary_model", model)
+        service = SpacyNLPService()
+        text = "Python Docker " * 2000  # Varios fragmentos de NLP_CHUNK_MAX_CHARS
+
+        expired = Deadline(0.001)
+        time.sleep(0.005)
+        partial = service.analyze(text, deadline=expired)
+        full = service.analyze(text, deadline=Deadline(None))
+
+        assert 0 < len(partial["tokens"]) < len(full["tokens"])
+        assert not Deadline(None).expired()
@@ -0,0 +1,100 @@
+"""
+Tests para el registro de patrones precompilados de extracción de CVs
+"""
+from app.services.cv_patterns import (
+    SECTION_HEADERS,
+    YEAR,
+    first_match_lines,
+    keyword_matcher,
+    word_matcher,
+)
+from app.services.unsupervised_cv_extractor import (
+    ACTION_VERBS,
+    ACTION_VERB_MATCHER,
+    TECH_TERMS,
+    TECH_TERM_MATCHER,
+    FieldExtractor,
+    LineFeatureExtractor,
+    UnsupervisedCVExtractor,
+)
+
+
+LINES = [
+    "Desarrollé microservicios en Python y FastAPI",
+    "Universidad Nacional Autónoma de México",
+    "Senior Backend Engineer - Empresa SA",
+    "Español nativo, Inglés avanzado",
+    "C++ y C# (3 años)",
+    "",
+]
+
+
+class TestKeywordMatchers:
+    """Los matchers equivalen a los bucles `any(...)` que reemplazan"""
+
+    def test_keyword_matcher_equals_substring_any(self):
+        for keywords, matcher in ((ACTION_VERBS, ACTION_VERB_MATCHER), (TECH_TERMS, TECH_TERM_MATCHER)):
+            for line in LINES:
+                line_lower = line.lower()
+                expected = any(kw in line_lower for kw in keywords)
+                assert (matcher.search(line_lower) is not None) == expected, line
+
+    def test_keyword_matcher_escapes_and_prefers_longest(self):
+        matcher = keyword_matcher(["c", "c++", "c#"])
+        assert matcher.search("sé c++").group() == "c++"
+        assert matcher.search("nada") is None
+
+    def test_word_matcher_requires_word_boundaries(self):
+        matcher = word_matcher(["go", "java"])
+        assert matcher.search("experiencia en go y docker")
+        assert matcher.search("google cloud") is None
+        assert matcher.search("javascript") is None
+
+
+class TestRegistryPatterns:
+    """Patrones compartidos entre extractores"""
+
+    def test_year_pattern(self):
+        assert YEAR.findall("2018 - 2024, 1999, 2100, 120234") == ["2018", "2024", "1999"]
+
+    def test_section_headers_keep_priority_order(self):
+        line = "PROFESSIONAL EXPERIENCE AND SKILLS"
+        first = next(name for pattern, name in SECTION_HEADERS if pattern.search(line))
+        assert first == "experience"
+
+    def test_languages_single_pass_keeps_map_order(self):
+        text = "Idiomas: francés básico, inglés avanzado, español nativo. Speaks Java."
+        assert FieldExtractor.extract_languages_improved(text) == ["English", "Spanish", "French"]
+
+
+class TestBatchFeaturization:
+    """La featurización por lotes equivale a la featurización por línea"""
+
+    def test_first_match_lines_marks_each_line_once(self):
+        lines = ["2018 - 2024", "sin fecha", "", "1999 y 2001"]
+        starts = [0, 12, 22, 23]
+        assert first_match_lines(YEAR, "\x00".join(lines), starts) == [True, False, False, True]
+
+    def test_extract_lines_matches_single_line_extract(self):
+        lines = LINES + ["2020@x.com", "Creció 5%", "Empresa SA", "www.example.com"]
+        batch = LineFeatureExtractor.extract_lines(lines)
+
+        assert batch == [LineFeatureExtractor.extract(line) for line in lines]
+        assert batch[LINES.index("")] == {}
+        assert batch[-4]["has_email"] and batch[-4]["has_dates"]
+        assert batch[-3]["has_metrics"]
+        assert batch[-2]["has_company_signals"]
+        assert batch[-1]["has_url"]
+
+    def test_feature_matrix_is_compact(self):
+        matrix = LineFeatureExtractor.feature_matrix(LINES)
+        assert matrix.shape == (len(LINES), len(LineFeatureExtractor.FEATURE_NAMES))
+        assert not matrix[LINES.index("")].any()
+
+    def test_extract_many_equals_extract(self):
+        extractor = UnsupervisedCVExtractor()
+        texts = ["\n".join(LINES), "", "EXPERIENCIA\nSenior Engineer - Startup Inc\n2019 - 2021"]
+        expected = [extractor.extract(text).to_dict() for text in texts]
+
+        results = extractor.extract_many(texts, batch_size=2)
+        assert [result.to_dict() for result in results] == expected
@@ -0,0 +1,147 @@
+"""
+Tests para la cola persistente de procesamiento de CVs
+"""
+import asyncio
+import hashlib
+import json
+import os
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.services.cv_processing_queue import (
+    COMPLETED,
+    FAILED,
+    PROCESSING,
+    QUEUED,
+    CVProcessingQueue,
+)
+from app.utils.datetime_utils import utc_now
+
+
+ACTOR = {"role": "student", "user_id": 7, "email": "ana@unrc.edu.mx"}
+
+
+@pytest_asyncio.fixture
+async def queue(tmp_path):
+    # Archivo (no :memory: + StaticPool): los workers usan sesiones concurrentes
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'queue.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    yield CVProcessingQueue(
+        session_factory=factory, storage_dir=str(tmp_path / "files"), workers=2,
+        max_attempts=2, poll_seconds=0.05, task_timeout_seconds=60,
+    )
+    await engine.dispose()
+
+
+async def _echo_processor(task, content, report):
+    await report("analyzing", 50)
+    return {"size": len(content), "meta": json.loads(task.meta)}
+
+
+class TestCVProcessingQueue:
+    """Encolado, ejecución, reintentos y recuperación"""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_then_process_completes_and_cleans_up(self, queue):
+        queue.set_processor(_echo_processor)
+        task = await queue.enqueue("cv.pdf", b"%PDF data", {"name": "Ana"}, ACTOR)
+
+        assert task.status == QUEUED
+        assert os.path.exists(task.file_path) and task.file_path.endswith(".pdf")
+
+        assert await queue.process_pending() == 1
+        done = await queue.get(task.task_id)
+        assert done.status == COMPLETED and done.progress == 100
+        assert json.loads(done.result) == {"size": 9, "meta": {"name": "Ana"}}
+        assert done.meta == "{}" and done.attempts == 1
+        assert not os.path.exists(task.file_path)
+
+    @pytest.mark.asyncio
+    async def test_emails_are_stored_encrypted_and_cleared_on_finish(self, queue):
+        seen = {}
+
+        async def processor(task, content, report):
+            seen.update(meta=queue.task_meta(task), actor=queue.task_actor_email(task))
+            return {}
+
+        queue.set_processor(processor)
+        task = await queue.enqueue("cv.txt", b"x", {"name": "Ana", "email": "Ana.Lopez@unrc.edu.mx"}, ACTOR)
+
+        assert "ana.lopez" not in task.meta.lower() and ACTOR["email"] not in task.actor_email
+        assert task.email_hash == hashlib.sha256(b"ana.lopez@unrc.edu.mx").hexdigest()
+
+        await queue.process_pending()
+        assert seen == {"meta": {"name": "Ana", "email": "ana.lopez@unrc.edu.mx"}, "actor": ACTOR["email"]}
+        done = await queue.get(task.task_id)
+        assert (done.meta, done.actor_email, done.email_hash) == ("{}", None, task.email_hash)
+
+    @pytest.mark.asyncio
+    async def test_client_error_fails_without_retry(self, queue):
+        async def processor(task, content, report):
+            raise HTTPException(status_code=400, detail="CV vacío")
+
+        queue.set_processor(processor)
+        task = await queue.enqueue("cv.txt", b"x", {}, ACTOR)
+        await queue.process_pending()
+
+        failed = await queue.get(task.task_id)
+        assert failed.status == FAILED
+        assert (failed.error, failed.error_status, failed.attempts) == ("CV vacío", 400, 1)
+
+    @pytest.mark.asyncio
+    async def test_transient_error_is_retried_up_to_max_attempts(self, queue):
+        calls = []
+
+        async def processor(task, content, report):
+            calls.append(task.attempts)
+            raise HTTPException(status_code=503, detail="ocupado")
+
+        queue.set_processor(processor)
+        task = await queue.enqueue("cv.txt", b"x", {}, ACTOR)
+        await queue.process_pending()
+
+        assert calls == [1, 2]
+        assert (await queue.get(task.task_id)).status == FAILED
+
+    @pytest.mark.asyncio
+    async def test_run_now_processes_only_that_task(self, queue):
+        queue.set_processor(_echo_processor)
+        first = await queue.enqueue("a.txt", b"a", {}, ACTOR)
+        second = await queue.enqueue("b.txt", b"bb", {}, ACTOR)
+
+        done = await queue.run_now(second.task_id)
+        assert done.status == COMPLETED
+        assert (await queue.get(first.task_id)).status == QUEUED
+
+    @pytest.mark.asyncio
+    async def test_stale_processing_task_is_requeued(self, queue):
+        queue.set_processor(_echo_processor)
+        task = await queue.enqueue("cv.txt", b"x", {}, ACTOR)
+        await queue._update(task.id, status=PROCESSING, attempts=1,
+                            started_at=utc_now() - timedelta(hours=1))
+
+        assert await queue._requeue_stale() == 1
+        assert (await queue.get(task.task_id)).status == QUEUED
+
+    @pytest.mark.asyncio
+    async def test_workers_process_in_background(self, queue):
+        queue.set_processor(_echo_processor)
+        await queue.start()
+        try:
+            task = await queue.enqueue("cv.txt", b"hola", {}, ACTOR)
+            for _ in range(100):
+                if (await queue.get(task.task_id)).status == COMPLETED:
+                    break
+                await asyncio.sleep(0.02)
+            assert (await queue.get(task.task_id)).status == COMPLETED
+        finally:
+            await queue.stop()
+        assert not queue.running
@@ -0,0 +1,136 @@
+"""
+Tests para el DedupStore (filtros de Bloom + tabla scraped_job_ids)
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, select
+
+from app.models import ScrapedJobId
+from app.services.dedup_store import DedupStore
+from app.utils.bloom_filter import ScalableBloomFilter
+
+
+@pytest_asyncio.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'dedup.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _store(factory, tmp_path, **overrides) -> DedupStore:
+    options = dict(
+        ttl_seconds=3600, generations=4, initial_capacity=100, error_rate=0.01,
+        session_factory=factory, snapshot_path=str(tmp_path / "occ.json"),
+    )
+    options.update(overrides)
+    return DedupStore(**options)
+
+
+class TestScalableBloomFilter:
+    """Sin falsos negativos, crecimiento y serialización"""
+
+    def test_grows_and_keeps_false_positive_rate_bounded(self):
+        bloom = ScalableBloomFilter(initial_capacity=500, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"job-{i}")
+
+        assert all(f"job-{i}" in bloom for i in range(5000))
+        assert len(bloom.filters) > 1
+        false_positives = sum(f"otro-{i}" in bloom for i in range(20000))
+        assert false_positives / 20000 < 0.02
+
+        restored = ScalableBloomFilter.from_dict(bloom.to_dict())
+        assert all(f"job-{i}" in restored for i in range(0, 5000, 7)) and len(restored) == len(bloom)
+
+
+class TestDedupStore:
+    """Confirmación, expiración, snapshot/restauración y modo en memoria"""
+
+    @pytest.mark.asyncio
+    async def test_false_positives_are_confirmed_against_the_table(self, factory, tmp_path):
+        # Filtro diminuto y saturado: casi todo es "quizá visto"
+        store = _store(factory, tmp_path, initial_capacity=1, error_rate=0.5)
+        assert await store.filter_new(["a", "b", "a", "c"]) == ["a", "b", "c"]
+        fresh = [f"nuevo-{i}" for i in range(50)]
+
+        assert await store.filter_new(["a", *fresh, "c"]) == fresh
+        stats = store.stats()
+        assert stats["duplicate"] == 2 and stats["new"] == 53
+        assert stats["false_positive"] > 0  # Descartados por la tabla, no por el filtro
+        async with factory() as session:
+            assert (await session.execute(select(func.count()).select_from(ScrapedJobId))).scalar() == 53
+
+    @pytest.mark.asyncio
+    async def test_reposted_jobs_reenter_after_ttl(self, factory, tmp_path):
+        store = _store(factory, tmp_path)
+        await store.filter_new(["viejo", "vigente"])
+        async with factory() as session:
+            await session.execute(
+                update(ScrapedJobId)
+                .where(ScrapedJobId.external_job_id == "viejo")
+                .values(last_seen_at=datetime.now(timezone.utc) - timedelta(hours=2))
+            )
+            await session.commit()
+
+        assert await store.filter_new(["viejo", "vigente"]) == ["viejo"]
+        assert await store.filter_new(["viejo"]) == []  # Se volvió a ver ahora
+
+    @pytest.mark.asyncio
+    async def test_filter_unseen_is_read_only_until_mark_seen(self, factory, tmp_path):
+        store = _store(factory, tmp_path)
+        assert await store.filter_unseen(["a", "b", "a"]) == ["a", "b"]
+        assert await store.filter_unseen(["a", "b"]) == ["a", "b"]  # Nada marcado aún
+
+        await store.mark_seen(["a"])
+        assert await store.filter_unseen(["a", "b"]) == ["b"]
+        async with factory() as session:
+            rows = (await session.execute(select(ScrapedJobId.external_job_id))).scalars().all()
+        assert rows == ["a"] and store.stats()["marked"] == 1
+
+    @pytest.mark.asyncio
+    async def test_snapshot_and_table_restore_on_startup(self, factory, tmp_path):
+        first = _store(factory, tmp_path)
+        await first.filter_new([f"job-{i}" for i in range(30)])
+        await first.close()
+
+        # Otro proceso vio más ofertas después del snapshot
+        other = _store(factory, tmp_path, snapshot_path=str(tmp_path / "other.json"))
+        await other.filter_new(["tardio"])
+
+        restored = _store(factory, tmp_path)
+        assert await restored.restore() == "snapshot"
+        assert restored.stats()["items"] == 31
+        restored._started = True
+        assert await restored.filter_new(["job-3", "tardio", "nuevo"]) == ["nuevo"]
+        assert restored.stats()["bloom_negative"] == 1  # Solo "nuevo" no estaba en el filtro
+
+        (tmp_path / "occ.json").write_text("{no es json")
+        rebuilt = _store(factory, tmp_path)
+        assert await rebuilt.restore() == "table"
+        assert rebuilt.stats()["items"] == 32
+
+    @pytest.mark.asyncio
+    async def test_in_memory_store_expires_generations_and_resets(self):
+        store = DedupStore(ttl_seconds=0.2, generations=2, initial_capacity=10, persistent=False)
+        assert await store.filter_new(["a", "b"]) == ["a", "b"]
+        assert await store.filter_new(["a"]) == []
+
+        await asyncio.sleep(0.35)
+        assert await store.filter_new(["c"]) == ["c"]
+        assert await store.filter_new(["a"]) == ["a"]  # Visto hace más del TTL
+
+        # Las generaciones vencidas se descartan y la memoria queda acotada
+        await asyncio.sleep(0.35)
+        assert await store.filter_new(["d"]) == ["d"]
+        assert store.stats()["generations"] == 2 and set(store._memory) == {"d"}
+
+        store.reset()
+        assert await store.filter_new(["c", "d"]) == ["c", "d"]
@@ -0,0 +1,61 @@
+"""
+Tests para el procesamiento por fragmentos de documentos largos
+"""
+from app.services.document_chunker import chunk_text, iter_chunks
+from app.services.text_vectorization_service import TermExtractor, TextVectorizationService
+
+
+PARAGRAPH = "Experiencia en Python y Docker. Trabajo en equipo y liderazgo."
+
+
+class TestIterChunks:
+    """Tests del particionado"""
+
+    def test_chunks_are_bounded_and_reconstruct_text(self):
+        text = "\n\n".join(f"{PARAGRAPH} Proyecto {i}." for i in range(200))
+        chunks = chunk_text(text, max_chars=500)
+
+        assert len(chunks) > 1
+        assert all(len(c.text) <= 500 for c in chunks)
+        assert "".join(c.text for c in chunks) == text
+        for chunk in chunks:
+            assert text[chunk.start:chunk.end] == chunk.text
+
+    def test_prefers_paragraph_boundaries(self):
+        text = "\n\n".join(["a" * 300, "b" * 300, "c" * 300])
+        chunks = chunk_text(text, max_chars=700)
+
+        assert chunks[0].text == "a" * 300 + "\n\n" + "b" * 300 + "\n\n"
+        assert chunks[1].text == "c" * 300
+
+    def test_falls_back_to_hard_cut_without_separators(self):
+        chunks = chunk_text("x" * 1050, max_chars=500)
+        assert [len(c.text) for c in chunks] == [500, 500, 50]
+
+    def test_total_cap_and_whitespace_only_pieces(self):
+        text = PARAGRAPH + " " * 2000
+        chunks = list(iter_chunks(text, max_chars=100, max_total_chars=1000))
+
+        assert chunks[-1].end <= 1000
+        assert all(c.text.strip() for c in chunks)
+        assert list(iter_chunks("")) == []
+
+
+class TestChunkedAnalysis:
+    """Tests de la fusión de resultados por fragmento"""
+
+    def test_analyze_document_merges_counts_across_chunks(self):
+        text = "\n\n".join([PARAGRAPH] * 2000)  # > NLP_MAX_TEXT_LENGTH
+        service = TextVectorizationService()
+        analysis = service.analyze_document(text)
+        single = service.analyze_document(PARAGRAPH)
+
+        terms = dict(analysis["technical_terms"])
+        assert terms["python"] == 1.0 + 2000 * 0.1
+        assert analysis["token_count"] == 2000 * single["token_count"]
+        assert len(analysis["normalized_text"]) <= 50000
+
+    def test_count_based_extraction_matches_relevance_formula(self):
+        extractor = TermExtractor()
+        terms = dict(extractor.extract_technical_terms("python docker python"))
+        assert terms == {"python": 1.2, "docker": 1.1}
@@ -0,0 +1,56 @@
+"""
+Tests para DocumentContext (representaciones de un CV calculadas una vez)
+"""
+import app.services.text_vectorization_service as text_vectorization
+from app.services.cv_extractor_v2_spacy import CVExtractorV2
+from app.services.document_context import DocumentContext
+from app.services.text_vectorization_service import NormalizationType, TermExtractor
+
+
+CV_TEXT = (
+    "Ana López\nDesarrolladora backend\n"
+    "EXPERIENCIA\nPython y FastAPI en Acme, 2020 - 2024.\nLiderazgo de equipo.\n"
+    "EDUCACIÓN\nUniversidad Nacional, Ingeniería en Computación.\n"
+    "HABILIDADES\n"
+)
+
+
+class TestDocumentContext:
+    """Secciones, líneas y normalización compartida"""
+
+    def test_sections_are_offsets_of_section_content(self):
+        context = DocumentContext(CV_TEXT)
+
+        assert context.section_text("experience") == "Python y FastAPI en Acme, 2020 - 2024.\nLiderazgo de equipo."
+        assert context.section_text("education") == "Universidad Nacional, Ingeniería en Computación."
+        assert context.section_text("skills") == ""
+        assert context.section_text("projects") == ""
+        assert CVExtractorV2._split_sections(None, CV_TEXT) == {
+            name: context.section_text(name) for name in context.sections
+        }
+
+    def test_normalizes_once_per_document(self, monkeypatch):
+        calls = []
+        original = text_vectorization.normalize_text
+        monkeypatch.setattr(
+            text_vectorization, "normalize_text",
+            lambda text, *args, **kwargs: calls.append(text) or original(text, *args, **kwargs),
+        )
+        context = DocumentContext(CV_TEXT)
+        extractor = TermExtractor()
+
+        extractor.extract_technical_terms(context)
+        extractor.extract_soft_skills(context)
+        extractor.extract_keyphrases(context)
+        text_vectorization.text_vectorization_service.analyze_document(context)
+
+        assert len(calls) == len(context.chunks) == 1
+        assert context.tokens(NormalizationType.AGGRESSIVE) is context.tokens(NormalizationType.TECHNICAL)
+
+    def test_clean_lines_and_accepts_plain_text(self):
+        context = DocumentContext("  Caf\u00e9 \n\nx\n Python ")
+
+        assert context.clean_lines == ["Cafe\u0301", "Python"]  # NFKD
+        assert DocumentContext.of(context) is context
+        assert DocumentContext.of("texto").text == "texto"
+        assert DocumentContext("", language="en").language == "en"
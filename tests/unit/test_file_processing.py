@@ -0,0 +1,151 @@
+"""
+Tests para la lectura de archivos subidos y la extracción de texto de PDFs
+"""
+import io
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import UploadFile
+
+from app.core.config import settings
+from app.core.cpu_executor import CPUExecutor
+from app.utils import file_processing
+from app.utils.file_processing import (
+    CVFileValidator,
+    _extract_pdf_pages,
+    _extract_pdf_parallel,
+    extract_pdf_text,
+    read_upload_async,
+)
+
+
+def _make_pdf(page_texts):
+    """PDF mínimo con una línea de texto (Helvetica) por página."""
+    count = len(page_texts)
+    font_id = 3 + 2 * count
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(
+            f"{3 + 2 * i} 0 R".encode() for i in range(count)
+        ) + f"] /Count {count} >>".encode(),
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+PAGES = [f"Pagina {i} experiencia en Python y analisis de datos para proyectos" for i in range(10)]
+
+
+class _CountingFile(io.BytesIO):
+    """BytesIO que cuenta los bytes entregados."""
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class TestReadUpload:
+    """Lectura por bloques con corte temprano"""
+
+    @pytest.mark.asyncio
+    async def test_reads_in_chunks(self, monkeypatch):
+        monkeypatch.setattr(settings, "UPLOAD_READ_CHUNK_BYTES", 7)
+        data = b"Experiencia en Python, SQL y analisis de datos. " * 3
+        upload = UploadFile(file=io.BytesIO(data), filename="cv.txt")
+
+        assert await read_upload_async(upload) == data
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_is_cut_early(self, monkeypatch):
+        monkeypatch.setattr(settings, "UPLOAD_READ_CHUNK_BYTES", 1024)
+        monkeypatch.setattr(CVFileValidator, "MAX_SIZE_BYTES", 4096)
+        source = _CountingFile(b"x" * 100_000)
+        upload = UploadFile(file=source, filename="cv.txt")
+
+        with pytest.raises(HTTPException) as exc:
+            await read_upload_async(upload)
+        assert exc.value.status_code == 413
+        assert source.bytes_read <= 4096 + 1024
+
+    @pytest.mark.asyncio
+    async def test_declared_size_rejected_before_reading(self, monkeypatch):
+        monkeypatch.setattr(CVFileValidator, "MAX_SIZE_BYTES", 10)
+        source = _CountingFile(b"x" * 100)
+        upload = UploadFile(file=source, filename="cv.txt", size=100)
+
+        with pytest.raises(HTTPException) as exc:
+            await read_upload_async(upload)
+        assert exc.value.status_code == 413
+        assert source.bytes_read == 0
+
+
+@pytest.mark.skipif(
+    not file_processing._pdf_page_backends(), reason="Requiere pdfplumber o PyPDF2"
+)
+class TestPDFExtraction:
+    """Extracción página a página, corte temprano y reparto entre procesos"""
+
+    def test_joins_pages_in_order_and_records_timings(self):
+        text, timings = extract_pdf_text(_make_pdf(PAGES), max_chars=0)
+
+        assert [line.split()[1] for line in text.splitlines()] == [str(i) for i in range(10)]
+        first = file_processing._pdf_page_backends()[0]
+        assert list(timings) == [first] and timings[first] >= 0
+
+    def test_stops_once_enough_text_is_collected(self):
+        text, _ = extract_pdf_text(_make_pdf(PAGES), max_chars=len(PAGES[0]) * 2)
+
+        assert len(text.splitlines()) == 2
+
+    def test_page_range(self):
+        backend = file_processing._pdf_page_backends()[0]
+        pages = _extract_pdf_pages(_make_pdf(PAGES), backend, start=3, stop=5)
+
+        assert [page.split()[1] for page in pages] == ["3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_parallel_extraction_matches_sequential(self, monkeypatch):
+        monkeypatch.setattr(settings, "PDF_PARALLEL_MIN_PAGES", 4)
+        monkeypatch.setattr(settings, "PDF_PAGES_PER_TASK", 3)
+        monkeypatch.setattr(settings, "PDF_MAX_TEXT_CHARS", 0)
+        content = _make_pdf(PAGES)
+        executor = CPUExecutor(process_workers=2, max_queue=8, default_timeout=120)
+        try:
+            text = await _extract_pdf_parallel(content, executor)
+        finally:
+            executor.shutdown()
+
+        assert text == extract_pdf_text(content, max_chars=0)[0]
+
+    @pytest.mark.asyncio
+    async def test_short_pdf_is_not_split(self, monkeypatch):
+        monkeypatch.setattr(settings, "PDF_PARALLEL_MIN_PAGES", 50)
+        executor = CPUExecutor(process_workers=2, max_queue=8)
+        try:
+            assert await _extract_pdf_parallel(_make_pdf(PAGES), executor) is None
+        finally:
+            executor.shutdown()
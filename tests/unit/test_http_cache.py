@@ -0,0 +1,168 @@
+"""
+Tests para el cache HTTP en disco del scraping
+"""
+import gzip
+import os
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from app.core import session_manager
+from app.core.http_cache import CachingTransport, HTTPCache, cache_key
+from app.core.session_manager import SessionManager
+
+
+DETAIL_URL = "https://oferta.occ.com.mx/offer/123/d/j"
+
+
+def _client(cache, handler):
+    return httpx.AsyncClient(transport=CachingTransport(httpx.MockTransport(handler), cache))
+
+
+def _cache(tmp_path, **kwargs):
+    kwargs.setdefault("ttl_rules", {r"/offer/\d+/d/j": 60})
+    return HTTPCache(path=str(tmp_path / "http_cache.sqlite3"), default_ttl=0, **kwargs)
+
+
+class TestHTTPCache:
+    """Frescura, revalidación condicional y expulsión"""
+
+    @pytest.mark.asyncio
+    async def test_fresh_response_is_served_without_network(self, tmp_path):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            body = gzip.compress(b'{"title": "Backend"}')
+            return httpx.Response(200, headers={"Content-Encoding": "gzip"}, content=body)
+
+        cache = _cache(tmp_path)
+        async with _client(cache, handler) as client:
+            first = await client.get(DETAIL_URL, params={"ipo": "41", "iapo": "1"})
+            second = await client.get(DETAIL_URL, params={"iapo": "1", "ipo": "41"})
+
+        assert len(calls) == 1
+        assert first.json() == second.json() == {"title": "Backend"}
+        assert second.extensions["from_cache"] is True
+        assert cache.stats == {"miss": 1, "stored": 1, "hit": 1}
+        assert cache.is_fresh(httpx.URL(DETAIL_URL, params={"iapo": "1", "ipo": "41"}))
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_is_revalidated_with_conditional_get(self, tmp_path):
+        seen = []
+
+        def handler(request):
+            seen.append(dict(request.headers))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304, headers={"Cache-Control": "max-age=120"})
+            return httpx.Response(200, headers={"ETag": '"v1"', "Cache-Control": "no-cache"}, text="<html>1</html>")
+
+        cache = _cache(tmp_path)
+        async with _client(cache, handler) as client:
+            await client.get("https://www.occ.com.mx/empleos/de-python/")
+            revalidated = await client.get("https://www.occ.com.mx/empleos/de-python/")
+            cached = await client.get("https://www.occ.com.mx/empleos/de-python/")
+
+        assert len(seen) == 2 and seen[1]["if-none-match"] == '"v1"'
+        assert revalidated.status_code == 200 and revalidated.text == cached.text == "<html>1</html>"
+        assert cache.stats["revalidated"] == 1 and cache.stats["hit"] == 1
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_responses_are_not_stored(self, tmp_path):
+        def handler(request):
+            if request.url.path == "/no-store":
+                return httpx.Response(200, headers={"Cache-Control": "no-store"}, text="x")
+            return httpx.Response(200 if request.url.path == "/sin-ttl" else 500, text="x")
+
+        cache = _cache(tmp_path)
+        async with _client(cache, handler) as client:
+            for path in ("/no-store", "/sin-ttl", "/offer/1/d/j"):
+                await client.get(f"https://www.occ.com.mx{path}")
+
+        assert cache.stats == {"miss": 3}
+        assert cache.size() == 0
+
+    def test_eviction_keeps_recently_used_entries(self, tmp_path):
+        cache = _cache(tmp_path, max_bytes=2500)
+        headers = httpx.Headers({"Cache-Control": "max-age=60"})
+        bodies = {name: os.urandom(1000) for name in "abc"}  # ~1 KB comprimido cada uno
+
+        cache.put("a", "https://x/a", 200, headers, bodies["a"])
+        cache.put("b", "https://x/b", 200, headers, bodies["b"])
+        time.sleep(0.01)
+        assert cache.get("a") is not None  # "a" pasa a ser la más reciente
+        cache.put("c", "https://x/c", 200, headers, bodies["c"])
+
+        assert cache.get("b") is None
+        assert cache.get("a").body == bodies["a"] and cache.get("c") is not None
+        assert cache.stats["evicted"] == 1 and cache.size() <= 2500
+        assert cache_key("GET", httpx.URL("https://x/?b=2&a=1")) == cache_key("GET", httpx.URL("https://x/?a=1&b=2"))
+
+    def test_close_writes_pending_accesses(self, tmp_path):
+        headers = httpx.Headers({"Cache-Control": "max-age=60"})
+        cache = _cache(tmp_path, max_bytes=2500)
+        cache.put("a", "https://x/a", 200, headers, os.urandom(1000))
+        cache.put("b", "https://x/b", 200, headers, os.urandom(1000))
+        time.sleep(0.01)
+        assert cache.get("a") is not None  # Acceso pendiente (aún no escrito)
+        cache.close()
+
+        # Tras reabrir, "a" sigue siendo la más reciente: se expulsa "b"
+        reopened = _cache(tmp_path, max_bytes=2500)
+        reopened.put("c", "https://x/c", 200, headers, os.urandom(1000))
+        assert reopened.get("b") is None and reopened.get("a") is not None
+
+
+class TestCacheGate:
+    """Solo las peticiones que salen a la red pasan por el rate limiter"""
+
+    @pytest.mark.asyncio
+    async def test_gate_wraps_network_requests_only(self, tmp_path):
+        gated = []
+
+        @asynccontextmanager
+        async def gate(request):
+            gated.append(request.url.path)
+            yield
+
+        def handler(request):
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, headers={"ETag": '"v1"'}, text="ok")
+
+        cache = _cache(tmp_path)
+        transport = CachingTransport(httpx.MockTransport(handler), cache, gate=gate)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get(DETAIL_URL)  # miss
+            hit = await client.get(DETAIL_URL)
+            await client.get("https://www.occ.com.mx/empleos/de-python/")  # miss (sin TTL, con ETag)
+            revalidated = await client.get("https://www.occ.com.mx/empleos/de-python/")
+            await client.post(DETAIL_URL)
+
+        assert gated == ["/offer/123/d/j", "/empleos/de-python/", "/empleos/de-python/", "/offer/123/d/j"]
+        assert hit.extensions == {"from_cache": True, "revalidated": False}
+        assert revalidated.extensions["revalidated"] is True
+
+    @pytest.mark.asyncio
+    async def test_session_manager_cache_hits_take_no_token(self, tmp_path, monkeypatch):
+        cache = _cache(tmp_path)
+        monkeypatch.setattr(
+            session_manager, "caching_transport",
+            lambda gate=None, **kwargs: CachingTransport(
+                httpx.MockTransport(lambda request: httpx.Response(200, text="ok")), cache, gate=gate
+            ),
+        )
+        manager = SessionManager()
+        try:
+            await manager.request("GET", DETAIL_URL)
+            tokens = manager.limiter(DETAIL_URL).tokens
+            started = time.perf_counter()
+            for _ in range(5):
+                assert (await manager.request("GET", DETAIL_URL)).text == "ok"
+        finally:
+            await manager.close()
+
+        assert time.perf_counter() - started < 0.5
+        assert manager.limiter(DETAIL_URL).tokens >= tokens and cache.stats["hit"] == 5
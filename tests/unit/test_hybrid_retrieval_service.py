@@ -0,0 +1,154 @@
+"""
+Tests para el pipeline híbrido de recuperación (léxico -> semántico)
+"""
+import numpy as np
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.models import JobPosition
+from app.services import matching_service as matching_module
+from app.services.hybrid_retrieval_service import HybridRetrievalService, LexicalJobIndex
+from app.services.job_embedding_index import JobEmbeddingIndex
+
+
+class KeywordEmbeddingIndex(JobEmbeddingIndex):
+    """Índice con codificador determinista (sin modelos spaCy)."""
+
+    VOCAB = ["python", "django", "java", "spring", "data", "react"]
+
+    @staticmethod
+    def encode_texts(texts):
+        vectors = np.zeros((len(texts), len(KeywordEmbeddingIndex.VOCAB)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for col, word in enumerate(KeywordEmbeddingIndex.VOCAB):
+                vectors[row, col] = text.lower().count(word)
+        return vectors
+
+
+class FailingEmbeddingIndex(JobEmbeddingIndex):
+    @staticmethod
+    def encode_texts(texts):
+        raise RuntimeError("modelo no disponible")
+
+
+JOBS = {
+    1: "Desarrollador Python Django backend",
+    2: "Ingeniero Java Spring",
+    3: "Analista de data con Python",
+    4: "Frontend React developer",
+    5: "Python Python Python data data data",
+}
+
+
+@pytest_asyncio.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _service(embedding_index):
+    service = HybridRetrievalService(lexical_index=LexicalJobIndex(), embedding_index=embedding_index)
+    service.index_texts(JOBS)
+    embedding_index.upsert_texts(JOBS)
+    return service
+
+
+class TestLexicalJobIndex:
+    """Tests de la etapa léxica"""
+
+    def test_returns_only_matching_jobs(self):
+        index = LexicalJobIndex()
+        for job_id, text in JOBS.items():
+            index.add(job_id, text)
+
+        result = index.search("java spring", limit=10, budget_ms=1000)
+        assert [c.job_id for c in result["candidates"]] == [2]
+        assert set(result["candidates"][0].matched_terms) == {"java", "spring"}
+        assert result["stats"]["elapsed_ms"] >= 0
+
+    def test_limit_bounds_candidates(self):
+        index = LexicalJobIndex()
+        for job_id, text in JOBS.items():
+            index.add(job_id, text)
+
+        result = index.search("python", limit=2, budget_ms=1000)
+        assert len(result["candidates"]) == 2
+        assert result["stats"]["matched_jobs"] == 3
+
+    def test_remove_and_replace(self):
+        index = LexicalJobIndex()
+        index.add(1, "python")
+        index.add(1, "java")
+        assert index.search("python", limit=5, budget_ms=1000)["candidates"] == []
+        assert index.remove([1]) == 1
+        assert len(index) == 0
+
+    def test_zero_budget_truncates(self):
+        index = LexicalJobIndex()
+        index.add(1, "python django")
+        result = index.search("python django", limit=5, budget_ms=0)
+        assert result["stats"]["truncated"] is True
+
+
+class TestHybridRetrievalService:
+    """Tests del pipeline completo"""
+
+    def test_semantic_stage_reranks_lexical_candidates(self):
+        service = _service(KeywordEmbeddingIndex(min_train_size=10_000))
+        result = service.retrieve("python data", limit=3, semantic_weight=1.0)
+
+        ids = [c.job_id for c in result.candidates]
+        assert ids[0] == 5
+        assert 2 not in ids and 4 not in ids
+        assert all(c.reranked for c in result.candidates)
+        assert set(result.stages) == {"lexical", "semantic"}
+        assert result.stages["semantic"]["reranked"] == 3
+
+    def test_semantic_limit_only_reranks_prefix(self):
+        service = _service(KeywordEmbeddingIndex(min_train_size=10_000))
+        result = service.retrieve("python data", limit=10, semantic_limit=1)
+
+        assert result.stages["semantic"]["candidates"] == 1
+        assert sum(c.reranked for c in result.candidates) == 1
+        assert result.candidates[0].reranked
+
+    def test_falls_back_to_lexical_order_when_encoder_fails(self):
+        service = _service(KeywordEmbeddingIndex(min_train_size=10_000))
+        service.embedding_index = FailingEmbeddingIndex(min_train_size=10_000)
+        service.embedding_index.add([1], np.ones((1, 3), dtype=np.float32))
+
+        result = service.retrieve("java spring", limit=5)
+        assert [c.job_id for c in result.candidates] == [2]
+        assert result.stages["semantic"]["skipped"] == "modelo no disponible"
+        assert result.candidates[0].to_details()["semantic_score"] is None
+
+
+class TestLexicalIndexWarmUp:
+    """Carga inicial del índice léxico desde la BD"""
+
+    @pytest.mark.asyncio
+    async def test_warms_from_db_even_if_a_scrape_indexed_first(self, factory, monkeypatch):
+        async with factory() as session:
+            session.add_all(
+                JobPosition(title=text, company="ACME", location="CDMX", description=text, source="occ")
+                for text in JOBS.values()
+            )
+            await session.commit()
+        service = HybridRetrievalService(lexical_index=LexicalJobIndex(), embedding_index=JobEmbeddingIndex())
+        monkeypatch.setattr(matching_module, "hybrid_retrieval_service", service)
+        service.index_texts({1: JOBS[1]})  # Scrape tras reiniciar, antes de la primera consulta
+
+        matching = matching_module.MatchingService()
+        async with factory() as session:
+            await matching._warm_lexical_index(session)
+            assert service.warmed and len(service.lexical_index) == len(JOBS)
+
+            service.remove_jobs([2])
+            await matching._warm_lexical_index(session)  # Ya cargado: no vuelve a leer la tabla
+            assert len(service.lexical_index) == len(JOBS) - 1
@@ -0,0 +1,112 @@
+"""
+Tests para el crawling incremental de búsquedas de OCC
+"""
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.services.incremental_crawler import IncrementalCrawler
+from app.services.occ_scraper_service import JobOffer, SearchFilters
+
+
+def _job(job_id: str, salary: str = "$20,000", date: str = "Hoy") -> JobOffer:
+    return JobOffer(job_id=job_id, title=f"Oferta {job_id}", company="Acme", location="CDMX",
+                    salary=salary, publication_date=date)
+
+
+class FakeScraper:
+    """Páginas de resultados fijas; registra páginas y detalles pedidos."""
+
+    def __init__(self, pages, failing=()):
+        self.pages = pages
+        self.failing = set(failing)
+        self.requested_pages = []
+        self.detail_requests = []
+
+    async def search_jobs(self, filters):
+        assert filters.sort_by == "date"
+        self.requested_pages.append(filters.page)
+        jobs = self.pages[filters.page - 1] if filters.page <= len(self.pages) else []
+        return list(jobs), 100
+
+    async def _fetch_detail_outcomes(self, jobs):
+        self.detail_requests.append([job.job_id for job in jobs])
+        return [
+            (job, "timeout") if job.job_id in self.failing
+            else (job.copy(update={"full_description": "detalle"}), "enriched")
+            for job in jobs
+        ]
+
+
+@pytest_asyncio.fixture
+async def crawler(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'crawl.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield IncrementalCrawler(
+        session_factory=sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), max_pages=5
+    )
+    await engine.dispose()
+
+
+FILTERS = SearchFilters(keyword="python", location="CDMX")
+
+
+class TestIncrementalCrawler:
+    """Paginación hasta lo conocido y detalles solo del delta"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_refresh_costs_one_page(self, crawler):
+        pages = [[_job("1"), _job("2")], [_job("3"), _job("4")], [_job("5")]]
+        first = await crawler.crawl(FILTERS, scraper=FakeScraper(pages))
+        assert first.first_run and len(first.new) == 5 and first.pages_fetched == 4
+
+        # Cambia solo la fecha relativa ("Hace 1 día"): no cuenta como cambio
+        scraper = FakeScraper([[_job(j.job_id, date="Hace 1 día") for j in page] for page in pages])
+        again = await crawler.crawl(FILTERS, scraper=scraper)
+
+        assert (again.delta, again.unchanged, again.first_run) == ([], 2, False)
+        assert scraper.requested_pages == [1] and again.stopped_early
+        assert scraper.detail_requests == []
+
+    @pytest.mark.asyncio
+    async def test_only_new_and_changed_cards_get_details(self, crawler):
+        await crawler.crawl(FILTERS, scraper=FakeScraper([[_job("1"), _job("2")], [_job("3"), _job("4")]]))
+
+        scraper = FakeScraper([
+            [_job("9"), _job("1", salary="$25,000")],
+            [_job("2"), _job("3")],
+            [_job("4")],
+        ])
+        result = await crawler.crawl(FILTERS, scraper=scraper)
+
+        assert [job.job_id for job in result.new] == ["9"]
+        assert [job.job_id for job in result.changed] == ["1"]
+        assert all(job.full_description == "detalle" for job in result.delta)
+        assert scraper.requested_pages == [1, 2]
+        assert scraper.detail_requests == [["9", "1"]]
+
+    @pytest.mark.asyncio
+    async def test_failed_details_are_retried_next_run(self, crawler):
+        pages = [[_job("1"), _job("2")]]
+        first = await crawler.crawl(FILTERS, scraper=FakeScraper(pages, failing={"2"}))
+        assert first.details == {"enriched": 1, "timeout": 1}
+
+        scraper = FakeScraper(pages)
+        retry = await crawler.crawl(FILTERS, scraper=scraper)
+
+        assert [job.job_id for job in retry.new] == ["2"]
+        assert scraper.detail_requests == [["2"]]
+
+    @pytest.mark.asyncio
+    async def test_scopes_and_baseline_pages(self, crawler):
+        pages = [[_job("1")], [_job("2")]]
+        scraper = FakeScraper(pages)
+        alert = await crawler.crawl(FILTERS, scope="alert:1", scraper=scraper,
+                                    fetch_details=False, baseline_pages=1)
+        assert scraper.requested_pages == [1] and len(alert.new) == 1
+
+        other = await crawler.crawl(FILTERS, scope="alert:2", scraper=FakeScraper(pages), fetch_details=False)
+        assert other.first_run and len(other.new) == 2
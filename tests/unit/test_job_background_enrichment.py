@@ -0,0 +1,178 @@
+"""
+Tests para el enriquecimiento en segundo plano de empleos
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.core.cpu_executor import THREAD
+from app.models import JobPosition
+from app.services import job_background_enrichment
+from app.services.job_background_enrichment import JobBackgroundEnricher, derive_fields, parse_salary
+from app.services.job_embedding_index import job_document_text, job_embedding_index
+from app.services.job_scraper_worker import JobPostingMinimal, JobScraperWorker
+
+
+@pytest_asyncio.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+def _job(index: int, **overrides) -> JobPosition:
+    now = datetime.now(timezone.utc) - timedelta(minutes=5)
+    values = dict(
+        title=f"Desarrollador Python {index}",
+        company="Tecnología Aplicada",
+        location="Ciudad de México",
+        description="Buscamos desarrollador con experiencia en Django, Docker y PostgreSQL. Trabajo remoto, tiempo completo.",
+        salary_range="$35,000 - $45,000 MXN Mensual",
+        source="occ",
+        external_job_id=str(20000000 + index),
+        created_at=now,
+        updated_at=now,
+    )
+    values.update(overrides)
+    return JobPosition(**values)
+
+
+async def _add(factory, *jobs):
+    async with factory() as session:
+        session.add_all(jobs)
+        await session.commit()
+
+
+def _enricher(factory, **overrides) -> JobBackgroundEnricher:
+    options = dict(session_factory=factory, batch_size=2, poll_seconds=0.05, vectorize=False, cpu_kind=THREAD)
+    options.update(overrides)
+    return JobBackgroundEnricher(**options)
+
+
+class TestDeriveFields:
+    """Salario, modalidad, tipo de contrato, skills e idioma"""
+
+    def test_salary_formats(self):
+        assert parse_salary("$35,000 - $45,000 MXN Mensual") == {
+            "min": 35000.0, "max": 45000.0, "currency": "MXN", "period": "month"}
+        assert parse_salary("30k - 40k USD anual") == {"min": 30000.0, "max": 40000.0, "currency": "USD", "period": "year"}
+        assert parse_salary("$15,000.00 Quincenal")["max"] == 15000.0
+        assert parse_salary("Sueldo no mostrado por la empresa") is None
+
+    def test_normalizes_fields_from_text_and_stored_values(self):
+        fields = derive_fields({
+            "title": "Ingeniero de datos", "skills": json.dumps(["SQL"]), "job_type": "Tiempo Parcial",
+            "description": "Modalidad híbrida. Experiencia con Python, Node.js, C++ y Power BI para reportes.",
+        })
+
+        assert fields["skills"][0] == "SQL" and {"Python", "Power Bi", "C++"} <= set(fields["skills"])
+        assert len({skill.lower() for skill in fields["skills"]}) == len(fields["skills"])
+        assert (fields["work_mode"], fields["job_type"], fields["language"]) == ("híbrido", "part-time", "es")
+
+
+class TestJobBackgroundEnricher:
+    """Lotes, hash de contenido, fallas y worker en segundo plano"""
+
+    @pytest.mark.asyncio
+    async def test_enriches_in_batches_and_skips_unchanged_jobs(self, factory):
+        await _add(factory, *(_job(i) for i in range(5)))
+        enricher = _enricher(factory)
+
+        assert await enricher.run_once() == {"selected": 5, "skipped": 0, "vectorized": 0, "enriched": 5}
+        stored = await enricher.get(range(1, 6))
+        assert stored[1].work_mode == "remoto" and stored[1].job_type == "full-time"
+        assert (stored[1].salary_min, stored[1].salary_max, stored[1].salary_period) == (35000.0, 45000.0, "month")
+        assert {"Django", "Docker", "Postgresql"} <= set(json.loads(stored[1].skills))
+        assert await enricher.run_once() == {}
+
+        # Re-scrape sin cambios (solo updated_at) vs. descripción distinta
+        async with factory() as session:
+            later = datetime.now(timezone.utc)
+            await session.execute(update(JobPosition).where(JobPosition.id.in_([1, 2])).values(updated_at=later))
+            await session.execute(
+                update(JobPosition).where(JobPosition.id == 2)
+                .values(description="Puesto presencial de medio tiempo en Monterrey con Java y Spring.")
+            )
+            await session.commit()
+
+        assert await enricher.run_once() == {"selected": 2, "skipped": 1, "vectorized": 0, "enriched": 1}
+        stored = await enricher.get([1, 2])
+        assert stored[2].work_mode == "presencial" and stored[2].checked_at >= stored[1].enriched_at
+        assert stored[1].checked_at.tzinfo is not None
+        assert await enricher.run_once() == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_jobs_are_recorded_and_executor_errors_retry(self, factory, monkeypatch):
+        await _add(factory, _job(1), _job(2, title="Contador"))
+        enricher = _enricher(factory)
+
+        async def busy(*args, **kwargs):
+            raise RuntimeError("executor ocupado")
+
+        monkeypatch.setattr(enricher.executor, "run", busy)
+        assert (await enricher.run_once())["deferred"] == 2
+        assert await enricher.get([1, 2]) == {}
+        monkeypatch.undo()
+
+        original = job_background_enrichment.derive_fields
+
+        def flaky(job, analysis=None):
+            if job["title"] == "Contador":
+                raise ValueError("texto ilegible")
+            return original(job, analysis)
+
+        monkeypatch.setattr(job_background_enrichment, "derive_fields", flaky)
+        assert await enricher.run_once() == {"selected": 2, "skipped": 0, "vectorized": 0, "enriched": 1, "failed": 1}
+        stored = await enricher.get([1, 2])
+        assert stored[2].status == "failed" and stored[2].error == "texto ilegible"
+
+    @pytest.mark.asyncio
+    async def test_vectorizes_with_the_index_document_text(self, factory, monkeypatch):
+        jobs = [_job(1, skills='["Excel"]'), _job(2)]
+        await _add(factory, *jobs)
+        upserted = {}
+        monkeypatch.setattr(job_embedding_index, "upsert_texts", lambda texts: upserted.update(texts) or len(texts))
+        enricher = _enricher(factory, vectorize=True, workers=0)
+
+        assert (await enricher.run_once())["vectorized"] == 2
+        assert upserted == {job.id: job_document_text(job) for job in jobs}
+        assert (await enricher.get([1]))[1].vectorized
+        assert enricher.executor.process_workers == 0 and enricher.executor.nice > 0
+
+    @pytest.mark.asyncio
+    async def test_background_worker_wakes_up_on_notify(self, factory):
+        enricher = _enricher(factory, poll_seconds=30)
+        await enricher.start()
+        try:
+            await _add(factory, _job(1))
+            enricher.notify()
+            for _ in range(100):
+                if enricher.counts["enriched"]:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await enricher.stop()
+
+        assert enricher.counts["enriched"] == 1 and not enricher.running
+
+    @pytest.mark.asyncio
+    async def test_worker_enrich_job_fills_missing_fields(self):
+        job = JobPostingMinimal(
+            external_job_id="1", title="Analista de datos", company="ACME", location="CDMX",
+            description="Home office, jornada completa. Tableau y Python.", skills=["Excel"],
+            published_at=datetime.utcnow(),
+        )
+
+        enriched = await JobScraperWorker().enrich_job(job)
+
+        assert enriched.skills[:1] == ["Excel"] and {"Python", "Tableau"} <= set(enriched.skills)
+        assert (enriched.work_mode, enriched.job_type) == ("remoto", "full-time")
@@ -0,0 +1,187 @@
+"""
+Tests para JobEmbeddingIndex (matriz de embeddings + índice IVF)
+Usa vectores sintéticos: no requiere modelos spaCy instalados.
+"""
+import numpy as np
+import pytest
+
+from app.services.job_embedding_index import JobEmbeddingIndex, l2_normalize
+
+
+def _random_vectors(n, dim=32, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.normal(size=(n, dim)).astype(np.float32)
+
+
+def _exact_top_k(vectors, ids, query, k):
+    scores = l2_normalize(vectors) @ l2_normalize(query)[0]
+    order = np.argsort(-scores)[:k]
+    return [ids[i] for i in order]
+
+
+class TestNormalization:
+    """Tests de normalización L2"""
+
+    def test_rows_have_unit_norm(self):
+        normalized = l2_normalize(_random_vectors(10))
+        assert np.allclose(np.linalg.norm(normalized, axis=1), 1.0, atol=1e-5)
+
+    def test_zero_rows_stay_zero(self):
+        vectors = np.zeros((2, 8), dtype=np.float32)
+        assert not l2_normalize(vectors).any()
+
+
+class TestBruteForceSearch:
+    """Tests de búsqueda exacta (índice sin entrenar)"""
+
+    def test_top_k_matches_exact_ranking(self):
+        vectors = _random_vectors(200)
+        ids = list(range(1, 201))
+        index = JobEmbeddingIndex(dtype="float32", min_train_size=10_000)
+        index.add(ids, vectors)
+
+        query = _random_vectors(1, seed=42)[0]
+        results = index.search(query, top_k=5)
+
+        assert not index.is_trained
+        assert [job_id for job_id, _ in results] == _exact_top_k(vectors, ids, query, 5)
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_empty_index_returns_no_results(self):
+        index = JobEmbeddingIndex(min_train_size=10_000)
+        assert index.search(np.ones(8, dtype=np.float32)) == []
+
+    def test_dimension_mismatch_raises(self):
+        index = JobEmbeddingIndex(min_train_size=10_000)
+        index.add([1], _random_vectors(1, dim=8))
+        with pytest.raises(ValueError):
+            index.search(np.ones(4, dtype=np.float32))
+
+    def test_invalid_dtype_raises(self):
+        with pytest.raises(ValueError):
+            JobEmbeddingIndex(dtype="float64")
+
+
+class TestIVFSearch:
+    """Tests de búsqueda aproximada con listas invertidas"""
+
+    def test_auto_trains_and_keeps_high_recall(self):
+        vectors = _random_vectors(1000, seed=1)
+        ids = list(range(1000))
+        index = JobEmbeddingIndex(dtype="float32", nlist=16, nprobe=8, min_train_size=500)
+        index.add(ids, vectors)
+
+        assert index.is_trained
+
+        hits = 0
+        for seed in range(20):
+            query = _random_vectors(1, seed=100 + seed)[0]
+            expected = set(_exact_top_k(vectors, ids, query, 10))
+            found = {job_id for job_id, _ in index.search(query, top_k=10)}
+            hits += len(expected & found)
+
+        assert hits / 200 >= 0.7
+
+    def test_full_probe_equals_exact(self):
+        vectors = _random_vectors(600, seed=2)
+        ids = list(range(600))
+        index = JobEmbeddingIndex(nlist=8, min_train_size=100)
+        index.add(ids, vectors)
+
+        query = _random_vectors(1, seed=7)[0]
+        results = index.search(query, top_k=10, nprobe=8)
+        assert [job_id for job_id, _ in results] == _exact_top_k(vectors, ids, query, 10)
+
+
+class TestMutations:
+    """Tests de altas, reemplazos y bajas"""
+
+    def test_add_replaces_existing_id(self):
+        index = JobEmbeddingIndex(min_train_size=10_000)
+        index.add([1, 2], _random_vectors(2, dim=8))
+        new_vector = np.eye(8, dtype=np.float32)[:1]
+        index.add([1], new_vector)
+
+        assert len(index) == 2
+        job_id, score = index.search(new_vector[0], top_k=1)[0]
+        assert job_id == 1
+        assert score == pytest.approx(1.0, abs=1e-5)
+
+    def test_remove_excludes_from_results(self):
+        vectors = _random_vectors(50)
+        index = JobEmbeddingIndex(min_train_size=10_000)
+        index.add(range(50), vectors)
+
+        assert index.remove([0, 1, 999]) == 2
+        assert 0 not in index
+        found = {job_id for job_id, _ in index.search(vectors[0], top_k=50)}
+        assert 0 not in found and 1 not in found
+        assert len(found) == 48
+
+    @pytest.mark.parametrize("dtype", ["float32", "int8"])
+    def test_vectors_without_dimensions_are_skipped(self, dtype):
+        index = JobEmbeddingIndex(dtype=dtype, min_train_size=10_000)
+        assert index.add([1, 2], np.zeros((2, 0), dtype=np.float32)) == 0
+        assert len(index) == 0 and index.dim == 0
+        assert index._encode_rows(np.zeros((2, 0), dtype=np.float32))[0].shape == (2, 0)
+
+    def test_compaction_reclaims_tombstones(self):
+        index = JobEmbeddingIndex(min_train_size=10_000)
+        index.add(range(100), _random_vectors(100))
+        index.remove(range(60))
+
+        stats = index.stats()
+        assert stats["vectors"] == 40
+        assert stats["rows_allocated"] == 40
+
+
+class TestQuantization:
+    """Tests de precisión reducida (float16 / int8)"""
+
+    @pytest.mark.parametrize("dtype", ["float16", "int8"])
+    def test_scores_close_to_float32(self, dtype):
+        vectors = _random_vectors(100)
+        query = _random_vectors(1, seed=9)[0]
+        reference = JobEmbeddingIndex(dtype="float32", min_train_size=10_000)
+        reduced = JobEmbeddingIndex(dtype=dtype, min_train_size=10_000)
+        reference.add(range(100), vectors)
+        reduced.add(range(100), vectors)
+
+        ref_scores = dict(reference.search(query, top_k=100))
+        red_scores = dict(reduced.search(query, top_k=100))
+        for job_id, score in ref_scores.items():
+            assert red_scores[job_id] == pytest.approx(score, abs=0.02)
+
+    def test_int8_uses_less_memory(self):
+        vectors = _random_vectors(100)
+        full = JobEmbeddingIndex(dtype="float32", min_train_size=10_000)
+        small = JobEmbeddingIndex(dtype="int8", min_train_size=10_000)
+        full.add(range(100), vectors)
+        small.add(range(100), vectors)
+        assert small.stats()["matrix_bytes"] * 4 == full.stats()["matrix_bytes"]
+
+
+class TestPersistence:
+    """Tests de guardado/carga"""
+
+    def test_save_load_roundtrip(self, tmp_path):
+        vectors = _random_vectors(300, seed=3)
+        index = JobEmbeddingIndex(dtype="float16", nlist=4, min_train_size=100)
+        index.add(range(300), vectors)
+        index.remove([5])
+        path = str(tmp_path / "index.npz")
+        index.save(path)
+
+        restored = JobEmbeddingIndex(min_train_size=10_000)
+        assert restored.load(path)
+        assert len(restored) == 299
+        assert restored.dtype == "float16"
+        assert restored.is_trained
+
+        query = _random_vectors(1, seed=11)[0]
+        assert restored.search(query, top_k=5) == index.search(query, top_k=5)
+
+    def test_load_missing_file_returns_false(self, tmp_path):
+        index = JobEmbeddingIndex()
+        assert index.load(str(tmp_path / "missing.npz")) is False
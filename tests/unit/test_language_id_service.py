@@ -0,0 +1,60 @@
+"""
+Tests para el identificador de idioma por trigramas
+"""
+from app.services.language_id_service import LanguageIdentifier, detect_language
+
+
+SPANISH_CV = (
+    "EXPERIENCIA PROFESIONAL\n"
+    "Desarrollador Backend en una empresa de tecnología. Lideré un equipo de "
+    "cinco personas y desarrollé servicios para clientes del sector financiero.\n"
+    "EDUCACIÓN\nLicenciatura en Ingeniería en Sistemas, Universidad Rosario Castellanos"
+)
+
+ENGLISH_CV = (
+    "PROFESSIONAL EXPERIENCE\n"
+    "Backend Developer at a technology company. I led a team of five people "
+    "and developed services for clients in the financial sector.\n"
+    "EDUCATION\nBachelor of Science in Computer Engineering, State University"
+)
+
+
+class TestLanguageIdentifier:
+    """Tests de identificación de idioma"""
+
+    def test_detects_spanish_and_english(self):
+        identifier = LanguageIdentifier()
+        spanish = identifier.detect(SPANISH_CV)
+        english = identifier.detect(ENGLISH_CV)
+
+        assert spanish.language == "es" and spanish.reliable
+        assert english.language == "en" and english.reliable
+
+    def test_short_headers(self):
+        identifier = LanguageIdentifier()
+        assert identifier.detect("Habilidades y certificaciones").language == "es"
+        assert identifier.detect("Skills and certifications").language == "en"
+
+    def test_empty_text_is_unreliable(self):
+        guess = LanguageIdentifier().detect("")
+        assert guess.confidence == 0.5
+        assert not guess.reliable
+
+    def test_only_prefix_is_analyzed(self):
+        identifier = LanguageIdentifier(prefix_chars=len(SPANISH_CV))
+        assert identifier.detect(SPANISH_CV + ENGLISH_CV * 20).language == "es"
+
+    def test_cache_hits_by_content(self):
+        identifier = LanguageIdentifier(cache_size=2)
+        identifier.detect(SPANISH_CV)
+        identifier.detect(SPANISH_CV)
+        assert identifier.cache_info()["hits"] == 1
+
+        identifier.detect(ENGLISH_CV)
+        identifier.detect("otro texto distinto")
+        info = identifier.cache_info()
+        assert info["size"] == 2
+        assert info["misses"] == 3
+
+    def test_shared_instance(self):
+        assert detect_language(ENGLISH_CV).language == "en"
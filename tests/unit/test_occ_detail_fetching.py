@@ -0,0 +1,83 @@
+"""
+Tests para la obtención concurrente de detalles de ofertas OCC
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.occ_scraper_service import JobOffer, OCCScraper
+
+
+def _job(job_id: str, title: str = "Listado") -> JobOffer:
+    return JobOffer(job_id=job_id, title=title, company="Acme", location="CDMX")
+
+
+def _scraper(handler, per_host: int = 4) -> OCCScraper:
+    scraper = OCCScraper()
+    scraper.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper.host_limiter.per_host = per_host
+    scraper._parse_job_detail_from_api = lambda data, job_id: _job(job_id, title=data["title"])
+    return scraper
+
+
+def _api_handler(delays):
+    """Responde el JSON de detalle tras `delays[job_id]` segundos (default 0.05)."""
+    async def handler(request: httpx.Request) -> httpx.Response:
+        job_id = request.url.path.split("/")[2]
+        await asyncio.sleep(delays.get(job_id, 0.05))
+        return httpx.Response(200, json={"title": f"Detalle {job_id}"})
+    return handler
+
+
+class TestFetchFullDetails:
+    """Concurrencia acotada, timeouts por detalle y deadline global"""
+
+    @pytest.mark.asyncio
+    async def test_details_are_fetched_concurrently_in_order(self):
+        scraper = _scraper(_api_handler({}), per_host=4)
+        jobs = [_job(str(i)) for i in range(8)]
+
+        started = time.perf_counter()
+        enriched = await scraper._fetch_full_details(jobs, concurrency=8, timeout=2, deadline=5)
+        elapsed = time.perf_counter() - started
+
+        assert [job.title for job in enriched] == [f"Detalle {i}" for i in range(8)]
+        assert elapsed < 8 * 0.05  # Secuencial tardaría 8 round trips
+        stats = scraper.fetch_stats()
+        assert stats["max_in_flight"] == 4  # Límite por host
+        assert stats["requests"] == 8 and stats["in_flight"] == {}
+        assert stats["details"] == {"enriched": 8}
+
+    @pytest.mark.asyncio
+    async def test_slow_details_keep_container_data(self):
+        scraper = _scraper(_api_handler({"lento": 1.0, "colgado": 5.0}))
+        jobs = [_job("rapido"), _job("lento"), _job("colgado")]
+
+        started = time.perf_counter()
+        enriched = await scraper._fetch_full_details(jobs, timeout=0.5, deadline=0.8)
+
+        assert time.perf_counter() - started < 1.5
+        assert [job.title for job in enriched] == ["Detalle rapido", "Listado", "Listado"]
+        assert scraper.fetch_stats()["details"] == {"enriched": 1, "timeout": 2}
+
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self):
+        scraper = _scraper(_api_handler({"b": 0.5}))
+        enriched = await scraper._fetch_full_details([_job("a"), _job("b")], timeout=2, deadline=0.2)
+
+        assert [job.title for job in enriched] == ["Detalle a", "Listado"]
+        assert scraper.fetch_stats()["details"] == {"enriched": 1, "deadline": 1}
+
+    @pytest.mark.asyncio
+    async def test_api_error_falls_back_to_html_once(self):
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request.url.host)
+            return httpx.Response(503)
+
+        scraper = _scraper(handler)
+        assert await scraper.get_job_details("123") is None
+        assert calls == ["oferta.occ.com.mx", "www.occ.com.mx", "www.occ.com.mx"]
@@ -0,0 +1,69 @@
+"""
+Tests para la réplica de OCC y el benchmark de throughput del scraping
+"""
+import httpx
+import pytest
+
+from app.services.occ_scraper_service import OCCScraper
+from tests.performance.occ_replay import OCCReplay
+from tests.performance.occ_scrape_benchmark import run_benchmark
+
+
+class TestOCCReplay:
+    """Rutas de búsqueda y detalle, ids únicos e inyección de fallas"""
+
+    @pytest.mark.asyncio
+    async def test_serves_search_pages_with_unique_ids_and_detail_json(self):
+        replay = OCCReplay()
+        scraper = OCCScraper()
+        async with httpx.AsyncClient(transport=replay.transport()) as client:
+            first = await client.get("https://www.occ.com.mx/empleos/de-python/")
+            second = await client.get("https://www.occ.com.mx/empleos/de-python/", params={"page": "2"})
+            other = await client.get("https://www.occ.com.mx/empleos/de-carpintero/")
+            detail = await client.get("https://oferta.occ.com.mx/offer/21000000/d/j", params={"ipo": "41"})
+            html_detail = await client.get("https://www.occ.com.mx/empleo/21000000")
+
+        ids = [
+            {offer.job_id for offer in scraper._parse_search_page(response.text, "python")[0]}
+            for response in (first, second, other)
+        ]
+        assert all(ids) and not ids[0] & ids[1] and not ids[1] & ids[2]
+        assert detail.json()["o"]["id"] == 21000000 and detail.json()["c"]["cn"]
+        assert html_detail.status_code == 404
+        assert replay.stats["search"] == 3 and replay.stats["detail"] == 1 and replay.stats["404"] == 1
+
+    @pytest.mark.asyncio
+    async def test_injects_rate_limits_and_errors(self):
+        replay = OCCReplay(rate_limit_rate=0.3, error_rate=0.3, retry_after=2, seed=7)
+        async with httpx.AsyncClient(transport=replay.transport()) as client:
+            responses = [await client.get("https://www.occ.com.mx/empleos/de-python/") for _ in range(200)]
+
+        statuses = [response.status_code for response in responses]
+        assert {200, 429, 503} == set(statuses)
+        assert 40 < statuses.count(429) < 80 and 40 < statuses.count(503) < 80
+        assert all(r.headers["Retry-After"] == "2" for r in responses if r.status_code == 429)
+
+
+class TestOCCScrapeBenchmark:
+    """Corrida completa del pipeline contra la réplica"""
+
+    def test_reports_throughput_cpu_and_latency(self):
+        report = run_benchmark(
+            queries=3, pages=2, latency_ms=5, jitter_ms=0, rate_limit_rate=0.1,
+            retry_after=0.05, details=True, seed=3,
+        )
+
+        assert report["pages_requested"] == 6
+        assert report["pages_fetched"] + report["errors"] == 6 and report["pages_fetched"] > 0
+        assert report["jobs"] > 0 and report["duplicates"] == 0  # Ids únicos por página
+        assert report["pages_per_second"] > 0 and report["cpu_ms_per_page"] > 0
+        assert 0 < report["latency_ms"]["p50"] <= report["latency_ms"]["max"]
+        assert sum(report["details"]["outcomes"].values()) == report["details"]["jobs"]
+        assert report["replay"]["search"] == 6
+
+    def test_persist_batch_saves_jobs_to_database(self):
+        report = run_benchmark(queries=2, pages=1, latency_ms=1, jitter_ms=0, persist=True, seed=1)
+
+        assert report["jobs"] > 0 and report["jobs_saved"] == report["jobs"]
+        assert report["errors"] == 0 and report["latency_ms"]["p50"] > 0
+        assert report["parameters"]["persist"] is True
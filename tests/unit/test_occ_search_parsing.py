@@ -0,0 +1,62 @@
+"""
+Tests para el parseo rápido de páginas de resultados de OCC
+"""
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.services.html_parser_service import FALLBACK_PARSER_BACKEND, parser_backend, select_fragments
+from app.services.occ_scraper_service import OCCScraper, SEARCH_PAGE_XPATH
+
+
+PAGES = sorted((Path(__file__).parents[1] / "performance" / "occ_pages").glob("*.html"))
+
+
+def _legacy_parse(scraper: OCCScraper, html: str):
+    """Implementación anterior: árbol completo con html.parser."""
+    soup = BeautifulSoup(html, "html.parser")
+    return scraper._extract_job_offers(soup, "python"), scraper._extract_total_results(soup)
+
+
+class TestSearchPageParsing:
+    """Misma salida que el árbol completo con cualquier backend"""
+
+    @pytest.mark.parametrize("page", PAGES, ids=lambda page: page.stem)
+    @pytest.mark.parametrize("backend", ["lxml", "html.parser"])
+    def test_saved_pages_match_full_tree(self, page, backend):
+        scraper = OCCScraper()
+        html = page.read_text(encoding="utf-8")
+
+        offers, total = scraper._parse_search_page(html, "python", backend=backend)
+
+        assert offers and total
+        assert (offers, total) == _legacy_parse(scraper, html)
+
+    @pytest.mark.parametrize("backend", ["lxml", "html.parser"])
+    def test_total_falls_back_to_page_text(self, backend):
+        scraper = OCCScraper()
+        html = (
+            "<html><head><title>Empleos</title></head><body><nav>3 vacantes</nav>"
+            "<span>57&nbsp;resultados para python</span>"
+            '<div data-offers-grid-offer-item-container="" data-id="7"><h2>Analista</h2>'
+            '<p class="text-grey-900 text-sm">Puebla, Puebla</p></div></body></html>'
+        )
+
+        offers, total = scraper._parse_search_page(html, "python", backend=backend)
+
+        assert total == 57
+        assert (offers, total) == _legacy_parse(scraper, html)
+
+    def test_fragments_and_backend_fallback(self):
+        html = (
+            '<div data-offers-grid-offer-item-container=""><p data-total-offers="">1</p></div>'
+            '<div>fuera</div><p data-total-offers="">2</p>'
+        )
+
+        assert select_fragments(html, SEARCH_PAGE_XPATH) == (
+            '<div data-offers-grid-offer-item-container=""><p data-total-offers="">1</p></div>'
+            '<p data-total-offers="">2</p>'
+        )
+        assert select_fragments("", SEARCH_PAGE_XPATH) is None
+        assert parser_backend("selectolax") == FALLBACK_PARSER_BACKEND
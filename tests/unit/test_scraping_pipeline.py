@@ -0,0 +1,175 @@
+"""
+Tests para el pipeline de scraping por etapas
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.job_scraper_worker import JobScraperWorker
+from app.services.occ_scraper_service import OCCScraper
+from app.services.scraping_pipeline import PipelineConfig, ScrapingPipeline
+from tests.performance.occ_parse_benchmark import load_pages
+
+
+def _config(**overrides) -> PipelineConfig:
+    values = dict(
+        fetch_concurrency=4, parse_concurrency=2, transform_concurrency=1, write_concurrency=1,
+        queue_size=2, write_batch_size=5, write_batch_seconds=0.05,
+    )
+    values.update(overrides)
+    return PipelineConfig(**values)
+
+
+class TestScrapingPipeline:
+    """Etapas concurrentes, lotes del writer, backpressure y errores"""
+
+    @pytest.mark.asyncio
+    async def test_all_records_flow_through_and_are_written_in_batches(self):
+        batches = []
+
+        async def fetch(item):
+            await asyncio.sleep(0.01)
+            return item
+
+        async def persist(batch):
+            batches.append(len(batch))
+            return len(batch)
+
+        pipeline = ScrapingPipeline(
+            fetch=fetch,
+            parse=lambda item: [item * 10 + i for i in range(3)],
+            transform=lambda values: [v for v in values if v % 10 != 2],
+            persist=persist,
+            collect=True,
+            config=_config(),
+        )
+        result = await pipeline.run(range(10))
+
+        assert (result.items, result.records, result.saved) == (10, 20, 20)
+        assert sorted(result.collected) == sorted(i * 10 + j for i in range(10) for j in (0, 1))
+        assert max(batches) == 5 and sum(batches) == 20
+        assert result.stages["fetch"]["processed"] == 10
+        assert result.stages["persist"]["processed"] == 20
+        assert all(stage["queue_depth"] == 0 for stage in result.stages.values())
+        assert len(result.latencies) == 20 and result.to_dict()["latency_ms"]["p50"] >= 10  # Desde el fetch
+
+    @pytest.mark.asyncio
+    async def test_slow_writer_bounds_queues_and_fetch_keeps_running_in_parallel(self):
+        async def fetch(item):
+            await asyncio.sleep(0.05)
+            return item
+
+        async def persist(batch):
+            await asyncio.sleep(0.02)
+            return len(batch)
+
+        pipeline = ScrapingPipeline(
+            fetch=fetch, parse=lambda item: item, transform=lambda item: [item], persist=persist,
+            config=_config(fetch_concurrency=8, queue_size=3, write_batch_size=1),
+        )
+        started = time.perf_counter()
+        result = await pipeline.run(range(40))
+
+        assert result.saved == 40
+        assert time.perf_counter() - started < 40 * 0.05  # Fetch en paralelo
+        assert all(stage["queue_max_depth"] <= 3 for stage in result.stages.values())
+        assert result.stages["persist"]["queue_max_depth"] == 3  # El writer es el cuello de botella
+
+    @pytest.mark.asyncio
+    async def test_item_errors_are_recorded_without_stopping_the_pipeline(self):
+        async def fetch(item):
+            if item == 3:
+                raise httpx.ConnectError("sin red")
+            return item
+
+        def parse(item):
+            if item == 5:
+                raise ValueError("HTML inesperado")
+            return item
+
+        async def persist(batch):
+            if 7 in batch:
+                raise RuntimeError("base de datos caída")
+            return len(batch)
+
+        pipeline = ScrapingPipeline(
+            fetch=fetch, parse=parse, transform=lambda item: [item], persist=persist,
+            config=_config(write_batch_size=1),
+        )
+        result = await pipeline.run(range(10))
+
+        assert result.saved == 7
+        assert sorted(error["stage"] for error in result.errors) == ["fetch", "parse", "persist"]
+        assert (result.stages["fetch"]["errors"], result.stages["parse"]["errors"]) == (1, 1)
+
+
+class _PagesSessionManager:
+    """SessionManager de prueba: responde cada búsqueda con una página guardada."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.urls = []
+
+    async def request(self, method, url, **kwargs):
+        self.urls.append(url)
+        keyword = httpx.URL(url).path.split("/")[2].replace("de-", "", 1).replace("-", "_")
+        html = self.pages[f"empleos_de_{keyword}"]
+        return httpx.Response(200, content=html.encode("utf-8"), request=httpx.Request(method, url))
+
+
+class TestScrapeOCCBatchPipeline:
+    """JobScraperWorker.scrape_occ_batch sobre el pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_batch_parses_dedups_and_persists_offers(self):
+        pages = load_pages()
+        scraper = OCCScraper()
+        expected = {
+            offer.job_id
+            for name, html in pages.items()
+            for offer in scraper._parse_search_page(html, name)[0][:10]
+        }
+        saved = []
+
+        async def persist(records):
+            saved.extend(offer.job_id for offer, _ in records)
+            return len(records)
+
+        session_manager = _PagesSessionManager(pages)
+        worker = JobScraperWorker(session_manager=session_manager)
+        worker._persist_occ_offers = persist
+        pairs = [("python", "remote"), ("contador", None), ("ingeniero devops", "cdmx")]
+
+        result = await worker.scrape_occ_batch(pairs, limit_per_pair=10, pages=2, persist=True)
+
+        assert len(session_manager.urls) == 6
+        assert set(saved) == expected and len(saved) == len(expected)
+        # La página 2 repite la 1 (mismo HTML) y las páginas guardadas comparten ids
+        assert result.total_found == 6 * 10
+        assert result.duplicates_removed == 6 * 10 - len(expected)
+        assert worker.last_pipeline_stats["stages"]["parse"]["processed"] == 6
+
+    @pytest.mark.asyncio
+    async def test_failed_persist_leaves_offers_unseen_for_the_next_run(self):
+        pages = load_pages()
+        attempts = []
+
+        async def persist(records):
+            attempts.append([offer.job_id for offer, _ in records])
+            if len(attempts) == 1:
+                raise RuntimeError("BD no disponible")
+            return len(records)
+
+        worker = JobScraperWorker(session_manager=_PagesSessionManager(pages))
+        worker._persist_occ_offers = persist
+        config = _config(write_batch_size=100, write_batch_seconds=1)
+
+        first = await worker.scrape_occ_batch([("python", None)], limit_per_pair=10, persist=True, config=config)
+        second = await worker.scrape_occ_batch([("python", None)], limit_per_pair=10, persist=True, config=config)
+        third = await worker.scrape_occ_batch([("python", None)], limit_per_pair=10, persist=True, config=config)
+
+        assert first.duplicates_removed == 0 and worker.last_pipeline_stats["saved"] == 0
+        assert len(attempts) == 2 and attempts[1] == attempts[0] and second.duplicates_removed == 0
+        assert third.duplicates_removed == len(attempts[0]) and len(attempts) == 2
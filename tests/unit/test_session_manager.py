@@ -6,14 +6,18 @@ Tests verify:
 - Adaptive delay timing
 - Session creation and cleanup
 - HTTP headers validity
+- Per-host token buckets and AIMD backoff
 """
 
 import pytest
 import asyncio
-from datetime import datetime
+import httpx
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from app.core.session_manager import (
     SessionManager,
     get_session_manager,
+    parse_retry_after,
     reset_session_manager,
 )
 
@@ -91,12 +95,12 @@ class TestSessionManagerDelay:
         await manager.adaptive_delay()
         elapsed = (datetime.now() - start).total_seconds()
         
-        # Should be at least MIN_DELAY
-        assert elapsed >= manager.MIN_DELAY - 0.2  # Small margin for timing variance
-        # Should be at most MAX_DELAY
-        assert elapsed <= manager.MAX_DELAY + 0.2
+        # Should wait one token interval of the default bucket
+        interval = 1 / manager.limiter().rate
+        assert elapsed >= interval - 0.2  # Small margin for timing variance
+        assert elapsed <= interval + 0.2
         
-        print(f"✓ Second delay waited: {elapsed:.2f}s (range: {manager.MIN_DELAY}-{manager.MAX_DELAY}s)")
+        print(f"✓ Second delay waited: {elapsed:.2f}s (interval: {interval:.2f}s)")
     
     @pytest.mark.asyncio
     async def test_adaptive_delay_timestamps(self):
@@ -118,6 +122,96 @@ class TestSessionManagerDelay:
         print("✓ Timestamps updated correctly")
 
 
+class TestSessionManagerHostRateLimits:
+    """Tests for per-host token buckets and AIMD rate adjustment"""
+    
+    @pytest.mark.asyncio
+    async def test_hosts_do_not_wait_on_each_other(self):
+        """A busy host should not delay requests to another host"""
+        manager = SessionManager()
+        
+        await manager.adaptive_delay("https://www.occ.com.mx/empleos/")
+        start = datetime.now()
+        await manager.adaptive_delay("https://oferta.occ.com.mx/api/1")
+        elapsed = (datetime.now() - start).total_seconds()
+        
+        assert elapsed < 0.1
+        assert set(manager.rate_stats()) == {"www.occ.com.mx", "oferta.occ.com.mx"}
+        print(f"✓ Second host was not delayed: {elapsed:.4f}s")
+    
+    def test_backoff_and_retry_after(self):
+        """429/5xx should cut the rate and Retry-After should pause the host"""
+        manager = SessionManager()
+        url = "https://www.occ.com.mx/empleos/"
+        limiter = manager.limiter(url)
+        initial_rate = limiter.rate
+        
+        manager.record_response(url, 429, {"Retry-After": "30"})
+        assert limiter.rate == pytest.approx(initial_rate * 0.5)
+        assert limiter.reserve() == pytest.approx(30, abs=0.5)
+        
+        manager.record_response(url, 503)
+        manager.record_response(url, 404)  # Client errors are neutral
+        assert limiter.rate == pytest.approx(max(limiter.min_rate, initial_rate * 0.25))
+        assert manager.limiter("https://oferta.occ.com.mx/").rate == initial_rate
+        print("✓ Backoff applied only to the throttled host")
+    
+    def test_rate_ramps_up_after_successes(self):
+        """A run of successes should add to the rate, up to its maximum"""
+        manager = SessionManager()
+        url = "https://www.occ.com.mx/empleos/"
+        limiter = manager.limiter(url)
+        initial_rate = limiter.rate
+        
+        for _ in range(limiter.success_window):
+            manager.record_response(url, 200)
+        assert limiter.rate == pytest.approx(initial_rate + limiter.increase)
+        
+        for _ in range(limiter.success_window * 100):
+            manager.record_response(url, 200)
+        assert limiter.rate == limiter.max_rate
+        print(f"✓ Rate ramped up to {limiter.rate} req/s")
+    
+    def test_parse_retry_after(self):
+        """Retry-After accepts delta-seconds and HTTP-dates, capped"""
+        in_a_minute = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+        
+        assert parse_retry_after("12") == 12
+        assert parse_retry_after(in_a_minute) == pytest.approx(60, abs=2)
+        assert parse_retry_after("86400", max_seconds=120) == 120
+        assert parse_retry_after("mañana") is None
+        assert parse_retry_after(None) is None
+    
+    @pytest.mark.asyncio
+    async def test_request_limits_connections_per_host(self):
+        """request() should respect the per-host connection limit and record responses"""
+        in_flight, peak = 0, 0
+        
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return httpx.Response(200)
+        
+        manager = SessionManager()
+        manager.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        limiter = manager.limiter("https://api.example.com/")
+        limiter.rate = limiter.burst = limiter.tokens = 100
+        manager._connection_slots["api.example.com"] = asyncio.Semaphore(2)
+        
+        responses = await asyncio.gather(*(
+            manager.request("GET", f"https://api.example.com/{i}") for i in range(6)
+        ))
+        await manager.close()
+        
+        assert [r.status_code for r in responses] == [200] * 6
+        assert peak == 2
+        assert limiter.successes == 6 % limiter.success_window
+        print("✓ Per-host connection limit respected")
+
+
 class TestSessionManagerSession:
     """Tests for HTTP session creation and management"""
     
@@ -251,9 +345,9 @@ class TestSessionManagerIntegration:
         
         total_elapsed = (datetime.now() - start_total).total_seconds()
         
-        # First call is instant, next 2 should each be MIN_DELAY
-        # So total should be roughly 2 * MIN_DELAY
-        expected_min = 2 * manager.MIN_DELAY - 0.3
+        # First call is instant, next 2 should each wait one token interval
+        # So total should be roughly 2 * interval
+        expected_min = 2 / manager.limiter().rate - 0.3
         
         assert total_elapsed >= expected_min
         print(f"✓ Three consecutive delays took {total_elapsed:.2f}s (expected min: {expected_min:.2f}s)")
@@ -0,0 +1,146 @@
+"""
+Tests para el job de re-análisis masivo de estudiantes
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.models import Student, StudentReanalysisJob
+from app.services import student_reanalysis
+from app.services.student_reanalysis import (
+    CANCELLED,
+    COMPLETED,
+    RUNNING,
+    ReanalysisJobConflictError,
+    StudentReanalysisJobs,
+)
+
+
+ADMIN = {"user_id": 1, "email": "admin@unrc.edu.mx"}
+CV_TEXT = (
+    "Ana López\nEXPERIENCIA\nDesarrolladora backend en Python y FastAPI, 2020 - 2024.\n"
+    "EDUCACIÓN\nUniversidad Nacional, Ingeniería en Computación, 2016 - 2020.\n"
+    "HABILIDADES\nPython, SQL, Docker, Git, trabajo en equipo y liderazgo.\n"
+)
+
+
+@pytest_asyncio.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'reanalysis.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _add_students(factory, texts):
+    now = datetime.now(timezone.utc)
+    async with factory() as session:
+        await session.execute(insert(Student), [
+            {"name": f"Estudiante {i}", "email": f"e{i}", "hashed_password": "", "profile_text": text,
+             "created_at": now, "consent_date": now}
+            for i, text in enumerate(texts)
+        ])
+        await session.commit()
+
+
+class TestStudentReanalysisJobs:
+    """Creación, checkpoint, cancelación y reanudación"""
+
+    @pytest.mark.asyncio
+    async def test_single_active_job_and_empty_base_completes(self, factory):
+        jobs = StudentReanalysisJobs(session_factory=factory, workers=0)
+        job = await jobs.create(ADMIN, start=False)
+        assert job.actor_email and ADMIN["email"] not in job.actor_email
+
+        with pytest.raises(ReanalysisJobConflictError):
+            await jobs.create(ADMIN, start=False)
+
+        done = await jobs.run(job.job_id)
+        assert (done.status, done.total, done.processed) == (COMPLETED, 0, 0)
+        assert (await jobs.create(ADMIN, start=False)).job_id != job.job_id
+
+    @pytest.mark.asyncio
+    async def test_failed_analysis_is_recorded_and_checkpoint_advances(self, factory, monkeypatch):
+        await _add_students(factory, [CV_TEXT, None, CV_TEXT, "", CV_TEXT])
+
+        def broken(texts):
+            raise RuntimeError("modelo no disponible\ntraceback...")
+        monkeypatch.setattr(student_reanalysis, "_reanalyze_texts", broken)
+
+        jobs = StudentReanalysisJobs(session_factory=factory, chunk_size=2, workers=0)
+        job = await jobs.create(ADMIN, start=False)
+        done = await jobs.run(job.job_id)
+
+        assert (done.total, done.processed, done.updated, done.failed) == (3, 3, 0, 3)
+        assert done.last_student_id == 5 and done.status == COMPLETED
+        assert json.loads(done.errors)[0] == {"student_id": 1, "error": "modelo no disponible"}
+
+    @pytest.mark.asyncio
+    async def test_cancelled_or_fresh_running_job_is_not_claimed(self, factory):
+        jobs = StudentReanalysisJobs(session_factory=factory, workers=0, stale_seconds=60)
+        cancelled = await jobs.create(ADMIN, start=False)
+        await jobs.cancel(cancelled.job_id)
+        running = await jobs.create(ADMIN, start=False)
+        async with factory() as session:
+            await session.execute(
+                update(StudentReanalysisJob)
+                .where(StudentReanalysisJob.id == running.id)
+                .values(status=RUNNING, heartbeat_at=datetime.now(timezone.utc))
+            )
+            await session.commit()
+
+        assert (await jobs.run(cancelled.job_id)).status == CANCELLED
+        assert (await jobs.run(running.job_id)).processed == 0
+        assert await jobs.resume() == 0
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_a_slow_chunk_from_being_reclaimed(self, factory, monkeypatch):
+        await _add_students(factory, [CV_TEXT])
+        jobs = StudentReanalysisJobs(session_factory=factory, workers=0, stale_seconds=0.3)
+        job = await jobs.create(ADMIN, start=False)
+        analyze = jobs._analyze_chunk
+
+        async def slow(executor, rows):
+            await asyncio.sleep(1.0)  # Más que stale_seconds
+            return await analyze(executor, rows)
+
+        monkeypatch.setattr(jobs, "_analyze_chunk", slow)
+        run = asyncio.create_task(jobs.run(job.job_id))
+        await asyncio.sleep(0.7)
+
+        other = StudentReanalysisJobs(session_factory=factory, workers=0, stale_seconds=0.3)
+        assert await other._claim(job.job_id) is None
+        done = await run
+        assert (done.status, done.updated) == (COMPLETED, 1)
+        assert done.heartbeat_at.tzinfo is not None
+
+    @pytest.mark.asyncio
+    async def test_updates_students_and_resumes_from_checkpoint(self, factory):
+        await _add_students(factory, [CV_TEXT] * 5)
+        jobs = StudentReanalysisJobs(session_factory=factory, chunk_size=2, workers=0, stale_seconds=60)
+        job = await jobs.create(ADMIN, start=False)
+        async with factory() as session:
+            # Simula un proceso caído tras confirmar el primer lote
+            await session.execute(
+                update(StudentReanalysisJob)
+                .where(StudentReanalysisJob.id == job.id)
+                .values(status=RUNNING, last_student_id=2, processed=2,
+                        heartbeat_at=datetime.now(timezone.utc) - timedelta(minutes=5))
+            )
+            await session.commit()
+
+        done = await jobs.run(job.job_id)
+
+        assert (done.status, done.processed, done.updated) == (COMPLETED, 5, 3)
+        async with factory() as session:
+            rows = (await session.execute(select(Student.id, Student.skills).order_by(Student.id))).all()
+        assert [skills is not None for _, skills in rows] == [False, False, True, True, True]
+        assert "python" in [skill.lower() for skill in json.loads(rows[-1][1])]